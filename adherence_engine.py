@@ -0,0 +1,236 @@
+"""
+File: adherence_engine.py
+Description: Contains the AdherenceEngine class which checks whether the meals in animals' diets and their scheduled
+treatments actually happened, each within a tolerance window of its scheduled time, and calculates adherence rates per
+animal, per Zookeeper and per Veterinarian over a date range. Each day's scheduled events are matched to the EAT, FEED
+and RECEIVE_TREATMENT rows of the zoo's logs with an as-of merge on time (pandas.merge_asof) rather than by searching
+the logs for every event. The rows are read from the zoo's event store in one view per kind of log, and each diet
+template shared by several animals is read once. Each log row is matched to at most one event: when several events find
+the same row, the nearest keeps it and the others are matched again against the rows that are left.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+from action import Action
+from lazy_modules import pd
+from veterinarian import Veterinarian
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+    from animal import Animal
+    from schedule import Schedule
+
+
+class AdherenceEngine:
+    EVENT_COLUMNS = ["Kind", "AnimalID", "StaffID", "Details", "ScheduledAt", "DoneAt", "Done"]
+
+    def __init__(self, zoo: ZooSystem, tolerance: timedelta = timedelta(hours=1)):
+        """
+        Create a new AdherenceEngine instance.
+        :param zoo: The zoo whose schedules and logs are checked.
+        :param tolerance: How far before or after its scheduled time an event may happen and still count (default is
+        1 hour).
+        """
+        self.__zoo = zoo
+        self.__tolerance = tolerance
+
+    def get_zoo(self) -> ZooSystem:
+        """Return the zoo whose schedules and logs are checked."""
+        return self.__zoo
+
+    def get_tolerance(self) -> timedelta:
+        """Return how far from its scheduled time an event may happen and still count."""
+        return self.__tolerance
+
+    zoo = property(get_zoo)
+    tolerance = property(get_tolerance)
+
+    def animal_events(self, start_date: date, end_date: date) -> DataFrame:
+        """
+        Check every meal in the animals' diets and every scheduled treatment on each day of a date range against the
+        EAT rows of the animals' logs and the RECEIVE_TREATMENT rows of their medical logs. Meals must have the same
+        description as the diet entry (e.g. "200g Raw Chicken"). The animals' current diets and treatment schedules
+        are used for every day of the range.
+        :param start_date: The first date of the range.
+        :param end_date: The last date of the range (inclusive).
+        :return: DataFrame with one row per scheduled event and the columns of EVENT_COLUMNS (StaffID is empty).
+        """
+        animals = self.__zoo.animals
+        meals = self.__entries([(self.__diet(animal), animal.id, "") for animal in animals])
+        treatments = self.__entries([(animal.treatments, animal.id, "") for animal in animals])
+        eaten = [self.__log_rows(self.__zoo.events(animals), Action.EAT)]
+        treated = [self.__log_rows(self.__zoo.events(animals, "MedicalLog"), Action.RECEIVE_TREATMENT)]
+
+        return pd.concat([self.__match("feeding", meals, eaten, start_date, end_date),
+                          self.__match("treatment", treatments, treated, start_date, end_date)], ignore_index=True)
+
+    def staff_events(self, start_date: date, end_date: date) -> DataFrame:
+        """
+        Check every feeding task of each Zookeeper and every treatment task of each Veterinarian on each day of a date
+        range (one per animal diet entry or scheduled treatment in their assigned enclosures) against the FEED rows of
+        the Zookeepers' logs and the RECEIVE_TREATMENT rows (given by that Veterinarian) of the animals' medical logs.
+        :param start_date: The first date of the range.
+        :param end_date: The last date of the range (inclusive).
+        :return: DataFrame with one row per scheduled task and the columns of EVENT_COLUMNS.
+        """
+        feeds, treatments = [], []  # (schedule, animal id, staff id) of each task
+        for member in self.__zoo.staff:
+            for enclosure in member.enclosure_assignments:
+                for animal in enclosure.inhabitants:
+                    if isinstance(member, Zookeeper):
+                        feeds.append((self.__diet(animal), animal.id, member.id))
+                    elif isinstance(member, Veterinarian):
+                        treatments.append((animal.treatments, animal.id, member.id))
+        keepers = [member for member in self.__zoo.staff if isinstance(member, Zookeeper)]
+        fed = [self.__log_rows(self.__zoo.events(keepers), Action.FEED, staff_column="SubjectID",
+                               animal_column="ObjectID")]
+        treated = [self.__log_rows(self.__zoo.events(self.__zoo.animals, "MedicalLog"), Action.RECEIVE_TREATMENT,
+                                   staff_column="ObjectID")]
+        feeds, treatments = self.__entries(feeds), self.__entries(treatments)
+
+        return pd.concat([self.__match("feeding", feeds, fed, start_date, end_date, by_staff=True),
+                          self.__match("treatment", treatments, treated, start_date, end_date, by_staff=True)],
+                         ignore_index=True)
+
+    def animal_adherence(self, start_date: date, end_date: date) -> DataFrame:
+        """
+        Calculate the share of each animal's scheduled meals and treatments that happened over a date range.
+        :param start_date: The first date of the range.
+        :param end_date: The last date of the range (inclusive).
+        :return: DataFrame indexed by animal id with columns Name, Scheduled, Done and Rate.
+        """
+        names = {animal.id: animal.name for animal in self.__zoo.animals}
+        return self.__rates(self.animal_events(start_date, end_date), "AnimalID", names)
+
+    def keeper_adherence(self, start_date: date, end_date: date) -> DataFrame:
+        """
+        Calculate the share of each Zookeeper's scheduled feeding tasks that they carried out over a date range.
+        :param start_date: The first date of the range.
+        :param end_date: The last date of the range (inclusive).
+        :return: DataFrame indexed by staff id with columns Name, Scheduled, Done and Rate.
+        """
+        events = self.staff_events(start_date, end_date)
+        names = {member.id: member.name for member in self.__zoo.staff if isinstance(member, Zookeeper)}
+        return self.__rates(events[events["Kind"] == "feeding"], "StaffID", names)
+
+    def vet_adherence(self, start_date: date, end_date: date) -> DataFrame:
+        """
+        Calculate the share of each Veterinarian's scheduled treatments that they gave over a date range.
+        :param start_date: The first date of the range.
+        :param end_date: The last date of the range (inclusive).
+        :return: DataFrame indexed by staff id with columns Name, Scheduled, Done and Rate.
+        """
+        events = self.staff_events(start_date, end_date)
+        names = {member.id: member.name for member in self.__zoo.staff if isinstance(member, Veterinarian)}
+        return self.__rates(events[events["Kind"] == "treatment"], "StaffID", names)
+
+    def report(self, start_date: date, end_date: date) -> str:
+        """
+        Generate a report of the adherence rates of every animal, Zookeeper and Veterinarian over a date range.
+        :param start_date: The first date of the range.
+        :param end_date: The last date of the range (inclusive).
+        :return: Report of adherence rates as a string.
+        """
+        output = ("----------------------------------------------------------------------------------------------\n"
+                  f"ADHERENCE ({start_date} to {end_date}, within {self.__tolerance} of the scheduled time):\n")
+        for title, rates in (("ANIMALS", self.animal_adherence(start_date, end_date)),
+                             ("ZOOKEEPERS", self.keeper_adherence(start_date, end_date)),
+                             ("VETERINARIANS", self.vet_adherence(start_date, end_date))):
+            output += f"\n{title}:"
+            for entity_id, row in rates.iterrows():
+                rate = f"{row['Rate']:.0%}" if row["Scheduled"] > 0 else "nothing scheduled"
+                output += f"\n - {row['Name']}_{entity_id}: {row['Done']}/{row['Scheduled']} ({rate})"
+        output += "\n----------------------------------------------------------------------------------------------\n"
+        return output
+
+    @staticmethod
+    def __diet(animal: Animal) -> Schedule:
+        """Return the schedule an animal's meals are read from: its species' diet template, which its diet shows until
+        it is customised (so a template is read once however many animals share it), or its own diet."""
+        return animal.diet.template if animal.diet.template is not None else animal.diet
+
+    @staticmethod
+    def __entries(tasks: list[tuple[Schedule, str, str]]) -> list[DataFrame]:
+        """Return the time of day (in seconds) and description of each entry of the daily schedules of tasks, given as
+        (schedule, animal id, staff id); the entries of a schedule shared by several tasks are made once."""
+        schedules = {}  # id of a schedule -> [schedule, [(animal id, staff id) of each task that follows it]]
+        for schedule, animal_id, staff_id in tasks:
+            schedules.setdefault(id(schedule), [schedule, []])[1].append((animal_id, staff_id))
+        entries = []
+        for schedule, followers in schedules.values():
+            rows = schedule.data
+            if rows.empty:
+                continue
+            times = pd.DataFrame({"Details": rows["Details"].to_numpy(),
+                                  "Seconds": [entry.hour * 3600 + entry.minute * 60 + entry.second
+                                              for entry in rows["Time"]]})
+            entries.append(pd.DataFrame(followers, columns=["AnimalID", "StaffID"]).merge(times, how="cross"))
+        return entries
+
+    @staticmethod
+    def __log_rows(log: DataFrame, action: Action, staff_column: str | None = None,
+                   animal_column: str = "SubjectID") -> DataFrame:
+        """Return when each row of a log with an action happened, who to, who by and its description."""
+        rows = log[log["Action"] == action]
+        return pd.DataFrame({"AnimalID": rows[animal_column],
+                             "StaffID": rows[staff_column] if staff_column is not None else "",
+                             "Details": rows["Details"],
+                             "DoneAt": pd.to_datetime(rows["DateTime"]).astype("datetime64[ns]")})
+
+    def __match(self, kind: str, entries: list[DataFrame], done: list[DataFrame], start_date: date, end_date: date,
+                by_staff: bool = False) -> DataFrame:
+        """
+        Repeat daily schedule entries on each day of a date range and match each of them to the log row with the same
+        animal, staff member (if by_staff) and description that happened nearest its scheduled time, within the
+        tolerance. A log row is only matched to one event (the nearest, or the earliest of events as near).
+        """
+        entries = pd.concat(entries) if entries else pd.DataFrame(columns=["AnimalID", "StaffID", "Details", "Seconds"])
+        days = pd.DataFrame({"Date": pd.date_range(start_date, end_date, freq="D")})
+        events = entries.merge(days, how="cross")
+        events["ScheduledAt"] = (events["Date"] + pd.to_timedelta(events["Seconds"].astype(float), unit="s")
+                                 ).astype("datetime64[ns]")
+        events["Kind"] = kind
+
+        done = [rows for rows in done if not rows.empty]
+        keys = ["AnimalID", "StaffID", "Details"] if by_staff else ["AnimalID", "Details"]
+        events = events.astype({key: "string" for key in keys}).sort_values("ScheduledAt", kind="stable")
+        events["DoneAt"] = pd.Series(pd.NaT, index=events.index, dtype="datetime64[ns]")
+        if done and not events.empty:
+            done = pd.concat(done, ignore_index=True).astype({key: "string" for key in keys})
+            done = done.rename_axis("Row").reset_index().sort_values("DoneAt", kind="stable")
+            events = events.reset_index(drop=True)
+            unmatched = events.index
+            while len(unmatched) and not done.empty:
+                matches = pd.merge_asof(events.loc[unmatched, keys + ["ScheduledAt"]].reset_index(),
+                                        done[keys + ["Row", "DoneAt"]], left_on="ScheduledAt", right_on="DoneAt",
+                                        by=keys, tolerance=pd.Timedelta(self.__tolerance), direction="nearest")
+                matches = matches[matches["Row"].notna()]
+                if matches.empty:
+                    break
+                # each log row goes to the nearest of the events that found it, the others try the rows left.
+                matches["Distance"] = (matches["DoneAt"] - matches["ScheduledAt"]).abs()
+                kept = matches.sort_values(["Distance", "ScheduledAt"], kind="stable").drop_duplicates("Row")
+                events.loc[kept["index"], "DoneAt"] = kept["DoneAt"].to_numpy()
+                done = done[~done["Row"].isin(kept["Row"])]
+                unmatched = unmatched.difference(kept["index"])
+        events["Done"] = events["DoneAt"].notna()
+        return events[AdherenceEngine.EVENT_COLUMNS]
+
+    @staticmethod
+    def __rates(events: DataFrame, by: str, names: dict[str, str]) -> DataFrame:
+        """Count the scheduled and done events of each animal or staff member and the share that were done."""
+        rates = events.groupby(by)["Done"].agg(Scheduled="size", Done="sum")
+        rates = rates.reindex(list(names), fill_value=0)  # include everyone, even with nothing scheduled
+        rates["Rate"] = rates["Done"] / rates["Scheduled"]  # NaN if nothing was scheduled
+        rates.insert(0, "Name", pd.Series(names))
+        rates.index.name = by
+        return rates
@@ -6,19 +6,26 @@ ID: 110462390
 Username: ivany005
 This is my own work as defined by the University's Academic Integrity Policy.
 """
+import sys
 from datetime import datetime  # automatically handles formatting issues with dates and times.
 from datetime import time
+from itertools import count
 
 from action import Action
+from diet_schedule import DietSchedule
 from environmental_type import EnvironmentalType
 from has_health import HasHealth
 from log import Log
+from observable import Observable
 from requires_cleaning import RequiresCleaning
-from schedule import Schedule
+from severity import Severity
+from species_profile import SpeciesProfile
 
 
 class Animal(RequiresCleaning, HasHealth):
-    _next_id = 1  # unique identifier of the animal which is incremented by one each time an animal is created.
+    __slots__ = RequiresCleaning.SLOTS + ("__name", "__species", "__sound", "__age", "__habitat", "__id", "__table",
+                                          "__table_row", "__profile", "__log", "__diet")
+    _ids = count(1)  # unique identifiers of animals, the next one is taken each time an animal is created.
 
     def __init__(self, name: str, species: str, sound: str, habitat: EnvironmentalType = EnvironmentalType.GRASS,
                  age: int = 0):
@@ -30,9 +37,10 @@ class Animal(RequiresCleaning, HasHealth):
         :param age:  The age of the animal in years (default is 0).
         :param sound: The sound that the animal makes
         """
-        self.__name = name
-        self.__species = species
-        self.__sound = sound
+        # names, species and sounds repeat across many animals, so a single shared copy of each string is kept.
+        self.__name = sys.intern(name) if isinstance(name, str) else name
+        self.__species = sys.intern(species) if isinstance(species, str) else species
+        self.__sound = sys.intern(sound) if isinstance(sound, str) else sound
 
         try:
             if age < 0:
@@ -54,12 +62,19 @@ class Animal(RequiresCleaning, HasHealth):
                   f"of EnvironmentalType.GRASS years was assumed.\n")
         self.__habitat = habitat
 
-        self.__id = "A" + str(Animal._next_id)  # A to represent 'Animal'
-        Animal._next_id += 1
+        self.__id = "A" + str(next(Animal._ids))  # A to represent 'Animal' (next() is safe across threads).
 
-        self.__log = Log(f"{self.__name}_{self.id} General Activity")  # new Log to store records of general activities.
-        self.__diet = Schedule(f"{self.__name}_{self.id} Dietary")  # create a new schedule to store daily feeding plan.
+        # optional AnimalTable that stores the animal's age, cleanliness and treatment status in its columns:
+        self.__table = None
+        self.__table_row = None
 
+        self.__log = Log(f"{self.__name}_{self.id} General Activity", self.id)  # new Log to store records of general activities.
+        # the profile of the species, whose diet template the animal eats until customised: the profile its zoo
+        # shares (see use_profile()), or one of its own made when first needed while it is not in a zoo.
+        self.__profile = None
+        self.__diet = DietSchedule(f"{self.__name}_{self.id} Dietary", self.id, self.__name)
+
+        Observable.__init__(self)
         RequiresCleaning.__init__(self)
         HasHealth.__init__(self)
 
@@ -85,7 +100,64 @@ class Animal(RequiresCleaning, HasHealth):
 
     def get_age(self) -> int:
         """Return an integer representing the animal's age in years."""
-        return self.__age
+        return self.__age if self.__table is None else self.__table.get_age(self.__table_row)
+
+    def get_cleanliness(self) -> Severity:
+        """Get how clean the animal is represented as an enumeration (Severity)."""
+        if self.__table is None:
+            return RequiresCleaning.get_cleanliness(self)
+        return self.__table.get_cleanliness(self.__table_row)
+
+    def _set_cleanliness(self, cleanliness: Severity):
+        """Store how clean the animal is (in its AnimalTable row if it has one)."""
+        if self.__table is None:
+            RequiresCleaning._set_cleanliness(self, cleanliness)
+        else:
+            self.__table.set_cleanliness(self.__table_row, cleanliness)
+
+    def get_under_treatment(self) -> bool:
+        """Get whether the animal is currently receiving medical treatment: true or false."""
+        if self.__table is None:
+            return HasHealth.get_under_treatment(self)
+        return self.__table.get_under_treatment(self.__table_row)
+
+    def _set_under_treatment(self, under_treatment: bool):
+        """Store whether the animal is under treatment (in its AnimalTable row if it has one)."""
+        if self.__table is None:
+            HasHealth._set_under_treatment(self, under_treatment)
+        else:
+            self.__table.set_under_treatment(self.__table_row, under_treatment)
+
+    def get_table(self):
+        """Return the AnimalTable that stores the animal's state (None if the animal is not in a table)."""
+        return self.__table
+
+    def get_table_row(self) -> int | None:
+        """Return the row of the animal in its AnimalTable (None if the animal is not in a table)."""
+        return self.__table_row
+
+    def attach_to_table(self, table, row: int):
+        """
+        Make the animal a view onto a row of an AnimalTable: its age, cleanliness and treatment status are read from
+        and written to the table from now on. Called by AnimalTable.add() once the row holds the animal's state.
+        :param table: The AnimalTable.
+        :param row: The row of the table that holds the animal's state.
+        :return: None
+        """
+        self.__table = table
+        self.__table_row = row
+
+    def detach_from_table(self):
+        """Copy the animal's state out of its AnimalTable row and stop using the table. Called by
+        AnimalTable.remove()."""
+        if self.__table is None:
+            return None
+        self.__age = self.get_age()
+        cleanliness, under_treatment = self.get_cleanliness(), self.get_under_treatment()
+        self.__table = None
+        self.__table_row = None
+        self._set_cleanliness(cleanliness)
+        self._set_under_treatment(under_treatment)
 
     def get_id(self) -> str:
         """Return a string representing the animal's unique identifier."""
@@ -95,6 +167,10 @@ class Animal(RequiresCleaning, HasHealth):
         """Return a string representing the animal's species."""
         return self.__species
 
+    def get_sound(self) -> str:
+        """Return a string representing the sound the animal makes."""
+        return self.__sound
+
     def get_habitat(self) -> EnvironmentalType:
         """Return an enumeration representing the habitat the animal lives in."""
         return self.__habitat
@@ -103,15 +179,38 @@ class Animal(RequiresCleaning, HasHealth):
         """ Returns the log of the animal's activities."""
         return self.__log
 
-    def get_diet(self) -> Schedule:
+    def get_profile(self) -> SpeciesProfile:
+        """Return the profile of the animal's species (shared by the animals of the species in its zoo)."""
+        if self.__profile is None:
+            self.use_profile(SpeciesProfile(self.__species, self.__habitat, self.__sound))
+        return self.__profile
+
+    def use_profile(self, profile: SpeciesProfile) -> None:
+        """
+        Share a profile of the animal's species, e.g. the profile of the zoo the animal is added to (called by
+        ZooSystem.add_animal()). The animal's diet shows the profile's diet template unless it has its own rows.
+        :param profile: The SpeciesProfile of the animal's species.
+        :return: None
+        """
+        if profile is not self.__profile and profile.species == self.__species:
+            self.__diet.use_template(profile.diet)
+            self.__profile = profile
+
+    def get_diet(self) -> DietSchedule:
         """ Returns the animal's daily feeding schedule."""
         return self.__diet
 
     name = property(get_name)
     age = property(get_age)
+    cleanliness = property(get_cleanliness)
+    under_treatment = property(get_under_treatment)
+    table = property(get_table)
+    table_row = property(get_table_row)
     id = property(get_id)
     species = property(get_species)
+    sound = property(get_sound)
     log = property(get_log)
+    profile = property(get_profile)
     diet = property(get_diet)
     habitat = property(get_habitat)
 
@@ -133,14 +232,17 @@ class Animal(RequiresCleaning, HasHealth):
             print(f"[WARNING] Provided number of years to age is not numeric, so default value of "
                   f"1 year was assumed.\n")
 
-        self.__age += years
+        if self.__table is None:
+            self.__age += years
+        else:
+            self.__table.set_age(self.__table_row, self.get_age() + years)
         self.log.new({"DateTime": at_datetime,
                       "SubjectID": self.__id,
                       "SubjectName": self.__name,
                       "ObjectID": self.__id,
                       "ObjectName": self.__name,
                       "Action": Action.AGE,
-                      "Details": f"by {years} year(s) to become {self.__age} year(s) old"})
+                      "Details": f"by {years} year(s) to become {self.age} year(s) old"})
 
     def sleep(self, at_datetime: datetime = datetime.now()):
         """
@@ -170,21 +272,21 @@ class Animal(RequiresCleaning, HasHealth):
                       "Action": Action.SPEAK,
                       "Details": f"'{self.__sound}'"})
 
-    def eat(self, food: str, quantity: str, at_datetime=datetime.now()):
+    def eat(self, food: str, quantity: str, at_datetime=datetime.now()) -> int | None:
         """
         Log that the animal ate food.
         :param food: Name of the food eaten.
         :param quantity: Quantity of the food eaten.
         :param at_datetime: The date and time at which the animal ate food (default is when the method is called).
-        :return: None
+        :return: The reference number of the new row added.
         """
-        self.log.new({"DateTime": at_datetime,
-                      "SubjectID": self.__id,
-                      "SubjectName": self.__name,
-                      "ObjectID": self.__id,
-                      "ObjectName": self.__name,
-                      "Action": Action.EAT,
-                      "Details": f"{quantity} {food}"})
+        return self.log.new({"DateTime": at_datetime,
+                             "SubjectID": self.__id,
+                             "SubjectName": self.__name,
+                             "ObjectID": self.__id,
+                             "ObjectName": self.__name,
+                             "Action": Action.EAT,
+                             "Details": f"{quantity} {food}"})
 
     def drink(self, liquid: str, quantity: str, at_datetime=datetime.now()):
         """
@@ -204,19 +306,13 @@ class Animal(RequiresCleaning, HasHealth):
 
     def add_to_diet(self, food: str, quantity: str, at_time: time):
         """
-        Add food to the animal's diet.
+        Add food to the animal's diet (the first change copies the species' diet template into the animal's diet).
         :param food: Name of the food to be eaten.
         :param quantity: Quantity of the food to be eaten.
         :param at_time: The time at which the animal should eat the food.
         :return: None
         """
-        self.diet.new({"Time": at_time,
-                       "SubjectID": self.id,
-                       "SubjectName": self.name,
-                       "ObjectID": self.id,
-                       "ObjectName": self.name,
-                       "Action": Action.EAT,
-                       "Details": f"{quantity} {food}"})
+        self.diet.add_food(food, quantity, at_time)
 
     def remove_food_from_diet(self, after_time: time = time(0, 0, 0),
                               before_time: time = time(23, 59, 59)):
@@ -0,0 +1,211 @@
+"""
+File: animal_table.py
+Description: Contains the AnimalTable class which stores the age, cleanliness and treatment status of many animals
+in numpy arrays (one row per animal), so that zoo-wide changes such as ageing every animal or making every animal
+dirtier are made to whole columns at once. Animals added to the table become views onto their row.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+
+from action import Action
+from animal import Animal
+from data_record import DataRecord
+from lazy_modules import np
+from severity import Severity
+
+
+class AnimalTable:
+    SEVERITY_BY_LEVEL = {severity.level: severity for severity in Severity}  # look up a Severity from its level.
+    MIN_LEVEL = min(SEVERITY_BY_LEVEL)
+    MAX_LEVEL = max(SEVERITY_BY_LEVEL)
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Create a new (empty) AnimalTable instance.
+        :param capacity: The number of rows to allocate up front (the table grows as required).
+        """
+        self.__size = 0
+        self.__animals = []  # row -> animal
+        self.__ages = np.zeros(capacity, dtype=float)
+        self.__cleanliness = np.zeros(capacity, dtype=np.int8)  # Severity levels
+        self.__under_treatment = np.zeros(capacity, dtype=bool)
+        self.__species = np.empty(capacity, dtype=object)
+
+    def __len__(self) -> int:
+        """Return the number of animals in the table."""
+        return self.__size
+
+    def get_animals(self) -> list[Animal]:
+        """Return the animals in the table in row order."""
+        return self.__animals
+
+    def get_ages(self) -> np.ndarray:
+        """Return the age column (years) of the table as a read-only array."""
+        return self.__read_only(self.__ages)
+
+    def get_cleanliness_levels(self) -> np.ndarray:
+        """Return the cleanliness column (Severity levels) of the table as a read-only array."""
+        return self.__read_only(self.__cleanliness)
+
+    def get_under_treatment(self, row: int | None = None) -> np.ndarray | bool:
+        """Return the under treatment column of the table as a read-only array, or the value of a single row."""
+        if row is not None:
+            return bool(self.__under_treatment[row])
+        return self.__read_only(self.__under_treatment)
+
+    def get_species(self) -> np.ndarray:
+        """Return the species column of the table as a read-only array."""
+        return self.__read_only(self.__species)
+
+    animals = property(get_animals)
+    ages = property(get_ages)
+    cleanliness_levels = property(get_cleanliness_levels)
+    under_treatment = property(get_under_treatment)
+    species = property(get_species)
+
+    # single row access (used by Animal views) ---------------------------------------------------------------
+
+    def get_age(self, row: int) -> float:
+        """Return the age of the animal in a row."""
+        age = self.__ages[row]
+        return int(age) if age.is_integer() else float(age)
+
+    def set_age(self, row: int, age: float):
+        """Set the age of the animal in a row."""
+        self.__ages[row] = age
+
+    def get_cleanliness(self, row: int) -> Severity:
+        """Return the cleanliness of the animal in a row."""
+        return AnimalTable.SEVERITY_BY_LEVEL[int(self.__cleanliness[row])]
+
+    def set_cleanliness(self, row: int, cleanliness: Severity):
+        """Set the cleanliness of the animal in a row."""
+        self.__cleanliness[row] = cleanliness.level
+
+    def set_under_treatment(self, row: int, under_treatment: bool):
+        """Set whether the animal in a row is under treatment."""
+        self.__under_treatment[row] = under_treatment
+
+    # adding and removing --------------------------------------------------------------------------------------
+
+    def add(self, animal: Animal) -> None:
+        """
+        Add an animal to the table. The animal's current state is copied into a new row and the animal then reads
+        and writes its state from the table.
+        :param animal: The animal to add.
+        :return: None
+        """
+        try:
+            if not isinstance(animal, Animal):
+                raise TypeError("Only Animal objects can be added to an AnimalTable.")
+            if animal.table is not None:
+                raise ValueError(f"{animal.name}_{animal.id} is already in an AnimalTable.")
+
+            if self.__size == len(self.__ages):  # double the capacity of every column when full
+                self.__ages, self.__cleanliness, self.__under_treatment, self.__species = (
+                    np.concatenate([column, np.zeros_like(column)]) for column in
+                    (self.__ages, self.__cleanliness, self.__under_treatment, self.__species))
+
+            row = self.__size
+            self.__ages[row] = animal.age
+            self.__cleanliness[row] = animal.cleanliness.level
+            self.__under_treatment[row] = animal.under_treatment
+            self.__species[row] = animal.species
+            self.__animals.append(animal)
+            self.__size += 1
+            animal.attach_to_table(self, row)
+        except (TypeError, ValueError) as e:
+            print(f"[ERROR] {e} No change made.\n")
+
+    def remove(self, animal: Animal) -> None:
+        """
+        Remove an animal from the table. Its state is copied back into the animal, and the last row of the table is
+        moved into the empty row so that the columns stay contiguous.
+        :param animal: The animal to remove.
+        :return: None
+        """
+        if not isinstance(animal, Animal) or animal.table is not self:
+            return None
+
+        row, last = animal.table_row, self.__size - 1
+        animal.detach_from_table()
+        if row != last:
+            for column in (self.__ages, self.__cleanliness, self.__under_treatment, self.__species):
+                column[row] = column[last]
+            self.__animals[row] = self.__animals[last]
+            self.__animals[row].attach_to_table(self, row)
+        self.__animals.pop()
+        self.__species[last] = None
+        self.__size -= 1
+
+    # vectorised operations ------------------------------------------------------------------------------------
+
+    def select(self, mask: np.ndarray) -> list[Animal]:
+        """
+        Return the animals in the rows selected by a boolean mask, e.g. table.select(table.ages >= 10).
+        :param mask: A boolean array with one value per row.
+        :return: A list of the selected animals in row order.
+        """
+        return [self.__animals[row] for row in np.flatnonzero(mask)]
+
+    def age_all(self, years: float = 1, at_datetime: datetime = datetime.now(), mask: np.ndarray | None = None):
+        """
+        Increase the age of every animal (or every animal selected by a mask) and log the event for each of them.
+        :param years: The number of years the animals have gotten older (default 1 year).
+        :param at_datetime: The date and time at which the animals got older (default is when the method is called).
+        :param mask: Optional boolean array selecting the rows to age (default is every row).
+        :return: None
+        """
+        rows = self.__rows(mask)
+        self.__ages[rows] += abs(years)
+        self.__log(rows, at_datetime, Action.AGE,
+                   [f"by {abs(years)} year(s) to become {self.get_age(row)} year(s) old" for row in rows])
+
+    def soil_all(self, levels: int | np.ndarray = 1, at_datetime: datetime = datetime.now(),
+                 mask: np.ndarray | None = None):
+        """
+        Reduce the cleanliness of every animal (or every animal selected by a mask) and log the event for each of
+        them. Cleanliness cannot drop below the lowest Severity level.
+        :param levels: The number of levels to reduce cleanliness by, either one number for every animal or an array
+        with one value per selected row (default 1).
+        :param at_datetime: The date and time at which the animals became dirtier (default is when method is called).
+        :param mask: Optional boolean array selecting the rows to soil (default is every row).
+        :return: None
+        """
+        rows = self.__rows(mask)
+        new_levels = np.clip(self.__cleanliness[rows] - np.abs(levels), AnimalTable.MIN_LEVEL, AnimalTable.MAX_LEVEL)
+        self.__cleanliness[rows] = new_levels
+        self.__log(rows, at_datetime, Action.BECOME_DIRTIER,
+                   [f"cleanliness is now '{AnimalTable.SEVERITY_BY_LEVEL[int(level)].description}'"
+                    for level in new_levels])
+        for row, level in zip(rows, new_levels):  # keep zoo-wide indexes (e.g. the CleaningQueue) up to date
+            self.__animals[row].notify_observers(Action.BECOME_DIRTIER, at_datetime,
+                                                 cleanliness=AnimalTable.SEVERITY_BY_LEVEL[int(level)])
+
+    def __rows(self, mask: np.ndarray | None) -> np.ndarray:
+        """Return the row numbers selected by a mask (every row if there is no mask)."""
+        return np.arange(self.__size) if mask is None else np.flatnonzero(mask[:self.__size])
+
+    def __log(self, rows: np.ndarray, at_datetime: datetime, action: Action, details: list[str]) -> None:
+        """Add one log row per animal in a single batch of writes."""
+        with DataRecord.batched_writes():
+            for row, row_details in zip(rows, details):
+                animal = self.__animals[row]
+                animal.log.new({"DateTime": at_datetime,
+                                "SubjectID": animal.id,
+                                "SubjectName": animal.name,
+                                "ObjectID": animal.id,
+                                "ObjectName": animal.name,
+                                "Action": action,
+                                "Details": row_details})
+
+    def __read_only(self, column: np.ndarray) -> np.ndarray:
+        """Return a read-only view of the filled rows of a column."""
+        view = column[:self.__size]
+        view.flags.writeable = False
+        return view
@@ -0,0 +1,19 @@
+"""
+File: __init__.py
+Description: The benchmark suite of the zoo: a seeded generator of synthetic zoos of any size (synthetic_zoo.py) and
+timings of the zoo's key paths on them, saved as JSON so runs can be compared (suite.py), and budgets for the memory
+of their animals, log rows and schedule rows (memory.py); recorded workloads (see workload.py) can be replayed and
+timed too. Run it from the project directory with e.g.
+
+    python -m benchmarks --scales 1000 10000 --output after.json --baseline before.json
+    python -m benchmarks --memory --scales 200
+    python -m benchmarks --replay monday.workload.gz
+
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from benchmarks.memory import BASELINE_ANIMALS, BUDGETS, Budget, Measurement, check_budgets, measure, measure_zoo
+from benchmarks.suite import BENCHMARKS, benchmark, compare, run_benchmarks, run_replay
+from benchmarks.synthetic_zoo import generate_zoo
@@ -0,0 +1,71 @@
+"""
+File: __main__.py
+Description: Command line of the benchmark suite: runs the benchmarks, saves the results as JSON and, given the
+results of an earlier run, lists the regressions (exiting with status 1 if there are any). With --memory the memory of
+each animal, log row and schedule row is checked against its budget instead (see memory.py), and with --replay a
+recorded workload is replayed and timed instead (see workload.py).
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.memory import BUDGETS, check_budgets
+from benchmarks.suite import BENCHMARKS, compare, run_benchmarks, run_replay
+
+parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Time the key paths of the zoo.")
+parser.add_argument("--scales", type=int, nargs="+", default=[1000],
+                    help="number of animals in each synthetic zoo, e.g. 1000 10000 100000 1000000 (default 1000)")
+parser.add_argument("--repeat", type=int, default=3, help="runs of each benchmark (default 3)")
+parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic zoos (default 0)")
+parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="benchmarks to run (default all)")
+parser.add_argument("--output", default="benchmark_results.json", help="file to save the results to")
+parser.add_argument("--baseline", help="results of an earlier run to compare with")
+parser.add_argument("--threshold", type=float, default=0.25,
+                    help="slowdown of the median time flagged as a regression (default 0.25, 25%%)")
+parser.add_argument("--memory", action="store_true",
+                    help="check the memory per animal, log row and schedule row against its budget instead of timing")
+parser.add_argument("--replay", metavar="TRACE", help="replay and time a recorded workload instead (see workload.py)")
+parser.add_argument("--speed", type=float,
+                    help="replay this many times faster than recorded (default as fast as possible)")
+arguments = parser.parse_args()
+
+if arguments.memory:
+    print(f"{'measurement':<14} {'animals':>9} {'units':>7} {'retained/unit':>14} {'peak/unit':>11} {'budgets':>17}")
+    failures = []
+    for scale in arguments.scales:
+        measurements, over = check_budgets(scale, seed=arguments.seed)
+        for name, measurement in measurements.items():
+            print(f"{name:<14} {scale:>9,} {measurement.units:>7,} {measurement.retained / measurement.units:>14,.0f}"
+                  f" {measurement.peak / measurement.units:>11,.0f} {BUDGETS[name].retained:>8,}/"
+                  f"{BUDGETS[name].peak:,}")
+        failures += over
+    for failure in failures:
+        print(f"[OVER BUDGET] {failure}")
+    sys.exit(1 if failures else 0)
+
+if arguments.replay:
+    print(f"{'benchmark':<40} {'calls':>9} {'median':>15}")
+    results = run_replay(arguments.replay, arguments.repeat, arguments.speed, print)
+    print(f"{results['skipped']:,} calls skipped, {results['errors']:,} raised an exception")
+else:
+    print(f"{'benchmark':<40} {'animals':>9} {'median':>15}")
+    results = run_benchmarks(arguments.scales, arguments.repeat, arguments.seed, arguments.only, print)
+with open(arguments.output, "w", encoding="utf-8") as file:
+    json.dump(results, file, indent=2)
+print(f"\nResults saved to {arguments.output}")
+
+if arguments.baseline:
+    with open(arguments.baseline, encoding="utf-8") as file:
+        regressions = compare(json.load(file), results, arguments.threshold)
+    for regression in regressions:
+        print(f"[REGRESSION] {regression['benchmark']} at {regression['scale']:,} "
+              f"{'calls' if arguments.replay else 'animals'}: "
+              f"{regression['before'] * 1000:.2f} ms -> {regression['after'] * 1000:.2f} ms "
+              f"(+{regression['change']:.0%})")
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions against {arguments.baseline}.")
@@ -0,0 +1,177 @@
+"""
+File: memory.py
+Description: Measures the memory used by synthetic zoos (see synthetic_zoo.py) with tracemalloc and checks it against
+budgets: the bytes each animal, each log row (event) and each schedule row may use at the peak of building them and
+once built (retained). Every entity keeps its records in pandas DataFrames, so a change that gives each one another
+DataFrame multiplies the memory of a large zoo. Only the line that made each allocation is traced while budgets are
+checked, which is cheap; a measurement over budget is repeated tracing whole call stacks, so that the allocation sites
+that grew the most can be named by the line that allocated the memory and the line of the zoo that called it, e.g.
+
+    python -m benchmarks --memory --scales 200
+
+To re-baseline after a change that is meant to use more (or less) memory, run the command above, which prints the
+bytes retained and at peak per unit of a BASELINE_ANIMALS zoo, and set each budget of BUDGETS 10-20% above them
+(keeping the measured values in the comments), so that a regression of more than that is caught.
+
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import gc
+import os
+import random
+import tracemalloc
+from datetime import datetime
+from typing import Callable, NamedTuple
+
+from benchmarks.synthetic_zoo import add_history, generate_zoo
+from data_record import DataRecord
+
+
+class Budget(NamedTuple):
+    retained: int  # bytes per unit still in use once it is built
+    peak: int  # bytes per unit in use at the peak of building it
+
+
+class Measurement(NamedTuple):
+    name: str  # what was measured, e.g. "animal"
+    units: int  # how many were built
+    retained: int  # bytes still in use once they were built
+    peak: int  # bytes in use at the peak of building them
+    top: list[tuple[str, int, int]]  # the sites that grew the most: (site, bytes, number of allocations)
+
+
+BASELINE_ANIMALS = 200  # the size of the synthetic zoo the budgets were measured on (smaller zoos use more per unit)
+BUDGETS = {  # the most memory each unit of a BASELINE_ANIMALS zoo may use, 10-20% over what it used when measured.
+    "animal": Budget(retained=63_000, peak=65_000),  # measured 54,551 retained and 55,903 at peak
+    "log_row": Budget(retained=1_200, peak=1_250),  # measured 1,018 and 1,053
+    "schedule_row": Budget(retained=490, peak=690),  # measured 421 and 594
+}
+FRAMES = 12  # frames of the call stack traced to name the sites of a measurement over budget (much slower to trace)
+_PROJECT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(name: str, build: Callable[[], tuple[object, int]], frames: int = 1, top: int = 10) -> Measurement:
+    """
+    Measure the memory used while building something and retained once it is built.
+    :param name: What is measured, e.g. "animal".
+    :param build: Function that builds it and returns (what was built, which is kept until it has been measured, the
+    number of units built).
+    :param frames: The number of frames of the call stack traced for each allocation (default 1, only the line that
+    made it).
+    :param top: The number of allocation sites to keep (default 10).
+    :return: The Measurement.
+    """
+    gc.collect()
+    tracemalloc.start(frames)
+    try:
+        before = tracemalloc.take_snapshot()
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        built, units = build()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del built
+    sites = {}  # site -> [bytes, number of allocations]
+    for difference in after.compare_to(before, "traceback"):
+        site = sites.setdefault(_site(difference.traceback), [0, 0])
+        site[0] += difference.size_diff
+        site[1] += difference.count_diff
+    largest = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    return Measurement(name, units, current - start, peak - start,
+                       [(site, size, count) for site, (size, count) in largest])
+
+
+def _site(traceback: tracemalloc.Traceback) -> str:
+    """Name an allocation by the line that made it and the last line of the zoo (outside benchmarks) on its stack."""
+    innermost = traceback[-1]
+    own = [frame for frame in traceback if frame.filename.startswith(_PROJECT) and "site-packages" not in
+           frame.filename and os.sep + "benchmarks" + os.sep not in frame.filename]
+    site = f"{os.path.basename(innermost.filename)}:{innermost.lineno}"
+    if own and own[-1] != innermost:
+        site += f" <- {os.path.basename(own[-1].filename)}:{own[-1].lineno}"
+    return site
+
+
+def measure_zoo(animals: int = 100, events_per_animal: int = 4, seed: int = 0, frames: int = 1,
+                only: list[str] | None = None) -> dict[str, Measurement]:
+    """
+    Measure the memory of each animal, log row and schedule row of a synthetic zoo: building the zoo (without
+    history), then adding its history, then generating every staff member's daily schedule.
+    :param animals: The number of animals in the zoo.
+    :param events_per_animal: The average number of events in the history of each animal.
+    :param seed: The seed of the synthetic zoo.
+    :param frames: The number of frames of the call stack traced for each allocation (default 1).
+    :param only: The measurements to make (default all).
+    :return: Dictionary of "animal", "log_row" and "schedule_row" (or those in only) -> Measurement.
+    """
+    warm_up = generate_zoo(15, events_per_animal=2, seed=seed)  # pandas allocates its caches on first use.
+    for staff_member in warm_up.staff:
+        staff_member.generate_schedule()
+    del warm_up
+
+    zoo = None
+
+    def build_zoo() -> tuple[object, int]:
+        nonlocal zoo
+        zoo = generate_zoo(animals, events_per_animal=0, seed=seed)
+        return zoo, animals
+
+    def build_history() -> tuple[object, int]:
+        events = len(zoo.event_store)
+        with DataRecord.batched_writes():
+            add_history(zoo, random.Random(seed), events_per_animal, datetime(2004, 11, 2))
+        return None, len(zoo.event_store) - events
+
+    def build_schedules() -> tuple[object, int]:
+        schedules = [staff_member.generate_schedule() for staff_member in zoo.staff]
+        return schedules, sum(schedule.row_count for schedule in schedules)
+
+    measurements = {}
+    for name, build in (("animal", build_zoo), ("log_row", build_history), ("schedule_row", build_schedules)):
+        if zoo is None and name != "animal":
+            build_zoo()
+        if only is None or name in only:
+            measurements[name] = measure(name, build, frames)
+    return measurements
+
+
+def over_budget(measurements: dict[str, Measurement], budgets: dict[str, Budget] = BUDGETS) -> list[str]:
+    """
+    Check measurements against budgets per unit.
+    :param measurements: Dictionary of name -> Measurement (see measure_zoo()).
+    :param budgets: Dictionary of name -> Budget per unit (default BUDGETS).
+    :return: A description of each measurement over its budget, with its top allocation sites (empty if none are).
+    """
+    failures = []
+    for name, measurement in measurements.items():
+        budget = budgets[name]
+        retained, peak = measurement.retained / measurement.units, measurement.peak / measurement.units
+        if retained > budget.retained or peak > budget.peak:
+            failures.append(f"{name}: {retained:,.0f} bytes retained (budget {budget.retained:,}) and {peak:,.0f} "
+                            f"bytes at peak (budget {budget.peak:,}) per {name} over {measurement.units:,}\n"
+                            f"{format_top(measurement)}")
+    return failures
+
+
+def format_top(measurement: Measurement) -> str:
+    """Return the allocation sites that grew the most during a measurement, one per line."""
+    return "".join(f"    {size:>+14,} B {count:>+9,} allocations  {site}\n" for site, size, count in measurement.top)
+
+
+def check_budgets(animals: int = BASELINE_ANIMALS, events_per_animal: int = 4, seed: int = 0,
+                  budgets: dict[str, Budget] = BUDGETS) -> tuple[dict[str, Measurement], list[str]]:
+    """
+    Measure a synthetic zoo (see measure_zoo()) and check it against budgets per unit, measuring again with whole
+    call stacks to name the allocation sites of any measurement over budget.
+    :return: The measurements and a description of each one over its budget, with its top allocation sites.
+    """
+    measurements = measure_zoo(animals, events_per_animal, seed)
+    over = [name for name in measurements if over_budget({name: measurements[name]}, budgets)]
+    if not over:
+        return measurements, []
+    return measurements, over_budget(measure_zoo(animals, events_per_animal, seed, FRAMES, over), budgets)
@@ -0,0 +1,192 @@
+"""
+File: suite.py
+Description: Times the key paths of the zoo on synthetic zoos (see synthetic_zoo.py) of one or more sizes: building
+the zoo, adding animals, writing log rows with Log.new, generating every staff member's schedule, every report_*
+method, moving animals between enclosures and simulating a day of the zoo (see zoo_simulation.py). A workload
+recorded from a real run (see workload.py) can be replayed and timed the same way, per type of operation. Results are
+kept as JSON documents so that runs can be saved, compared and regressions flagged.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import functools
+import platform
+import statistics
+from datetime import datetime, timedelta
+from itertools import count
+from time import perf_counter
+from typing import Callable
+
+from action import Action
+from benchmarks.synthetic_zoo import SPECIES, generate_zoo
+from workload import WorkloadReplayer, read_workload
+from zoo_simulation import ZooSimulation
+from zoo_system import ZooSystem
+
+BENCHMARKS = {}  # name -> function(zoo, scale) that runs the benchmark once and returns the number of operations.
+
+
+def benchmark(name: str) -> Callable:
+    """Register a function as the benchmark of a key path, e.g. @benchmark("log_new")."""
+    def register(function: Callable) -> Callable:
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+
+@benchmark("add_animals")
+def add_animals(zoo: ZooSystem, scale: int) -> int:
+    """Create 100 animals and add them to the zoo (they are removed again afterwards, outside the timing)."""
+    cls, species, habitat, arguments, diet = SPECIES[0]
+    animals = [cls(f"{species} Newcomer", species, *arguments, habitat=habitat) for _ in range(100)]
+    for animal in animals:
+        zoo.add_animal(animal)
+    return len(animals)
+
+
+@benchmark("log_new")
+def log_new(zoo: ZooSystem, scale: int) -> int:
+    """Write one row per animal of the zoo to the animal's log with Log.new."""
+    at = datetime(2005, 1, 1)
+    for animal in zoo.animals:
+        animal.log.new({"DateTime": at, "SubjectID": animal.id, "SubjectName": animal.name, "Action": Action.EAT,
+                        "ObjectID": None, "ObjectName": None, "Details": "200g Raw Chicken"})
+    return len(zoo.animals)
+
+
+@benchmark("generate_schedule")
+def generate_schedule(zoo: ZooSystem, scale: int) -> int:
+    """Generate the daily schedule of every staff member."""
+    for staff_member in zoo.staff:
+        staff_member.generate_schedule()
+    return len(zoo.staff)
+
+
+def _report_benchmark(name: str) -> None:
+    """Register the benchmark of one report_* method of ZooSystem."""
+    def run(zoo: ZooSystem, scale: int) -> int:
+        if name == "report_animal_medical_history":
+            getattr(zoo, name)(zoo.animals[0])
+        else:
+            getattr(zoo, name)()
+        return 1
+    run.__doc__ = f"Generate the {name.removeprefix('report_').replace('_', ' ')} report once."
+    benchmark(name)(run)
+
+
+for report_name in [name for name in vars(ZooSystem) if name.startswith("report_")]:
+    _report_benchmark(report_name)
+
+
+@benchmark("move_animal")
+def move_animal(zoo: ZooSystem, scale: int) -> int:
+    """Move up to 100 animals (not under treatment) to another enclosure of their species, and back again."""
+    enclosures = {}
+    for enclosure in zoo.enclosures:
+        enclosures.setdefault(enclosure.species, []).append(enclosure)
+    moves = [(animal, home, others[1] if others[0] is home else others[0])
+             for others in enclosures.values() if len(others) > 1
+             for home in others for animal in home.inhabitants if not animal.under_treatment][:100]
+    for animal, home, other in moves:
+        zoo.move_animal(animal, home, other)
+    for animal, home, other in moves:
+        zoo.move_animal(animal, other, home)
+    return 2 * len(moves)
+
+
+_simulated_days = count()  # each run of simulate_day simulates the day after the one before.
+
+
+@benchmark("simulate_day")
+def simulate_day(zoo: ZooSystem, scale: int) -> int:
+    """Simulate one day of the zoo with its animals in an AnimalTable (a year of the zoo takes 365 times as long)."""
+    zoo.enable_animal_table()
+    summary = ZooSimulation(zoo, datetime(2006, 1, 1) + timedelta(days=next(_simulated_days))).run(1)
+    return sum(summary["events"].values())
+
+
+def run_benchmarks(scales: list[int], repeat: int = 3, seed: int = 0, only: list[str] | None = None,
+                   progress: Callable[[str], None] | None = None) -> dict:
+    """
+    Build a synthetic zoo of each size and time each benchmark on it.
+    :param scales: The number of animals in each zoo, e.g. [1000, 10000].
+    :param repeat: How many times each benchmark is run (default 3); the median and best times are kept.
+    :param seed: The seed of the synthetic zoos (default 0).
+    :param only: The names of the benchmarks to run (default every benchmark in BENCHMARKS).
+    :param progress: Function called with a line describing each result as it is measured (default none).
+    :return: The results as a JSON-ready dictionary (see compare()).
+    """
+    names = list(BENCHMARKS) if only is None else only
+    results = []
+    record = functools.partial(_record, results, progress)
+
+    for scale in scales:
+        start = perf_counter()
+        zoo = generate_zoo(scale, seed=seed)
+        record("generate_zoo", scale, scale, [perf_counter() - start])
+        for name in names:
+            runs = []
+            for _ in range(repeat):
+                animals = list(zoo.animals)
+                start = perf_counter()
+                operations = BENCHMARKS[name](zoo, scale)
+                runs.append(perf_counter() - start)
+                for animal in zoo.animals[len(animals):]:  # e.g. the animals added by add_animals
+                    zoo.remove_animal(animal)
+            record(name, scale, operations, runs)
+
+    return {"created": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+            "platform": platform.platform(), "seed": seed, "repeat": repeat, "results": results}
+
+
+def run_replay(path: str, repeat: int = 3, speed: float | None = None,
+               progress: Callable[[str], None] | None = None) -> dict:
+    """
+    Replay a recorded workload against fresh zoos and time it, in total and per type of operation.
+    :param path: The path of the workload's trace (see workload.py).
+    :param repeat: How many times the workload is replayed (default 3); the median and best times are kept.
+    :param speed: None to replay as fast as possible (default), or how many times faster than recorded to replay.
+    :param progress: Function called with a line describing each result as it is measured (default none).
+    :return: The results as a JSON-ready dictionary (see compare()), whose scale is the number of calls in the trace.
+    """
+    header, calls = read_workload(path)
+    replays = [WorkloadReplayer(calls).replay(speed) for _ in range(repeat)]
+    results = []
+    record = functools.partial(_record, results, progress)
+    record("replay", len(calls), replays[0].operations, [replay.duration for replay in replays])
+    for label in sorted({label for replay in replays for label in replay.durations}):
+        record(f"replay {label}", len(calls), len(replays[0].durations.get(label, [])),
+               [sum(replay.durations.get(label, [])) for replay in replays])
+    return {"created": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+            "platform": platform.platform(), "workload": path, "recorded": header["started"], "repeat": repeat,
+            "skipped": replays[0].skipped, "errors": sum(replays[0].errors.values()), "results": results}
+
+
+def _record(results: list[dict], progress: Callable[[str], None] | None, name: str, scale: int, operations: int,
+            runs: list[float]) -> None:
+    """Add the result of a benchmark (its median and best times) to the results, and describe it to progress."""
+    result = {"benchmark": name, "scale": scale, "operations": operations, "seconds": statistics.median(runs),
+              "best": min(runs), "runs": runs}
+    results.append(result)
+    if progress is not None:
+        progress(f"{name:<40} {scale:>9,} {result['seconds'] * 1000:>12.2f} ms  ({operations:,} operations)")
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.25) -> list[dict]:
+    """
+    Compare two runs of the benchmarks and find the regressions: benchmarks (at the same scale) whose median time
+    grew by more than the threshold.
+    :param baseline: The results of the earlier run (from run_benchmarks() or a saved JSON file).
+    :param current: The results of the later run.
+    :param threshold: How much slower a benchmark may become before it is a regression (default 0.25, 25%).
+    :return: A dictionary for each regression with the benchmark, scale, times before and after, and the change.
+    """
+    before = {(result["benchmark"], result["scale"]): result["seconds"] for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        key = (result["benchmark"], result["scale"])
+        if key in before and before[key] > 0 and result["seconds"] > before[key] * (1 + threshold):
+            regressions.append({"benchmark": key[0], "scale": key[1], "before": before[key],
+                                "after": result["seconds"], "change": result["seconds"] / before[key] - 1})
+    return regressions
@@ -0,0 +1,141 @@
+"""
+File: synthetic_zoo.py
+Description: Builds synthetic zoos of any size for benchmarks. The same arguments (including the seed) always give a
+zoo of the same shape: the same animals of the same species and classes (Bird, Mammal and Reptile, several species
+per EnvironmentalType), housed in the same enclosures, the same keepers and vets with the same assignments, species
+diet templates with some animals' diets customised, and a history of feedings, cleanings, health checks, diagnoses,
+treatments and recoveries. Only the ids differ, as they are unique across every zoo built in a process.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import random
+from datetime import datetime, time, timedelta
+
+from bird import Bird
+from data_record import DataRecord
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from mammal import Mammal
+from reptile import Reptile
+from severity import Severity
+from veterinarian import Veterinarian
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+# (class, species, habitat, the arguments of the class after name and species, diet template of (food, quantity, time))
+SPECIES = [
+    (Mammal, "Panthera leo", EnvironmentalType.SAVANNAH, ("Roar", "Golden"), [("Raw Beef", "5kg", time(16))]),
+    (Mammal, "Vulpes zerda", EnvironmentalType.DESERT, ("Yip", "Sandy", True), [("Mouse", "2x whole", time(20))]),
+    (Mammal, "Hydrochoerus hydrochaeris", EnvironmentalType.GRASS, ("Whistle", "Brown"),
+     [("Hay", "2kg", time(9)), ("Carrots", "500g", time(15))]),
+    (Mammal, "Panthera onca", EnvironmentalType.RAINFOREST, ("Growl", "Spotted", True),
+     [("Raw Chicken", "2kg", time(18))]),
+    (Mammal, "Enhydra lutris", EnvironmentalType.AQUATIC, ("Squeal", "Brown"),
+     [("Clams", "1kg", time(10)), ("Fish", "1kg", time(16))]),
+    (Bird, "Aptenodytes forsteri", EnvironmentalType.AQUATIC, (76, False), [("Fish", "1kg", time(11))]),
+    (Bird, "Ara macao", EnvironmentalType.RAINFOREST, (100, True),
+     [("Seeds", "100g", time(8)), ("Fruit", "200g", time(14))]),
+    (Bird, "Struthio camelus", EnvironmentalType.SAVANNAH, (200, False), [("Pellets", "1.5kg", time(9))]),
+    (Bird, "Geococcyx californianus", EnvironmentalType.DESERT, (50, True), [("Crickets", "30x whole", time(12))]),
+    (Bird, "Passer domesticus", EnvironmentalType.GRASS, (22, True), [("Seeds", "20g", time(7))]),
+    (Reptile, "Ophiophagus hannah", EnvironmentalType.DESERT, ("Hiss", "Smooth", True),
+     [("Raw Chicken", "200g", time(10))]),
+    (Reptile, "Eunectes murinus", EnvironmentalType.RAINFOREST, ("Hiss", "Smooth"), [("Rabbit", "1x whole", time(19))]),
+    (Reptile, "Chelonia mydas", EnvironmentalType.AQUATIC, ("Grunt", "Scute"), [("Seagrass", "500g", time(13))]),
+    (Reptile, "Crocodylus niloticus", EnvironmentalType.SAVANNAH, ("Bellow", "Keeled"),
+     [("Raw Beef", "3kg", time(17))]),
+    (Reptile, "Thamnophis sirtalis", EnvironmentalType.GRASS, ("Hiss", "Keeled"), [("Worms", "10x whole", time(11))]),
+]
+
+
+def generate_zoo(animals: int = 1000, enclosures_per_type: int | None = None, keepers: int | None = None,
+                 vets: int | None = None, events_per_animal: int = 4, seed: int = 0,
+                 start: datetime = datetime(2004, 11, 1)) -> ZooSystem:
+    """
+    Build a synthetic zoo.
+    :param animals: The number of animals.
+    :param enclosures_per_type: The number of enclosures of each EnvironmentalType (default one for every 60 animals
+    of the type, at least two per species of the type). Each enclosure houses one species of its type.
+    :param keepers: The number of Zookeepers, who share the enclosures between them (default one per 50 animals).
+    :param vets: The number of Veterinarians, who share the animals between them (default one per 200 animals).
+    :param events_per_animal: The average number of events in the history of each animal (default 4).
+    :param seed: The seed of the random choices (default 0).
+    :param start: When the history of the zoo starts (default 1 November 2004).
+    :return: The zoo as a ZooSystem.
+    """
+    rng = random.Random(seed)
+    zoo = ZooSystem(f"Synthetic Zoo ({animals} animals, seed {seed})")
+    habitats = list(EnvironmentalType)
+    species_by_habitat = {habitat: [entry for entry in SPECIES if entry[2] == habitat] for habitat in habitats}
+    if enclosures_per_type is None:
+        enclosures_per_type = max(2 * max(map(len, species_by_habitat.values())), animals // (60 * len(habitats)))
+    keepers = max(1, animals // 50) if keepers is None else keepers
+    vets = max(1, animals // 200) if vets is None else vets
+
+    with DataRecord.batched_writes():  # every log is written once, at the end.
+        for cls, species, habitat, arguments, diet in SPECIES:  # the diet templates shared by the zoo's animals.
+            profile = zoo.get_species_profile(species, habitat)
+            for food, quantity, at_time in diet:
+                profile.add_to_diet(food, quantity, at_time)
+
+        homes = {}  # species -> the enclosures housing it
+        for habitat in habitats:
+            for number in range(enclosures_per_type):
+                enclosure = Enclosure(f"{habitat.value} {number + 1}", habitat, rng.randint(50, 500))
+                enclosure.location = (rng.uniform(0, 1000), rng.uniform(0, 1000))
+                zoo.add_enclosure(enclosure, start)
+                species = species_by_habitat[habitat][number % len(species_by_habitat[habitat])]
+                homes.setdefault(species[1], []).append(enclosure)
+
+        for number in range(animals):
+            cls, species, habitat, arguments, diet = rng.choice(SPECIES)
+            animal = cls(f"{species} {number + 1}", species, *arguments, age=rng.randint(0, 20), habitat=habitat)
+            zoo.add_animal(animal, start)
+            if rng.random() < 0.1:  # a tenth of the animals have a customised diet.
+                animal.add_to_diet("Vitamin Supplement", "10g", time(rng.randint(6, 20)))
+            enclosures = homes[species]
+            zoo.assign_animal_to_enclosure(animal, enclosures[number % len(enclosures)], start)
+
+        staff_start = start + timedelta(hours=1)
+        zookeepers = [Zookeeper(f"Keeper {number + 1}") for number in range(keepers)]
+        veterinarians = [Veterinarian(f"Vet {number + 1}") for number in range(vets)]
+        for staff_member in zookeepers + veterinarians:
+            zoo.add_staff_member(staff_member, start)
+        for number, enclosure in enumerate(zoo.enclosures):
+            zookeepers[number % keepers].assign(enclosure, staff_start)
+        for number, animal in enumerate(zoo.animals):
+            veterinarians[number % vets].assign(animal, staff_start)
+
+        add_history(zoo, rng, events_per_animal, staff_start)
+    return zoo
+
+
+def add_history(zoo: ZooSystem, rng: random.Random, events_per_animal: int, start: datetime) -> None:
+    """Add feedings, cleanings, health checks and treatments to the history of a synthetic zoo, in time order."""
+    keeper_of = {enclosure.id: keeper for keeper in zoo.staff if isinstance(keeper, Zookeeper)
+                 for enclosure in keeper.enclosure_assignments}
+    vet_of = {animal.id: vet for vet in zoo.staff if isinstance(vet, Veterinarian) for animal in vet.animal_assignments}
+    home_of = {animal.id: enclosure for enclosure in zoo.enclosures for animal in enclosure.inhabitants}
+    animals = zoo.animals
+    at = start
+    for _ in range(len(animals) * events_per_animal):
+        at += timedelta(seconds=rng.randint(1, 120))
+        animal = animals[rng.randrange(len(animals))]
+        home = home_of[animal.id]
+        kind = rng.random()
+        if kind < 0.5:
+            keeper_of[home.id].feed(animal, "Raw Chicken", "200g", at)
+        elif kind < 0.7:
+            home.become_dirtier(at, 1)
+            keeper_of[home.id].clean(home, at)
+        elif kind < 0.9:
+            vet_of[animal.id].check_health(animal, "Routine check", Severity.VERY_LOW, at)
+        elif not animal.under_treatment:
+            vet_of[animal.id].diagnose(animal, "Infection", rng.choice(list(Severity)), "Antibiotics.",
+                                       [[time(9), "antibiotics"]], at)
+        elif rng.random() < 0.5:
+            vet_of[animal.id].treat(animal, "antibiotics", Severity.LOW, at)
+        else:
+            vet_of[animal.id].declare_recovery(animal, "Recovered.", at)
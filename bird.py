@@ -15,6 +15,8 @@ from environmental_type import EnvironmentalType
 
 
 class Bird(Animal):
+    __slots__ = ("__can_fly", "__wingspan")
+
     def __init__(self, name: str, species: str, wingspan: float, can_fly: bool = True, age: int = 0,
                  habitat: EnvironmentalType = EnvironmentalType.RAINFOREST):
         """
@@ -60,6 +62,17 @@ class Bird(Animal):
                                     f"\n > Can fly: {self.__can_fly}"
                                     f"\n")
 
+    def get_wingspan(self) -> float:
+        """Return the wingspan of the bird in cm."""
+        return self.__wingspan
+
+    def get_can_fly(self) -> bool:
+        """Return whether the bird can fly."""
+        return self.__can_fly
+
+    wingspan = property(get_wingspan)
+    can_fly = property(get_can_fly)
+
     def fly(self, at_datetime: datetime = datetime.now()):
         """Log that the Bird flies, or tries and fails to fly depending on the Bird's can_fly attribute.
         :param at_datetime: The date and time at which the bird attempted to fly (default is when the method is called).
@@ -0,0 +1,135 @@
+"""
+File: cleaning_queue.py
+Description: Contains the CleaningQueue class which keeps the enclosures and animals of a zoo ordered by how much they
+need cleaning: dirtiest first, and then by how long it has been since they were last cleaned. It also keeps them
+ordered by when they were last cleaned, so that objects which have not been cleaned within a time limit are found
+without checking every object. The queue watches each object so it is always up to date.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import threading
+from datetime import datetime, timedelta
+
+from action import Action
+from indexed_heap import IndexedHeap
+from requires_cleaning import RequiresCleaning
+from severity import Severity
+
+
+class CleaningQueue:
+    CLEAN_LEVEL = max(severity.level for severity in Severity)  # objects at this level do not need cleaning.
+
+    def __init__(self):
+        """
+        Create a new (empty) CleaningQueue instance.
+        """
+        self.__by_need = IndexedHeap()  # object id -> (cleanliness level, last cleaned datetime)
+        self.__by_last_cleaned = IndexedHeap()  # object id -> last cleaned datetime
+        self.__objects = {}  # object id -> object, for every object being watched by the queue.
+        self.__lock = threading.RLock()  # held while the queue is read or changed (by any thread).
+
+    def __len__(self) -> int:
+        """Return the number of objects being watched by the queue."""
+        return len(self.__objects)
+
+    def __contains__(self, dirtying_object: RequiresCleaning) -> bool:
+        """Determine whether an object is being watched by the queue."""
+        return isinstance(dirtying_object, RequiresCleaning) and dirtying_object.id in self.__objects
+
+    def get_last_cleaned(self, dirtying_object: RequiresCleaning) -> datetime | None:
+        """Return when an object was last cleaned (None if it has never been cleaned or is not being watched)."""
+        last_cleaned = self.__by_last_cleaned.get_priority(dirtying_object.id)
+        return None if last_cleaned is None or last_cleaned == datetime.min else last_cleaned
+
+    def watch(self, dirtying_object: RequiresCleaning) -> None:
+        """
+        Start keeping track of an enclosure or animal. Its last cleaning is found from its log.
+        :param dirtying_object: The object (of type RequiresCleaning) to watch.
+        :return: None
+        """
+        try:
+            if not isinstance(dirtying_object, RequiresCleaning):
+                raise TypeError("Only RequiresCleaning objects can be added to the cleaning queue.")
+
+            with self.__lock:
+                self.__objects[dirtying_object.id] = dirtying_object
+                dirtying_object.add_observer(self)
+
+                log = dirtying_object.log.data
+                cleanings = log.loc[log["Action"] == Action.RECEIVE_CLEANING, "DateTime"]
+                self.__prioritise(dirtying_object, cleanings.max() if len(cleanings) > 0 else datetime.min)
+        except TypeError as e:
+            print(f"[ERROR] {e} No change made.\n")
+
+    def unwatch(self, dirtying_object: RequiresCleaning) -> None:
+        """
+        Stop keeping track of an enclosure or animal.
+        :param dirtying_object: The object to stop watching.
+        :return: None
+        """
+        with self.__lock:
+            if dirtying_object in self:
+                dirtying_object.remove_observer(self)
+                self.__by_need.remove(dirtying_object.id)
+                self.__by_last_cleaned.remove(dirtying_object.id)
+                del self.__objects[dirtying_object.id]
+
+    def update(self, subject: RequiresCleaning, action: Action, at_datetime: datetime, **details) -> None:
+        """
+        Re-prioritise an object after its cleanliness changed (called by the object as one of its observers).
+        :param subject: The object whose cleanliness changed.
+        :param action: The action that occurred.
+        :param at_datetime: When the action occurred.
+        :param details: Further information about the action.
+        :return: None
+        """
+        with self.__lock:
+            if subject.id not in self.__objects:
+                return None  # unwatched by another thread while it was being notified.
+            match action:
+                case Action.BECOME_DIRTIER:
+                    self.__prioritise(subject, self.__by_last_cleaned.get_priority(subject.id))
+                case Action.RECEIVE_CLEANING:
+                    # an older cleaning cannot override the object's latest cleaning.
+                    self.__prioritise(subject, max(at_datetime, self.__by_last_cleaned.get_priority(subject.id)))
+
+    def next_to_clean(self, k: int = 1, object_ids: set[str] | None = None) -> list[RequiresCleaning]:
+        """
+        Return the k objects that most need cleaning, dirtiest first (objects that are fully clean are left out).
+        :param k: The number of objects to return (default 1).
+        :param object_ids: Optionally only consider the objects with these ids.
+        :return: A list of enclosures and/or animals.
+        """
+        predicate = None if object_ids is None else object_ids.__contains__
+        with self.__lock:
+            entries = self.__by_need.peek(k, predicate, below=(CleaningQueue.CLEAN_LEVEL,))
+            return [self.__objects[key] for key, priority in entries]
+
+    def not_cleaned_since(self, cutoff: datetime, object_ids: set[str] | None = None) -> list[RequiresCleaning]:
+        """
+        Return the objects that have not been cleaned since a date and time, longest since cleaning first. Only those
+        objects are visited, so this takes O(m log m) time for m objects returned.
+        :param cutoff: The date and time objects must have been cleaned since.
+        :param object_ids: Optionally only consider the objects with these ids.
+        :return: A list of enclosures and/or animals.
+        """
+        predicate = None if object_ids is None else object_ids.__contains__
+        with self.__lock:
+            entries = self.__by_last_cleaned.peek(len(self.__objects), predicate, below=cutoff)
+            return [self.__objects[key] for key, priority in entries]
+
+    def overdue(self, now: datetime, limit: timedelta = timedelta(hours=24)) -> list[RequiresCleaning]:
+        """
+        Return the objects that have not been cleaned within a time limit (e.g. "not cleaned in 24h").
+        :param now: The current date and time.
+        :param limit: How often objects must be cleaned (default 24 hours).
+        :return: A list of enclosures and/or animals, longest since cleaning first.
+        """
+        return self.not_cleaned_since(now - limit)
+
+    def __prioritise(self, dirtying_object: RequiresCleaning, last_cleaned: datetime) -> None:
+        """Store an object's current cleanliness and when it was last cleaned in both orderings."""
+        self.__by_need.push(dirtying_object.id, (dirtying_object.cleanliness.level, last_cleaned))
+        self.__by_last_cleaned.push(dirtying_object.id, last_cleaned)
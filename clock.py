@@ -0,0 +1,57 @@
+"""
+File: clock.py
+Description: Contains the abstract Clock class and its concrete SystemClock and SimulatedClock subclasses which
+provide the current date and time used for the at_datetime of zoo actions, so that the same code can run in real
+time or in a simulation.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import time as system_time
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+
+class Clock(ABC):
+    @abstractmethod
+    def now(self) -> datetime:
+        """Return the current date and time according to the clock."""
+
+    @abstractmethod
+    def advance_to(self, at_datetime: datetime) -> None:
+        """
+        Move the clock forward to a date and time (or wait until it is reached).
+        :param at_datetime: The date and time to move to.
+        :return: None
+        """
+
+
+class SystemClock(Clock):
+    def now(self) -> datetime:
+        """Return the current date and time of the computer."""
+        return datetime.now()
+
+    def advance_to(self, at_datetime: datetime) -> None:
+        """Wait in real time until the date and time is reached."""
+        delay = (at_datetime - datetime.now()).total_seconds()
+        if delay > 0:
+            system_time.sleep(delay)
+
+
+class SimulatedClock(Clock):
+    def __init__(self, start: datetime):
+        """
+        Create a new SimulatedClock instance.
+        :param start: The date and time the clock starts at.
+        """
+        self.__now = start
+
+    def now(self) -> datetime:
+        """Return the current simulated date and time."""
+        return self.__now
+
+    def advance_to(self, at_datetime: datetime) -> None:
+        """Jump straight to a date and time (the clock never goes backwards)."""
+        if at_datetime > self.__now:
+            self.__now = at_datetime
@@ -7,16 +7,27 @@ ID: 110462390
 Username: ivany005
 This is my own work as defined by the University's Academic Integrity Policy.
 """
-from abc import ABC, abstractmethod
+from __future__ import annotations
 
-import pandas as pd
-from pandas import DataFrame
+import sys
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from itertools import count
+from typing import TYPE_CHECKING
 
 from action import Action
+from lazy_modules import pd
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class DataRecord(ABC):
-    _next_empty_row = 0  # use to index records, increment by +1 each time a new row is added to a record.
+    _ref_nums = count()  # use to index records, the next number is taken each time a new row is added to a record.
+    # per thread: the number of open batched_writes() contexts (new rows are buffered while it is above 0) and the
+    # records holding buffered rows that have not yet been added to their data.
+    _batching = threading.local()
 
     # Id is stored as a class attribute so that every row in the zoo's records has an absolutely unique
     # reference number and can be tracked down if required.
@@ -34,12 +45,21 @@ class DataRecord(ABC):
             "ObjectID": pd.Series(dtype="string"),  # receiver of the action (if applicable)
             "ObjectName": pd.Series(dtype="string"),  # receiver of the action (if applicable)
             "Details": pd.Series(dtype="string")})
+        self.__pending_rows = []  # rows added during batched_writes() that are not yet in the DataFrame.
+        self.__pending_index = []  # reference numbers of the pending rows.
+        self.__lock = threading.RLock()  # held while rows are added to the record (by any thread).
 
     def get_data(self) -> DataFrame:
         """Return the data stored in the DataRecord instance.
         :return: DataFrame"""
+        if self.__pending_rows:
+            self.flush()
         return self.__data
 
+    def get_columns(self) -> list[str]:
+        """Return the names of the columns of the DataRecord (without adding any pending rows to the data)."""
+        return list(self.__data.columns.values)
+
     def set_data(self, new_data: DataFrame):
         """
         Replace the data stored in the DataRecord instance with another DataFrame that has matching columns.
@@ -66,8 +86,57 @@ class DataRecord(ABC):
         """Set the name of the DataRecord to a new string value."""
         self.__name = name
 
+    def get_memory_usage(self) -> int:
+        """Return the number of bytes used by the DataRecord and the rows stored in its own DataFrame."""
+        self.flush()
+        return sys.getsizeof(self) + int(self.__data.memory_usage(deep=True).sum())
+
+    def get_row_count(self) -> int:
+        """Return the number of rows in the DataRecord (including buffered rows, without adding them to the data)."""
+        return len(self.__data) + len(self.__pending_rows)
+
     data = property(get_data, set_data)
     name = property(get_name, set_name)
+    columns = property(get_columns)
+    row_count = property(get_row_count)
+
+    @classmethod
+    @contextmanager
+    def batched_writes(cls):
+        """
+        Buffer the rows added to every DataRecord inside a 'with DataRecord.batched_writes():' block, and add them to
+        their DataFrames in one step per record when the block ends (or when a record's data is next read). Adding
+        rows one at a time copies the whole DataFrame each time, so this is much faster for many rows.
+        :return: None
+        """
+        batching = DataRecord._batching
+        if not hasattr(batching, "depth"):  # the first batch of this thread.
+            batching.depth, batching.records = 0, []
+        batching.depth += 1
+        try:
+            yield
+        finally:
+            batching.depth -= 1
+            if batching.depth == 0:
+                cls.flush_all()
+
+    @classmethod
+    def flush_all(cls):
+        """Add the rows buffered by the current thread to the DataFrames of their DataRecords."""
+        records, DataRecord._batching.records = getattr(DataRecord._batching, "records", []), []
+        for record in records:
+            record.flush()
+
+    def flush(self):
+        """Add the buffered rows of the DataRecord to its DataFrame in a single step."""
+        with self.__lock:
+            if not self.__pending_rows:
+                return None
+            new_rows = pd.DataFrame.from_records(self.__pending_rows, index=self.__pending_index,
+                                                 columns=self.__data.columns)
+            self.__data = new_rows if self.__data.empty else pd.concat([self.__data, new_rows])
+            self.__pending_rows = []
+            self.__pending_index = []
 
     @abstractmethod
     def new(self, new_row: dict) -> int | None:
@@ -91,14 +160,21 @@ class DataRecord(ABC):
             if not isinstance(new_row.get("Action"), Action):
                 raise TypeError("The action of a new log record must be from the Action enumeration.")
 
-            assert set(self.data.columns.values) == set(new_row.keys()), (
+            assert set(self.columns) == set(new_row.keys()), (
                 f"The dictionary keys must match the existing columns of the DataRecord data attribute. "
                 f"\nExpected: {set(self.__data.columns.values)}"
                 f"\nGot: {set(new_row.keys())}")
 
-            self.__data.loc[DataRecord._next_empty_row] = new_row
-            DataRecord._next_empty_row += 1
-            return DataRecord._next_empty_row - 1  # reduce by one as incrementing by +1 has already occurred.
+            with self.__lock:
+                log_ref_num = next(DataRecord._ref_nums)  # next() never gives two threads the same number.
+                if getattr(DataRecord._batching, "depth", 0) > 0:
+                    if not self.__pending_rows:
+                        DataRecord._batching.records.append(self)
+                    self.__pending_rows.append(new_row)
+                    self.__pending_index.append(log_ref_num)
+                else:
+                    self.__data.loc[log_ref_num] = new_row
+            return log_ref_num
 
         except TypeError as e:
             print(f"[ERROR] {e} No change made.\n")
@@ -0,0 +1,159 @@
+"""
+File: decay_scheduler.py
+Description: Contains the DecayScheduler class which makes enclosures and animals become dirtier on their own, one
+level at a time, at a rate that depends on their environment (e.g. AQUATIC enclosures foul faster than DESERT ones).
+Each object has one decay timer in a TimerWheel, so scheduling and cancelling a decay takes O(1) time and moving time
+forward only visits the objects that are due rather than looping over every enclosure and animal. The decays of
+each tick are logged with a single bulk write.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import threading
+from datetime import datetime, timedelta
+
+from action import Action
+from data_record import DataRecord
+from environmental_type import EnvironmentalType
+from requires_cleaning import RequiresCleaning
+from severity import Severity
+from timer_wheel import TimerWheel
+
+
+class DecayScheduler:
+    # how long an object in each environment takes to become one level dirtier:
+    DECAY_INTERVALS = {EnvironmentalType.AQUATIC: timedelta(hours=6),
+                       EnvironmentalType.RAINFOREST: timedelta(hours=8),
+                       EnvironmentalType.SAVANNAH: timedelta(hours=12),
+                       EnvironmentalType.GRASS: timedelta(hours=12),
+                       EnvironmentalType.DESERT: timedelta(hours=24)}
+    DIRTIEST_LEVEL = min(severity.level for severity in Severity)  # objects at this level cannot decay any further.
+
+    def __init__(self, start: datetime, decay_intervals: dict[EnvironmentalType, timedelta] | None = None,
+                 resolution: timedelta = timedelta(minutes=1)):
+        """
+        Create a new DecayScheduler instance (with no objects).
+        :param start: The date and time the scheduler starts at.
+        :param decay_intervals: How long an object in each environment takes to become one level dirtier (default is
+        DECAY_INTERVALS, environments that are left out use the default too).
+        :param resolution: The length of one tick of the scheduler, decays are rounded down to a whole tick (default
+        1 minute).
+        """
+        self.__start = start
+        self.__resolution = resolution
+        self.__intervals = {environment: max(1, interval // resolution)  # in ticks
+                            for environment, interval in (DecayScheduler.DECAY_INTERVALS | (decay_intervals or {})
+                                                          ).items()}
+        self.__wheel = TimerWheel()
+        self.__objects = {}  # object id -> object, for every object being watched by the scheduler.
+        self.__lock = threading.RLock()  # held while the wheel is changed (never while objects decay).
+
+    def __len__(self) -> int:
+        """Return the number of objects being watched by the scheduler."""
+        return len(self.__objects)
+
+    def __contains__(self, dirtying_object: RequiresCleaning) -> bool:
+        """Determine whether an object is being watched by the scheduler."""
+        return isinstance(dirtying_object, RequiresCleaning) and dirtying_object.id in self.__objects
+
+    def get_now(self) -> datetime:
+        """Return the date and time the scheduler has reached."""
+        return self.__time_of(self.__wheel.now)
+
+    def get_decay_interval(self, dirtying_object: RequiresCleaning) -> timedelta:
+        """Return how long an object takes to become one level dirtier (based on its environment)."""
+        return self.__ticks_per_level(dirtying_object) * self.__resolution
+
+    def get_next_decay(self, dirtying_object: RequiresCleaning) -> datetime | None:
+        """Return when an object next becomes dirtier (None if it is not being watched or cannot decay further)."""
+        due_tick = self.__wheel.get_due(dirtying_object.id)
+        return None if due_tick is None else self.__time_of(due_tick)
+
+    now = property(get_now)
+
+    def watch(self, dirtying_object: RequiresCleaning) -> None:
+        """
+        Start decaying an enclosure or animal, its first decay is one decay interval from now.
+        :param dirtying_object: The object (of type RequiresCleaning) to decay.
+        :return: None
+        """
+        try:
+            if not isinstance(dirtying_object, RequiresCleaning):
+                raise TypeError("Only RequiresCleaning objects can be decayed by the scheduler.")
+
+            with self.__lock:
+                self.__objects[dirtying_object.id] = dirtying_object
+                dirtying_object.add_observer(self)
+                self.__schedule(dirtying_object, self.__wheel.now)
+        except TypeError as e:
+            print(f"[ERROR] {e} No change made.\n")
+
+    def unwatch(self, dirtying_object: RequiresCleaning) -> None:
+        """
+        Stop decaying an enclosure or animal.
+        :param dirtying_object: The object to stop decaying.
+        :return: None
+        """
+        with self.__lock:
+            if dirtying_object in self:
+                dirtying_object.remove_observer(self)
+                self.__wheel.cancel(dirtying_object.id)
+                del self.__objects[dirtying_object.id]
+
+    def update(self, subject: RequiresCleaning, action: Action, at_datetime: datetime, **details) -> None:
+        """
+        Restart an object's decay after it was cleaned (called by the object as one of its observers).
+        :param subject: The object whose cleanliness changed.
+        :param action: The action that occurred.
+        :param at_datetime: When the action occurred.
+        :param details: Further information about the action.
+        :return: None
+        """
+        if action == Action.RECEIVE_CLEANING:
+            with self.__lock:
+                if subject in self:
+                    self.__schedule(subject, (at_datetime - self.__start) // self.__resolution)
+
+    def advance_to(self, at_datetime: datetime) -> int:
+        """
+        Move the scheduler forward to a date and time, making every object whose decay is due by then one level
+        dirtier (at the time its decay was due). Objects that become fully dirty stop decaying until they are cleaned.
+        :param at_datetime: The date and time to move to.
+        :return: The number of decays that occurred.
+        """
+        decays = 0
+        ticks = self.__wheel.advance((at_datetime - self.__start) // self.__resolution)
+        while True:
+            with self.__lock:  # the wheel moves under the lock, but objects decay outside it (they take their own).
+                tick, object_ids = next(ticks, (None, None))
+            if tick is None:
+                return decays
+            due = self.__time_of(tick)
+            with DataRecord.batched_writes():  # one bulk write for every decay of the tick.
+                for object_id in object_ids:
+                    dirtying_object = self.__objects.get(object_id)
+                    if dirtying_object is None:
+                        continue  # unwatched by another thread since it became due.
+                    dirtying_object.become_dirtier(due, 1)
+                    with self.__lock:
+                        if object_id in self.__objects:
+                            self.__schedule(dirtying_object, tick)
+                    decays += 1
+
+    def __schedule(self, dirtying_object: RequiresCleaning, from_tick: int) -> None:
+        """Set an object's next decay one decay interval after a tick (unless it cannot get any dirtier)."""
+        if dirtying_object.cleanliness.level > DecayScheduler.DIRTIEST_LEVEL:
+            self.__wheel.schedule(dirtying_object.id, from_tick + self.__ticks_per_level(dirtying_object))
+        else:
+            self.__wheel.cancel(dirtying_object.id)
+
+    def __ticks_per_level(self, dirtying_object: RequiresCleaning) -> int:
+        """Return the number of ticks an object takes to become one level dirtier."""
+        environment = getattr(dirtying_object, "environmental_type", None) or getattr(dirtying_object, "habitat",
+                                                                                      None)
+        return self.__intervals.get(environment, self.__intervals[EnvironmentalType.GRASS])
+
+    def __time_of(self, tick: int) -> datetime:
+        """Return the date and time of a tick."""
+        return self.__start + tick * self.__resolution
@@ -0,0 +1,141 @@
+"""
+File: diet_schedule.py
+Description: Contains the DietSchedule class which is an animal's daily feeding plan. Until it is customised, a
+DietSchedule stores no rows of its own and shows the diet template of the animal's SpeciesProfile instead (shared by
+every animal of the species in the animal's zoo, see ZooSystem.get_species_profile()). The template rows are copied
+into the DietSchedule the first time it is changed (copy-on-write). Besides the free-text Details, each row stores the
+food and its amount as a number in a standard unit (see food_quantity.py) so that food demand can be calculated
+without parsing text. DietSchedule is a subclass of Schedule.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from __future__ import annotations
+
+from datetime import time
+from typing import TYPE_CHECKING
+
+from action import Action
+from food_quantity import parse_quantity
+from lazy_modules import pd
+from schedule import Schedule
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+class DietSchedule(Schedule):
+    def __init__(self, schedule_name: str, animal_id: str, animal_name: str, template: Schedule | None = None):
+        """
+        Create a new DietSchedule instance.
+        :param schedule_name: The name of the Schedule.
+        :param animal_id: The id of the animal that eats the diet (shown as the subject and object of each row).
+        :param animal_name: The name of the animal that eats the diet.
+        :param template: The diet template shared by the animal's species (default is no template: an empty diet
+        until a template is used, see use_template()).
+        """
+        self.__template = None  # set after the Schedule columns are created, as that replaces the data.
+        self.__customised = True
+        self.__animal_id = animal_id
+        self.__animal_name = animal_name
+        super().__init__(schedule_name)
+
+        # add the columns that describe the food of each entry:
+        cols_to_add = pd.DataFrame({"Food": pd.Series(dtype="string"),
+                                    "Amount": pd.Series(dtype=float),  # in the standard Unit
+                                    "Unit": pd.Series(dtype="string")})  # g, ml or x (a count of items)
+        self.data = pd.concat([self.data, cols_to_add])
+        self.__template = template
+        self.__customised = False  # whether the diet stores its own rows rather than showing a template.
+
+    def get_template(self) -> Schedule | None:
+        """Return the shared diet template that the diet shows (None once the diet has been customised, or if it has
+        no template)."""
+        return self.__template
+
+    def is_customised(self) -> bool:
+        """Return whether the diet stores its own rows rather than showing its species' diet template."""
+        return self.__customised
+
+    def get_data(self) -> DataFrame:
+        """
+        Return the diet. Until the diet is customised this is a copy of the template's rows for the animal.
+        :return: DataFrame
+        """
+        if self.__template is None:
+            return super().get_data()
+
+        data = self.__template.data.copy()
+        for column, value in (("SubjectID", self.__animal_id), ("SubjectName", self.__animal_name),
+                              ("ObjectID", self.__animal_id), ("ObjectName", self.__animal_name)):
+            data[column] = pd.Series(value, index=data.index, dtype="string")
+        return data
+
+    def set_data(self, new_data: DataFrame):
+        """
+        Replace the diet with another DataFrame that has matching columns, which customises the diet.
+        :param new_data: The new data to store (a DataFrame).
+        :return: None
+        """
+        template, self.__template = self.__template, None
+        super().set_data(new_data)
+        if super().get_data() is not new_data:  # the new data was not valid, so keep showing the template.
+            self.__template = template
+        else:
+            self.__customised = True
+
+    template = property(get_template)
+    data = property(get_data, set_data)
+    customised = property(is_customised)
+
+    def use_template(self, template: Schedule) -> None:
+        """
+        Show another diet template instead, e.g. that of the zoo the animal joins. A customised diet keeps its own
+        rows, and a diet whose current template has different rows is customised with them first, so the animal's
+        diet only changes if it had no template rows to eat.
+        :param template: The diet template to show.
+        :return: None
+        """
+        if self.__customised or template is self.__template:
+            return None
+        if self.__template is not None and len(self.__template.data) > 0 \
+                and self.__entries(self.__template) != self.__entries(template):
+            self.set_data(self.get_data())  # keep eating the rows of the current template.
+        else:
+            self.__template = template
+
+    @staticmethod
+    def __entries(template: Schedule) -> list[tuple]:
+        """Return the (time, details) of each row of a diet template."""
+        return list(zip(template.data["Time"], template.data["Details"]))
+
+    def add_food(self, food: str, quantity: str, at_time: time) -> int | None:
+        """
+        Add food to the diet.
+        :param food: Name of the food to be eaten.
+        :param quantity: Quantity of the food to be eaten, e.g. "200g" or "2x whole".
+        :param at_time: The time at which the food should be eaten.
+        :return: The reference number of the new row added.
+        """
+        amount, unit = parse_quantity(quantity)
+        return self.new({"Time": at_time,
+                         "SubjectID": self.__animal_id,
+                         "SubjectName": self.__animal_name,
+                         "ObjectID": self.__animal_id,
+                         "ObjectName": self.__animal_name,
+                         "Action": Action.EAT,
+                         "Details": f"{quantity} {food}",
+                         "Food": food,
+                         "Amount": amount,
+                         "Unit": unit})
+
+    def new(self, new_row: dict) -> int | None:
+        """
+        Add a new row to the diet, copying the template rows into the diet first if it has not been customised.
+        :param new_row: New row of information to be added, represented as a dictionary (see Schedule.new()).
+        :return: The reference number of the new row added.
+        """
+        if not self.__customised:
+            self.set_data(self.get_data())
+        return super().new(new_row)
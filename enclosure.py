@@ -8,14 +8,23 @@ Username: ivany005
 This is my own work as defined by the University's Academic Integrity Policy.
 """
 
+import sys
+from datetime import datetime
+from itertools import count
+
+from action import Action
 from animal import Animal
 from environmental_type import EnvironmentalType
+from lock_stripes import ENTITY_LOCKS
 from log import Log
+from observable import Observable
 from requires_cleaning import RequiresCleaning
 
 
 class Enclosure(RequiresCleaning):
-    _next_id = 1  # unique identifier of the enclosure which is incremented by one each time an enclosure is created.
+    __slots__ = RequiresCleaning.SLOTS + ("__name", "__size", "__species", "__inhabitants", "__location",
+                                          "__environmental_type", "__id", "__log")
+    _ids = count(1)  # unique identifiers of enclosures, the next one is taken each time an enclosure is created.
 
     def __init__(self, name: str, environmental_type: EnvironmentalType, size: int):
         """
@@ -24,10 +33,11 @@ class Enclosure(RequiresCleaning):
         :param environmental_type: The environmental type the animal lives in.
         :param size: the area contained by the enclosure in square meters.
         """
-        self.__name = name
+        self.__name = sys.intern(name) if isinstance(name, str) else name
         self.__size = size
         self.__species = None  # The species of animal housed by the enclosure (default is None).
         self.__inhabitants = []  # list containing the animals living in the enclosure.
+        self.__location = None  # (x, y) position of the enclosure on the zoo map in meters (optional).
 
         try:
             if not isinstance(environmental_type, EnvironmentalType):
@@ -38,11 +48,11 @@ class Enclosure(RequiresCleaning):
 
         self.__environmental_type = environmental_type
 
-        self.__id = "E" + str(Enclosure._next_id)  # E to represent 'Enclosure'
-        Enclosure._next_id += 1
+        self.__id = "E" + str(next(Enclosure._ids))  # E to represent 'Enclosure' (next() is safe across threads).
 
         # new Log to store records of enclosure cleaning and other maintenance actions.
-        self.__log = Log(f"{self.__name}_{self.id} Maintenance")
+        self.__log = Log(f"{self.__name}_{self.id} Maintenance", self.id)
+        Observable.__init__(self)
         RequiresCleaning.__init__(self)
 
     def __str__(self) -> str:
@@ -91,6 +101,18 @@ class Enclosure(RequiresCleaning):
         """ Returns the log of the enclosure's maintenance."""
         return self.__log
 
+    def get_location(self) -> tuple[float, float] | None:
+        """Return the (x, y) position of the enclosure on the zoo map in meters (None if it has not been set)."""
+        return self.__location
+
+    def set_location(self, location: tuple[float, float]):
+        """Set the (x, y) position of the enclosure on the zoo map in meters."""
+        try:
+            x, y = location
+            self.__location = (float(x), float(y))
+        except (TypeError, ValueError):
+            print(f"[ERROR] The location of an enclosure must be a pair of (x, y) coordinates. No change made.\n")
+
     name = property(get_name)
     size = property(get_size)
     id = property(get_id)
@@ -98,50 +120,72 @@ class Enclosure(RequiresCleaning):
     inhabitants = property(get_inhabitants)
     environmental_type = property(get_environmental_type)
     log = property(get_log)
+    location = property(get_location, set_location)
 
-    def add_animal(self, animal: Animal):
+    def check_inhabitant(self, animal: Animal, inhabitants: list[Animal] | None = None) -> None:
+        """
+        Check that an animal can live in the enclosure: it must not be under treatment, the enclosure must match its
+        habitat and the animals it would live with must be of its species. Raises a TypeError or ValueError if not.
+        :param animal: The animal to check.
+        :param inhabitants: The animals it would live with (default is the current inhabitants).
+        :return: None
+        """
+        if not isinstance(animal, Animal):
+            raise TypeError("Only Animal objects can live in the enclosure.")
+        if inhabitants is None:
+            inhabitants = self.inhabitants
+        if animal.under_treatment:
+            raise ValueError(
+                f"{animal.name}_{animal.id} is under treatment so they cannot be relocated at this time.")
+        if animal.habitat != self.environmental_type:
+            raise ValueError(
+                f"{animal.name}_{animal.id} requires a(n) {animal.habitat.value.upper()} habitat and cannot live in "
+                f"a(n) {self.environmental_type.value.upper()} enclosure.")
+        other_species = {inhabitant.species for inhabitant in inhabitants} - {animal.species}
+        if other_species:
+            raise ValueError(
+                f"{animal.name}_{animal.id} cannot live in {self.__name}_{self.id} as animals of a different"
+                f" species already live there ({other_species.pop()}).")
+
+    def add_animal(self, animal: Animal, at_datetime: datetime | None = None):
         """
         House a new animal in the enclosure if the enclosure matches its habitat and species requirements and is not
         under treatment.
         :param animal: The animal to add to the enclosure.
+        :param at_datetime: When the animal moved in, reported to observers (default is unknown).
         :return: None
         """
         try:
             if not isinstance(animal, Animal):
                 raise TypeError("Only Animal objects can live in the enclosure.")
-            if animal.under_treatment:
-                raise ValueError(
-                    f"{animal.name}_{animal.id} is under treatment so they cannot be relocated at this time.")
-            if animal.habitat != self.environmental_type:
-                raise ValueError(
-                    f"{animal.name}_{animal.id} requires a(n) {animal.habitat.value.upper()} habitat and cannot live in "
-                    f"a(n) {self.environmental_type.value.upper()} enclosure.")
-            if (len(self.inhabitants) > 0) & (self.__species != animal.species):
-                raise ValueError(
-                    f"{animal.name}_{animal.id} cannot live in {self.__name}_{self.id} as animals of a different"
-                    f" species already live there ({self.species}).")
-            if animal not in self.inhabitants:  # unnecessary if animal already is in enclosure.
-                self.__inhabitants.append(animal)
-                self.__species = animal.species  # update species attribute in case the enclosure was previously empty.
+            with ENTITY_LOCKS.holding(self.id, animal.id):  # the check and the change happen together.
+                self.check_inhabitant(animal)
+                if animal not in self.inhabitants:  # unnecessary if animal already is in enclosure.
+                    self.__inhabitants.append(animal)
+                    self.__species = animal.species  # update species in case the enclosure was previously empty.
+                    self.notify_observers(Action.ASSIGN, at_datetime, animal=animal)
         except (TypeError, ValueError) as e:
             print(f"[ERROR] {e} No change made.\n")
 
-    def remove_animal(self, animal: Animal):
+    def remove_animal(self, animal: Animal, at_datetime: datetime | None = None):
         """
         Remove an animal from the enclosure if it is not under treatment.
         :param animal: The animal to remove from the enclosure.
+        :param at_datetime: When the animal moved out, reported to observers (default is unknown).
         :return: None
         """
         try:
             if not isinstance(animal, Animal):
                 raise TypeError("Only Animal objects can be removed from enclosure.")
-            if animal.under_treatment:
-                raise ValueError(
-                    f"{animal.name}_{animal.id} is under treatment so they cannot be relocated at this time.")
-
-            if animal in self.inhabitants:
-                self.inhabitants.remove(animal)
-                if len(self.inhabitants) == 0:
-                    self.__species = None
+            with ENTITY_LOCKS.holding(self.id, animal.id):
+                if animal.under_treatment:
+                    raise ValueError(
+                        f"{animal.name}_{animal.id} is under treatment so they cannot be relocated at this time.")
+
+                if animal in self.inhabitants:
+                    self.inhabitants.remove(animal)
+                    if len(self.inhabitants) == 0:
+                        self.__species = None
+                    self.notify_observers(Action.UNASSIGN, at_datetime, animal=animal)
         except (TypeError, ValueError) as e:
             print(f"[ERROR] {e} No change made.\n")
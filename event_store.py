@@ -0,0 +1,606 @@
+"""
+File: event_store.py
+Description: Contains the EventStore class which holds the events of the entities of a zoo in one place (each
+ZooSystem has its own store, see ZooSystem.event_store). Each event is
+written once, with the entity that recorded it as its subject. When another entity takes part in the same event (e.g.
+a Zookeeper feeding the animal that ate) it joins the event as its counterpart instead of writing its own copy. The
+logs of entities are views of the store filtered by participant, which show each event from that participant's side.
+Events are added without a lock, so any number of threads can write to the store at once (see lock_stripes.py).
+So that a long-running process does not keep every event in memory, each kind of log (e.g. "MedicalLog") can be given
+a RetentionPolicy that keeps only its latest rows, or the rows of its latest days, in memory, and the store can be given
+a cap on the memory its events use. Older events are spilled to segments on disk (a few thousand at a time, as
+gzip-compressed JSON lines like the history of a ZooStore) in a temporary directory of the store's own, which is
+removed with the store, and read back from them whenever a log or query includes them, so the logs show every event
+as before. Only the index of which events belong to whom stays in memory. The store of each zoo is configured by
+environment variables, e.g.
+
+    ZOO_EVENT_RETENTION="Log=30d,MedicalLog=100000"   # 30 days of general logs, 100,000 rows of medical logs
+    ZOO_EVENT_MEMORY_MB=512                            # spill the oldest events when they use more than 512 MB
+    ZOO_EVENT_SPILL_DIR=/var/tmp/zoo                   # where the stores' directories are made (default the system's)
+
+EventStore is a subclass of DataRecord.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Iterable, Iterator
+from datetime import datetime, time, timedelta
+from enum import Enum
+from itertools import count, islice, takewhile
+from typing import TYPE_CHECKING, NamedTuple
+
+from action import Action
+from data_record import DataRecord
+from lazy_modules import pd
+from severity import Severity
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+class RetentionPolicy(NamedTuple):
+    max_rows: int | None = None  # the most rows of the kind of log kept in memory (None for no limit).
+    max_age: timedelta | None = None  # how long before the store's latest event rows are kept in memory (or None).
+
+
+class EventStore(DataRecord):
+    # column name -> dtype of every column of the store:
+    COLUMNS = {"DateTime": "object",  # datetime object
+               "SubjectID": "string",
+               "SubjectName": "string",
+               "Action": "object",  # Action enumeration
+               "ObjectID": "string",
+               "ObjectName": "string",
+               "Details": "string",
+               "Severity": "object",  # Severity enumeration (medical events only)
+               "Treatment": "string",  # (medical events only)
+               "Record": "string",  # the kind of log the subject recorded the event in (e.g. "MedicalLog")
+               "CounterpartID": "string",  # the other participant of the event (if any) ...
+               "CounterpartName": "string",
+               "CounterpartAction": "object",  # ... and the event as it is described from their side.
+               "CounterpartDetails": "string"}
+    COLUMN_TYPES = {"DateTime": datetime, "Action": Action, "Severity": Severity, "CounterpartAction": Action}
+    ROW_BYTES = 400  # estimated memory of an event in memory besides its strings and date and time, including its
+    # place in the lists and dictionaries of events in memory (see set_memory_cap()).
+    KEY_BYTES = 200  # estimated memory of a participant's entry in the index besides its reference numbers.
+
+    def __init__(self, store_name: str = "Zoo Event", spill_directory: str | None = None, spill_batch: int = 4096):
+        """
+        Create a new (empty) EventStore instance.
+        :param store_name: The name of the EventStore.
+        :param spill_directory: The directory in which the store makes a temporary directory to spill events to when
+        it first needs one, removed with the store (default the system's temporary directory).
+        :param spill_batch: The fewest events spilled to one segment because of a RetentionPolicy (default 4096), so
+        rows are kept in memory a little past their policy until there are enough to spill.
+        """
+        super().__init__(store_name)
+        # events are stored column by column so that adding one takes O(1) time rather than copying a DataFrame:
+        self.__columns = {column: [] for column in EventStore.COLUMNS}
+        self.__ref_nums = []  # position -> reference number of each event (or None once spilled).
+        self.__positions = {}  # reference number -> position of each event kept in memory.
+        # (participant id, record kind) -> reference numbers of their events in order, 8 bytes each (in memory or
+        # spilled: this index stays in memory, so it is kept compact and counted toward the memory cap):
+        self.__participants = {}
+        self.__last_ref_num = -1  # the highest reference number of an event in the store.
+        # new events wait here as (reference number, row, participant key) until the store is next read. Appending to
+        # a deque is atomic, so writers never wait for each other or for readers:
+        self.__inbox = deque()
+        self.__lock = threading.RLock()  # held while the inbox is moved into the columns and while they are read.
+
+        self.__retention = {}  # record kind -> RetentionPolicy
+        self.__memory_cap = None  # the most bytes the events in memory and the index may use (estimated), or None.
+        self.__memory = 0  # the estimated bytes used by the events in memory.
+        self.__index_memory = 0  # the estimated bytes used by the index of participants and of spilled events.
+        self.__index_warned = False  # whether the index has been reported to take most of the memory cap.
+        self.__in_memory = {}  # record kind -> reference numbers of its events in memory, in the order added.
+        self.__latest = None  # the latest date and time of an event (from which the age of events is measured).
+        self.__spill_directory = spill_directory
+        self.__segment_directory = None  # the store's own directory of segments (made when first needed).
+        self.__spill_batch = max(1, spill_batch)
+        self.__segments = []  # (path, reference numbers of its events in increasing order) of each spilled segment.
+        self.__spilled = 0  # the number of events spilled.
+        self.__segment_cache = (None, {})  # the path of the segment read last and its events by reference number.
+
+    @classmethod
+    def from_environment(cls, store_name: str = "Zoo Event") -> EventStore:
+        """
+        Create a new EventStore configured by the environment variables ZOO_EVENT_RETENTION, ZOO_EVENT_MEMORY_MB and
+        ZOO_EVENT_SPILL_DIR (each ZooSystem creates its store this way).
+        :param store_name: The name of the EventStore.
+        :return: The new EventStore.
+        """
+        store = cls(store_name, spill_directory=os.environ.get("ZOO_EVENT_SPILL_DIR") or None)
+        for policy in os.environ.get("ZOO_EVENT_RETENTION", "").split(","):
+            if "=" in policy:  # e.g. Log=30d (the rows of the last 30 days) or MedicalLog=100000 (rows)
+                record_kind, limit = (part.strip() for part in policy.split("=", 1))
+                if limit.endswith("d"):
+                    store.set_retention(record_kind, max_age=timedelta(days=float(limit[:-1])))
+                else:
+                    store.set_retention(record_kind, max_rows=int(limit))
+        if os.environ.get("ZOO_EVENT_MEMORY_MB"):
+            store.set_memory_cap(int(float(os.environ["ZOO_EVENT_MEMORY_MB"]) * 2 ** 20))
+        return store
+
+    def __len__(self) -> int:
+        """Return the number of events in the store (in memory and spilled)."""
+        return len(self.__positions) + self.__spilled + len(self.__inbox)
+
+    def get_data(self) -> DataFrame:
+        """Return every event in the store (including those spilled to disk), in the order they were added. The
+        DataFrame is made each time and not kept, as it holds every spilled event too; to go through the events of a
+        large store use events() or view() instead.
+        :return: DataFrame"""
+        ref_nums, rows = [], {column: [] for column in EventStore.COLUMNS}
+        with self.__lock:
+            for log_ref_num, values in self.events():
+                ref_nums.append(log_ref_num)
+                for column, value in zip(rows.values(), values):
+                    column.append(value)
+        return self.__frame(ref_nums, rows, EventStore.COLUMNS)
+
+    def set_data(self, new_data: DataFrame):
+        """Events cannot be replaced or removed once they are in the store."""
+        print(f"[ERROR] The events of the {self.name} Store cannot be replaced. No change made.\n")
+
+    def get_columns(self) -> list[str]:
+        """Return the names of the columns of the store."""
+        return list(EventStore.COLUMNS)
+
+    def get_memory_usage(self) -> int:
+        """Return the number of bytes used by the store's events in memory and its index of participants."""
+        with self.__lock:
+            self.__receive()
+        lists = [self.__ref_nums, *self.__columns.values(), *self.__participants.values(),
+                 *self.__in_memory.values(), *(ref_nums for path, ref_nums in self.__segments)]
+        strings = {id(value): value for column, dtype in EventStore.COLUMNS.items() if dtype == "string"
+                   for value in self.__columns[column] if isinstance(value, str)}  # shared strings count once
+        return (sys.getsizeof(self) + sys.getsizeof(self.__positions) + sys.getsizeof(self.__participants)
+                + sum(sys.getsizeof(values) for values in lists)
+                + sum(sys.getsizeof(value) for value in strings.values()))
+
+    def get_estimated_memory(self) -> int:
+        """Return the estimated bytes used by the events in memory and the index of every event (what the memory cap
+        limits, see set_memory_cap())."""
+        with self.__lock:
+            self.__receive()
+            return self.__memory + self.__index_memory
+
+    def get_row_count(self) -> int:
+        """Return the number of events in the store."""
+        return len(self)
+
+    def get_last_ref_num(self) -> int:
+        """Return the highest reference number of an event in the store (-1 if it has none), without reading any."""
+        with self.__lock:
+            self.__receive()
+            return self.__last_ref_num
+
+    def get_spilled_count(self) -> int:
+        """Return the number of events spilled to disk."""
+        return self.__spilled
+
+    def get_segments(self) -> list[str]:
+        """Return the paths of the segments events have been spilled to, oldest first."""
+        return [path for path, ref_nums in self.__segments]
+
+    def get_retention(self) -> dict[str, RetentionPolicy]:
+        """Return the RetentionPolicy of each kind of log that has one."""
+        return dict(self.__retention)
+
+    def get_memory_cap(self) -> int | None:
+        """Return the most bytes the events in memory may use (None if there is no cap)."""
+        return self.__memory_cap
+
+    data = property(get_data, set_data)
+    columns = property(get_columns)
+    row_count = property(get_row_count)
+    last_ref_num = property(get_last_ref_num)
+    spilled_count = property(get_spilled_count)
+    segments = property(get_segments)
+    retention = property(get_retention)
+    memory_cap = property(get_memory_cap)
+    estimated_memory = property(get_estimated_memory)
+
+    def set_retention(self, record_kind: str, max_rows: int | None = None, max_age: timedelta | None = None) -> None:
+        """
+        Set how many events of one kind of log are kept in memory; older events are spilled to disk.
+        :param record_kind: The kind of log, e.g. "Log" or "MedicalLog".
+        :param max_rows: The most rows kept in memory (default no limit).
+        :param max_age: Keep the rows less than this long before the store's latest event in memory (default no limit).
+        Without max_rows or max_age, the kind of log's events are all kept in memory.
+        :return: None
+        """
+        try:
+            if max_rows is not None and (not isinstance(max_rows, int) or max_rows < 0):
+                raise ValueError("The rows a retention policy keeps must be a number of at least 0.")
+            if max_age is not None and not isinstance(max_age, timedelta):
+                raise TypeError("The age of the rows a retention policy keeps must be a timedelta.")
+            with self.__lock:
+                if max_rows is None and max_age is None:
+                    self.__retention.pop(record_kind, None)
+                else:
+                    self.__retention[record_kind] = RetentionPolicy(max_rows, max_age)
+                self.__enforce()
+        except (TypeError, ValueError) as e:
+            print(f"[ERROR] {e} No change made.\n")
+
+    def set_memory_cap(self, max_bytes: int | None) -> None:
+        """
+        Cap the memory used by the events kept in memory and the index of every event. The estimate counts each event's
+        strings and date and time (shared strings more than once) and ROW_BYTES for the rest, and 8 bytes for each
+        reference number in the index (and KEY_BYTES for each participant's entry). When it is over the cap, the oldest
+        events are spilled to disk until it is under three quarters of the cap. The index is the only part that grows
+        with the events spilled, so the cap must leave room for it (a warning is printed once if it takes over three
+        quarters of the cap, when every event is spilled as soon as it is read).
+        :param max_bytes: The most bytes (None for no cap).
+        :return: None
+        """
+        try:
+            if max_bytes is not None and (not isinstance(max_bytes, int) or max_bytes <= 0):
+                raise ValueError("The memory cap of an event store must be a number of bytes above 0.")
+            with self.__lock:
+                self.__memory_cap = max_bytes
+                self.__enforce()
+        except ValueError as e:
+            print(f"[ERROR] {e} No change made.\n")
+
+    def new(self, new_row: dict) -> int | None:
+        """
+        Add a new event to the store.
+        :param new_row: The new event represented as a dictionary with a value for each of the store's COLUMNS.
+        :return: The reference number of the new event.
+        """
+        try:
+            if not isinstance(new_row, dict):
+                raise TypeError("The new row of data must be provided as a Dictionary object.")
+            if not isinstance(new_row.get("Action"), Action):
+                raise TypeError("The action of a new log record must be from the Action enumeration.")
+            assert set(EventStore.COLUMNS) == set(new_row.keys()), (
+                f"The dictionary keys must match the columns of the {self.name} Store.")
+
+            return self.__send(new_row)
+
+        except TypeError as e:
+            print(f"[ERROR] {e} No change made.\n")
+            return None
+        except AssertionError as e:
+            print(f"[ERROR] {e}\nNo change made.\n")
+            return None
+
+    def record(self, participant_id: str, record_kind: str, new_row: dict,
+               log_ref_num: int | None = None) -> int | None:
+        """
+        Add an event that a participant recorded in one of its logs.
+        :param participant_id: The id of the entity that recorded the event.
+        :param record_kind: The kind of log the event was recorded in (e.g. "Log" or "MedicalLog").
+        :param new_row: The event as a dictionary of log columns (columns of the store it does not have are empty).
+        :param log_ref_num: The reference number of the event (default the next one), e.g. the number it was saved
+        with, so that rows which refer to it by number still do when it is loaded (see zoo_store.py). It must be
+        higher than the number of every event in the store, and events added after it are given higher numbers.
+        :return: The reference number of the new event.
+        """
+        full_row = {column: new_row.get(column) for column in EventStore.COLUMNS} | {"Record": record_kind}
+        if not isinstance(full_row["Action"], Action):
+            return self.new(full_row)  # reports the problem
+        if log_ref_num is not None and log_ref_num <= self.last_ref_num:
+            print(f"[ERROR] Event {log_ref_num} is not after every event of the {self.name} Store. No change made.\n")
+            return None
+        return self.__send(full_row, (participant_id, record_kind), log_ref_num)
+
+    def __send(self, full_row: dict, participant: tuple[str, str] | None = None, log_ref_num: int | None = None) -> int:
+        """Give a new event a reference number (unless it has one) and put it in the inbox (safe to call from any
+        thread, except for an event that has a reference number, which are loaded by one thread)."""
+        if log_ref_num is None:
+            log_ref_num = next(DataRecord._ref_nums)  # next() never gives two threads the same number.
+        else:
+            DataRecord._ref_nums = count(max(next(DataRecord._ref_nums), log_ref_num + 1))
+        self.__inbox.append((log_ref_num, full_row, participant))
+        if ((self.__retention or self.__memory_cap is not None) and len(self.__inbox) >= self.__spill_batch
+                and self.__lock.acquire(blocking=False)):  # events are spilled even if the store is never read.
+            try:
+                self.__receive()
+            finally:
+                self.__lock.release()
+        return log_ref_num
+
+    def __receive(self) -> int:
+        """Move the events in the inbox into the columns of the store (the store's lock must be held).
+        :return: The number of events moved."""
+        received = 0
+        while self.__inbox:
+            log_ref_num, full_row, participant = self.__inbox.popleft()
+            self.__positions[log_ref_num] = len(self.__ref_nums)
+            self.__ref_nums.append(log_ref_num)
+            self.__last_ref_num = max(self.__last_ref_num, log_ref_num)
+            for column, values in self.__columns.items():
+                values.append(full_row[column])
+            if participant is not None:
+                self.__index(participant, log_ref_num)
+            self.__in_memory.setdefault(full_row["Record"], deque()).append(log_ref_num)
+            self.__memory += self.__size(full_row.values())
+            if isinstance(full_row["DateTime"], datetime) and (self.__latest is None
+                                                                or full_row["DateTime"] > self.__latest):
+                self.__latest = full_row["DateTime"]
+            received += 1
+        if received:
+            self.__enforce()
+        return received
+
+    def __index(self, participant: tuple[str, str], log_ref_num: int) -> None:
+        """Add an event to a participant's reference numbers in the index (the store's lock must be held)."""
+        ref_nums = self.__participants.get(participant)
+        if ref_nums is None:
+            ref_nums = self.__participants[participant] = array("q")
+            self.__index_memory += EventStore.KEY_BYTES
+        ref_nums.append(log_ref_num)
+        self.__index_memory += ref_nums.itemsize
+
+    @staticmethod
+    def __size(values: Iterable) -> int:
+        """Estimate the bytes used by the values of an event kept in memory."""
+        return EventStore.ROW_BYTES + sum(sys.getsizeof(value) for value in values
+                                          if isinstance(value, (str, datetime)))
+
+    # spilling to disk ----------------------------------------------------------------------------------------
+
+    def __enforce(self) -> None:
+        """Spill the events that the retention policies and memory cap do not keep in memory (the store's lock must
+        be held)."""
+        for record_kind, policy in self.__retention.items():
+            in_memory = self.__in_memory.get(record_kind)
+            if not in_memory:
+                continue
+            if policy.max_rows is not None and len(in_memory) >= policy.max_rows + self.__spill_batch:
+                self.__spill([in_memory.popleft() for _ in range(len(in_memory) - policy.max_rows)])
+            if policy.max_age is not None and self.__latest is not None:
+                cutoff = self.__latest - policy.max_age
+                date_times = self.__columns["DateTime"]
+
+                def is_old(log_ref_num: int) -> bool:
+                    date_time = date_times[self.__positions[log_ref_num]]
+                    return isinstance(date_time, datetime) and date_time < cutoff
+
+                # only the oldest events are checked, and spilled once there are enough of them:
+                if sum(1 for _ in takewhile(is_old, islice(in_memory, self.__spill_batch))) == self.__spill_batch:
+                    old = []
+                    while in_memory and is_old(in_memory[0]):
+                        old.append(in_memory.popleft())
+                    self.__spill(old)
+
+        if self.__memory_cap is not None and self.__memory + self.__index_memory > self.__memory_cap:
+            if self.__index_memory > self.__memory_cap * 3 // 4 and not self.__index_warned:
+                self.__index_warned = True
+                print(f"[WARNING] The index of the {self.name} Store uses {self.__index_memory:,} bytes, over three "
+                      f"quarters of its memory cap, so its events are spilled as soon as they are read.\n")
+            target, oldest = self.__memory + self.__index_memory - self.__memory_cap * 3 // 4, []
+            while target > 0 and any(self.__in_memory.values()):
+                in_memory = min((refs for refs in self.__in_memory.values() if refs), key=lambda refs: refs[0])
+                log_ref_num = in_memory.popleft()
+                target -= self.__size(values[self.__positions[log_ref_num]] for values in self.__columns.values())
+                oldest.append(log_ref_num)
+            self.__spill(sorted(oldest))
+
+    def __spill(self, ref_nums: list[int]) -> None:
+        """Move events from memory to a new segment on disk (the store's lock must be held, and they must already
+        be removed from __in_memory)."""
+        if not ref_nums:
+            return None
+        if self.__segment_directory is None:  # a directory of its own, so stores never write to each other's.
+            if self.__spill_directory is not None:
+                os.makedirs(self.__spill_directory, exist_ok=True)
+            self.__segment_directory = tempfile.mkdtemp(prefix="zoo-events-", dir=self.__spill_directory)
+            weakref.finalize(self, shutil.rmtree, self.__segment_directory, True)
+
+        rows = []
+        for log_ref_num in ref_nums:
+            position = self.__positions.pop(log_ref_num)
+            rows.append(tuple(values[position] for values in self.__columns.values()))
+            for values in self.__columns.values():
+                values[position] = None
+            self.__ref_nums[position] = None
+            self.__memory -= self.__size(rows[-1])
+        path = os.path.join(self.__segment_directory, f"{len(self.__segments) + 1:06d}.jsonl.gz")
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as file:
+            file.write(json.dumps({"format": "zoo-spilled-events", "events": len(rows)}) + "\n")
+            for log_ref_num, row in zip(ref_nums, rows):
+                file.write(json.dumps([log_ref_num, *map(encode_value, row)], separators=(",", ":")) + "\n")
+        self.__segments.append((path, array("q", ref_nums)))
+        self.__index_memory += self.__segments[-1][1].itemsize * len(ref_nums)
+        self.__spilled += len(ref_nums)
+
+        if len(self.__ref_nums) > 2 * len(self.__positions) + self.__spill_batch:  # mostly gaps: close them up.
+            kept = sorted(self.__positions.values())
+            self.__ref_nums = [self.__ref_nums[position] for position in kept]
+            self.__columns = {column: [values[position] for position in kept]
+                              for column, values in self.__columns.items()}
+            self.__positions = {log_ref_num: position for position, log_ref_num in enumerate(self.__ref_nums)}
+
+    def __read_segment(self, path: str) -> dict[int, tuple]:
+        """Return the events of a spilled segment by reference number (the last segment read is kept in memory)."""
+        if self.__segment_cache[0] != path:
+            kinds = [EventStore.COLUMN_TYPES.get(column) for column in EventStore.COLUMNS]
+            events = {}
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                file.readline()  # the segment's header.
+                for line in file:
+                    log_ref_num, *values = json.loads(line)
+                    events[log_ref_num] = tuple(map(decode_value, values, kinds))
+            self.__segment_cache = (path, events)
+        return self.__segment_cache[1]
+
+    def __read_spilled(self, ref_nums: Iterable[int]) -> dict[int, tuple]:
+        """Return spilled events by reference number, reading each segment that holds any of them once."""
+        wanted = sorted(log_ref_num for log_ref_num in ref_nums if log_ref_num not in self.__positions)
+        spilled = {}
+        for path, segment_ref_nums in self.__segments:
+            if not wanted or wanted[-1] < segment_ref_nums[0] or wanted[0] > segment_ref_nums[-1]:
+                continue
+            found = [log_ref_num for log_ref_num in wanted if (index := bisect_left(segment_ref_nums, log_ref_num))
+                     < len(segment_ref_nums) and segment_ref_nums[index] == log_ref_num]
+            if found:
+                events = self.__read_segment(path)
+                spilled.update((log_ref_num, events[log_ref_num]) for log_ref_num in found)
+        return spilled
+
+    def __rows(self, ref_nums: list[int], columns: Iterable[str], spilled: dict[int, tuple]) -> dict[str, list]:
+        """Return the values of columns of events, in memory or spilled (given by reference number), by column."""
+        indexes = {column: position for position, column in enumerate(EventStore.COLUMNS)}
+        rows = {}
+        for column in columns:
+            values, index = self.__columns[column], indexes[column]
+            rows[column] = [values[self.__positions[log_ref_num]] if log_ref_num in self.__positions
+                            else spilled[log_ref_num][index] for log_ref_num in ref_nums]
+        return rows
+
+    def join(self, participant_id: str, log_ref_num: int, new_row: dict) -> bool:
+        """
+        Add a participant to an event as its counterpart, rather than adding the participant's side of the event as
+        a new event. The participant's side must happen at the same time, have the event's subject as its object and
+        the event must not already have a counterpart.
+        :param participant_id: The id of the entity joining the event.
+        :param log_ref_num: The reference number of the event.
+        :param new_row: The participant's side of the event as a dictionary of general log columns.
+        :return: Whether the participant joined the event (False if the row must be added as a new event instead).
+        """
+        with self.__lock:
+            self.__receive()
+            return self.__join(participant_id, log_ref_num, new_row)
+
+    def __join(self, participant_id: str, log_ref_num: int, new_row: dict) -> bool:
+        """Add a participant to an event as its counterpart (the store's lock must be held)."""
+        position = self.__positions.get(log_ref_num)
+        if (position is None or not isinstance(new_row.get("Action"), Action)
+                or self.__columns["CounterpartID"][position] is not None
+                or self.__columns["SubjectID"][position] in (new_row.get("SubjectID"), None)
+                or self.__columns["SubjectID"][position] != new_row.get("ObjectID")
+                or self.__columns["DateTime"][position] != new_row.get("DateTime")):
+            return False
+
+        self.__columns["CounterpartID"][position] = new_row["SubjectID"]
+        self.__columns["CounterpartName"][position] = new_row["SubjectName"]
+        self.__columns["CounterpartAction"][position] = new_row["Action"]
+        self.__columns["CounterpartDetails"][position] = new_row["Details"]
+        self.__index((participant_id, "Log"), log_ref_num)
+        self.__memory += self.__size((new_row["SubjectID"], new_row["SubjectName"], new_row["Details"])) \
+            - EventStore.ROW_BYTES
+        return True
+
+    def get_ref_nums(self, participant_id: str, record_kind: str = "Log") -> list[int]:
+        """Return the reference numbers of the events a participant has in one kind of log, in order."""
+        with self.__lock:
+            self.__receive()
+            return list(self.__participants.get((participant_id, record_kind), []))
+
+    def events(self, after_ref_num: int = -1, chunk_size: int = 4096) -> Iterator[tuple[int, tuple]]:
+        """
+        Yield the events added to the store after a reference number, in the order they were added. They are found
+        in the index, and their values are read chunk_size events at a time (from memory, or from the segments on
+        disk that hold any of them), so only one chunk of the events is in memory at once.
+        :param after_ref_num: Only events with a higher reference number are yielded (default -1, every event).
+        :param chunk_size: The most events read at a time (default 4096).
+        :return: Iterator of (reference number, values in the order of COLUMNS) of each event.
+        """
+        with self.__lock:
+            self.__receive()
+            ref_nums = [log_ref_num for log_ref_num in self.__positions if log_ref_num > after_ref_num]
+            for path, segment_ref_nums in self.__segments:
+                ref_nums.extend(segment_ref_nums[bisect_right(segment_ref_nums, after_ref_num):])
+        ref_nums.sort()
+
+        for start in range(0, len(ref_nums), max(1, chunk_size)):
+            chunk = ref_nums[start:start + max(1, chunk_size)]
+            with self.__lock:  # events may be spilled between chunks, so each chunk is found where it is now.
+                spilled = self.__read_spilled(chunk) if self.__spilled else {}
+                rows = self.__rows(chunk, EventStore.COLUMNS, spilled)
+            yield from zip(chunk, zip(*rows.values()))
+
+    def view(self, participant_ids: str | Iterable[str], record_kind: str = "Log",
+             columns: Iterable[str] = ("DateTime", "SubjectID", "SubjectName", "Action", "ObjectID", "ObjectName",
+                                       "Details")) -> DataFrame:
+        """
+        Return the events of one or more participants in one kind of log, each from the participant's side: events
+        the participant joined as the counterpart show the participant as the subject. Only those events are visited
+        (and only the segments on disk that hold any of them are read).
+        :param participant_ids: The id of a participant or a collection of ids.
+        :param record_kind: The kind of log (default "Log").
+        :param columns: The columns to include (default is the columns of a Log).
+        :return: DataFrame indexed by reference number (in the order the events were added).
+        """
+        if isinstance(participant_ids, str):
+            participant_ids = [participant_ids]
+        with self.__lock:  # read a consistent copy of the events while other threads keep adding events.
+            self.__receive()
+            entries = [(log_ref_num, participant_id) for participant_id in participant_ids
+                       for log_ref_num in self.__participants.get((participant_id, record_kind), [])]
+            if len(participant_ids) > 1:
+                entries.sort(key=lambda entry: entry[0])
+
+            columns = list(columns)
+            ref_nums = [log_ref_num for log_ref_num, participant_id in entries]
+            spilled = self.__read_spilled(ref_nums) if self.__spilled else {}
+            rows = self.__rows(ref_nums, columns, spilled)
+            sides = self.__rows(ref_nums, ["SubjectID", "SubjectName", "CounterpartID", "CounterpartName",
+                                           "CounterpartAction", "CounterpartDetails"], spilled)
+            for row, (log_ref_num, participant_id) in enumerate(entries):
+                if sides["CounterpartID"][row] == participant_id:  # show the event from their side.
+                    counterpart = {"ObjectID": sides["SubjectID"][row],
+                                   "ObjectName": sides["SubjectName"][row],
+                                   "SubjectID": participant_id,
+                                   "SubjectName": sides["CounterpartName"][row],
+                                   "Action": sides["CounterpartAction"][row],
+                                   "Details": sides["CounterpartDetails"][row]}
+                    for column, value in counterpart.items():
+                        if column in rows:
+                            rows[column][row] = value
+        return self.__frame(ref_nums, rows, {column: EventStore.COLUMNS[column] for column in columns})
+
+    @staticmethod
+    def __frame(ref_nums: list[int], rows: dict[str, list], dtypes: dict[str, str]) -> DataFrame:
+        """Make a DataFrame of columns of values, indexed by reference number."""
+        return pd.DataFrame(rows, index=pd.Index(ref_nums, dtype="int64"), columns=list(dtypes)).astype(dtypes)
+
+    def __str__(self) -> str:
+        """
+        Display a summary of the store.
+        :return: A formatted string representing the store.
+        """
+        with self.__lock:
+            self.__receive()
+        output = super().__str__() + " STORE:"
+        output += f"\n{len(self)} events recorded by {len({key[0] for key in self.__participants})} participants."
+        if self.__spilled:
+            output += f"\n{self.__spilled} of them spilled to {len(self.__segments)} segments on disk."
+        output += f"\n----------------------------------------------------------------------------------------------\n"
+        return output
+
+
+def encode_value(value):
+    """Return a value as a JSON value (enumerations by name, dates and times in ISO format)."""
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, (datetime, time)):
+        return value.isoformat()
+    return value
+
+
+def decode_value(value, kind: type | None):
+    """Return the value a JSON value was encoded from, given its type (None for a JSON type)."""
+    if value is None or kind is None:
+        return value
+    if issubclass(kind, Enum):
+        return kind[value]
+    return kind.fromisoformat(value)
@@ -0,0 +1,148 @@
+"""
+File: food_demand.py
+Description: Contains the FoodDemand class which calculates how much of each food a zoo needs over a date range from
+the diets of its animals (planned demand), how much the animals actually ate from the EAT rows of their logs, and the
+difference between the two. Amounts are summed per food and standard unit with pandas rather than row by row, and
+animals that share their species' diet template are counted together.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, time
+from typing import TYPE_CHECKING
+
+from action import Action
+from food_quantity import parse_meals
+from lazy_modules import pd
+from zoo_system import ZooSystem
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+class FoodDemand:
+    FOOD_COLUMNS = ["Food", "Amount", "Unit"]
+
+    def __init__(self, zoo: ZooSystem):
+        """
+        Create a new FoodDemand instance.
+        :param zoo: The zoo whose food demand is calculated.
+        """
+        self.__zoo = zoo
+
+    def get_zoo(self) -> ZooSystem:
+        """Return the zoo whose food demand is calculated."""
+        return self.__zoo
+
+    zoo = property(get_zoo)
+
+    def daily_diets(self) -> DataFrame:
+        """
+        Return the food that the zoo's animals eat in a day, with one row per diet entry (an entry of a diet template
+        shared by several animals has its amount multiplied by the number of animals).
+        :return: DataFrame with columns Food, Amount and Unit.
+        """
+        diets = []
+        for diet, animals in self.__diets():
+            diet = diet[FoodDemand.FOOD_COLUMNS]
+            if animals > 1:
+                diet = diet.copy()
+                diet["Amount"] *= animals
+            diets.append(diet)
+
+        diets = [diet for diet in diets if not diet.empty]
+        if len(diets) == 0:
+            return pd.DataFrame({column: pd.Series(dtype=float if column == "Amount" else "string")
+                                 for column in FoodDemand.FOOD_COLUMNS})
+        return pd.concat(diets, ignore_index=True)
+
+    def __diets(self) -> list[tuple[DataFrame, int]]:
+        """Return the rows of each diet the zoo's animals eat and the number of animals that eat it: each customised
+        diet, and each diet template once however many animals share it (their diets are not copied)."""
+        diets = []
+        template_users = {}  # id of a diet template -> [template rows, number of animals that eat it]
+        for animal in self.__zoo.animals:
+            template = animal.diet.template
+            if template is None:
+                diets.append((animal.diet.data, 1))
+            else:
+                template_users.setdefault(id(template), [template.data, 0])[1] += 1
+        return diets + [(rows, animals) for rows, animals in template_users.values()]
+
+    def planned(self, start_date: date, end_date: date) -> pd.Series:
+        """
+        Calculate the total amount of each food that the zoo's diets require over a date range.
+        :param start_date: The first date of the range.
+        :param end_date: The last date of the range (inclusive).
+        :return: Series of amounts indexed by (Food, Unit).
+        """
+        days = max((end_date - start_date).days + 1, 0)
+        return self.__total(self.daily_diets()) * days
+
+    def actual(self, start_date: date, end_date: date) -> pd.Series:
+        """
+        Calculate the total amount of each food that the zoo's animals ate over a date range, from the EAT rows of
+        their logs. Meals are matched to the diet entries they were served from (so they are described in the same
+        way), and any other meals are split into quantity and food.
+        :param start_date: The first date of the range.
+        :param end_date: The last date of the range (inclusive).
+        :return: Series of amounts indexed by (Food, Unit).
+        """
+        events = self.__zoo.events(self.__zoo.animals)
+        meals = events[events["Action"] == Action.EAT]
+        in_range = ((meals["DateTime"] >= datetime.combine(start_date, time.min))
+                    & (meals["DateTime"] <= datetime.combine(end_date, time.max)))
+        meals = meals.loc[in_range, ["Details"]].astype({"Details": "string"})
+
+        # what each diet entry description means (e.g. "2x whole Mouse" is 2 Mouse, not 2 whole Mouse):
+        entries = [diet[["Details"] + FoodDemand.FOOD_COLUMNS] for diet, animals in self.__diets()]
+        entries = [entry for entry in entries if not entry.empty]
+        if entries:
+            known = pd.concat(entries).drop_duplicates("Details").astype({"Details": "string"})
+            meals = meals.merge(known, on="Details", how="left")
+        else:
+            meals = meals.assign(Food=pd.NA, Amount=float("nan"), Unit=pd.NA)
+
+        unknown = meals["Food"].isna()
+        if unknown.any():
+            meals.loc[unknown, FoodDemand.FOOD_COLUMNS] = parse_meals(meals.loc[unknown, "Details"])
+        return self.__total(meals[FoodDemand.FOOD_COLUMNS])
+
+    def compare(self, start_date: date, end_date: date) -> DataFrame:
+        """
+        Compare the planned and actual amount of each food over a date range.
+        :param start_date: The first date of the range.
+        :param end_date: The last date of the range (inclusive).
+        :return: DataFrame indexed by (Food, Unit) with columns Planned, Actual and Difference (actual - planned).
+        """
+        comparison = pd.concat({"Planned": self.planned(start_date, end_date),
+                                "Actual": self.actual(start_date, end_date)}, axis=1).fillna(0)
+        comparison["Difference"] = comparison["Actual"] - comparison["Planned"]
+        return comparison.sort_index()
+
+    def report(self, start_date: date, end_date: date) -> str:
+        """
+        Generate a report of the planned and actual amount of each food over a date range.
+        :param start_date: The first date of the range.
+        :param end_date: The last date of the range (inclusive).
+        :return: Report of food demand as a string.
+        """
+        output = ("----------------------------------------------------------------------------------------------\n"
+                  f"FOOD DEMAND ({start_date} to {end_date}):\n")
+        comparison = self.compare(start_date, end_date)
+        if comparison.empty:
+            output += "\nNo food required."
+        for (food, unit), row in comparison.iterrows():
+            output += (f"\n - {food}: planned {row['Planned']:g}{unit}, actual {row['Actual']:g}{unit} "
+                       f"({row['Difference']:+g}{unit})")
+        output += "\n----------------------------------------------------------------------------------------------\n"
+        return output
+
+    @staticmethod
+    def __total(food: DataFrame) -> pd.Series:
+        """Sum the amounts of food per (Food, Unit), leaving out entries without a numeric amount."""
+        food = food.dropna(subset=["Food", "Amount"])
+        return food.groupby(["Food", "Unit"])["Amount"].sum()
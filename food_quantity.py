@@ -0,0 +1,61 @@
+"""
+File: food_quantity.py
+Description: Contains functions which convert free-text food quantities such as "200g", "1.5 kg" or "2x whole" into
+a numeric amount in a standard unit (grams, millilitres or a count of items), either one quantity at a time or for a
+whole column of quantities at once.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+from lazy_modules import np, pd
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+# unit as written -> (factor to multiply the amount by, standard unit):
+UNITS = {"mg": (0.001, "g"), "g": (1, "g"), "kg": (1000, "g"),
+         "ml": (1, "ml"), "l": (1000, "ml"),
+         "x": (1, "x"), "": (1, "x")}  # a count of whole items, e.g. "2x whole" or "3"
+
+QUANTITY_PATTERN = r"^\s*(?P<Amount>\d+(?:\.\d+)?)\s*(?P<Unit>[A-Za-z]*)"
+MEAL_PATTERN = QUANTITY_PATTERN + r"\s+(?P<Food>.*\S)\s*$"  # quantity followed by the food, e.g. "200g Raw Chicken"
+
+
+def parse_quantity(quantity: str) -> tuple[float, str]:
+    """
+    Convert a food quantity to a numeric amount in a standard unit, e.g. "1.5kg" -> (1500.0, "g").
+    Anything after the unit is a description and is ignored, e.g. "2x whole" -> (2.0, "x"). Units that are not
+    recognised are kept as they are, e.g. "3 leaves" -> (3.0, "leaves").
+    :param quantity: The quantity as written in a diet or log.
+    :return: The (amount, unit) of the quantity, or (NaN, "") if the quantity does not start with a number.
+    """
+    match = re.match(QUANTITY_PATTERN, str(quantity))
+    if match is None:
+        return np.nan, ""
+    factor, unit = UNITS.get(match["Unit"].lower(), (1, match["Unit"]))
+    return float(match["Amount"]) * factor, unit
+
+
+def parse_meals(details: pd.Series) -> DataFrame:
+    """
+    Split a column of "<quantity> <food>" descriptions (as written in EAT and FEED log rows) into a numeric amount in
+    a standard unit and the food, for every row at once.
+    :param details: The descriptions, e.g. "200g Raw Chicken".
+    :return: DataFrame with the same index and columns Food, Amount and Unit (all missing if a row does not match).
+    """
+    meals = details.astype("string").str.extract(MEAL_PATTERN)
+    written_units = meals["Unit"].str.lower()
+    known = written_units.isin(list(UNITS))
+    factors = written_units.map({unit: factor for unit, (factor, _) in UNITS.items()}).where(known, 1)
+    return pd.DataFrame({"Food": meals["Food"],
+                         "Amount": meals["Amount"].astype(float) * factors.astype(float),
+                         "Unit": written_units.map({unit: standard for unit, (_, standard) in UNITS.items()})
+                        .where(known, meals["Unit"]).astype("string")},
+                        index=details.index)
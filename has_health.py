@@ -11,20 +11,24 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 
 from action import Action
+from lock_stripes import ENTITY_LOCKS
 from log import Log
 from medical_log import MedicalLog
+from observable import Observable
 from schedule import Schedule
 from severity import Severity
 
 
-class HasHealth(ABC):
+class HasHealth(Observable, ABC):
+    __slots__ = ("__under_treatment", "__medical_log", "__treatments")
+
     def __init__(self):
         """
         Create a new HasHealth instance.
         """
         self.__under_treatment = False  # healthy upon initiation
         self.__medical_log = MedicalLog(
-            f"{self.get_name()}_{self.get_id()} Medical")  # new MedicalLog to store records of medical events.
+            f"{self.get_name()}_{self.get_id()} Medical", self.get_id())  # new MedicalLog to store records of medical events.
         self.__treatments = Schedule(
             f"{self.get_name()}_{self.get_id()} Treatment")  # create a new schedule to store daily treatment plan.
 
@@ -32,6 +36,10 @@ class HasHealth(ABC):
         """Get whether the object is currently receiving medical treatment: true or false. ."""
         return self.__under_treatment
 
+    def _set_under_treatment(self, under_treatment: bool):
+        """Store whether the object is under treatment (subclasses may store it elsewhere, e.g. in an AnimalTable)."""
+        self.__under_treatment = under_treatment
+
     def get_medical_log(self) -> MedicalLog:
         """ Returns the log of the object's medical history."""
         return self.__medical_log
@@ -90,17 +98,20 @@ class HasHealth(ABC):
         try:
             assert doctor_id[0] == "S", "Only zoo staff can conduct health checkups at the zoo."
 
-            return self.medical_log.new({"DateTime": at_datetime,
-                                         "SubjectID": self.id,
-                                         "SubjectName": self.name,
-                                         "ObjectID": doctor_id,
-                                         "ObjectName": doctor_name,
-                                         "Action": Action.RECEIVE_HEALTH_CHECK,
-                                         "Details": f"{details}",
-                                         "Severity": severity,
-                                         "Treatment": "NA"
-                                         # treatment should only be described when a diagnosis is made.
-                                         })
+            log_ref_num = self.medical_log.new({"DateTime": at_datetime,
+                                                "SubjectID": self.id,
+                                                "SubjectName": self.name,
+                                                "ObjectID": doctor_id,
+                                                "ObjectName": doctor_name,
+                                                "Action": Action.RECEIVE_HEALTH_CHECK,
+                                                "Details": f"{details}",
+                                                "Severity": severity,
+                                                "Treatment": "NA"
+                                                # treatment should only be described when a diagnosis is made.
+                                                })
+            if log_ref_num is not None:  # only notify observers of events that were recorded.
+                self.notify_observers(Action.RECEIVE_HEALTH_CHECK, at_datetime, severity=severity)
+            return log_ref_num
         except AssertionError as e:
             print(f"[ERROR] {e} Event not added to {self.medical_log.name} Log.\n")
             return None
@@ -123,19 +134,23 @@ class HasHealth(ABC):
         try:
             assert doctor_id[0] == "S", "Only zoo staff can give diagnoses at the zoo."
 
-            self.schedule_treatments(treatment_list)
-            self.__under_treatment = True
-
-            return self.medical_log.new({"DateTime": at_datetime,
-                                         "SubjectID": self.id,
-                                         "SubjectName": self.name,
-                                         "ObjectID": doctor_id,
-                                         "ObjectName": doctor_name,
-                                         "Action": Action.RECEIVE_DIAGNOSIS,
-                                         "Details": f"{details}",
-                                         "Severity": severity,
-                                         "Treatment": f"{treatment_desc}"
-                                         })
+            with ENTITY_LOCKS.holding(self.id):  # treatment status and its treatments change together.
+                self.schedule_treatments(treatment_list)
+                self._set_under_treatment(True)
+
+                log_ref_num = self.medical_log.new({"DateTime": at_datetime,
+                                                    "SubjectID": self.id,
+                                                    "SubjectName": self.name,
+                                                    "ObjectID": doctor_id,
+                                                    "ObjectName": doctor_name,
+                                                    "Action": Action.RECEIVE_DIAGNOSIS,
+                                                    "Details": f"{details}",
+                                                    "Severity": severity,
+                                                    "Treatment": f"{treatment_desc}"
+                                                    })
+                if log_ref_num is not None:  # only notify observers of events that were recorded.
+                    self.notify_observers(Action.RECEIVE_DIAGNOSIS, at_datetime, severity=severity)
+            return log_ref_num
         except AssertionError as e:
             print(f"[ERROR] {e} Event not added to {self.medical_log.name} Log.\n")
             return None
@@ -154,17 +169,20 @@ class HasHealth(ABC):
         try:
             assert treater_id[0] == "S", "Only zoo staff can administer treatments at the zoo."
 
-            return self.medical_log.new({"DateTime": at_datetime,
-                                         "SubjectID": self.id,
-                                         "SubjectName": self.name,
-                                         "ObjectID": treater_id,
-                                         "ObjectName": treater_name,
-                                         "Action": Action.RECEIVE_TREATMENT,
-                                         "Details": f"{details}",
-                                         "Severity": severity,
-                                         "Treatment": "NA"
-                                         # treatment should only be described when a diagnosis is made.
-                                         })
+            log_ref_num = self.medical_log.new({"DateTime": at_datetime,
+                                                "SubjectID": self.id,
+                                                "SubjectName": self.name,
+                                                "ObjectID": treater_id,
+                                                "ObjectName": treater_name,
+                                                "Action": Action.RECEIVE_TREATMENT,
+                                                "Details": f"{details}",
+                                                "Severity": severity,
+                                                "Treatment": "NA"
+                                                # treatment should only be described when a diagnosis is made.
+                                                })
+            if log_ref_num is not None:  # only notify observers of events that were recorded.
+                self.notify_observers(Action.RECEIVE_TREATMENT, at_datetime, severity=severity)
+            return log_ref_num
         except AssertionError as e:
             print(f"[ERROR] {e} Event not added to {self.medical_log.name} Log.\n")
             return None
@@ -181,20 +199,25 @@ class HasHealth(ABC):
         try:
             assert doctor_id[0] == "S", "Only zoo staff can declare recoveries at the zoo."
 
-            self.__under_treatment = False
-            self.treatments.remove()  # remove all treatments
-
-            return self.medical_log.new({"DateTime": at_datetime,
-                                         "SubjectID": self.id,
-                                         "SubjectName": self.name,
-                                         "ObjectID": doctor_id,
-                                         "ObjectName": doctor_name,
-                                         "Action": Action.RECOVER,
-                                         "Details": f"{details}",
-                                         "Severity": Severity.VERY_LOW,  # all recovery declarations are low urgency.
-                                         "Treatment": "NA"
-                                         # treatment should only be described when a diagnosis is made.
-                                         })
+            with ENTITY_LOCKS.holding(self.id):
+                self._set_under_treatment(False)
+                self.treatments.remove()  # remove all treatments
+
+                log_ref_num = self.medical_log.new({"DateTime": at_datetime,
+                                                    "SubjectID": self.id,
+                                                    "SubjectName": self.name,
+                                                    "ObjectID": doctor_id,
+                                                    "ObjectName": doctor_name,
+                                                    "Action": Action.RECOVER,
+                                                    "Details": f"{details}",
+                                                    # all recovery declarations are low urgency:
+                                                    "Severity": Severity.VERY_LOW,
+                                                    "Treatment": "NA"
+                                                    # treatment should only be described when a diagnosis is made.
+                                                    })
+                if log_ref_num is not None:  # only notify observers of events that were recorded.
+                    self.notify_observers(Action.RECOVER, at_datetime, severity=Severity.VERY_LOW)
+            return log_ref_num
         except AssertionError as e:
             print(f"[ERROR] {e} Event not added to {self.medical_log.name} Log.\n")
             return None
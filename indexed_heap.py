@@ -0,0 +1,169 @@
+"""
+File: indexed_heap.py
+Description: Contains the IndexedHeap class which is a binary min-heap of keyed entries that keeps track of the
+position of every key, so that the priority of any entry can be changed (or the entry removed) in O(log n) time.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import heapq
+
+
+class IndexedHeap:
+    def __init__(self):
+        """
+        Create a new (empty) IndexedHeap instance.
+        """
+        self.__heap = []  # list of [priority, key] entries which satisfies the heap property on priority.
+        self.__positions = {}  # key -> index of the key's entry in the heap list.
+
+    def __len__(self) -> int:
+        """Return the number of entries in the heap."""
+        return len(self.__heap)
+
+    def __contains__(self, key) -> bool:
+        """Determine whether an entry with the given key is in the heap."""
+        return key in self.__positions
+
+    def get_priority(self, key):
+        """
+        Return the priority of the entry with the given key.
+        :param key: The key of the entry.
+        :return: The priority of the entry, or None if the key is not in the heap.
+        """
+        position = self.__positions.get(key)
+        return None if position is None else self.__heap[position][0]
+
+    def push(self, key, priority) -> None:
+        """
+        Add a new entry to the heap, or change the priority of the entry if the key is already in the heap.
+        :param key: The unique (hashable) key of the entry.
+        :param priority: The priority of the entry (lowest priority is at the top of the heap).
+        :return: None
+        """
+        if key in self.__positions:
+            self.update(key, priority)
+            return None
+
+        self.__heap.append([priority, key])
+        self.__positions[key] = len(self.__heap) - 1
+        self.__sift_up(len(self.__heap) - 1)
+
+    def update(self, key, priority) -> None:
+        """
+        Change the priority of an existing entry and restore the heap property (covers decrease-key).
+        :param key: The key of the entry to change.
+        :param priority: The new priority of the entry.
+        :return: None
+        """
+        try:
+            if key not in self.__positions:
+                raise KeyError(f"{key} is not in the heap.")
+            position = self.__positions[key]
+            old_priority = self.__heap[position][0]
+            self.__heap[position][0] = priority
+            if priority < old_priority:
+                self.__sift_up(position)
+            else:
+                self.__sift_down(position)
+        except KeyError as e:
+            print(f"[ERROR] {e.args[0]} No change made.\n")
+
+    def decrease_key(self, key, priority) -> None:
+        """
+        Move an existing entry closer to the top of the heap by lowering its priority.
+        :param key: The key of the entry to change.
+        :param priority: The new priority of the entry (must not be higher than the existing priority).
+        :return: None
+        """
+        try:
+            if key in self.__positions and self.get_priority(key) < priority:
+                raise ValueError(f"The new priority of {key} is higher than its existing priority.")
+            self.update(key, priority)
+        except ValueError as e:
+            print(f"[ERROR] {e} No change made.\n")
+
+    def remove(self, key) -> None:
+        """
+        Remove the entry with the given key from the heap (if present).
+        :param key: The key of the entry to remove.
+        :return: None
+        """
+        position = self.__positions.pop(key, None)
+        if position is None:
+            return None
+
+        last_entry = self.__heap.pop()
+        if position < len(self.__heap):  # fill the gap with the last entry, then restore the heap property.
+            self.__heap[position] = last_entry
+            self.__positions[last_entry[1]] = position
+            self.__sift_up(position)
+            self.__sift_down(self.__positions[last_entry[1]])
+
+    def pop(self) -> tuple | None:
+        """
+        Remove and return the entry at the top of the heap.
+        :return: A (key, priority) tuple, or None if the heap is empty.
+        """
+        if len(self.__heap) == 0:
+            return None
+        priority, key = self.__heap[0]
+        self.remove(key)
+        return key, priority
+
+    def peek(self, k: int = 1, predicate=None, below=None) -> list[tuple]:
+        """
+        Return (without removing) the k entries closest to the top of the heap in priority order. Only the parts of
+        the heap that can contain the answer are visited, so this takes O(k log k) time when no predicate is given.
+        :param k: The number of entries to return (default 1).
+        :param predicate: An optional function of the key, entries are only returned if it returns True.
+        :param below: An optional priority, only entries with a lower priority are returned (the walk stops there).
+        :return: A list of (key, priority) tuples.
+        """
+        results = []
+        frontier = [(self.__heap[0][0], 0)] if len(self.__heap) > 0 else []
+
+        # best-first walk of the heap tree: the next best entry is always the root or a child of an entry already seen
+        while frontier and len(results) < k:
+            priority, position = heapq.heappop(frontier)
+            if below is not None and not priority < below:
+                break  # every entry left in the frontier (and below it) has a priority that is at least as high
+            key = self.__heap[position][1]
+            if predicate is None or predicate(key):
+                results.append((key, priority))
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(self.__heap):
+                    heapq.heappush(frontier, (self.__heap[child][0], child))
+        return results
+
+    def __sift_up(self, position: int) -> None:
+        """Move the entry at a position up the heap until its parent has a lower (or equal) priority."""
+        entry = self.__heap[position]
+        while position > 0:
+            parent = (position - 1) // 2
+            if not entry[0] < self.__heap[parent][0]:
+                break
+            self.__heap[position] = self.__heap[parent]
+            self.__positions[self.__heap[position][1]] = position
+            position = parent
+        self.__heap[position] = entry
+        self.__positions[entry[1]] = position
+
+    def __sift_down(self, position: int) -> None:
+        """Move the entry at a position down the heap until both children have a higher (or equal) priority."""
+        entry = self.__heap[position]
+        size = len(self.__heap)
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and self.__heap[child + 1][0] < self.__heap[child][0]:
+                child += 1  # use the child with the lower priority
+            if not self.__heap[child][0] < entry[0]:
+                break
+            self.__heap[position] = self.__heap[child]
+            self.__positions[self.__heap[position][1]] = position
+            position = child
+        self.__heap[position] = entry
+        self.__positions[entry[1]] = position
@@ -0,0 +1,109 @@
+"""
+File: instrumentation.py
+Description: Lets profiling tools (hooks) observe each call of the zoo's key methods: every public method of
+ZooSystem (including each report_* method), every DataRecord.new, Schedule.remove and generate_schedule. A hook is
+any object with the methods enter(label) -> token, called as a method starts, and leave(label, token, failed), called
+as it returns or raises, where label names the method, e.g. "Zookeeper.generate_schedule". A hook may observe other
+methods instead, and may receive the arguments of each call as enter(label, args, kwargs). Each method is wrapped when
+the first hook that observes it is added and unwrapped when the last one is removed, so while no hook observes a
+method it runs exactly as written and costs nothing extra. See metrics.py, tracing.py and workload.py for the hooks of
+the zoo.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import functools
+import threading
+from typing import Callable
+
+_hooks = ()  # every hook added.
+# (class, method name) -> ((hook, whether it receives the arguments), ...) for each method observed by a hook, replaced
+# rather than changed, so a call in progress keeps the hooks it started with:
+_method_hooks = {}
+_originals = {}  # (class, method name) -> the method before it was wrapped, while a hook observes it.
+_lock = threading.Lock()  # held while hooks are added or removed.
+
+
+def instrumented_methods() -> list[tuple[type, str]]:
+    """Return the (class, method name) of each method the hooks observe."""
+    # imported here so that importing a hook does not import the zoo, and every subclass is imported so that its own
+    # versions of the methods are found:
+    from data_record import DataRecord
+    from diet_schedule import DietSchedule
+    from event_store import EventStore
+    from medical_log import MedicalLog
+    from schedule import Schedule
+    from staff import Staff
+    from veterinarian import Veterinarian
+    from zoo_system import ZooSystem
+    from zookeeper import Zookeeper
+
+    methods = [(ZooSystem, name) for name, attribute in vars(ZooSystem).items()
+               if callable(attribute) and not name.startswith(("_", "get_")) and name != "locked"]
+    # each class that has its own version of a method is observed separately (e.g. Log.new and MedicalLog.new):
+    for base, name in ((DataRecord, "new"), (Schedule, "remove"), (Staff, "generate_schedule")):
+        classes = [base]
+        for cls in classes:
+            classes += cls.__subclasses__()
+        methods += [(cls, name) for cls in dict.fromkeys(classes) if name in vars(cls)]
+    return methods
+
+
+def get_hooks() -> tuple:
+    """Return the hooks that observe the zoo's methods."""
+    return _hooks
+
+
+def add_hook(hook, methods: list[tuple[type, str]] | None = None, arguments: bool = False) -> None:
+    """
+    Start passing each call of the zoo's methods to a hook (wrapping each method no other hook observes).
+    :param hook: The hook.
+    :param methods: The (class, method name) of each method it observes (default instrumented_methods()).
+    :param arguments: Whether it receives the arguments of each call, as enter(label, args, kwargs) (default False).
+    :return: None
+    """
+    global _hooks
+    with _lock:
+        if hook in _hooks:
+            return None
+        for cls, name in instrumented_methods() if methods is None else methods:
+            if (cls, name) not in _originals:
+                original = vars(cls)[name]
+                _originals[(cls, name)] = original
+                setattr(cls, name, _observed(original, f"{cls.__name__}.{name}", (cls, name)))
+            _method_hooks[(cls, name)] = _method_hooks.get((cls, name), ()) + ((hook, arguments),)
+        _hooks = _hooks + (hook,)
+
+
+def remove_hook(hook) -> None:
+    """Stop passing calls to a hook (unwrapping each method no other hook observes)."""
+    global _hooks
+    with _lock:
+        if hook not in _hooks:
+            return None
+        _hooks = tuple(other for other in _hooks if other is not hook)
+        for method, hooks in list(_method_hooks.items()):
+            hooks = tuple(entry for entry in hooks if entry[0] is not hook)
+            if hooks:
+                _method_hooks[method] = hooks
+            else:
+                del _method_hooks[method]
+                setattr(*method, _originals.pop(method))
+
+
+def _observed(method: Callable, label: str, key: tuple[type, str]) -> Callable:
+    """Return a version of a method that passes each call to its hooks under a label, e.g. "ZooSystem.add_animal"."""
+    @functools.wraps(method)
+    def observed(*args, **kwargs):
+        hooks = _method_hooks.get(key, ())
+        tokens = [hook.enter(label, args, kwargs) if arguments else hook.enter(label) for hook, arguments in hooks]
+        failed = True
+        try:
+            result = method(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            for (hook, _), token in zip(reversed(hooks), reversed(tokens)):  # the last hook entered leaves first.
+                hook.leave(label, token, failed)
+    return observed
@@ -0,0 +1,36 @@
+"""
+File: lazy_modules.py
+Description: Contains the LazyModule class, which stands in for a module that is only imported the first time one of
+its attributes is used, and pd and np, which stand in for pandas and numpy. Importing pandas takes about half a
+second, far longer than the rest of the zoo, so the zoo's modules use these instead and a job that never builds a
+DataFrame (e.g. one that only prints the species) never pays for it. Type annotations that name pandas or numpy
+types are not evaluated (see 'from __future__ import annotations'), so they do not import them either.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import importlib
+
+
+class LazyModule:
+    def __init__(self, name: str):
+        """
+        Create a new LazyModule instance.
+        :param name: The name of the module it stands in for, e.g. "pandas".
+        """
+        self.__name = name
+
+    def __getattr__(self, attribute: str):
+        """Import the module (the first time an attribute is used) and return one of its attributes."""
+        module = importlib.import_module(self.__name)
+        vars(self).update(vars(module))  # later uses find the module's attributes without coming here.
+        return getattr(module, attribute)
+
+    def __repr__(self) -> str:
+        """Return the name of the module and whether it has been imported."""
+        return f"<LazyModule {self.__name!r} ({'imported' if '__name__' in vars(self) else 'not imported yet'})>"
+
+
+pd = LazyModule("pandas")
+np = LazyModule("numpy")
@@ -0,0 +1,65 @@
+"""
+File: lock_stripes.py
+Description: Contains the LockStripes class which shares a fixed number of locks ("stripes") between any number of
+keys, and ENTITY_LOCKS, the stripes that guard the state of every animal, enclosure and staff member.
+
+Concurrency model of the zoo:
+ - The state of an entity (cleanliness, health and treatments, inhabitants, assignments) is changed while holding the
+   stripe of its id. Staff actions (feed, clean, health checks, diagnoses, treatments and recoveries) hold the stripes
+   of the staff member and the object they act on for the whole action, so each action is atomic and actions on
+   unrelated entities run in parallel. Stripes are always taken together with holding(), which takes them in a fixed
+   order, so two actions can never wait on each other. A thread that holds stripes only takes more stripes it
+   already holds (the stripes are re-entrant) or the private locks below.
+ - Zoo-wide indexes (TriageQueue, CleaningQueue, DecayScheduler, ZooHistory) and each DataFrame-backed log have a
+   private lock that is only held while the index itself is read or changed, never while calling other objects.
+ - Events are added to the EventStore without a lock: each is appended to a thread-safe inbox, and the inbox is
+   moved into the store's columns (under the store's lock) the next time the store is read. Reference numbers and
+   entity ids come from itertools.count, which never gives two threads the same number.
+ - Changing the animals, enclosures and staff of a ZooSystem (adding, removing, housing, moving and batches) holds
+   the zoo's lock, and batches also hold the stripes of every entity they involve.
+The AnimalTable and ZooSimulation are not thread-safe and must only be used by one thread.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import threading
+from contextlib import contextmanager
+from typing import Hashable
+
+
+class LockStripes:
+    def __init__(self, stripes: int = 64):
+        """
+        Create a new LockStripes instance.
+        :param stripes: The number of locks shared between the keys (default 64).
+        """
+        self.__locks = [threading.RLock() for _ in range(max(1, stripes))]
+
+    def __len__(self) -> int:
+        """Return the number of stripes."""
+        return len(self.__locks)
+
+    def stripe_of(self, key: Hashable) -> int:
+        """Return the number of the stripe that guards a key."""
+        return hash(key) % len(self.__locks)
+
+    @contextmanager
+    def holding(self, *keys: Hashable):
+        """
+        Hold the stripes of one or more keys inside a 'with stripes.holding(key1, key2):' block. The stripes are
+        taken in order of their number, so blocks holding overlapping keys cannot deadlock.
+        :param keys: The keys to hold (keys that share a stripe take it once).
+        :return: None
+        """
+        locks = [self.__locks[stripe] for stripe in sorted({self.stripe_of(key) for key in keys})]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+
+ENTITY_LOCKS = LockStripes()  # guards the state of every animal, enclosure and staff member, by id.
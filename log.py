@@ -1,32 +1,112 @@
 """
 File: log.py
 Description: Contains the Log class which is used to keep track of historical information about the actions of zoo
-entities over time. Log is a subclass of DataRecord.
+entities over time. The log of a zoo entity stores its own rows until the entity joins a zoo, from then on it is kept
+in the zoo's EventStore and its data is a view of the entity's events there. Log is a subclass of DataRecord.
 Author: Nenja Ivanovic
 ID: 110462390
 Username: ivany005
 This is my own work as defined by the University's Academic Integrity Policy.
 """
-from datetime import datetime
+from __future__ import annotations
 
-import pandas as pd
-from pandas import DataFrame
+import sys
+from datetime import datetime
+from typing import TYPE_CHECKING
 
 from data_record import DataRecord
+from event_store import EventStore
+from lazy_modules import pd
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class Log(DataRecord):
-    def __init__(self, log_name: str):
+    def __init__(self, log_name: str, owner_id: str | None = None):
         """
         Create a new Log instance.
         :param log_name: The name of the log.
+        :param owner_id: The id of the zoo entity the log belongs to (default is none). The log stores its own rows
+        until it is kept in the EventStore of the entity's zoo (see use_event_store()).
         """
         super().__init__(log_name)
+        self.__store = None  # the EventStore the log's rows are kept in (None if the log stores its own rows).
+        self.__owner_id = owner_id
 
         # create a dataframe to store action history (base columns with new columns added):
-        cols_to_add = DataFrame({"DateTime": pd.Series(dtype="object")})  # datetime object
+        cols_to_add = pd.DataFrame({"DateTime": pd.Series(dtype="object")})  # datetime object
         self.data = pd.concat([self.data, cols_to_add])
 
+    def get_data(self) -> DataFrame:
+        """Return the rows of the log (for a log kept in an EventStore, a view of its owner's events).
+        :return: DataFrame"""
+        if self.__store is None:
+            return super().get_data()
+        return self.__store.view(self.__owner_id, type(self).__name__, self.columns)
+
+    def set_data(self, new_data: DataFrame):
+        """
+        Replace the rows of a stand-alone log with another DataFrame that has matching columns (the rows of a log
+        kept in an EventStore cannot be replaced).
+        :param new_data: The new data to store (a DataFrame).
+        :return: None
+        """
+        if self.__store is None:
+            return super().set_data(new_data)
+        print(f"[ERROR] The {self.name} Log is kept in the {self.__store.name} Store and cannot be replaced."
+              f" No change made.\n")
+
+    def get_store(self) -> EventStore | None:
+        """Return the EventStore the log is kept in (None for a stand-alone log)."""
+        return self.__store
+
+    def get_owner_id(self) -> str | None:
+        """Return the id of the zoo entity the log belongs to (None for a log of no entity)."""
+        return self.__owner_id
+
+    def get_memory_usage(self) -> int:
+        """Return the number of bytes used by the log (the events of a log kept in an EventStore are counted there)."""
+        if self.__store is None:
+            return super().get_memory_usage()
+        return sys.getsizeof(self) + sys.getsizeof(self.__store.get_ref_nums(self.__owner_id, type(self).__name__))
+
+    def get_row_count(self) -> int:
+        """Return the number of rows in the log (for a log kept in an EventStore, the number of its owner's events)."""
+        if self.__store is None:
+            return super().get_row_count()
+        return len(self.__store.get_ref_nums(self.__owner_id, type(self).__name__))
+
+    data = property(get_data, set_data)
+    row_count = property(get_row_count)
+    store = property(get_store)
+    owner_id = property(get_owner_id)
+
+    def use_event_store(self, owner_id: str, store: EventStore) -> None:
+        """
+        Keep the log in an EventStore as the log of a zoo entity (e.g. the store of the zoo the entity joins), its
+        data becomes a view of the entity's events. The rows the log already has are added to the store as events the
+        entity recorded (the events of a log kept in another store stay there too).
+        :param owner_id: The id of the zoo entity the log belongs to.
+        :param store: The EventStore to keep the log in.
+        :return: None
+        """
+        try:
+            if not isinstance(store, EventStore):
+                raise TypeError("A log can only be kept in an EventStore.")
+            if store is self.__store and owner_id == self.__owner_id:
+                return None
+            rows = self.data
+            for row in rows.to_dict("records"):
+                store.record(owner_id, type(self).__name__, {column: None if pd.isna(value) else value
+                                                             for column, value in row.items()})
+            if self.__store is None:
+                super().set_data(rows.iloc[0:0])  # the rows are kept in the store now.
+            self.__store = store
+            self.__owner_id = owner_id
+        except TypeError as e:
+            print(f"[ERROR] {e} No change made.\n")
+
     def new(self, new_row: dict) -> int | None:
         """
         Add a new row of information to the log.
@@ -45,12 +125,12 @@ class Log(DataRecord):
         try:
             if not isinstance(new_row, dict):
                 raise TypeError("The new row of data must be provided as a Dictionary object.")
-            assert set(self.data.columns.values) == set(new_row.keys()), (
+            assert set(self.columns) == set(new_row.keys()), (
                 f"The dictionary keys of the new row must match the existing columns of the Log data attribute.")
             if not isinstance(new_row.get("DateTime"),
                               datetime):  # the datetime class will internally handle formatting issues.
                 raise TypeError("The Datetime of a new log record must be a datetime object.")
-            return super().new(new_row)
+            return self.__write(new_row)
 
         except AssertionError as e:
             print(f"[ERROR] {e}\nNo changes made to {self.name} Log.\n")
@@ -65,7 +145,27 @@ class Log(DataRecord):
                     new_row.update({"DateTime": datetime.now()})
                     print(f"[WARNING] {e} Default DateTime (now) has been assumed for the new record added to"
                           f" {self.name} Log.\n")
-                    return super().new(new_row)
+                    return self.__write(new_row)
+
+    def join(self, log_ref_num: int | None, new_row: dict) -> int | None:
+        """
+        Add the owner's side of an event that another participant has already logged (e.g. a Zookeeper feeding an
+        animal which logged that it ate). In an EventStore the event is not written again: the owner joins it and the
+        log shows it from the owner's side. Otherwise the row is added to the log as a new row.
+        :param log_ref_num: The reference number of the event logged by the other participant.
+        :param new_row: The owner's side of the event (see new()), its object must be the other participant.
+        :return: The reference number of the event (or of the new row added).
+        """
+        if (self.__store is not None and log_ref_num is not None and isinstance(new_row, dict)
+                and self.__store.join(self.__owner_id, log_ref_num, new_row)):
+            return log_ref_num
+        return self.new(new_row)
+
+    def __write(self, new_row: dict) -> int | None:
+        """Add a checked row to the log's own data or to the EventStore it is kept in."""
+        if self.__store is None:
+            return DataRecord.new(self, new_row)
+        return self.__store.record(self.__owner_id, type(self).__name__, new_row)
 
     def __str__(self) -> str:
         """
@@ -74,14 +174,15 @@ class Log(DataRecord):
         """
         output = super().__str__() + " LOG:"
 
-        if len(self.data) == 0:
+        data = self.data
+        if len(data) == 0:
             output += "\nNo data recorded."
         else:
             output += "\n"
-            self.data.sort_values(by=['DateTime'], ascending=True, inplace=True)  # keep original unique record ref nums
+            data = data.sort_values(by=['DateTime'], ascending=True)  # keep original unique record ref nums
 
             # iterate through log records and add each as a formatted line:
-            for row in self.data.itertuples():
+            for row in data.itertuples():
                 subject_desc = f"{row.SubjectName}_{row.SubjectID}"
                 object_desc = f"{row.ObjectName}_{row.ObjectID}"
 
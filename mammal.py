@@ -15,6 +15,8 @@ from environmental_type import EnvironmentalType
 
 
 class Mammal(Animal):
+    __slots__ = ("__fur_colour", "__is_nocturnal")
+
     def __init__(self, name: str, species: str, sound: str, fur_colour: str,
                  is_nocturnal: bool = False, age: int = 0, habitat: EnvironmentalType = EnvironmentalType.GRASS):
         """
@@ -52,6 +54,17 @@ class Mammal(Animal):
             f" > Nocturnal: {self.__is_nocturnal}\n"
         )
 
+    def get_fur_colour(self) -> str:
+        """Return a string representing the primary colour of the mammal's fur."""
+        return self.__fur_colour
+
+    def get_is_nocturnal(self) -> bool:
+        """Return whether the mammal is primarily active at night."""
+        return self.__is_nocturnal
+
+    fur_colour = property(get_fur_colour)
+    is_nocturnal = property(get_is_nocturnal)
+
     def groom(self, at_datetime: datetime = datetime.now()):
         """
         Log that the Mammal grooms its fur.
@@ -7,25 +7,24 @@ ID: 110462390
 Username: ivany005
 This is my own work as defined by the University's Academic Integrity Policy.
 """
-
-import pandas as pd
-from pandas import DataFrame
-
 from data_record import DataRecord
+from lazy_modules import pd
 from log import Log
 from severity import Severity
 
 
 class MedicalLog(Log):
-    def __init__(self, log_name: str):
+    def __init__(self, log_name: str, owner_id: str | None = None):
         """
         Create a new Log instance.
         :param log_name: The name of the log.
+        :param owner_id: The id of the animal the log belongs to (default is none). The log stores its own rows until
+        it is kept in the EventStore of the animal's zoo (see use_event_store()).
         """
-        super().__init__(log_name)
+        super().__init__(log_name, owner_id)
 
         # create a dataframe to store medical history (base columns with new columns added):
-        cols_to_add = DataFrame({
+        cols_to_add = pd.DataFrame({
             "Severity": pd.Series(dtype="object"),  # Severity enumeration
             "Treatment": pd.Series(dtype="string")})
         self.data = pd.concat([self.data, cols_to_add])
@@ -51,7 +50,7 @@ class MedicalLog(Log):
         try:
             if not isinstance(new_row, dict):
                 raise TypeError("The new row of data must be provided as a Dictionary object.")
-            assert set(self.data.columns.values) == set(new_row.keys()), (
+            assert set(self.columns) == set(new_row.keys()), (
                 f"The dictionary keys of the new row must match the existing columns of the Medical Log data attribute.")
             if not isinstance(new_row.get("Severity"), Severity):
                 raise TypeError("The logged record severity must be from the Severity enumeration.")
@@ -71,12 +70,13 @@ class MedicalLog(Log):
         """
         output = DataRecord.__str__(self) + " LOG:"
 
-        if len(self.data) == 0:
+        data = self.data
+        if len(data) == 0:
             output += "\nNo medical history recorded."
         else:
-            self.data.sort_values(by=['DateTime'], ascending=True, inplace=True)  # keep original unique record ref nums
+            data = data.sort_values(by=['DateTime'], ascending=True)  # keep original unique record ref nums
             # iterate through log records and add each as a formatted line:
-            for row in self.data.itertuples():
+            for row in data.itertuples():
                 subject_desc = f"{row.SubjectName}_{row.SubjectID}"
                 object_desc = f"{row.ObjectName}_{row.ObjectID}"
                 # if the subject of the scheduled action only relates to the performer, do not describe
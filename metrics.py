@@ -0,0 +1,292 @@
+"""
+File: metrics.py
+Description: Contains the Counter, Histogram and MetricsRegistry classes which measure where the zoo spends its time,
+and METRICS, the registry used by the zoo. Once enabled (with METRICS.enable(), or by setting the environment variable
+ZOO_METRICS=1 before the zoo is imported) every public method of ZooSystem (including each report_* method), every
+DataRecord.new, Schedule.remove and generate_schedule is counted and timed through a hook (see instrumentation.py), so
+disabled metrics cost nothing at all. Latencies are kept in histograms with buckets that double in size from 1
+microsecond up to about a minute. The number of rows and bytes of memory of each type of record of a watched zoo are
+reported as gauges. Every metric can be exported in the Prometheus text format, to a file or from a local HTTP
+endpoint, e.g.
+
+    METRICS.enable()
+    METRICS.watch(zoo)
+    METRICS.serve(port=9464)  # or METRICS.write("zoo.prom")
+
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import os
+import threading
+import weakref
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from typing import Callable
+
+from instrumentation import add_hook, get_hooks, remove_hook
+
+BUCKETS = tuple(1e-6 * 2 ** power for power in range(27))  # upper bounds in seconds: 1 us, 2 us, 4 us ... 67 s
+
+
+class Counter:
+    def __init__(self, name: str, description: str, label: str):
+        """
+        Create a new Counter instance, a count for each value of one label.
+        :param name: The name of the metric, e.g. "zoo_calls_total".
+        :param description: What is counted.
+        :param label: The name of the label the counts are kept by, e.g. "method".
+        """
+        self.__name = name
+        self.__description = description
+        self.__label = label
+        self.__counts = {}  # label value -> count
+        self.__lock = threading.Lock()
+
+    def get_name(self) -> str:
+        """Return the name of the metric."""
+        return self.__name
+
+    name = property(get_name)
+
+    def increment(self, label_value: str, amount: int = 1) -> None:
+        """Add to the count of a label value."""
+        with self.__lock:
+            self.__counts[label_value] = self.__counts.get(label_value, 0) + amount
+
+    def value(self, label_value: str) -> int:
+        """Return the count of a label value."""
+        return self.__counts.get(label_value, 0)
+
+    def reset(self) -> None:
+        """Set every count back to zero."""
+        with self.__lock:
+            self.__counts = {}
+
+    def to_prometheus(self) -> str:
+        """Return the counts in the Prometheus text format."""
+        with self.__lock:
+            counts = sorted(self.__counts.items())
+        lines = [f"# HELP {self.__name} {self.__description}", f"# TYPE {self.__name} counter"]
+        lines += [f'{self.__name}{{{self.__label}="{value}"}} {count}' for value, count in counts]
+        return "\n".join(lines) + "\n"
+
+
+class Histogram:
+    def __init__(self, name: str, description: str, label: str):
+        """
+        Create a new Histogram instance, a distribution of observed values (e.g. latencies) for each value of one label.
+        :param name: The name of the metric, e.g. "zoo_call_duration_seconds".
+        :param description: What is observed.
+        :param label: The name of the label the distributions are kept by, e.g. "method".
+        """
+        self.__name = name
+        self.__description = description
+        self.__label = label
+        self.__series = {}  # label value -> [count in each bucket (and one above the last), count, sum]
+        self.__lock = threading.Lock()
+
+    def get_name(self) -> str:
+        """Return the name of the metric."""
+        return self.__name
+
+    name = property(get_name)
+
+    def observe(self, label_value: str, value: float) -> None:
+        """Add an observed value (e.g. a latency in seconds) to the distribution of a label value."""
+        bucket = bisect_left(BUCKETS, value)
+        with self.__lock:
+            series = self.__series.get(label_value)
+            if series is None:
+                series = self.__series[label_value] = [[0] * (len(BUCKETS) + 1), 0, 0.0]
+            series[0][bucket] += 1
+            series[1] += 1
+            series[2] += value
+
+    def count(self, label_value: str) -> int:
+        """Return the number of values observed for a label value."""
+        return self.__series[label_value][1] if label_value in self.__series else 0
+
+    def quantile(self, label_value: str, quantile: float) -> float:
+        """
+        Estimate a quantile of the values observed for a label value, e.g. histogram.quantile("ZooSystem.add_animal",
+        0.99), as the upper bound of the bucket it falls in (so it is at most twice the true value).
+        :return: The estimate (0.0 if nothing was observed, infinity if it is above the last bucket).
+        """
+        with self.__lock:
+            if label_value not in self.__series:
+                return 0.0
+            buckets, count, _ = self.__series[label_value]
+            running = 0
+            for bound, bucket_count in zip(BUCKETS + (float("inf"),), buckets):
+                running += bucket_count
+                if running >= quantile * count:
+                    return bound
+        return float("inf")
+
+    def reset(self) -> None:
+        """Forget every observed value."""
+        with self.__lock:
+            self.__series = {}
+
+    def to_prometheus(self) -> str:
+        """Return the distributions in the Prometheus text format (cumulative buckets, sum and count)."""
+        with self.__lock:
+            series = sorted((value, [list(buckets), count, total])
+                            for value, (buckets, count, total) in self.__series.items())
+        lines = [f"# HELP {self.__name} {self.__description}", f"# TYPE {self.__name} histogram"]
+        for value, (buckets, count, total) in series:
+            running = 0
+            for bound, bucket_count in zip(BUCKETS, buckets):
+                running += bucket_count
+                lines.append(f'{self.__name}_bucket{{{self.__label}="{value}",le="{bound:.6g}"}} {running}')
+            lines.append(f'{self.__name}_bucket{{{self.__label}="{value}",le="+Inf"}} {count}')
+            lines.append(f'{self.__name}_sum{{{self.__label}="{value}"}} {total:.9g}')
+            lines.append(f'{self.__name}_count{{{self.__label}="{value}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """Create a new (disabled) MetricsRegistry instance."""
+        self.__calls = Counter("zoo_calls_total", "Number of calls of each measured method.", "method")
+        self.__errors = Counter("zoo_call_errors_total", "Number of calls of each measured method that raised an "
+                                                         "exception.", "method")
+        self.__durations = Histogram("zoo_call_duration_seconds", "How long each call of each measured method took.",
+                                     "method")
+        self.__zoos = weakref.WeakSet()  # the zoos whose records are reported as gauges.
+        self.__gauges = {}  # gauge name -> (description, label, function returning {label value: value})
+        self.add_gauge("zoo_record_rows", "Number of rows in the records of watched zoos, by type of record.",
+                       "record_type", lambda: self.__record_totals(lambda record: record.row_count))
+        self.add_gauge("zoo_record_memory_bytes", "Bytes of memory used by the records of watched zoos, by type of "
+                                                  "record.",
+                       "record_type", lambda: self.__record_totals(lambda record: record.get_memory_usage()))
+
+    def get_enabled(self) -> bool:
+        """Return whether calls are being measured."""
+        return self in get_hooks()
+
+    def get_calls(self) -> Counter:
+        """Return the number of calls of each measured method."""
+        return self.__calls
+
+    def get_errors(self) -> Counter:
+        """Return the number of calls of each measured method that raised an exception."""
+        return self.__errors
+
+    def get_durations(self) -> Histogram:
+        """Return the distribution of how long the calls of each measured method took."""
+        return self.__durations
+
+    enabled = property(get_enabled)
+    calls = property(get_calls)
+    errors = property(get_errors)
+    durations = property(get_durations)
+
+    def enable(self) -> None:
+        """Start measuring the calls of every measured method."""
+        add_hook(self)
+
+    def disable(self) -> None:
+        """Stop measuring calls (once no other hook is added, the methods run exactly as before). Counts are kept."""
+        remove_hook(self)
+
+    def reset(self) -> None:
+        """Forget every count and latency measured so far."""
+        self.__calls.reset()
+        self.__errors.reset()
+        self.__durations.reset()
+
+    def enter(self, label: str) -> float:
+        """Start timing a call of a measured method (see instrumentation.py)."""
+        return perf_counter()
+
+    def leave(self, label: str, start: float, failed: bool) -> None:
+        """Count and time a call of a measured method that has returned or raised an exception."""
+        self.__durations.observe(label, perf_counter() - start)
+        self.__calls.increment(label)
+        if failed:
+            self.__errors.increment(label)
+
+    # gauges ---------------------------------------------------------------------------------------------------
+
+    def add_gauge(self, name: str, description: str, label: str, read: Callable[[], dict]) -> None:
+        """
+        Add a gauge, a value read each time metrics are exported.
+        :param name: The name of the metric, e.g. "zoo_record_rows".
+        :param description: What is measured.
+        :param label: The name of the label of the values, e.g. "record_type".
+        :param read: Function that returns the current value of each label value, as a dictionary.
+        :return: None
+        """
+        self.__gauges[name] = (description, label, read)
+
+    def watch(self, zoo) -> None:
+        """Report the number of rows and memory of each type of record of a zoo in the gauges."""
+        self.__zoos.add(zoo)
+
+    def unwatch(self, zoo) -> None:
+        """Stop reporting the records of a zoo."""
+        self.__zoos.discard(zoo)
+
+    def __record_totals(self, measure: Callable) -> dict[str, int]:
+        """Return the total of a measure of each record of the watched zoos (each record once), by type of record."""
+        records = {}
+        for zoo in list(self.__zoos):
+            for record_type, typed_records in zoo.records().items():
+                records.setdefault(record_type, {}).update((id(record), record) for record in typed_records)
+        return {record_type: sum(measure(record) for record in typed_records.values())
+                for record_type, typed_records in records.items()}
+
+    # exporting ------------------------------------------------------------------------------------------------
+
+    def to_prometheus(self) -> str:
+        """Return every metric in the Prometheus text format."""
+        output = self.__calls.to_prometheus() + self.__errors.to_prometheus() + self.__durations.to_prometheus()
+        for name, (description, label, read) in self.__gauges.items():
+            output += f"# HELP {name} {description}\n# TYPE {name} gauge\n"
+            output += "".join(f'{name}{{{label}="{value}"}} {measured}\n' for value, measured in sorted(read().items()))
+        return output
+
+    def write(self, path: str) -> None:
+        """Write every metric to a file in the Prometheus text format (e.g. for the node exporter's textfile reader)."""
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(self.to_prometheus())
+        os.replace(temporary, path)  # readers never see a half-written file.
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9464) -> ThreadingHTTPServer:
+        """
+        Serve every metric in the Prometheus text format at http://<host>:<port>/metrics from a background thread.
+        :param host: The address to listen on (default is only this computer).
+        :param port: The port to listen on (default 9464; 0 for any free port).
+        :return: The HTTP server (call its shutdown() method to stop serving).
+        """
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                """Answer a scrape with every metric."""
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return None
+                data = registry.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                """Do not print a line for each scrape."""
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="zoo-metrics", daemon=True).start()
+        return server
+
+
+METRICS = MetricsRegistry()  # measures the zoo while enabled.
+if os.environ.get("ZOO_METRICS", "") not in ("", "0"):
+    METRICS.enable()
@@ -0,0 +1,65 @@
+"""
+File: observable.py
+Description: Contains the abstract Observable class which is inherited by zoo objects whose state changes can be
+watched by other objects (observers) such as zoo-wide indexes and queues.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from abc import ABC
+from datetime import datetime
+
+from action import Action
+
+
+class Observable(ABC):
+    __slots__ = ("__observers",)
+
+    def __init__(self):
+        """
+        Create a new Observable instance.
+        """
+        self.__observers = []  # objects that are notified each time the observable object changes state.
+
+    def get_observers(self) -> list:
+        """Return a list containing the objects that are watching the object."""
+        return self.__observers
+
+    observers = property(get_observers)
+
+    def add_observer(self, observer) -> None:
+        """
+        Register an object to be notified of the object's state changes.
+        :param observer: The object to notify. It must provide an update(subject, action, at_datetime, **details)
+        method.
+        :return: None
+        """
+        try:
+            if not callable(getattr(observer, "update", None)):
+                raise TypeError(f"{observer.__class__.__name__} objects cannot observe zoo objects as they have no "
+                                f"update method.")
+            if observer not in self.__observers:  # duplicates not allowed
+                self.__observers.append(observer)
+        except TypeError as e:
+            print(f"[ERROR] {e} No change made.\n")
+
+    def remove_observer(self, observer) -> None:
+        """
+        Stop notifying an object of the object's state changes.
+        :param observer: The object to stop notifying.
+        :return: None
+        """
+        if observer in self.__observers:
+            self.__observers.remove(observer)
+
+    def notify_observers(self, action: Action, at_datetime: datetime, **details) -> None:
+        """
+        Notify every registered observer that an action has changed the state of the object.
+        :param action: The action that changed the object's state.
+        :param at_datetime: The date and time at which the action occurred.
+        :param details: Any further information about the action (e.g. severity=Severity.HIGH).
+        :return: None
+        """
+        for observer in tuple(self.__observers):  # observers may be added or removed by other threads meanwhile.
+            observer.update(self, action, at_datetime, **details)
@@ -0,0 +1,250 @@
+"""
+File: outbreak_simulation.py
+Description: Contains the OutbreakSimulation class which estimates how an infectious illness could spread through a
+zoo, and the OutbreakResults class which summarises the outcome. Illness spreads between animals that share an
+enclosure and between enclosures that share a Zookeeper. Infected animals are diagnosed and put under treatment,
+which reduces how infectious they are, until they recover. Thousands of random trials are run, each as rows of numpy
+state arrays, in batches spread across a process pool.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+
+from lazy_modules import np
+from veterinarian import Veterinarian
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+
+# animal states in the per-trial state arrays:
+HEALTHY = 0
+INFECTED = 1  # infectious but not yet diagnosed
+UNDER_TREATMENT = 2  # diagnosed and under treatment (in quarantine)
+RECOVERED = 3  # immune for the rest of the trial
+
+
+class OutbreakResults:
+    def __init__(self, under_treatment: np.ndarray, vet_workload: np.ndarray, vet_names: list[str]):
+        """
+        Create a new OutbreakResults instance.
+        :param under_treatment: Array of shape (trials, days + 1): the number of animals under treatment each day.
+        :param vet_workload: Array of shape (trials, days + 1, vets): the animals under treatment per vet each day.
+        :param vet_names: The name and id of each vet, in the order of the last axis of vet_workload.
+        """
+        self.__under_treatment = under_treatment
+        self.__vet_workload = vet_workload
+        self.__vet_names = vet_names
+
+    def get_under_treatment(self) -> np.ndarray:
+        """Return the number of animals under treatment on each day of each trial (trials x days + 1)."""
+        return self.__under_treatment
+
+    def get_vet_workload(self) -> np.ndarray:
+        """Return the number of animals under treatment per vet on each day of each trial (trials x days + 1 x vets)."""
+        return self.__vet_workload
+
+    def get_vet_names(self) -> list[str]:
+        """Return the name and id of each vet in the results."""
+        return self.__vet_names
+
+    under_treatment = property(get_under_treatment)
+    vet_workload = property(get_vet_workload)
+    vet_names = property(get_vet_names)
+
+    def under_treatment_quantiles(self, quantiles: tuple = (0.05, 0.5, 0.95)) -> np.ndarray:
+        """
+        Return the distribution of the number of animals under treatment on each day across trials.
+        :param quantiles: The quantiles to calculate (default 5th, 50th and 95th percentiles).
+        :return: Array of shape (quantiles, days + 1).
+        """
+        return np.quantile(self.__under_treatment, quantiles, axis=0)
+
+    def vet_workload_quantiles(self, quantiles: tuple = (0.05, 0.5, 0.95)) -> np.ndarray:
+        """
+        Return the distribution of each vet's peak number of animals under treatment across trials.
+        :param quantiles: The quantiles to calculate (default 5th, 50th and 95th percentiles).
+        :return: Array of shape (quantiles, vets).
+        """
+        return np.quantile(self.__vet_workload.max(axis=1), quantiles, axis=0)
+
+    def __str__(self) -> str:
+        """Return a summary of the outbreak results as a formatted string."""
+        low, median, high = self.under_treatment_quantiles()
+        output = (f"----------------------------------------------------------------------------------------------\n"
+                  f"OUTBREAK SIMULATION ({len(self.__under_treatment)} trials):\n"
+                  f"\nANIMALS UNDER TREATMENT (5th / 50th / 95th percentile):")
+        for day in range(len(median)):
+            output += f"\n - Day {day}: {low[day]:g} / {median[day]:g} / {high[day]:g}"
+
+        output += "\n\nPEAK VET WORKLOAD (5th / 50th / 95th percentile):"
+        for vet_name, (vet_low, vet_median, vet_high) in zip(self.__vet_names, self.vet_workload_quantiles().T):
+            output += f"\n - {vet_name}: {vet_low:g} / {vet_median:g} / {vet_high:g}"
+        output += "\n----------------------------------------------------------------------------------------------\n"
+        return output
+
+
+class OutbreakSimulation:
+    def __init__(self, zoo: ZooSystem, enclosure_rate: float = 0.1, keeper_rate: float = 0.01,
+                 treatment_factor: float = 0.2, detection_days: float = 3, recovery_days: float = 7,
+                 index_cases: int = 1):
+        """
+        Create a new OutbreakSimulation instance from the current state of a zoo. Animals that are currently under
+        treatment (after HasHealth.receive_diagnosis) start every trial under treatment.
+        :param zoo: The zoo to model (it is not changed by the simulation).
+        :param enclosure_rate: Daily rate of infection from each infectious animal in the same enclosure.
+        :param keeper_rate: Daily rate of infection from each infectious animal in another enclosure that shares a
+        Zookeeper (per shared Zookeeper).
+        :param treatment_factor: How infectious an animal under treatment is compared to an undiagnosed animal.
+        :param detection_days: The average number of days before an infected animal is diagnosed.
+        :param recovery_days: The average number of days an animal is under treatment.
+        :param index_cases: The number of randomly chosen healthy animals infected at the start of each trial.
+        """
+        self.__zoo = zoo
+        self.__parameters = {"enclosure_rate": enclosure_rate, "keeper_rate": keeper_rate,
+                             "treatment_factor": treatment_factor, "detect_chance": 1 / max(detection_days, 1),
+                             "recover_chance": 1 / max(recovery_days, 1), "index_cases": index_cases}
+
+        animals = zoo.animals
+        enclosures = zoo.enclosures
+        animal_index = {animal.id: i for i, animal in enumerate(animals)}
+        enclosure_index = {enclosure.id: i for i, enclosure in enumerate(enclosures)}
+        animal_enclosure = np.full(len(animals), -1)
+        for enclosure in enclosures:
+            for animal in enclosure.inhabitants:
+                if animal.id in animal_index:
+                    animal_enclosure[animal_index[animal.id]] = enclosure_index[enclosure.id]
+
+        # the animals that live in an enclosure and the index of their enclosure (animals outside enclosures infect
+        # nobody). Kept as index arrays rather than an animals x enclosures matrix, so memory and time per day grow
+        # with the number of animals, not animals x enclosures:
+        housed = np.flatnonzero(animal_enclosure >= 0)
+
+        # keeper_links[e1, e2] = number of Zookeepers who look after both enclosures.
+        keeper_links = np.zeros((len(enclosures), len(enclosures)))
+        for keeper in [member for member in zoo.staff if isinstance(member, Zookeeper)]:
+            assigned = [enclosure_index[enclosure.id] for enclosure in keeper.enclosure_assignments
+                        if enclosure.id in enclosure_index]
+            keeper_links[np.ix_(assigned, assigned)] += 1
+        np.fill_diagonal(keeper_links, 0)
+
+        # each animal's treatment is split between all the vets responsible for it: those assigned to the animal
+        # itself or to its enclosure. Stored as one (animal, vet, share) entry per responsible vet.
+        vets = [member for member in zoo.staff if isinstance(member, Veterinarian)]
+        vets_of = {}  # animal index -> indexes of the vets responsible for the animal
+        for v, vet in enumerate(vets):
+            patients = [animal for enclosure in vet.enclosure_assignments if enclosure.id in enclosure_index
+                        for animal in enclosure.inhabitants] + vet.animal_assignments
+            for animal in patients:
+                if animal.id in animal_index:
+                    vets_of.setdefault(animal_index[animal.id], set()).add(v)
+        care = [(a, v, 1 / len(responsible)) for a, responsible in vets_of.items() for v in sorted(responsible)]
+        care_animal = np.array([a for a, v, share in care], dtype=np.intp)
+        care_vet = np.array([v for a, v, share in care], dtype=np.intp)
+        care_share = np.array([share for a, v, share in care], dtype=float)
+
+        initial_state = np.array([UNDER_TREATMENT if animal.under_treatment else HEALTHY for animal in animals])
+        self.__arrays = {"housed": housed, "housed_enclosure": animal_enclosure[housed],
+                         "keeper_links": keeper_links, "care_animal": care_animal, "care_vet": care_vet,
+                         "care_share": care_share, "vets": len(vets), "initial_state": initial_state}
+        self.__vet_names = [f"{vet.name}_{vet.id}" for vet in vets]
+
+    def get_zoo(self) -> ZooSystem:
+        """Return the zoo being modelled."""
+        return self.__zoo
+
+    zoo = property(get_zoo)
+
+    def run(self, trials: int, days: int, seed: int = 0, batch_size: int = 250,
+            max_workers: int | None = 1) -> OutbreakResults:
+        """
+        Run random outbreak trials. Trials are split into batches which are run in parallel when max_workers is not
+        1. Every batch has its own random stream derived from the seed, so results only depend on the seed and the
+        batch size (not on the number of workers).
+        :param trials: The number of trials to run.
+        :param days: The number of days each trial lasts.
+        :param seed: The seed of the random number generator (default 0).
+        :param batch_size: The number of trials simulated together as one set of arrays (default 250).
+        :param max_workers: The number of processes to use, None uses every processor (default 1: no process pool).
+        :return: The OutbreakResults of all trials.
+        """
+        batch_sizes = [min(batch_size, trials - start) for start in range(0, trials, batch_size)]
+        batch_seeds = np.random.SeedSequence(seed).spawn(len(batch_sizes))
+        jobs = [(self.__arrays, self.__parameters, days, size, batch_seed)
+                for size, batch_seed in zip(batch_sizes, batch_seeds)]
+
+        if max_workers == 1:
+            batches = [simulate_batch(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                batches = list(executor.map(simulate_batch, *zip(*jobs)))
+
+        under_treatment = np.concatenate([batch[0] for batch in batches])
+        vet_workload = np.concatenate([batch[1] for batch in batches])
+        return OutbreakResults(under_treatment, vet_workload, self.__vet_names)
+
+
+def simulate_batch(arrays: dict, parameters: dict, days: int, trials: int,
+                   seed: np.random.SeedSequence) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate a batch of outbreak trials at once. Row t of every state array holds trial t.
+    :param arrays: The zoo's housing, keeper_links, vet care and initial_state arrays (see OutbreakSimulation).
+    :param parameters: The transmission parameters of the OutbreakSimulation.
+    :param days: The number of days each trial lasts.
+    :param trials: The number of trials in the batch.
+    :param seed: The random seed of the batch.
+    :return: The (under treatment counts, vet workloads) of the batch.
+    """
+    rng = np.random.default_rng(seed)
+    housed, housed_enclosure = arrays["housed"], arrays["housed_enclosure"]
+    enclosures = len(arrays["keeper_links"])
+    state = np.tile(arrays["initial_state"], (trials, 1))
+
+    # infect random healthy animals in each trial:
+    for _ in range(parameters["index_cases"]):
+        scores = np.where(state == HEALTHY, rng.random(state.shape), -1)
+        chosen = scores.argmax(axis=1)
+        infectable = scores[np.arange(trials), chosen] >= 0
+        state[np.flatnonzero(infectable), chosen[infectable]] = INFECTED
+
+    under_treatment = np.zeros((trials, days + 1), dtype=np.int32)
+    vet_workload = np.zeros((trials, days + 1, arrays["vets"]))
+    for day in range(days + 1):
+        treated = state == UNDER_TREATMENT
+        under_treatment[:, day] = treated.sum(axis=1)
+        vet_workload[:, day] = group_sums(treated[:, arrays["care_animal"]] * arrays["care_share"], arrays["care_vet"],
+                                          arrays["vets"])
+        if day == days:
+            break
+
+        # infection pressure on each enclosure from its own animals and from enclosures that share a keeper:
+        infectious = (state == INFECTED) + parameters["treatment_factor"] * treated
+        enclosure_load = group_sums(infectious[:, housed], housed_enclosure, enclosures)
+        enclosure_pressure = (parameters["enclosure_rate"] * enclosure_load
+                              + parameters["keeper_rate"] * enclosure_load @ arrays["keeper_links"])
+        pressure = np.zeros(state.shape)
+        pressure[:, housed] = enclosure_pressure[:, housed_enclosure]
+        newly_infected = (state == HEALTHY) & (rng.random(state.shape) < 1 - np.exp(-pressure))
+
+        diagnosed = (state == INFECTED) & (rng.random(state.shape) < parameters["detect_chance"])
+        recovered = treated & (rng.random(state.shape) < parameters["recover_chance"])
+        state[newly_infected] = INFECTED
+        state[diagnosed] = UNDER_TREATMENT
+        state[recovered] = RECOVERED
+    return under_treatment, vet_workload
+
+
+def group_sums(values: np.ndarray, groups: np.ndarray, group_count: int) -> np.ndarray:
+    """
+    Sum the columns of each row of values by group, for every row at once with a single np.bincount.
+    :param values: Array of shape (trials, columns).
+    :param groups: The group (0 to group_count - 1) of each column.
+    :param group_count: The number of groups.
+    :return: Array of shape (trials, group_count).
+    """
+    trials = len(values)
+    bins = (np.arange(trials)[:, None] * group_count + groups).ravel()
+    return np.bincount(bins, weights=values.ravel(), minlength=trials * group_count).reshape(trials, group_count)
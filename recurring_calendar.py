@@ -0,0 +1,179 @@
+"""
+File: recurring_calendar.py
+Description: Contains the RecurringCalendar class which treats daily Schedules (diets, treatments, staff tasks) as
+rules that recur every day between a start and end date, so that they can be planned over weeks or months. Events
+are expanded lazily one day at a time and totals are calculated arithmetically, without expanding every event.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+
+from schedule import Schedule
+
+
+class RecurringCalendar:
+    # the columns of a schedule that are copied into each event (schedules such as diets may have more columns):
+    EVENT_COLUMNS = ["Time", "SubjectID", "SubjectName", "ObjectID", "ObjectName", "Action", "Details"]
+
+    def __init__(self, calendar_name: str):
+        """
+        Create a new (empty) RecurringCalendar instance.
+        :param calendar_name: The name of the calendar.
+        """
+        self.__name = calendar_name
+        self.__rules = []  # list of [schedule, start_date, end_date, sorted list of dates the rule is skipped]
+        self.__exceptions = []  # sorted list of dates on which no rule recurs.
+
+    def get_name(self) -> str:
+        """Return the name (string) of the calendar."""
+        return self.__name
+
+    def get_schedules(self) -> list[Schedule]:
+        """Return a list of the Schedules that recur in the calendar."""
+        return [rule[0] for rule in self.__rules]
+
+    name = property(get_name)
+    schedules = property(get_schedules)
+
+    def add_schedule(self, schedule: Schedule, start_date: date = date.min, end_date: date = date.max) -> None:
+        """
+        Add a daily Schedule to the calendar so that each of its entries recurs every day in a date range.
+        :param schedule: The daily Schedule to recur.
+        :param start_date: The first date on which the schedule applies (default is no start date).
+        :param end_date: The last date on which the schedule applies, e.g. the end of a treatment (default is none).
+        :return: None
+        """
+        try:
+            if not isinstance(schedule, Schedule):
+                raise TypeError("Only Schedule objects can recur in a calendar.")
+            if not (isinstance(start_date, date) and isinstance(end_date, date)):
+                raise TypeError("The start_date and end_date of a recurring schedule must be date objects.")
+            if end_date < start_date:
+                raise ValueError("The end_date of a recurring schedule cannot be before its start_date.")
+            self.__rules.append([schedule, self.__to_date(start_date), self.__to_date(end_date), []])
+        except (TypeError, ValueError) as e:
+            print(f"[ERROR] {e} No change made to {self.name} Calendar.\n")
+
+    def add_exception(self, on_date: date, schedule: Schedule | None = None) -> None:
+        """
+        Skip a date in the calendar, either for one schedule or (by default) for every schedule.
+        :param on_date: The date to skip.
+        :param schedule: The schedule to skip on the date (default is all schedules).
+        :return: None
+        """
+        try:
+            if not isinstance(on_date, date):
+                raise TypeError("The date of a calendar exception must be a date object.")
+            on_date = self.__to_date(on_date)
+
+            if schedule is None:
+                if on_date not in self.__exceptions:
+                    insort(self.__exceptions, on_date)
+                    for rule in self.__rules:  # a rule exception would now be counted twice, so remove it.
+                        if on_date in rule[3]:
+                            rule[3].remove(on_date)
+                return None
+
+            rules = [rule for rule in self.__rules if rule[0] is schedule]
+            if len(rules) == 0:
+                raise ValueError(f"{schedule.name} Schedule does not recur in the calendar.")
+            for rule in rules:
+                if on_date not in rule[3] and on_date not in self.__exceptions:
+                    insort(rule[3], on_date)
+        except (TypeError, ValueError) as e:
+            print(f"[ERROR] {e} No change made to {self.name} Calendar.\n")
+
+    def expand(self, start_date: date, end_date: date) -> Iterator[dict]:
+        """
+        Generate every event that occurs in a date range in chronological order. Events are created one day at a
+        time as they are requested, so the full expansion is never held in memory.
+        :param start_date: The first date of the range.
+        :param end_date: The last date of the range (inclusive).
+        :return: An iterator of dictionaries with the columns of a Log record ('DateTime', 'SubjectID', ...).
+        """
+        if not self.__valid_range(start_date, end_date):
+            return
+
+        # each rule's entries are sorted by time once, rather than once per day:
+        daily_rows = []
+        for schedule, rule_start, rule_end, skipped in self.__rules:
+            rows = sorted(schedule.data[RecurringCalendar.EVENT_COLUMNS].to_dict("records"),
+                          key=lambda row: row["Time"])
+            daily_rows.append((rows, rule_start, rule_end, set(skipped)))
+
+        exceptions = set(self.__exceptions)
+        day, last = self.__to_date(start_date), self.__to_date(end_date)
+        while day <= last:
+            if day not in exceptions:
+                active = [rows for rows, rule_start, rule_end, skipped in daily_rows
+                          if rule_start <= day <= rule_end and day not in skipped]
+                for row in heapq.merge(*active, key=lambda entry: entry["Time"]):
+                    event = {key: value for key, value in row.items() if key != "Time"}
+                    event["DateTime"] = datetime.combine(day, row["Time"])
+                    yield event
+            if day == last:  # stop before the day after, which does not exist when the range ends on date.max.
+                break
+            day += timedelta(days=1)
+
+    def count(self, start_date: date, end_date: date) -> int:
+        """
+        Count the events that occur in a date range without expanding them.
+        :param start_date: The first date of the range.
+        :param end_date: The last date of the range (inclusive).
+        :return: The number of events.
+        """
+        if not self.__valid_range(start_date, end_date):
+            return 0
+        return sum(len(rule[0].data) * self.__active_days(rule, start_date, end_date) for rule in self.__rules)
+
+    def aggregate(self, start_date: date, end_date: date, by: str = "Action") -> dict:
+        """
+        Count the events that occur in a date range grouped by the values of a column, without expanding them.
+        :param start_date: The first date of the range.
+        :param end_date: The last date of the range (inclusive).
+        :param by: The Schedule column to group events by (default is 'Action').
+        :return: A dictionary of {column value: number of events}.
+        """
+        totals = {}
+        try:
+            if not self.__valid_range(start_date, end_date):
+                return totals
+            for rule in self.__rules:
+                if by not in rule[0].data.columns:
+                    raise KeyError(f"Events cannot be grouped by {by} as it is not a Schedule column.")
+                days = self.__active_days(rule, start_date, end_date)
+                if days == 0:
+                    continue
+                for value, count in rule[0].data[by].value_counts().items():
+                    totals[value] = totals.get(value, 0) + int(count) * days
+        except KeyError as e:
+            print(f"[ERROR] {e.args[0]}\n")
+        return totals
+
+    def __active_days(self, rule: list, start_date: date, end_date: date) -> int:
+        """Return the number of days in a date range on which a rule recurs."""
+        first = max(rule[1], self.__to_date(start_date))
+        last = min(rule[2], self.__to_date(end_date))
+        if last < first:
+            return 0
+        days = (last - first).days + 1
+        for exceptions in (self.__exceptions, rule[3]):  # sorted lists, so each can be counted with a binary search.
+            days -= bisect_right(exceptions, last) - bisect_left(exceptions, first)
+        return days
+
+    def __valid_range(self, start_date: date, end_date: date) -> bool:
+        """Check that a date range is made of date objects and print an error if it is not."""
+        if not (isinstance(start_date, date) and isinstance(end_date, date)):
+            print(f"[ERROR] The start_date and end_date of a date range must be date objects.\n")
+            return False
+        return True
+
+    @staticmethod
+    def __to_date(value: date) -> date:
+        """Return the date part of a date or datetime object."""
+        return value.date() if isinstance(value, datetime) else value
@@ -15,6 +15,8 @@ from environmental_type import EnvironmentalType
 
 
 class Reptile(Animal):
+    __slots__ = ("__scale_type", "__is_venomous")
+
     def __init__(self, name: str, species: str, sound: str, scale_type: str,
                  is_venomous: bool = False, age: int = 0, habitat: EnvironmentalType = EnvironmentalType.RAINFOREST):
         """
@@ -52,6 +54,17 @@ class Reptile(Animal):
             f" > Venomous: {self.__is_venomous}\n"
         )
 
+    def get_scale_type(self) -> str:
+        """Return a string representing the primary type of the reptile's scales."""
+        return self.__scale_type
+
+    def get_is_venomous(self) -> bool:
+        """Return whether the reptile is venomous."""
+        return self.__is_venomous
+
+    scale_type = property(get_scale_type)
+    is_venomous = property(get_is_venomous)
+
     def bask(self, at_datetime: datetime = datetime.now()):
         """
         Log that the Reptile basks to regulate its body temperature.
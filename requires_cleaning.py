@@ -1,7 +1,8 @@
 """
 File: requires_cleaning.py
 Description: Contains the abstract RequiresCleaning class which is inherited by zoo objects that have a cleanliness
-status and require cleaning (primarily Animals and Enclosures).
+status and require cleaning (primarily Animals and Enclosures). Changes in cleanliness are reported to the object's
+observers (e.g. the zoo's CleaningQueue).
 Author: Nenja Ivanovic
 ID: 110462390
 Username: ivany005
@@ -11,11 +12,18 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 
 from action import Action
+from lock_stripes import ENTITY_LOCKS
 from log import Log
+from observable import Observable
 from severity import Severity
 
 
-class RequiresCleaning(ABC):
+class RequiresCleaning(Observable, ABC):
+    # RequiresCleaning is combined with other classes that have __slots__ (e.g. Animal with HasHealth), and Python
+    # only allows one base class with non-empty __slots__, so subclasses declare its storage from SLOTS themselves.
+    __slots__ = ()
+    SLOTS = ("_RequiresCleaning__cleanliness",)
+
     def __init__(self):
         """
         Create a new RequiresCleaning instance.
@@ -26,6 +34,10 @@ class RequiresCleaning(ABC):
         """Get how clean the object is represented as an enumeration (Severity)."""
         return self.__cleanliness
 
+    def _set_cleanliness(self, cleanliness: Severity):
+        """Store how clean the object is (subclasses may store it elsewhere, e.g. in an AnimalTable)."""
+        self.__cleanliness = cleanliness
+
     @abstractmethod
     def get_name(self) -> str:
         """Return a string representing the object's name."""
@@ -70,26 +82,29 @@ class RequiresCleaning(ABC):
                     print(f"[WARNING] {e} Default value of 1 has been assumed.\n")
 
         # num_levels needs to be made negative so that the increase_decrease() method knows a decrease is occurring:
-        self.__cleanliness = self.__cleanliness.increase_decrease(num_levels * -1)
-
-        # log event:
-        self.get_log().new({"DateTime": at_datetime,
-                            "SubjectID": self.id,
-                            "SubjectName": self.name,
-                            "ObjectID": self.id,
-                            "ObjectName": self.name,
-                            "Action": Action.BECOME_DIRTIER,
-                            "Details": f"cleanliness is now '{self.cleanliness.description}'"})
+        with ENTITY_LOCKS.holding(self.id):  # one change of cleanliness at a time.
+            self._set_cleanliness(self.get_cleanliness().increase_decrease(num_levels * -1))
+
+            # log event:
+            log_ref_num = self.get_log().new({"DateTime": at_datetime,
+                                              "SubjectID": self.id,
+                                              "SubjectName": self.name,
+                                              "ObjectID": self.id,
+                                              "ObjectName": self.name,
+                                              "Action": Action.BECOME_DIRTIER,
+                                              "Details": f"cleanliness is now '{self.get_cleanliness().description}'"})
+            if log_ref_num is not None:  # only notify observers of events that were recorded.
+                self.notify_observers(Action.BECOME_DIRTIER, at_datetime, cleanliness=self.get_cleanliness())
 
     def receive_cleaning(self, object_id: str, object_name: str, at_datetime: datetime = datetime.now(),
-                         num_levels: int = 1, ):
+                         num_levels: int = 1, ) -> int | None:
         """
         Increase cleanliness by a number of severity levels if possible. Log event.
         :param at_datetime: The date and time at which the object was cleaned (default is when the method is called).
         :param object_name: The name of the object that the RequiresCleaning object is being cleaned by.
         :param object_id: The id of the object that the RequiresCleaning object is being cleaned by.
         :param num_levels: The number of levels cleanliness is increasing (default = 1).
-        :return: None
+        :return: The reference number of the new row added.
         """
         try:
             if num_levels < 0:
@@ -111,13 +126,17 @@ class RequiresCleaning(ABC):
                     print(
                         f"[WARNING] {e} Default value of 1 has been assumed.\n")
 
-        self.__cleanliness = self.__cleanliness.increase_decrease(num_levels)
-
-        # log event:
-        self.get_log().new({"DateTime": at_datetime,
-                            "SubjectID": self.id,
-                            "SubjectName": self.name,
-                            "ObjectID": object_id,
-                            "ObjectName": object_name,
-                            "Action": Action.RECEIVE_CLEANING,
-                            "Details": f"cleanliness is now '{self.__cleanliness.description}'"})
+        with ENTITY_LOCKS.holding(self.id):
+            self._set_cleanliness(self.get_cleanliness().increase_decrease(num_levels))
+
+            # log event:
+            log_ref_num = self.get_log().new({"DateTime": at_datetime,
+                                              "SubjectID": self.id,
+                                              "SubjectName": self.name,
+                                              "ObjectID": object_id,
+                                              "ObjectName": object_name,
+                                              "Action": Action.RECEIVE_CLEANING,
+                                              "Details": f"cleanliness is now '{self.get_cleanliness().description}'"})
+            if log_ref_num is not None:  # only notify observers of events that were recorded.
+                self.notify_observers(Action.RECEIVE_CLEANING, at_datetime, cleanliness=self.get_cleanliness())
+        return log_ref_num
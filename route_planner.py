@@ -0,0 +1,173 @@
+"""
+File: route_planner.py
+Description: Contains the RoutePlanner class which orders the tasks of a staff member's daily schedule that share a
+time slot so that the walk between enclosures is as short as possible. Distances come from either the (x, y)
+locations of enclosures or a graph of walking paths between enclosures. Routes are built with the nearest-neighbour
+heuristic and then improved with 2-opt on a precomputed distance matrix.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from __future__ import annotations
+
+import heapq
+
+from enclosure import Enclosure
+from lazy_modules import np, pd
+from schedule import Schedule
+
+
+class RoutePlanner:
+    def __init__(self, max_passes: int = 50):
+        """
+        Create a new RoutePlanner instance.
+        :param max_passes: The maximum number of 2-opt improvement passes made over a route (default 50).
+        """
+        self.__max_passes = max_passes
+        self.__paths = {}  # walking graph: enclosure id -> {neighbouring enclosure id: walking distance in meters}
+
+    def get_paths(self) -> dict[str, dict[str, float]]:
+        """Return the walking graph between enclosures as {enclosure id: {neighbour id: distance}}."""
+        return self.__paths
+
+    paths = property(get_paths)
+
+    def add_path(self, enclosure1: Enclosure, enclosure2: Enclosure, distance: float) -> None:
+        """
+        Add a two-way walking path between two enclosures. Once any paths have been added, distances are measured
+        along the walking graph rather than in a straight line between enclosure locations.
+        :param enclosure1: The enclosure at one end of the path.
+        :param enclosure2: The enclosure at the other end of the path.
+        :param distance: The length of the path in meters.
+        :return: None
+        """
+        try:
+            if not (isinstance(enclosure1, Enclosure) and isinstance(enclosure2, Enclosure)):
+                raise TypeError("Walking paths can only be added between Enclosure objects.")
+            if distance < 0:
+                raise ValueError("The length of a walking path cannot be negative.")
+            self.__paths.setdefault(enclosure1.id, {})[enclosure2.id] = float(distance)
+            self.__paths.setdefault(enclosure2.id, {})[enclosure1.id] = float(distance)
+        except (TypeError, ValueError) as e:
+            print(f"[ERROR] {e} No change made.\n")
+
+    def distance_matrix(self, stops: list[Enclosure]) -> np.ndarray:
+        """
+        Calculate the walking distance between every pair of stops.
+        :param stops: The enclosures to visit.
+        :return: A square array where [i, j] is the distance from stops[i] to stops[j] (inf if unreachable).
+        """
+        if len(self.__paths) > 0:
+            return np.array([self.__shortest_distances(stop, stops) for stop in stops]).reshape(len(stops),
+                                                                                              len(stops))
+        locations = np.array([stop.location for stop in stops], dtype=float).reshape(len(stops), 2)
+        differences = locations[:, np.newaxis, :] - locations[np.newaxis, :, :]
+        return np.sqrt((differences ** 2).sum(axis=2))
+
+    def plan_route(self, stops: list[Enclosure], start: Enclosure | None = None) -> list[Enclosure]:
+        """
+        Order a set of enclosures into a short walking route.
+        :param stops: The enclosures to visit (duplicates are visited once).
+        :param start: The enclosure the route must start from (default is the first stop).
+        :return: The enclosures in the order they should be visited.
+        """
+        unique_stops = list({stop.id: stop for stop in ([start] if start is not None else []) + list(stops)}.values())
+        if len(unique_stops) < 3:
+            return unique_stops
+
+        distances = self.distance_matrix(unique_stops)
+        distances[np.isinf(distances)] = distances[~np.isinf(distances)].sum() + 1  # unreachable is worst choice
+        route = self.__two_opt(self.__nearest_neighbour(distances), distances)
+        return [unique_stops[i] for i in route]
+
+    def order_schedule(self, schedule: Schedule, locations: dict[str, Enclosure]) -> Schedule:
+        """
+        Reorder the tasks that share a time slot in a schedule so that they follow a short walking route. Tasks are
+        kept in time order, and tasks whose object has no known location are left at the end of their time slot.
+        :param schedule: The schedule to reorder.
+        :param locations: {object id: the enclosure where the object is found} for the objects of the tasks.
+        :return: A new Schedule with the same tasks in route order.
+        """
+        ordered = Schedule(schedule.name)
+        if len(schedule.data) == 0:
+            return ordered
+
+        data = schedule.data.sort_values(by=["Time"], kind="stable")
+        ordered_groups = []
+        previous_stop = None
+        for event_time, event in data.groupby("Time", sort=True):
+            stops = [locations[object_id] for object_id in event["ObjectID"]
+                     if object_id in locations and self.__is_mapped(locations[object_id])]
+            # continue from the enclosure the previous time slot finished at, if it is visited again:
+            start = previous_stop if previous_stop is not None and previous_stop in stops else None
+            route = self.plan_route(stops, start)
+            rank = {stop.id: position for position, stop in enumerate(route)}
+
+            # sort the tasks by the position of their enclosure in the route (unmapped tasks go last):
+            stop_order = [rank.get(locations[object_id].id, len(rank)) if object_id in locations else len(rank)
+                          for object_id in event["ObjectID"]]
+            ordered_groups.append(event.iloc[np.argsort(stop_order, kind="stable")])
+            previous_stop = route[-1] if len(route) > 0 else previous_stop
+
+        ordered.data = pd.concat(ordered_groups)
+        return ordered
+
+    def __is_mapped(self, enclosure: Enclosure) -> bool:
+        """Determine whether the distance to an enclosure can be measured."""
+        return enclosure.id in self.__paths if len(self.__paths) > 0 else enclosure.location is not None
+
+    def __shortest_distances(self, source: Enclosure, stops: list[Enclosure]) -> list[float]:
+        """Return the walking distance from one enclosure to each of the stops (Dijkstra's algorithm)."""
+        targets = {stop.id for stop in stops}
+        distances = {source.id: 0.0}
+        frontier = [(0.0, source.id)]
+        visited = set()
+        while frontier and not targets <= visited:
+            distance, enclosure_id = heapq.heappop(frontier)
+            if enclosure_id in visited:
+                continue
+            visited.add(enclosure_id)
+            for neighbour_id, path_length in self.__paths.get(enclosure_id, {}).items():
+                if distance + path_length < distances.get(neighbour_id, np.inf):
+                    distances[neighbour_id] = distance + path_length
+                    heapq.heappush(frontier, (distance + path_length, neighbour_id))
+        return [distances.get(stop.id, np.inf) for stop in stops]
+
+    @staticmethod
+    def __nearest_neighbour(distances: np.ndarray) -> list[int]:
+        """Build a route from the first stop by always walking to the closest stop not yet visited."""
+        unvisited = np.ones(len(distances), dtype=bool)
+        unvisited[0] = False
+        route = [0]
+        for _ in range(len(distances) - 1):
+            candidates = np.where(unvisited, distances[route[-1]], np.inf)
+            next_stop = int(np.argmin(candidates))
+            route.append(next_stop)
+            unvisited[next_stop] = False
+        return route
+
+    def __two_opt(self, route: list[int], distances: np.ndarray) -> list[int]:
+        """Improve a route (with a fixed first stop) by reversing sections of it while that shortens the walk."""
+        route = np.array(route)
+        size = len(route)
+        for _ in range(self.__max_passes):
+            improved = False
+            for i in range(size - 2):
+                # gain of reversing route[i + 1..j] for every j at once: edges (i, i+1) and (j, j+1) are replaced by
+                # (i, j) and (i+1, j+1). The last stop has no following edge as the route does not loop back.
+                j = np.arange(i + 2, size)
+                following = np.minimum(j + 1, size - 1)
+                has_following = j + 1 < size
+                removed = distances[route[i], route[i + 1]] + np.where(
+                    has_following, distances[route[j], route[following]], 0)
+                added = distances[route[i], route[j]] + np.where(
+                    has_following, distances[route[i + 1], route[following]], 0)
+                change = added - removed
+                best = int(np.argmin(change))
+                if change[best] < -1e-9:
+                    route[i + 1:j[best] + 1] = route[i + 1:j[best] + 1][::-1]
+                    improved = True
+            if not improved:
+                break
+        return route.tolist()
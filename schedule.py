@@ -9,10 +9,8 @@ This is my own work as defined by the University's Academic Integrity Policy.
 """
 from datetime import time
 
-import pandas as pd
-from pandas import DataFrame
-
 from data_record import DataRecord
+from lazy_modules import pd
 
 
 class Schedule(DataRecord):
@@ -26,7 +24,7 @@ class Schedule(DataRecord):
         super().__init__(schedule_name)
 
         # create a dataframe to store scheduled actions (base columns with new columns added):
-        cols_to_add = DataFrame(
+        cols_to_add = pd.DataFrame(
             {"Time": pd.Series(dtype="object")})  # time object - no date required as schedule is daily.
         self.data = pd.concat([self.data, cols_to_add])
 
@@ -48,7 +46,7 @@ class Schedule(DataRecord):
         try:
             if not isinstance(new_row, dict):
                 raise TypeError("The new row of data must be provided as a Dictionary object.")
-            assert set(self.data.columns.values) == set(new_row.keys()), (
+            assert set(self.columns) == set(new_row.keys()), (
                 f"The dictionary keys of the new row must match the existing columns of the Schedule data attribute.")
             if not isinstance(new_row.get("Time"),
                               time):  # the time class will internally handle formatting issues.
@@ -73,7 +71,7 @@ class Schedule(DataRecord):
         if len(self.data) == 0:
             output += "\nNo events scheduled."
         else:
-            self.data.sort_values(by=['Time'], ascending=True, inplace=True)
+            self.data.sort_values(by=['Time'], ascending=True, inplace=True, kind="stable")  # keep task order
             event_times = self.data['Time'].unique()
             event_number = 1
 
@@ -0,0 +1,82 @@
+"""
+File: species_profile.py
+Description: Contains the SpeciesProfile class which holds the information shared by every animal of a species: its
+habitat, its default sound and its diet template. A zoo keeps one SpeciesProfile per species, shared by its animals of
+that species (see ZooSystem.get_species_profile()), so the templates of different zoos are kept apart. An animal that
+is not in a zoo has a profile of its own. Each animal's DietSchedule shows its species' diet template until the
+animal's own diet is changed.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import sys
+from datetime import time
+
+from diet_schedule import DietSchedule
+from environmental_type import EnvironmentalType
+
+
+class SpeciesProfile:
+    __slots__ = ("__species", "__habitat", "__sound", "__diet")
+
+    def __init__(self, species: str, habitat: EnvironmentalType = EnvironmentalType.GRASS, sound: str = ""):
+        """
+        Create a new SpeciesProfile instance (ZooSystem.get_species_profile() should be used to get the profile a
+        zoo shares).
+        :param species: The name of the species.
+        :param habitat: The environmental type the species lives in (default is GRASS).
+        :param sound: The sound that animals of the species make (default is no sound).
+        """
+        self.__species = sys.intern(species) if isinstance(species, str) else species
+        self.__habitat = habitat
+        self.__sound = sys.intern(sound) if isinstance(sound, str) else sound
+        # the daily feeding plan of every animal of the species:
+        self.__diet = DietSchedule(f"{species} Dietary Template", self.__species, self.__species)
+
+    def __str__(self) -> str:
+        """Return the SpeciesProfile's key attributes as a formatted string."""
+        return (f"SPECIES PROFILE: {self.__species}"
+                f"\n > Habitat: {self.__habitat.value}"
+                f"\n > Sound: {self.__sound}"
+                f"\n > Diet template entries: {len(self.__diet.data)}\n")
+
+    def get_species(self) -> str:
+        """Return the name of the species."""
+        return self.__species
+
+    def get_habitat(self) -> EnvironmentalType:
+        """Return the environmental type the species lives in."""
+        return self.__habitat
+
+    def get_sound(self) -> str:
+        """Return the sound that animals of the species make."""
+        return self.__sound
+
+    def get_diet(self) -> DietSchedule:
+        """Return the diet template shared by animals of the species."""
+        return self.__diet
+
+    species = property(get_species)
+    habitat = property(get_habitat)
+    sound = property(get_sound)
+    diet = property(get_diet)
+
+    def add_to_diet(self, food: str, quantity: str, at_time: time):
+        """
+        Add food to the diet template of the species (seen by every animal whose diet has not been customised).
+        :param food: Name of the food to be eaten.
+        :param quantity: Quantity of the food to be eaten.
+        :param at_time: The time at which the animals should eat the food.
+        :return: None
+        """
+        self.__diet.add_food(food, quantity, at_time)
+
+    def remove_food_from_diet(self, after_time: time = time(0, 0, 0), before_time: time = time(23, 59, 59)):
+        """
+        Remove meal(s) from the diet template which occur in the provided time range.
+        :param after_time: The start of the time range associated with the meal(s) to be removed.
+        :param before_time: The end of the time range associated with the meal(s) to be removed.
+        :return: None
+        """
+        self.__diet.remove(after_time, before_time)
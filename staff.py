@@ -6,34 +6,39 @@ ID: 110462390
 Username: ivany005
 This is my own work as defined by the University's Academic Integrity Policy.
 """
+import sys
 from abc import abstractmethod, ABC
 from datetime import datetime  # automatically handles formatting issues with dates and times.
+from itertools import count
 
 from action import Action
 from animal import Animal
 from enclosure import Enclosure
+from lock_stripes import ENTITY_LOCKS
 from log import Log
+from observable import Observable
 from schedule import Schedule
 
 
-class Staff(ABC):
-    _next_id = 1  # unique identifier of the staff which is incremented by one each time a staff object is created.
+class Staff(Observable, ABC):
+    __slots__ = ("__name", "__id", "__animal_assignments", "__enclosure_assignments", "__special_tasks", "__log")
+    _ids = count(1)  # unique identifiers of staff, the next one is taken each time a staff object is created.
 
     def __init__(self, name: str):
         """
         Initialise new Staff instances.
         :param name: The name of the staff member.
         """
-        self.__name = name
+        self.__name = sys.intern(name) if isinstance(name, str) else name
 
-        self.__id = "S" + str(Staff._next_id)  # S to represent "Staff".
-        Staff._next_id += 1
+        self.__id = "S" + str(next(Staff._ids))  # S to represent "Staff" (next() is safe across threads).
 
         self.__animal_assignments = []
         self.__enclosure_assignments = []
         self.__special_tasks = Schedule(f"{self.__name} Special Task")
 
-        self.__log = Log(f"{self.__name}_{self.id} General Activity")  # new Log to store records of general activities.
+        self.__log = Log(f"{self.__name}_{self.id} General Activity", self.id)  # new Log to store records of general activities.
+        Observable.__init__(self)
 
     @abstractmethod
     def __str__(self) -> str:
@@ -87,10 +92,21 @@ class Staff(ABC):
     special_tasks = property(get_special_tasks)
 
     @abstractmethod
-    def generate_schedule(self) -> Schedule:
-        """Return the full daily schedule of responsibilities of the Staff member"""
+    def generate_schedule(self, route_planner=None) -> Schedule:
+        """Return the full daily schedule of responsibilities of the Staff member.
+        :param route_planner: Optional RoutePlanner used to order tasks that share a time by walking route.
+        :return: Schedule"""
         pass
 
+    def get_task_locations(self) -> dict[str, Enclosure]:
+        """Return {object id: enclosure where the object is found} for the assigned enclosures and their animals."""
+        locations = {}
+        for enclosure in self.enclosure_assignments:
+            locations[enclosure.id] = enclosure
+            for animal in enclosure.inhabitants:
+                locations[animal.id] = enclosure
+        return locations
+
     def assign(self, assignment: Animal | Enclosure, at_datetime: datetime = datetime.now()):
         """
         Assign a new object to the responsibilities of the staff member.
@@ -99,26 +115,28 @@ class Staff(ABC):
         :return: None
         """
         try:
-            if isinstance(assignment, Animal):
-                if assignment not in self.animal_assignments:  # duplicates not allowed
-                    self.animal_assignments.append(assignment)
-                else:
-                    return None
-            elif isinstance(assignment, Enclosure):
-                if assignment not in self.enclosure_assignments:  # duplicates not allowed
-                    self.enclosure_assignments.append(assignment)
+            with ENTITY_LOCKS.holding(self.id):  # one change of assignments at a time.
+                if isinstance(assignment, Animal):
+                    if assignment not in self.animal_assignments:  # duplicates not allowed
+                        self.animal_assignments.append(assignment)
+                    else:
+                        return None
+                elif isinstance(assignment, Enclosure):
+                    if assignment not in self.enclosure_assignments:  # duplicates not allowed
+                        self.enclosure_assignments.append(assignment)
+                    else:
+                        return None
                 else:
-                    return None
-            else:
-                raise TypeError(f"Staff members cannot be assigned to {assignment.__class__.__name__} objects.")
-
-            self.log.new({"DateTime": at_datetime,
-                          "SubjectID": self.__id,
-                          "SubjectName": self.__name,
-                          "ObjectID": assignment.id,
-                          "ObjectName": assignment.name,
-                          "Action": Action.ASSIGN,
-                          "Details": f"{assignment.__class__.__name__}"})
+                    raise TypeError(f"Staff members cannot be assigned to {assignment.__class__.__name__} objects.")
+
+                self.log.new({"DateTime": at_datetime,
+                              "SubjectID": self.__id,
+                              "SubjectName": self.__name,
+                              "ObjectID": assignment.id,
+                              "ObjectName": assignment.name,
+                              "Action": Action.ASSIGN,
+                              "Details": f"{assignment.__class__.__name__}"})
+                self.notify_observers(Action.ASSIGN, at_datetime, assignment=assignment)
         except TypeError as e:
             print(f"[ERROR] {e} No change made.\n")
 
@@ -129,19 +147,21 @@ class Staff(ABC):
         :param at_datetime: the datetime at which the unassignment occurred (default is when method is called).
         :return: None
         """
-        if assignment in self.animal_assignments:
-            self.animal_assignments.remove(assignment)
-        elif assignment in self.enclosure_assignments:
-            self.enclosure_assignments.remove(assignment)
-        else:
-            return None  # skip adding a log entry if nothing was changed.
-
-        self.log.new({"DateTime": at_datetime,
-                      "SubjectID": self.__id,
-                      "SubjectName": self.__name,
-                      "ObjectID": assignment.id,
-                      "ObjectName": assignment.name,
-                      "Action": Action.UNASSIGN,
-                      "Details": f"{assignment.__class__.__name__}"})
+        with ENTITY_LOCKS.holding(self.id):
+            if assignment in self.animal_assignments:
+                self.animal_assignments.remove(assignment)
+            elif assignment in self.enclosure_assignments:
+                self.enclosure_assignments.remove(assignment)
+            else:
+                return None  # skip adding a log entry if nothing was changed.
+
+            self.log.new({"DateTime": at_datetime,
+                          "SubjectID": self.__id,
+                          "SubjectName": self.__name,
+                          "ObjectID": assignment.id,
+                          "ObjectName": assignment.name,
+                          "Action": Action.UNASSIGN,
+                          "Details": f"{assignment.__class__.__name__}"})
+            self.notify_observers(Action.UNASSIGN, at_datetime, assignment=assignment)
 
         return None
@@ -0,0 +1,27 @@
+"""
+File: state_change.py
+Description: Contains the enumeration class for the kinds of change to the state of a zoo that are recorded in its
+history (see ZooHistory).
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from enum import Enum
+
+
+class StateChange(Enum):
+    ADD_ANIMAL = "animal added to the zoo"
+    REMOVE_ANIMAL = "animal removed from the zoo"
+    ADD_ENCLOSURE = "enclosure added to the zoo"
+    REMOVE_ENCLOSURE = "enclosure removed from the zoo"
+    ADD_STAFF = "staff member added to the zoo"
+    REMOVE_STAFF = "staff member removed from the zoo"
+
+    HOUSE = "animal moved into an enclosure"
+    UNHOUSE = "animal moved out of an enclosure"
+    ASSIGN = "animal or enclosure assigned to a staff member"
+    UNASSIGN = "animal or enclosure unassigned from a staff member"
+
+    CLEANLINESS = "cleanliness changed"
+    TREATMENT = "treatment status changed"
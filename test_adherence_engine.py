@@ -0,0 +1,95 @@
+"""
+File: test_adherence_engine.py
+Description: Suite of unit tests for the AdherenceEngine class.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from adherence_engine import AdherenceEngine
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from reptile import Reptile
+from severity import Severity
+from veterinarian import Veterinarian
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+
+class TestAdherenceEngine:
+    @pytest.fixture
+    def zoo1(self) -> ZooSystem:
+        zoo = ZooSystem("The Royal Zoo")
+        dune = Enclosure("Dune", EnvironmentalType.DESERT, 10)
+        zoo.add_enclosure(dune)
+        for member in (Zookeeper("Daniel"), Zookeeper("Nenja"), Veterinarian("Ethan")):
+            zoo.add_staff_member(member)
+            zoo.assign_staff_to_enclosure(member, dune, datetime(2004, 11, 1))
+
+        for name in ("Shai-Hulud", "LittleMaker"):
+            cobra = Reptile(name, "King Cobra", "Hiss", "Smooth", True, 4, habitat=EnvironmentalType.DESERT)
+            cobra.add_to_diet("Raw Chicken", "200g", time(10))
+            cobra.add_to_diet("Raw Lamb", "100g", time(18, 30))
+            zoo.add_animal(cobra)
+            zoo.assign_animal_to_enclosure(cobra, dune)
+        return zoo
+
+    def test_feeding_adherence(self, zoo1: ZooSystem) -> None:
+        daniel, nenja = zoo1.staff[0], zoo1.staff[1]
+        cobra1, cobra2 = zoo1.animals
+        for day in (12, 13):
+            daniel.feed(cobra1, "Raw Chicken", "200g", datetime(2004, 11, day, 10, 20))  # on time
+            daniel.feed(cobra1, "Raw Lamb", "100g", datetime(2004, 11, day, 20))  # too late
+        nenja.feed(cobra2, "Raw Chicken", "200g", datetime(2004, 11, 12, 9, 45))
+        nenja.feed(cobra2, "Raw Chicken", "200g", datetime(2004, 11, 12, 18, 30))  # wrong food for 18:30
+
+        engine = AdherenceEngine(zoo1)
+        events = engine.animal_events(date(2004, 11, 12), date(2004, 11, 13))
+        assert len(events) == 2 * 2 * 2 and set(events["Kind"]) == {"feeding"}
+        done = events[events["Done"]]
+        assert sorted(done["ScheduledAt"].dt.day.tolist()) == [12, 12, 13]
+
+        animals = engine.animal_adherence(date(2004, 11, 12), date(2004, 11, 13))
+        assert animals.loc[cobra1.id, ["Scheduled", "Done"]].tolist() == [4, 2]
+        assert animals.loc[cobra2.id, "Rate"] == 0.25
+
+        keepers = engine.keeper_adherence(date(2004, 11, 12), date(2004, 11, 13))
+        assert keepers["Scheduled"].tolist() == [8, 8]  # both keepers are responsible for every meal in Dune
+        assert keepers["Done"].tolist() == [2, 1]
+
+        lenient = AdherenceEngine(zoo1, tolerance=timedelta(hours=2))
+        assert lenient.animal_adherence(date(2004, 11, 12), date(2004, 11, 13))["Done"].tolist() == [4, 1]
+
+    def test_treatment_adherence(self, zoo1: ZooSystem) -> None:
+        vet, cobra1 = zoo1.staff[2], zoo1.animals[0]
+        vet.diagnose(cobra1, "Mouth rot", Severity.HIGH, "Antibiotics.", [[time(9), "antibiotics"]],
+                     datetime(2004, 11, 11))
+        vet.treat(cobra1, "antibiotics", Severity.HIGH, datetime(2004, 11, 12, 9, 5))
+        Veterinarian("Locum").treat(cobra1, "antibiotics", Severity.HIGH, datetime(2004, 11, 13, 9))
+
+        engine = AdherenceEngine(zoo1)
+        assert engine.vet_adherence(date(2004, 11, 12), date(2004, 11, 14)).loc[vet.id, "Done"] == 1
+        treatments = engine.animal_events(date(2004, 11, 12), date(2004, 11, 14)).query("Kind == 'treatment'")
+        assert treatments["Done"].tolist() == [True, True, False]  # the animal was treated, by anyone
+
+        report = engine.report(date(2004, 11, 12), date(2004, 11, 14))
+        assert f" - Ethan_{vet.id}: 1/3 (33%)" in report
+        assert f" - LittleMaker_{zoo1.animals[1].id}: 0/6 (0%)" in report
+
+    def test_log_row_matches_one_meal(self, zoo1: ZooSystem) -> None:
+        daniel, cobra1 = zoo1.staff[0], zoo1.animals[0]
+        cobra1.add_to_diet("Raw Chicken", "200g", time(11))  # the same meal twice, an hour apart
+        daniel.feed(cobra1, "Raw Chicken", "200g", datetime(2004, 11, 12, 10, 35))  # within an hour of both
+
+        events = AdherenceEngine(zoo1).animal_events(date(2004, 11, 12), date(2004, 11, 12))
+        chicken = events[(events["AnimalID"] == cobra1.id) & (events["Details"] == "200g Raw Chicken")]
+        assert chicken["Done"].tolist() == [False, True]  # only the nearer meal is counted as eaten
+
+        daniel.feed(cobra1, "Raw Chicken", "200g", datetime(2004, 11, 12, 9, 10))  # the 10:00 meal, re-matched
+        events = AdherenceEngine(zoo1).animal_events(date(2004, 11, 12), date(2004, 11, 12))
+        chicken = events[(events["AnimalID"] == cobra1.id) & (events["Details"] == "200g Raw Chicken")]
+        assert chicken["DoneAt"].dt.strftime("%H:%M").tolist() == ["09:10", "10:35"]
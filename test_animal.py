@@ -15,6 +15,7 @@ from bird import Bird
 from environmental_type import EnvironmentalType
 from mammal import Mammal
 from reptile import Reptile
+from zoo_system import ZooSystem
 
 
 class TestAnimal:
@@ -145,3 +146,43 @@ class TestAnimal:
             f" - Pinky_{bird.id} to eat (200g squid)\n"
             f"----------------------------------------------------------------------------------------------\n")
         assert expected == actual
+
+    def test_species_profile_diet_template(self) -> None:
+        zoo = ZooSystem("The Royal Zoo")
+        guppy1 = Bird("Guppy1", "Gouldian Finch", 10, age=1)
+        guppy2 = Bird("Guppy2", "Gouldian Finch", 12, age=1)
+        zoo.add_animal(guppy1)
+        zoo.add_animal(guppy2)
+        profile = guppy1.profile
+        assert profile is guppy2.profile is zoo.get_species_profile("Gouldian Finch")
+        assert profile.sound == "Squawk" and profile.habitat == EnvironmentalType.RAINFOREST
+
+        profile.add_to_diet("Seeds", "5g", time(8))
+        profile.add_to_diet("Mealworms", "2x whole", time(17))
+        assert list(guppy1.diet.data["Details"]) == ["5g Seeds", "2x whole Mealworms"]
+        assert list(guppy2.diet.data["SubjectID"]) == [guppy2.id, guppy2.id]
+        assert not guppy1.diet.customised and len(guppy1.diet.columns) == len(profile.diet.columns)
+
+        guppy2.add_to_diet("Apple", "1x slice", time(12))  # copies the template before changing it
+        profile.remove_food_from_diet(time(17), time(17))
+        assert guppy2.diet.customised and guppy2.diet.template is None
+        assert list(guppy2.diet.data["Details"]) == ["5g Seeds", "2x whole Mealworms", "1x slice Apple"]
+        assert list(guppy1.diet.data["Details"]) == ["5g Seeds"]  # still follows the template
+        assert f" - Guppy1_{guppy1.id} to eat (5g Seeds)" in str(guppy1.diet)
+
+    def test_species_profiles_per_zoo(self) -> None:
+        zoo1, zoo2 = ZooSystem("The Royal Zoo"), ZooSystem("The Other Zoo")
+        zoo1.get_species_profile("Gouldian Finch").add_to_diet("Seeds", "5g", time(8))
+        zoo2.get_species_profile("Gouldian Finch").add_to_diet("Mealworms", "2x whole", time(17))
+        guppy1, guppy2 = Bird("Guppy1", "Gouldian Finch", 10), Bird("Guppy2", "Gouldian Finch", 12)
+        zoo1.add_animal(guppy1)
+        zoo2.add_animal(guppy2)
+        assert list(guppy1.diet.data["Details"]) == ["5g Seeds"]  # each zoo's template, not shared between zoos
+        assert list(guppy2.diet.data["Details"]) == ["2x whole Mealworms"]
+
+        zoo2.add_animal(guppy1)  # keeps eating the template of the zoo it came from, as its own rows.
+        assert guppy1.profile is zoo2.get_species_profile("Gouldian Finch") and guppy1.diet.customised
+        assert list(guppy1.diet.data["Details"]) == ["5g Seeds"]
+
+        stray = Bird("Stray", "Gouldian Finch", 11)  # not in a zoo: a profile of its own
+        assert stray.profile.species == "Gouldian Finch" and len(stray.diet.data) == 0
@@ -0,0 +1,79 @@
+"""
+File: test_animal_table.py
+Description: Suite of unit tests for the AnimalTable class and its use by ZooSystem.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from datetime import datetime, time
+
+import pytest
+
+from action import Action
+from animal_table import AnimalTable
+from mammal import Mammal
+from reptile import Reptile
+from severity import Severity
+from veterinarian import Veterinarian
+from zoo_system import ZooSystem
+
+
+class TestAnimalTable:
+    @pytest.fixture
+    def zoo1(self) -> ZooSystem:
+        zoo = ZooSystem("The Royal Zoo")
+        zoo.add_animal(Mammal("Giraffe", "Reticulated Giraffe", "Hum", "Yellow", age=3))
+        zoo.add_animal(Reptile("Cobra", "King Cobra", "Hiss", "Smooth", True, 4))
+        zoo.add_animal(Mammal("Lion", "African Lion", "Roar", "Brown", age=10))
+        return zoo
+
+    def test_animals_are_views_onto_rows(self, zoo1: ZooSystem) -> None:
+        giraffe, cobra, lion = zoo1.animals
+        table = zoo1.enable_animal_table()
+        assert zoo1.animal_table is table and len(table) == 3
+        assert list(table.ages) == [3, 4, 10]
+        assert list(table.species) == ["Reticulated Giraffe", "King Cobra", "African Lion"]
+
+        cobra.become_older(datetime(2004, 11, 12), 2)
+        cobra.become_dirtier(datetime(2004, 11, 12), 2)
+        Veterinarian("Ethan").diagnose(lion, "Mange", Severity.LOW, "Rest.", [[time(9), "cream"]],
+                                       datetime(2004, 11, 12))
+        assert table.ages[1] == 6 and cobra.age == 6
+        assert table.cleanliness_levels[1] == cobra.cleanliness.level
+        assert list(table.under_treatment) == [False, False, True]
+        assert "ANIMALS CURRENTLY ON DISPLAY (2)" in zoo1.report_animals_on_display()
+
+        with pytest.raises(ValueError):
+            table.ages[0] = 100  # columns can only be changed through the table
+
+    def test_bulk_updates_are_logged(self, zoo1: ZooSystem) -> None:
+        giraffe, cobra, lion = zoo1.animals
+        table = zoo1.enable_animal_table()
+        table.age_all(1, datetime(2004, 11, 12))
+        table.soil_all(2, datetime(2004, 11, 12), mask=table.ages > 5)
+        table.soil_all(10, datetime(2004, 11, 13), mask=table.ages > 5)
+
+        assert [animal.age for animal in zoo1.animals] == [4, 5, 11]
+        assert giraffe.cleanliness == Severity.VERY_HIGH
+        assert lion.cleanliness == Severity.VERY_LOW  # cannot get dirtier than the lowest level
+        assert table.select(table.ages > 4) == [cobra, lion]
+
+        details = lion.log.data[lion.log.data["Action"] == Action.BECOME_DIRTIER]["Details"]
+        assert list(details) == ["cleanliness is now 'Moderate'", "cleanliness is now 'Very Low'"]
+        assert cobra.log.data["Details"].iloc[-1] == "by 1 year(s) to become 5 year(s) old"
+
+    def test_remove_and_grow(self, zoo1: ZooSystem) -> None:
+        giraffe, cobra, lion = zoo1.animals
+        table = zoo1.enable_animal_table()
+        giraffe.become_dirtier(datetime(2004, 11, 12), 3)
+        zoo1.remove_animal(giraffe)
+
+        assert giraffe.table is None and giraffe.age == 3 and giraffe.cleanliness == Severity.LOW
+        assert len(table) == 2 and lion.table_row == 0 and table.animals == [lion, cobra]
+
+        small_table = AnimalTable(capacity=1)
+        for animal in (giraffe, Mammal("Zebra", "Plains Zebra", "Bray", "Striped", age=2)):
+            small_table.add(animal)
+        small_table.add(cobra)  # already in the zoo's table: no change
+        assert list(small_table.ages) == [3, 2]
@@ -0,0 +1,64 @@
+"""
+File: test_benchmarks.py
+Description: Suite of unit tests for the synthetic zoo generator and the benchmark suite in the benchmarks package.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import json
+
+from benchmarks import BENCHMARKS, compare, generate_zoo, run_benchmarks, run_replay
+from veterinarian import Veterinarian
+from workload import WorkloadRecorder
+from zookeeper import Zookeeper
+
+
+class TestBenchmarks:
+    def test_generate_zoo(self) -> None:
+        zoo1, zoo2 = generate_zoo(40, events_per_animal=2, seed=7), generate_zoo(40, events_per_animal=2, seed=7)
+        shape = lambda zoo: ([(type(animal).__name__, animal.name, animal.age) for animal in zoo.animals],
+                             [len(enclosure.inhabitants) for enclosure in zoo.enclosures],
+                             len(zoo.events(zoo.animals)))
+        assert shape(zoo1) == shape(zoo2)  # the same seed gives the same zoo
+        assert shape(generate_zoo(40, events_per_animal=2, seed=8)) != shape(zoo1)
+
+        assert len(zoo1.animals) == 40 and {type(animal).__name__ for animal in zoo1.animals} == {
+            "Bird", "Mammal", "Reptile"}
+        housed = [animal for enclosure in zoo1.enclosures for animal in enclosure.inhabitants]
+        assert sorted(animal.id for animal in housed) == sorted(animal.id for animal in zoo1.animals)
+        assert all(animal.habitat == enclosure.environmental_type and animal.species == enclosure.species
+                   for enclosure in zoo1.enclosures for animal in enclosure.inhabitants)
+        assert any(isinstance(member, Zookeeper) for member in zoo1.staff)
+        assert any(isinstance(member, Veterinarian) for member in zoo1.staff)
+        assert len(zoo1.events(zoo1.staff)) >= 40 * 2  # every action of the generated history
+
+    def test_run_and_compare(self, tmp_path) -> None:
+        assert {"add_animals", "log_new", "generate_schedule", "move_animal", "simulate_day",
+                "report_zoo_daily_staff_schedules"} <= set(BENCHMARKS)
+        results = run_benchmarks([30], repeat=2, only=["log_new", "move_animal", "report_species"])
+        (tmp_path / "results.json").write_text(json.dumps(results))
+        saved = json.loads((tmp_path / "results.json").read_text())
+
+        names = [result["benchmark"] for result in saved["results"]]
+        assert names == ["generate_zoo", "log_new", "move_animal", "report_species"]
+        assert all(len(result["runs"]) == 2 for result in saved["results"][1:])
+        assert saved["results"][1]["operations"] == 30
+
+        assert compare(saved, saved) == []
+        slower = json.loads(json.dumps(saved))
+        slower["results"][1]["seconds"] *= 2
+        assert [(regression["benchmark"], regression["scale"]) for regression in compare(saved, slower)] == [
+            ("log_new", 30)]
+
+    def test_replay(self, tmp_path) -> None:
+        with WorkloadRecorder() as recorder:
+            zoo = generate_zoo(10, events_per_animal=2, seed=3)
+            zoo.report_zoo_daily_staff_schedules()
+        recorder.write(str(tmp_path / "day.workload.gz"))
+        results = run_replay(str(tmp_path / "day.workload.gz"), repeat=2)
+        total = results["results"][0]
+        assert total["benchmark"] == "replay" and total["scale"] == len(recorder.calls) == total["operations"]
+        assert results["skipped"] == 0 and len(total["runs"]) == 2
+        assert "replay ZooSystem.report_zoo_daily_staff_schedules" in [result["benchmark"]
+                                                                        for result in results["results"]]
@@ -0,0 +1,72 @@
+"""
+File: test_cleaning_queue.py
+Description: Suite of unit tests for the CleaningQueue class.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from cleaning_queue import CleaningQueue
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from reptile import Reptile
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+
+class TestCleaningQueue:
+    @pytest.fixture
+    def zoo1(self) -> ZooSystem:
+        zoo = ZooSystem("The Royal Zoo")
+        keeper = Zookeeper("Daniel")
+        zoo.add_staff_member(keeper)
+        for number in range(4):
+            enclosure = Enclosure(f"Dune{number}", EnvironmentalType.DESERT, 10)
+            zoo.add_enclosure(enclosure)
+            if number < 2:
+                zoo.assign_staff_to_enclosure(keeper, enclosure, datetime(2004, 11, 1))
+        return zoo
+
+    def test_next_to_clean(self, zoo1: ZooSystem) -> None:
+        dune0, dune1, dune2, dune3 = zoo1.enclosures
+        keeper = zoo1.staff[0]
+        assert len(zoo1.cleaning) == 4 and zoo1.cleaning.next_to_clean(4) == []  # everything starts clean
+
+        dune2.become_dirtier(datetime(2004, 11, 12, 8), 3)
+        dune0.become_dirtier(datetime(2004, 11, 12, 8), 1)
+        dune1.become_dirtier(datetime(2004, 11, 12, 8), 1)
+        keeper.clean(dune0, datetime(2004, 11, 12, 9))
+        dune0.become_dirtier(datetime(2004, 11, 12, 10), 1)
+        assert zoo1.cleaning.next_to_clean(4) == [dune2, dune1, dune0]  # dune1 has waited longer than dune0
+        assert keeper.next_to_clean(zoo1.cleaning) == [dune1, dune0]  # only the keeper's own enclosures
+
+        keeper.clean(dune2, datetime(2004, 11, 12, 11))
+        assert zoo1.cleaning.next_to_clean(1) == [dune2]  # still the dirtiest after one level of cleaning
+        zoo1.remove_enclosure(dune2)
+        assert dune2 not in zoo1.cleaning and zoo1.cleaning.next_to_clean(1) == [dune1]
+
+    def test_sla_breaches(self, zoo1: ZooSystem) -> None:
+        dune0, dune1, dune2, dune3 = zoo1.enclosures
+        keeper = zoo1.staff[0]
+        keeper.clean(dune0, datetime(2004, 11, 11, 7))
+        keeper.clean(dune1, datetime(2004, 11, 12, 7))
+        keeper.clean(dune1, datetime(2004, 11, 10, 7))  # a late record of an older cleaning
+        assert zoo1.cleaning.get_last_cleaned(dune1) == datetime(2004, 11, 12, 7)
+        assert zoo1.cleaning.get_last_cleaned(dune2) is None
+
+        overdue = zoo1.cleaning.overdue(datetime(2004, 11, 12, 12), timedelta(hours=24))
+        assert overdue[:2] in ([dune2, dune3], [dune3, dune2]) and overdue[2:] == [dune0]
+        assert zoo1.cleaning.not_cleaned_since(datetime(2004, 11, 11), {dune0.id, dune1.id}) == []
+
+        # a new queue finds the last cleaning of each object from its log:
+        queue = CleaningQueue()
+        cobra = Reptile("Cobra", "King Cobra", "Hiss", "Smooth", True, 4)
+        cobra.receive_cleaning(keeper.id, keeper.name, datetime(2004, 11, 12, 7))
+        for dirtying_object in (dune0, dune1, cobra):
+            queue.watch(dirtying_object)
+        assert queue.get_last_cleaned(dune0) == datetime(2004, 11, 11, 7)
+        assert queue.not_cleaned_since(datetime(2004, 11, 12)) == [dune0]
@@ -0,0 +1,133 @@
+"""
+File: test_concurrency.py
+Description: Stress tests for the concurrency model of the zoo (see lock_stripes.py): many keeper and vet actions,
+log writes and batches are run at once from a thread pool, and the zoo is checked for lost or mixed-up updates.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from action import Action
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from lock_stripes import LockStripes
+from log import Log
+from reptile import Reptile
+from severity import Severity
+from veterinarian import Veterinarian
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    """Make threads switch far more often than usual, so races show up within a short test."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+class TestConcurrency:
+    @pytest.fixture
+    def zoo1(self) -> ZooSystem:
+        zoo = ZooSystem("The Royal Zoo")
+        for number in range(4):
+            enclosure = Enclosure(f"Dune {number}", EnvironmentalType.DESERT, 100)
+            zoo.add_enclosure(enclosure)
+            for _ in range(10):
+                cobra = Reptile(f"Cobra {number}", "King Cobra", "Hiss", "Smooth", True, 4,
+                                habitat=EnvironmentalType.DESERT)
+                zoo.add_animal(cobra)
+                zoo.assign_animal_to_enclosure(cobra, enclosure)
+        for number in range(4):
+            zoo.add_staff_member(Zookeeper(f"Keeper {number}"))
+            zoo.add_staff_member(Veterinarian(f"Vet {number}"))
+        return zoo
+
+    def test_lock_stripes(self) -> None:
+        stripes = LockStripes(4)
+        assert len(stripes) == 4 and stripes.stripe_of("A1") == stripes.stripe_of("A1")
+        with stripes.holding("A1", "A1", "E1"):
+            with stripes.holding("A1"):  # the stripes are re-entrant
+                pass
+
+    def test_concurrent_staff_actions(self, zoo1: ZooSystem) -> None:
+        keepers, vets = zoo1.staff[0::2], zoo1.staff[1::2]
+        start = datetime(2004, 11, 12)
+        actions = []
+        for step in range(400):
+            animal = zoo1.animals[step // 4 % len(zoo1.animals)]
+            at = start + timedelta(minutes=step)
+            keeper, vet = keepers[step // 4 % len(keepers)], vets[step // 4 % len(vets)]
+            match step % 4:
+                case 0:
+                    actions.append(lambda k=keeper, a=animal, t=at: k.feed(a, "Raw Chicken", "200g", t))
+                case 1:
+                    actions.append(lambda a=animal, t=at: a.become_dirtier(t, 1))
+                case 2:
+                    actions.append(lambda k=keeper, a=animal, t=at: k.clean(a, t))
+                case 3:
+                    actions.append(lambda v=vet, a=animal, t=at: v.check_health(a, "check", Severity.LOW, t))
+        events_before = len(zoo1.event_store)
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            for future in [pool.submit(action) for action in actions]:
+                future.result()
+
+        events = zoo1.event_store.data.iloc[events_before:]
+        assert len(events) == 400 and events.index.is_unique  # every action written once, with its own number
+        fed = zoo1.events(keepers)
+        assert (fed["Action"] == Action.FEED).sum() == 100 and (fed["Action"] == Action.CLEAN).sum() == 100
+        assert all(len(vet.log.data) == 25 for vet in vets)
+        for animal in zoo1.animals:  # the cleaning queue agrees with each animal's final cleanliness
+            assert zoo1.cleaning.next_to_clean(1, {animal.id}) == ([] if animal.cleanliness == Severity.VERY_HIGH
+                                                                   else [animal])
+        assert len(zoo1.triage) == len(zoo1.animals)
+
+    def test_concurrent_treatment_and_batches(self, zoo1: ZooSystem) -> None:
+        dunes = zoo1.enclosures
+        vets = zoo1.staff[1::2]
+
+        def rotate(step: int) -> None:  # every cobra of one enclosure moves to the next one
+            source, target = dunes[step % 4], dunes[(step + 1) % 4]
+            with zoo1.batch(datetime(2004, 11, 12)) as batch:
+                for cobra in list(source.inhabitants):
+                    batch.move_animal(cobra, source, target)
+
+        def treat(step: int) -> None:
+            vet, cobra = vets[step % len(vets)], zoo1.animals[step % len(zoo1.animals)]
+            vet.diagnose(cobra, "Mouth rot", Severity.HIGH, "Antibiotics.", [[time(9), "antibiotics"]],
+                         datetime(2004, 11, 12))
+            vet.treat(cobra, "antibiotics", Severity.HIGH, datetime(2004, 11, 12, 9))
+            vet.declare_recovery(cobra, "Recovered.", datetime(2004, 11, 12, 10))
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            futures = [pool.submit(rotate if step % 2 else treat, step) for step in range(200)]
+            for future in futures:
+                future.result()
+
+        housed = [cobra.id for dune in dunes for cobra in dune.inhabitants]
+        assert sorted(housed) == sorted(cobra.id for cobra in zoo1.animals)  # each cobra in exactly one enclosure
+        assert not any(cobra.under_treatment for cobra in zoo1.animals) and len(zoo1.triage) == 0
+
+    def test_concurrent_log_writes(self) -> None:
+        log = Log("Gateway Activity")  # a stand-alone (DataFrame) log
+        row = {"DateTime": datetime(2004, 11, 12), "SubjectID": "S1", "SubjectName": "Daniel",
+               "ObjectID": "A1", "ObjectName": "Cobra", "Action": Action.FEED, "Details": "200g Raw Chicken"}
+
+        def write(step: int) -> list[int]:
+            if step % 2:
+                with Log.batched_writes():  # buffered rows of one thread are not lost by the others
+                    return [log.new(row) for _ in range(10)]
+            return [log.new(row) for _ in range(10)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            ref_nums = [ref_num for refs in pool.map(write, range(40)) for ref_num in refs]
+        assert len(set(ref_nums)) == 400
+        assert sorted(log.data.index) == sorted(ref_nums)
@@ -11,6 +11,7 @@ from datetime import datetime, time
 import pytest
 
 from action import Action
+from data_record import DataRecord
 from log import Log
 from medical_log import MedicalLog
 from schedule import Schedule
@@ -82,6 +83,23 @@ class TestLog:
                 "\n----------------------------------------------------------------------------------------------\n")
         assert len(log1.data) == 1
 
+    def test_batched_writes(self, log1):
+        rows = [{"DateTime": datetime(2004, 11, 12, hour), "SubjectID": "1", "SubjectName": "Jane", "ObjectID": "1",
+                 "ObjectName": "Jane", "Action": Action.EAT, "Details": f"{hour}x apple"} for hour in range(10)]
+        unbatched_log = Log("Unbatched")
+        for row in rows:
+            unbatched_log.new(dict(row))
+
+        with DataRecord.batched_writes():
+            reference_numbers = [log1.new(dict(row)) for row in rows]
+            assert reference_numbers == sorted(set(reference_numbers))  # unique and in order
+            assert len(log1.columns) == 7
+            assert len(log1.data) == 10  # reading the data adds the buffered rows first
+            log1.new(dict(rows[0]))
+        assert len(log1.data) == 11
+        assert list(log1.data.index[:10]) == reference_numbers
+        assert log1.data.iloc[:10].reset_index(drop=True).equals(unbatched_log.data.reset_index(drop=True))
+
     def test_medical_log(self, medical_log1):
         output = medical_log1.__str__()
 
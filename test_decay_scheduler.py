@@ -0,0 +1,94 @@
+"""
+File: test_decay_scheduler.py
+Description: Suite of unit tests for the TimerWheel and DecayScheduler classes.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from action import Action
+from decay_scheduler import DecayScheduler
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from reptile import Reptile
+from severity import Severity
+from timer_wheel import TimerWheel
+from zoo_simulation import ZooSimulation
+from zookeeper import Zookeeper
+from test_zoo_simulation import build_desert_zoo
+
+
+class TestTimerWheel:
+    def test_timers_fire_in_order(self) -> None:
+        wheel = TimerWheel(slots_per_level=4, levels=4)
+        due_ticks = [1, 3, 4, 5, 9, 16, 17, 63, 64, 100, 255]
+        for due_tick in reversed(due_ticks):
+            wheel.schedule(f"timer{due_tick}", due_tick)
+        wheel.schedule("cancelled", 50)
+        wheel.cancel("cancelled")
+        assert len(wheel) == len(due_ticks) and "cancelled" not in wheel
+
+        fired = [(tick, keys) for tick, keys in wheel.advance(60)]
+        assert fired == [(due_tick, [f"timer{due_tick}"]) for due_tick in due_ticks if due_tick <= 60]
+        assert wheel.get_due("timer100") == 100 and wheel.now == 60
+        assert [tick for tick, keys in wheel.advance(300)] == [63, 64, 100, 255]
+        assert len(wheel) == 0
+
+    def test_reschedule_while_advancing(self) -> None:
+        wheel = TimerWheel(slots_per_level=4, levels=3)
+        wheel.schedule("repeating", 5)
+        wheel.schedule("late", -10)  # already due, fires on the next tick
+        fired = []
+        for tick, keys in wheel.advance(40):
+            fired.append(tick)
+            if "repeating" in keys:
+                wheel.schedule("repeating", tick + 7)
+        assert fired == [1, 5, 12, 19, 26, 33, 40]
+
+
+class TestDecayScheduler:
+    @pytest.fixture
+    def scheduler1(self) -> DecayScheduler:
+        return DecayScheduler(datetime(2004, 11, 12), {EnvironmentalType.DESERT: timedelta(hours=10)})
+
+    def test_decay_rates_by_environment(self, scheduler1: DecayScheduler) -> None:
+        pool = Enclosure("Pool", EnvironmentalType.AQUATIC, 10)
+        dune = Enclosure("Dune", EnvironmentalType.DESERT, 10)
+        cobra = Reptile("Cobra", "King Cobra", "Hiss", "Smooth", True, 4, habitat=EnvironmentalType.DESERT)
+        for dirtying_object in (pool, dune, cobra):
+            scheduler1.watch(dirtying_object)
+        assert scheduler1.get_decay_interval(pool) == timedelta(hours=6)  # default rate
+        assert scheduler1.get_decay_interval(cobra) == timedelta(hours=10)  # the animal's habitat is used
+
+        assert scheduler1.advance_to(datetime(2004, 11, 12, 12)) == 2 + 1 + 1  # the pool twice, the rest once
+        assert pool.cleanliness == Severity.MODERATE and dune.cleanliness == Severity.HIGH
+        decays = pool.log.data[pool.log.data["Action"] == Action.BECOME_DIRTIER]
+        assert decays["DateTime"].tolist() == [datetime(2004, 11, 12, 6), datetime(2004, 11, 12, 12)]
+
+        assert scheduler1.advance_to(datetime(2004, 11, 13, 12)) == 2 + 2 * 2
+        assert pool.cleanliness == Severity.VERY_LOW and scheduler1.get_next_decay(pool) is None  # fully dirty
+        assert cobra.cleanliness == Severity.LOW
+        assert scheduler1.get_next_decay(cobra) == datetime(2004, 11, 13, 16)
+
+    def test_cleaning_restarts_decay(self, scheduler1: DecayScheduler) -> None:
+        pool = Enclosure("Pool", EnvironmentalType.AQUATIC, 10)
+        scheduler1.watch(pool)
+        scheduler1.advance_to(datetime(2004, 11, 13))
+        assert pool.cleanliness == Severity.VERY_LOW and scheduler1.get_next_decay(pool) is None
+
+        Zookeeper("Daniel").clean(pool, datetime(2004, 11, 13, 1))
+        assert scheduler1.get_next_decay(pool) == datetime(2004, 11, 13, 7)
+        scheduler1.unwatch(pool)
+        assert pool not in scheduler1 and scheduler1.advance_to(datetime(2004, 11, 14)) == 0
+
+    def test_simulation_with_decay_rates(self) -> None:
+        zoo = build_desert_zoo()
+        summary = ZooSimulation(zoo, datetime(2004, 11, 12), seed=1, incident_rate=0, decay_intervals={}).run(3)
+        cobra = zoo.animals[0]
+        decays = cobra.log.data[cobra.log.data["Action"] == Action.BECOME_DIRTIER]
+        assert decays["DateTime"].tolist() == [datetime(2004, 11, 13), datetime(2004, 11, 14)]  # once a day
+        assert summary["events"]["decay"] >= 2 * len(zoo.animals)
@@ -89,7 +89,7 @@ class TestEnclosure:
 
         desert1.add_animal(desert_mouse)
         expected = (
-            f"[ERROR] Muad'Dib_{desert_mouse.id} cannot live in Dune_E3 as animals of a different species already live there"
+            f"[ERROR] Muad'Dib_{desert_mouse.id} cannot live in Dune_{desert1.id} as animals of a different species already live there"
             f" (King Cobra). No change made.")
         actual = capsys.readouterr().out.strip()
         assert expected == actual
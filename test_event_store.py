@@ -0,0 +1,232 @@
+"""
+File: test_event_store.py
+Description: Suite of unit tests for the EventStore class and the logs kept in it.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import gc
+import gzip
+import json
+import os
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from action import Action
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from event_store import EventStore
+from log import Log
+from medical_log import MedicalLog
+from reptile import Reptile
+from severity import Severity
+from veterinarian import Veterinarian
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+
+class TestEventStore:
+    @pytest.fixture
+    def zoo1(self) -> ZooSystem:
+        zoo = ZooSystem("The Royal Zoo")
+        dune = Enclosure("Dune", EnvironmentalType.DESERT, 10)
+        cobra = Reptile("Shai-Hulud", "King Cobra", "Hiss", "Smooth", True, 4, habitat=EnvironmentalType.DESERT)
+        zoo.add_enclosure(dune)
+        zoo.add_animal(cobra)
+        zoo.assign_animal_to_enclosure(cobra, dune)
+        zoo.add_staff_member(Zookeeper("Daniel"))
+        zoo.add_staff_member(Veterinarian("Ethan"))
+        return zoo
+
+    def test_shared_events_are_written_once(self, zoo1: ZooSystem) -> None:
+        keeper, vet = zoo1.staff
+        cobra, dune = zoo1.animals[0], zoo1.enclosures[0]
+        store = zoo1.event_store
+        assert cobra.log.store is store and cobra.medical_log.store is store and cobra.log.owner_id == cobra.id
+
+        events_before = len(store)
+        keeper.feed(cobra, "Raw Chicken", "200g", datetime(2004, 11, 12, 10))
+        keeper.clean(dune, datetime(2004, 11, 12, 11))
+        vet.treat(cobra, "antibiotics", Severity.HIGH, datetime(2004, 11, 12, 12))
+        assert len(store) == events_before + 3  # one event each, not one per log
+
+        ate, fed = cobra.log.data.iloc[-1], keeper.log.data.iloc[0]
+        assert ate.name == fed.name  # the same event, seen from each side
+        assert (ate["SubjectID"], ate["Action"], ate["ObjectID"]) == (cobra.id, Action.EAT, cobra.id)
+        assert (fed["SubjectID"], fed["Action"], fed["ObjectID"]) == (keeper.id, Action.FEED, cobra.id)
+        assert keeper.log.data["Action"].tolist() == [Action.FEED, Action.CLEAN]
+        assert dune.log.data["Details"].iloc[-1] == "cleanliness is now 'Very High'"
+
+        treated = cobra.medical_log.data.iloc[-1]
+        assert treated["Action"] == Action.RECEIVE_TREATMENT and treated["Severity"] == Severity.HIGH
+        assert vet.log.data["Details"].tolist() == [f"log ref: {treated.name}"]
+        assert store.data.loc[treated.name, "Record"] == "MedicalLog"
+
+    def test_zoo_wide_events(self, zoo1: ZooSystem) -> None:
+        keeper, vet = zoo1.staff
+        cobra = zoo1.animals[0]
+        vet.diagnose(cobra, "Mouth rot", Severity.HIGH, "Antibiotics.", [[time(9), "antibiotics"]],
+                     datetime(2004, 11, 11))
+        keeper.feed(cobra, "Raw Chicken", "200g", datetime(2004, 11, 12, 10))
+
+        staff_events = zoo1.events(zoo1.staff)
+        assert staff_events["Action"].tolist() == [Action.DIAGNOSE, Action.FEED]
+        assert list(staff_events.index) == sorted(staff_events.index)
+        medical = zoo1.events(record_kind="MedicalLog")
+        assert medical["Treatment"].tolist() == ["Antibiotics."]
+        assert len(zoo1.events()) == 3  # the feeding for both participants, the diagnosis for the vet only
+        assert "EventStore" in zoo1.memory_usage()
+
+    def test_stand_alone_logs(self) -> None:
+        log = Log("Jane's Activity")
+        assert log.store is None
+        log.join(None, {"DateTime": datetime(2004, 11, 12), "SubjectID": "1", "SubjectName": "Jane",
+                        "ObjectID": "2", "ObjectName": "John", "Action": Action.FEED, "Details": "lunch"})
+        assert len(log.data) == 1  # nothing to join, so a new row is added
+
+        cobra = Reptile("Cobra", "King Cobra", "Hiss", "Smooth", True, 4)
+        cobra.sleep(datetime(2004, 11, 12))
+        assert cobra.log.store is None and cobra.log.owner_id == cobra.id  # stores its own rows until in a zoo
+        zoo = ZooSystem("The Royal Zoo")
+        zoo.add_animal(cobra)  # the rows it already has are kept in the zoo's store
+        assert cobra.log.store is zoo.event_store and len(zoo.event_store) == 1
+        cobra.log.data = log.data  # the log is a view of the store
+        assert cobra.log.data["Action"].tolist() == [Action.SLEEP]
+        log.use_event_store("1", None)
+        assert log.store is None and len(log.data) == 1
+
+    def test_store_per_zoo(self, zoo1: ZooSystem) -> None:
+        zoo2 = ZooSystem("The Other Zoo")
+        keeper, cobra = zoo1.staff[0], zoo1.animals[0]
+        gecko = Reptile("Gecko", "Leopard Gecko", "Chirp", "Spotted", False, 1)
+        zoo2.add_animal(gecko)
+        keeper.feed(cobra, "Raw Chicken", "200g", datetime(2004, 11, 12, 10))
+        gecko.sleep(datetime(2004, 11, 12, 11))
+        assert zoo1.event_store is not zoo2.event_store
+        assert len(zoo1.event_store) == 1 and len(zoo2.event_store) == 1  # neither sees the other zoo's events
+        assert zoo2.memory_usage()["EventStore"]["count"] == 1
+
+        zoo1.remove_animal(cobra)
+        zoo2.add_animal(cobra)  # moves to the other zoo with its log
+        assert cobra.log.store is zoo2.event_store and cobra.log.data["Action"].tolist() == [Action.EAT]
+        assert len(zoo1.event_store) == 1 and len(zoo2.event_store) == 2
+
+
+class TestRetention:
+    @staticmethod
+    def fill(store: EventStore, days: int) -> tuple[Log, Log, MedicalLog]:
+        """Add a day of events to the logs of a keeper, an animal and its medical log, for each of a number of days."""
+        keeper, animal, medical = Log("Daniel's Activity"), Log("Cobra's Activity"), MedicalLog("Cobra's Medical")
+        keeper.use_event_store("S1", store)
+        animal.use_event_store("A1", store)
+        medical.use_event_store("A1", store)
+        for day in range(days):
+            at = datetime(2004, 11, 1) + timedelta(days=day)
+            ate = animal.new({"DateTime": at, "SubjectID": "A1", "SubjectName": "Cobra", "ObjectID": "A1",
+                              "ObjectName": "Cobra", "Action": Action.EAT, "Details": f"meal {day}"})
+            keeper.join(ate, {"DateTime": at, "SubjectID": "S1", "SubjectName": "Daniel", "ObjectID": "A1",
+                              "ObjectName": "Cobra", "Action": Action.FEED, "Details": f"fed meal {day}"})
+            medical.new({"DateTime": at, "SubjectID": "A1", "SubjectName": "Cobra", "ObjectID": "A1",
+                         "ObjectName": "Cobra", "Action": Action.RECEIVE_TREATMENT, "Details": f"checkup {day}",
+                         "Severity": Severity.LOW, "Treatment": "None."})
+        return keeper, animal, medical
+
+    def test_retention_by_rows(self, tmp_path) -> None:
+        store, kept = EventStore(spill_directory=str(tmp_path), spill_batch=10), EventStore()
+        store.set_retention("Log", max_rows=5)
+        logs, expected = self.fill(store, 40), self.fill(kept, 40)
+        assert len(store) == len(kept) == 80 and store.spilled_count >= 30 and store.segments
+        assert all(path.startswith(str(tmp_path)) for path in store.segments)
+        for log, same in zip(logs, expected):  # queries across the boundary see every event, as before.
+            assert log.data.reset_index(drop=True).equals(same.data.reset_index(drop=True))
+        assert store.data.reset_index(drop=True).equals(kept.data.reset_index(drop=True))
+        assert store.view(["A1", "S1"])["Details"].tolist() == kept.view(["A1", "S1"])["Details"].tolist()
+        assert store.get_memory_usage() < kept.get_memory_usage()
+        assert f"{store.spilled_count} of them spilled" in str(store)
+
+        medical = store.view("A1", "MedicalLog", EventStore.COLUMNS)
+        assert len(medical) == 40 and set(medical["Record"]) == {"MedicalLog"}  # has no policy: nothing spilled.
+
+    def test_retention_by_age(self, tmp_path) -> None:
+        store = EventStore(spill_directory=str(tmp_path), spill_batch=4)
+        store.set_retention("MedicalLog", max_age=timedelta(days=7))
+        keeper, animal, medical = self.fill(store, 30)
+        assert 30 - 7 - 4 <= store.spilled_count <= 30 - 7  # old rows wait for a batch before they are spilled.
+        assert medical.data["Details"].tolist() == [f"checkup {day}" for day in range(30)]
+
+        late = animal.new({"DateTime": datetime(2004, 12, 1), "SubjectID": "A1", "SubjectName": "Cobra",
+                           "ObjectID": "A1", "ObjectName": "Cobra", "Action": Action.EAT, "Details": "late meal"})
+        spilled = store.view("A1", "Log", ["DateTime"]).index[0]
+        assert store.join("S1", late, {"DateTime": datetime(2004, 12, 1), "SubjectID": "S1", "SubjectName": "Daniel",
+                                       "ObjectID": "A1", "ObjectName": "Cobra", "Action": Action.FEED,
+                                       "Details": "fed late meal"})
+        store.set_retention("Log", max_age=timedelta(days=1))
+        assert not store.join("S2", spilled, {"DateTime": datetime(2004, 11, 1), "SubjectID": "S2",
+                                              "SubjectName": "Ethan", "ObjectID": "A1", "ObjectName": "Cobra",
+                                              "Action": Action.FEED, "Details": "fed meal 0"})  # only joins in memory.
+        assert keeper.data["Details"].tolist()[-2:] == ["fed meal 29", "fed late meal"]
+
+    def test_memory_cap(self, tmp_path) -> None:
+        store = EventStore(spill_directory=str(tmp_path), spill_batch=1)
+        store.set_memory_cap(20 * EventStore.ROW_BYTES)
+        keeper, animal, medical = self.fill(store, 50)
+        assert len(store) == 100 and store.spilled_count >= 80  # the oldest events of any kind were spilled.
+        assert store.view(["A1"], "Log", ["Details"])["Details"].tolist() == [f"meal {day}" for day in range(50)]
+        assert len(keeper.data) == len(medical.data) == 50
+        assert store.estimated_memory <= store.memory_cap  # the index of every event is counted too.
+
+    def test_memory_cap_counts_index(self, tmp_path, capsys) -> None:
+        store = EventStore(spill_directory=str(tmp_path), spill_batch=1)
+        store.set_memory_cap(3 * EventStore.KEY_BYTES + 100 * 8)  # room for little more than the index.
+        self.fill(store, 50)
+        assert "[WARNING] The index of the Zoo Event Store" in capsys.readouterr().out
+        assert store.spilled_count >= len(store) - 5  # (the keeper cannot join spilled events, so adds their own)
+        assert store.view("S1")["Details"].tolist() == [f"fed meal {day}" for day in range(50)]
+
+    def test_events_after(self, tmp_path) -> None:
+        store = EventStore(spill_directory=str(tmp_path), spill_batch=4)
+        store.set_retention("Log", max_rows=2)
+        self.fill(store, 20)
+        data = store.data
+        assert store.spilled_count > 0 and store.last_ref_num == data.index.max()
+        after = int(data.index[5])
+        events = list(store.events(after, chunk_size=3))  # read from memory and the segments, a chunk at a time.
+        assert [log_ref_num for log_ref_num, values in events] == data.index[6:].tolist()
+        assert [values[list(EventStore.COLUMNS).index("Details")] for log_ref_num, values in events] \
+            == data["Details"].iloc[6:].tolist()
+        assert list(store.events(store.last_ref_num)) == [] and EventStore().last_ref_num == -1
+
+    def test_record_with_ref_num(self, capsys) -> None:
+        store, row = EventStore(), {"DateTime": datetime(2004, 11, 1), "Action": Action.EAT, "Details": "meal"}
+        later = store.record("A1", "Log", row, store.record("A1", "Log", row) + 1000)
+        assert store.record("A1", "Log", row) > later and store.get_ref_nums("A1")[1] == later
+        assert store.record("A1", "Log", row, later) is None and "No change made." in capsys.readouterr().out
+
+    def test_segments_per_store(self, tmp_path) -> None:
+        stores = [EventStore(spill_directory=str(tmp_path / "spill"), spill_batch=2) for _ in range(2)]
+        for store in stores:
+            store.set_retention("Log", max_rows=1)
+            self.fill(store, 10)
+        directories = [os.path.dirname(store.segments[0]) for store in stores]
+        assert directories[0] != directories[1] and all(os.path.dirname(directory) == str(tmp_path / "spill")
+                                                        for directory in directories)
+        with gzip.open(stores[0].segments[0], "rt", encoding="utf-8") as file:  # JSON lines, as in a ZooStore.
+            assert json.loads(file.readline())["events"] == len(file.readlines())
+        assert stores[0].view("A1")["Details"].tolist() == [f"meal {day}" for day in range(10)]
+
+        del stores[0], store
+        gc.collect()
+        assert not os.path.exists(directories[0]) and os.path.exists(directories[1])  # removed with its store.
+
+    def test_invalid_policies(self, capsys) -> None:
+        store = EventStore()
+        store.set_retention("Log", max_rows=-1)
+        store.set_retention("Log", max_age=7)
+        store.set_memory_cap(0)
+        assert capsys.readouterr().out.count("No change made.") == 3
+        assert store.retention == {} and store.memory_cap is None
+        store.set_retention("Log", max_rows=10)
+        store.set_retention("Log")  # removes the policy.
+        assert store.retention == {}
@@ -0,0 +1,78 @@
+"""
+File: test_food_demand.py
+Description: Suite of unit tests for the FoodDemand class and the food quantity functions it uses.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import math
+from datetime import date, datetime, time
+
+import pandas as pd
+import pytest
+
+from environmental_type import EnvironmentalType
+from food_demand import FoodDemand
+from food_quantity import parse_meals, parse_quantity
+from mammal import Mammal
+from reptile import Reptile
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+
+class TestFoodQuantity:
+    def test_parse_quantity(self) -> None:
+        assert parse_quantity("200g") == (200, "g")
+        assert parse_quantity("1.5 kg") == (1500, "g")
+        assert parse_quantity("2x whole") == (2, "x")
+        assert parse_quantity("3 leaves") == (3, "leaves")
+        amount, unit = parse_quantity("a handful")
+        assert math.isnan(amount) and unit == ""
+
+    def test_parse_meals(self) -> None:
+        meals = parse_meals(pd.Series(["200g Raw Chicken", "0.5L Water", "2x whole Mouse", "some fish"]))
+        assert list(meals["Food"].fillna("")) == ["Raw Chicken", "Water", "whole Mouse", ""]
+        assert list(meals["Amount"].fillna(-1)) == [200, 500, 2, -1]
+        assert list(meals["Unit"].fillna("")) == ["g", "ml", "x", ""]
+
+
+class TestFoodDemand:
+    @pytest.fixture
+    def zoo1(self) -> ZooSystem:
+        zoo = ZooSystem("The Royal Zoo")
+        zoo.add_staff_member(Zookeeper("Daniel"))
+        cobra1 = Reptile("Shai-Hulud", "King Cobra", "Hiss", "Smooth", True, 4, habitat=EnvironmentalType.DESERT)
+        cobra1.add_to_diet("Raw Chicken", "200g", time(10))
+        cobra1.add_to_diet("Raw Lamb", "0.1kg", time(18, 30))
+        zoo.add_animal(cobra1)
+
+        profile = zoo.get_species_profile("Wood Mouse")
+        profile.add_to_diet("Grasshopper", "2x whole", time(6))
+        for number in range(3):  # three mice that share their species' diet template
+            zoo.add_animal(Mammal(f"Mouse{number}", "Wood Mouse", "Squeak", "Brown"))
+        return zoo
+
+    def test_planned_demand(self, zoo1: ZooSystem) -> None:
+        demand = FoodDemand(zoo1)
+        assert len(demand.daily_diets()) == 3  # the shared template is counted once, for three mice
+        planned = demand.planned(date(2004, 11, 1), date(2004, 11, 30))
+        assert planned[("Raw Chicken", "g")] == 200 * 30
+        assert planned[("Raw Lamb", "g")] == 100 * 30
+        assert planned[("Grasshopper", "x")] == 2 * 3 * 30
+        assert demand.planned(date(2004, 11, 2), date(2004, 11, 1)).sum() == 0
+
+    def test_actual_compared_with_planned(self, zoo1: ZooSystem) -> None:
+        keeper, cobra, mouse = zoo1.staff[0], zoo1.animals[0], zoo1.animals[1]
+        keeper.feed(cobra, "Raw Chicken", "200g", datetime(2004, 11, 12, 10))
+        keeper.feed(cobra, "Raw Chicken", "0.05kg", datetime(2004, 11, 12, 15))
+        keeper.feed(mouse, "whole Grasshopper", "2x", datetime(2004, 11, 12, 6))
+        keeper.feed(mouse, "whole Grasshopper", "2x", datetime(2004, 11, 13, 6))  # outside of the range
+
+        comparison = FoodDemand(zoo1).compare(date(2004, 11, 12), date(2004, 11, 12))
+        assert comparison.loc[("Raw Chicken", "g")].tolist() == [200, 250, 50]
+        assert comparison.loc[("Raw Lamb", "g")].tolist() == [100, 0, -100]
+        assert comparison.loc[("Grasshopper", "x")].tolist() == [6, 2, -4]  # matched with the diet entry
+
+        report = FoodDemand(zoo1).report(date(2004, 11, 12), date(2004, 11, 12))
+        assert " - Raw Chicken: planned 200g, actual 250g (+50g)" in report
@@ -0,0 +1,60 @@
+"""
+File: test_lazy_modules.py
+Description: Suite of unit tests for the LazyModule class and the import-time budget of the zoo: importing the zoo's
+modules must not import pandas or numpy, and must take less than IMPORT_BUDGET seconds (measured with -X importtime).
+Wall-clock times depend on the machine and its load, so the time budget is only checked (on the median of
+IMPORT_RUNS imports) when the ZOO_TIMING_TESTS environment variable is set, e.g. ZOO_TIMING_TESTS=1 pytest.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+import pytest
+
+from lazy_modules import LazyModule
+
+IMPORT_BUDGET = 0.25  # seconds to import the modules of a report job; pandas alone takes about half a second.
+IMPORT_RUNS = 5  # imports timed by the time budget test, whose median is checked
+JOB_MODULES = ["zoo_system", "food_demand", "adherence_engine", "zoo_simulation"]
+
+
+def import_times(modules: list[str]) -> dict[str, tuple[int, int]]:
+    """
+    Import modules in a new interpreter with -X importtime and return how long each module imported took.
+    :param modules: The names of the modules to import.
+    :return: Dictionary of module name -> (microseconds spent in the module itself, including what it imported).
+    """
+    run = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+                         cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True)
+    times = {}
+    for line in run.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            own, cumulative, name = line.removeprefix("import time:").split("|")
+            if own.strip().isdigit():  # not the heading
+                times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+class TestLazyModules:
+    def test_lazy_module(self) -> None:
+        sys.modules.pop("colorsys", None)
+        colorsys = LazyModule("colorsys")
+        assert "colorsys" not in sys.modules and "not imported yet" in repr(colorsys)
+        assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)  # imported on first use
+        assert "colorsys" in sys.modules and "rgb_to_hsv" in vars(colorsys)
+
+    def test_imports_without_pandas(self) -> None:
+        times = import_times(JOB_MODULES)
+        assert "pandas" not in times and "numpy" not in times  # imported when the first DataFrame is made
+
+    @pytest.mark.skipif(not os.environ.get("ZOO_TIMING_TESTS"), reason="set ZOO_TIMING_TESTS to check wall-clock times")
+    def test_import_time_budget(self) -> None:
+        runs = [import_times(JOB_MODULES) for _ in range(IMPORT_RUNS)]
+        total = statistics.median(sum(times[module][1] for module in JOB_MODULES) for times in runs) / 1e6
+        slowest = sorted(runs[0].items(), key=lambda item: -item[1][0])[:10]
+        assert total < IMPORT_BUDGET, f"importing took {total:.3f} s (median), the slowest modules: {slowest}"
@@ -0,0 +1,28 @@
+"""
+File: test_memory.py
+Description: Suite of memory ceiling tests: the memory of each animal, log row and schedule row of a synthetic zoo
+must stay within its budget (see benchmarks/memory.py).
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from benchmarks.memory import FRAMES, Budget, check_budgets, measure, over_budget
+from log import Log
+
+
+class TestMemory:
+    def test_zoo_within_budgets(self) -> None:
+        measurements, failures = check_budgets()  # the zoo the budgets were measured on
+        assert set(measurements) == {"animal", "log_row", "schedule_row"}
+        assert all(measurement.units > 0 and measurement.peak >= measurement.retained > 0
+                   for measurement in measurements.values())
+        assert not failures, "\n".join(failures)  # lists the allocation sites that grew the most
+
+    def test_over_budget_names_allocation_sites(self) -> None:
+        logs = measure("log", lambda: ([Log(f"Log {number}") for number in range(5)], 5), FRAMES)
+        assert logs.retained > 0 and logs.top
+        failures = over_budget({"log": logs}, {"log": Budget(retained=100, peak=100)})
+        assert len(failures) == 1 and failures[0].startswith("log: ")
+        assert " <- log.py:" in failures[0]  # pandas' allocations are traced back to the line of the zoo
+        assert not over_budget({"log": logs}, {"log": Budget(retained=10 ** 9, peak=10 ** 9)})
@@ -0,0 +1,98 @@
+"""
+File: test_metrics.py
+Description: Suite of unit tests for the Counter, Histogram and MetricsRegistry classes.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import urllib.request
+from datetime import datetime
+
+import pytest
+
+from action import Action
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from log import Log
+from metrics import Histogram, MetricsRegistry
+from reptile import Reptile
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+
+class TestMetrics:
+    @pytest.fixture
+    def metrics(self):
+        registry = MetricsRegistry()
+        registry.enable()
+        yield registry
+        registry.disable()
+
+    @pytest.fixture
+    def zoo1(self) -> ZooSystem:
+        zoo = ZooSystem("The Royal Zoo")
+        zoo.add_enclosure(Enclosure("Dune", EnvironmentalType.DESERT, 10))
+        zoo.add_staff_member(Zookeeper("Daniel"))
+        return zoo
+
+    def test_histogram(self) -> None:
+        histogram = Histogram("test_seconds", "Test latencies.", "method")
+        for latency in (0.5e-6, 3e-6, 3e-6, 1e-3, 100):
+            histogram.observe("feed", latency)
+        assert histogram.count("feed") == 5 and histogram.count("clean") == 0
+        assert histogram.quantile("feed", 0.2) == 1e-6 and histogram.quantile("feed", 0.6) == 4e-6
+        assert histogram.quantile("feed", 1.0) == float("inf")
+        text = histogram.to_prometheus()
+        assert 'test_seconds_bucket{method="feed",le="4e-06"} 3' in text
+        assert 'test_seconds_bucket{method="feed",le="+Inf"} 5' in text
+        assert 'test_seconds_count{method="feed"} 5' in text
+
+    def test_methods_are_measured(self, metrics: MetricsRegistry, zoo1: ZooSystem) -> None:
+        cobra = Reptile("Shai-Hulud", "King Cobra", "Hiss", "Smooth", True, 4, habitat=EnvironmentalType.DESERT)
+        zoo1.add_animal(cobra)
+        zoo1.assign_animal_to_enclosure(cobra, zoo1.enclosures[0])
+        zoo1.staff[0].feed(cobra, "Raw Chicken", "200g", datetime(2004, 11, 12))
+        zoo1.report_zoo_staff_activity()
+        zoo1.staff[0].generate_schedule()
+        with pytest.raises(ValueError):
+            zoo1.report_animal_medical_history(Reptile("Sally", "Rattlesnake", "Hiss", "Keeled"))
+
+        assert metrics.calls.value("ZooSystem.add_animal") == 1
+        assert metrics.calls.value("ZooSystem.report_zoo_staff_activity") == 1
+        assert metrics.calls.value("Zookeeper.generate_schedule") == 1
+        assert metrics.calls.value("Log.new") >= 1  # the feeding is written to the cobra's log
+        assert metrics.errors.value("ZooSystem.report_animal_medical_history") == 1
+        assert metrics.durations.count("ZooSystem.add_animal") == 1
+
+    def test_disabled_metrics_cost_nothing(self, metrics: MetricsRegistry, zoo1: ZooSystem) -> None:
+        assert metrics.enabled and hasattr(ZooSystem.add_animal, "__wrapped__")  # measured while enabled
+        metrics.disable()
+        assert not metrics.enabled and not hasattr(ZooSystem.add_animal, "__wrapped__")  # the original methods
+        zoo1.report_species()
+        assert metrics.calls.value("ZooSystem.report_species") == 0
+
+    def test_gauges_and_export(self, metrics: MetricsRegistry, zoo1: ZooSystem, tmp_path) -> None:
+        metrics.watch(zoo1)
+        zoo1.enclosures[0].become_dirtier(datetime(2004, 11, 12), 1)
+        text = metrics.to_prometheus()
+        assert "# TYPE zoo_record_rows gauge" in text and 'zoo_record_memory_bytes{record_type="Schedule"}' in text
+        assert metrics.calls.value("ZooSystem.records") == 2  # the gauges read the zoo's records
+
+        metrics.write(str(tmp_path / "zoo.prom"))
+        assert (tmp_path / "zoo.prom").read_text().startswith("# HELP zoo_calls_total")
+
+        server = metrics.serve(port=0)
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as answer:
+                assert "zoo_call_duration_seconds_bucket" in answer.read().decode()
+        finally:
+            server.shutdown()
+
+    def test_row_count(self) -> None:
+        log = Log("Gateway Activity")
+        with Log.batched_writes():
+            log.new({"DateTime": datetime(2004, 11, 12), "SubjectID": "S1", "SubjectName": "Daniel", "ObjectID": "A1",
+                     "ObjectName": "Cobra", "Action": Action.FEED, "Details": "200g Raw Chicken"})
+            assert log.row_count == 1  # buffered rows are counted
+        assert log.row_count == len(log.data) == 1
@@ -0,0 +1,86 @@
+"""
+File: test_outbreak_simulation.py
+Description: Suite of unit tests for the OutbreakSimulation and OutbreakResults classes.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from datetime import datetime, time
+
+import numpy as np
+import pytest
+
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from outbreak_simulation import OutbreakSimulation
+from reptile import Reptile
+from severity import Severity
+from veterinarian import Veterinarian
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+
+class TestOutbreakSimulation:
+    @pytest.fixture
+    def zoo1(self) -> ZooSystem:
+        # three enclosures of four cobras: Dune0 and Dune1 share a keeper, Dune2 has its own keeper.
+        zoo = ZooSystem("The Royal Zoo")
+        keepers = [Zookeeper("Daniel"), Zookeeper("Nenja")]
+        vets = [Veterinarian("Ethan"), Veterinarian("Cece")]
+        for member in keepers + vets:
+            zoo.add_staff_member(member)
+
+        for number in range(3):
+            enclosure = Enclosure(f"Dune{number}", EnvironmentalType.DESERT, 10)
+            zoo.add_enclosure(enclosure)
+            for _ in range(4):
+                cobra = Reptile("Cobra", "King Cobra", "Hiss", "Smooth", True, 4, habitat=EnvironmentalType.DESERT)
+                zoo.add_animal(cobra)
+                zoo.assign_animal_to_enclosure(cobra, enclosure)
+            zoo.assign_staff_to_enclosure(keepers[0] if number < 2 else keepers[1], enclosure, datetime(2004, 1, 1))
+            zoo.assign_staff_to_enclosure(vets[0] if number < 2 else vets[1], enclosure, datetime(2004, 1, 1))
+        return zoo
+
+    def test_no_spread_without_contact(self, zoo1: ZooSystem) -> None:
+        vet = zoo1.staff[2]
+        vet.diagnose(zoo1.animals[0], "Mouth rot", Severity.HIGH, "Antibiotics.", [[time(9), "antibiotics"]],
+                     datetime(2004, 11, 12))
+        simulation = OutbreakSimulation(zoo1, enclosure_rate=0, keeper_rate=0, recovery_days=1e9, index_cases=0)
+        results = simulation.run(trials=20, days=10)
+
+        assert results.under_treatment.shape == (20, 11)
+        assert (results.under_treatment == 1).all()  # the diagnosed animal stays under treatment, nobody else
+        assert results.vet_workload.shape == (20, 11, 2)
+        assert (results.vet_workload[:, :, 0] == 1).all() and (results.vet_workload[:, :, 1] == 0).all()
+
+    def test_spreads_within_enclosure_only(self, zoo1: ZooSystem) -> None:
+        zoo1.staff[2].diagnose(zoo1.animals[0], "Mouth rot", Severity.HIGH, "Antibiotics.",
+                               [[time(9), "antibiotics"]], datetime(2004, 11, 12))
+        simulation = OutbreakSimulation(zoo1, enclosure_rate=5, keeper_rate=0, treatment_factor=1,
+                                        detection_days=1, recovery_days=1e9, index_cases=0)
+        results = simulation.run(trials=50, days=5)
+        assert (results.under_treatment[:, -1] == 4).all()  # only the cobras in the first enclosure
+
+    def test_same_seed_same_results_with_process_pool(self, zoo1: ZooSystem) -> None:
+        simulation = OutbreakSimulation(zoo1, enclosure_rate=0.5, keeper_rate=0.2)
+        results1 = simulation.run(trials=300, days=30, seed=3, batch_size=100)
+        results2 = simulation.run(trials=300, days=30, seed=3, batch_size=100, max_workers=2)
+
+        assert np.array_equal(results1.under_treatment, results2.under_treatment)
+        assert np.array_equal(results1.vet_workload, results2.vet_workload)
+        assert results1.under_treatment_quantiles().shape == (3, 31)
+        assert results1.under_treatment.max() > 1
+
+        report = str(results1)
+        assert "OUTBREAK SIMULATION (300 trials):" in report
+        assert f" - Ethan_{zoo1.staff[2].id}: " in report
+
+    def test_vets_assigned_to_animals(self, zoo1: ZooSystem) -> None:
+        cece, cobra = zoo1.staff[3], zoo1.animals[0]
+        cece.assign(cobra, datetime(2004, 1, 1))  # shares the cobra with Ethan, who looks after its enclosure.
+        cece.diagnose(cobra, "Mouth rot", Severity.HIGH, "Antibiotics.", [[time(9), "antibiotics"]],
+                      datetime(2004, 11, 12))
+        simulation = OutbreakSimulation(zoo1, enclosure_rate=0, keeper_rate=0, recovery_days=1e9, index_cases=0)
+        results = simulation.run(trials=5, days=3)
+        assert (results.vet_workload == 0.5).all()  # the cobra's treatment is split between both vets.
@@ -0,0 +1,75 @@
+"""
+File: test_recurring_calendar.py
+Description: Suite of unit tests for the RecurringCalendar class.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import types
+from datetime import date, datetime, time
+
+import pytest
+
+from action import Action
+from environmental_type import EnvironmentalType
+from mammal import Mammal
+from recurring_calendar import RecurringCalendar
+
+
+class TestRecurringCalendar:
+    @pytest.fixture
+    def mouse(self) -> Mammal:
+        mouse = Mammal("Muad'Dib", "Brown Desert Mouse", "Squeak", "Brown", True,
+                       habitat=EnvironmentalType.DESERT)
+        mouse.add_to_diet("Spinach", "2x leaves", time(20, 15))
+        mouse.add_to_diet("Grasshopper", "2x whole", time(6))
+        mouse.schedule_treatments([[time(7), "5 min cuddles"], [time(19), "5 min cuddles"]])
+        return mouse
+
+    @pytest.fixture
+    def calendar1(self, mouse: Mammal) -> RecurringCalendar:
+        calendar1 = RecurringCalendar("Mouse Care")
+        calendar1.add_schedule(mouse.diet)
+        calendar1.add_schedule(mouse.treatments, date(2004, 11, 12), date(2004, 11, 13))  # treatment ends on 13th
+        return calendar1
+
+    def test_expand_in_chronological_order(self, calendar1: RecurringCalendar) -> None:
+        events = calendar1.expand(date(2004, 11, 12), date(2004, 11, 14))
+        assert isinstance(events, types.GeneratorType)  # nothing is expanded until it is requested
+
+        events = list(events)
+        assert len(events) == 2 * 3 + 2 * 2
+        assert [event["DateTime"] for event in events[:4]] == [datetime(2004, 11, 12, 6), datetime(2004, 11, 12, 7),
+                                                               datetime(2004, 11, 12, 19),
+                                                               datetime(2004, 11, 12, 20, 15)]
+        assert events[-1]["DateTime"] == datetime(2004, 11, 14, 20, 15)
+        assert events[-1]["Details"] == "2x leaves Spinach"
+        assert set(events[0].keys()) == {"DateTime", "SubjectID", "SubjectName", "ObjectID", "ObjectName",
+                                         "Action", "Details"}
+
+    def test_count_and_aggregate_match_expansion(self, calendar1: RecurringCalendar, mouse: Mammal) -> None:
+        calendar1.add_exception(date(2004, 11, 20))
+        calendar1.add_exception(date(2004, 11, 21), mouse.diet)
+
+        start, end = date(2004, 11, 1), date(2004, 11, 30)
+        events = list(calendar1.expand(start, end))
+        assert calendar1.count(start, end) == len(events) == 2 * 28 + 2 * 2
+        assert calendar1.aggregate(start, end) == {Action.EAT: 56, Action.RECEIVE_TREATMENT: 4}
+
+    def test_count_over_long_range(self, calendar1: RecurringCalendar) -> None:
+        assert calendar1.count(date(2000, 1, 1), date(2099, 12, 31)) == 2 * 36525 + 2 * 2
+
+    def test_open_ended_rule(self, calendar1: RecurringCalendar, mouse: Mammal) -> None:
+        last_day = list(calendar1.expand(date.max, date.max))  # the diet recurs with no end date.
+        assert [event["DateTime"] for event in last_day] == [datetime.combine(date.max, time(6)),
+                                                            datetime.combine(date.max, time(20, 15))]
+        assert len(list(calendar1.expand(date(9999, 12, 30), date.max))) == calendar1.count(date(9999, 12, 30),
+                                                                                          date.max) == 4
+
+    def test_invalid_input(self, calendar1: RecurringCalendar, capsys) -> None:
+        calendar1.add_schedule("not a schedule")
+        assert capsys.readouterr().out.strip() == \
+               "[ERROR] Only Schedule objects can recur in a calendar. No change made to Mouse Care Calendar."
+        assert calendar1.count("yesterday", date(2004, 11, 12)) == 0
+        assert len(calendar1.schedules) == 2
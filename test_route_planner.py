@@ -0,0 +1,88 @@
+"""
+File: test_route_planner.py
+Description: Suite of unit tests for the RoutePlanner class.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import random
+from datetime import time
+
+import numpy as np
+import pytest
+
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from reptile import Reptile
+from route_planner import RoutePlanner
+from zookeeper import Zookeeper
+
+
+class TestRoutePlanner:
+    @pytest.fixture
+    def row_of_enclosures(self) -> list[Enclosure]:
+        # five enclosures along a straight path, created (and so numbered) in a scrambled order.
+        enclosures = []
+        for x in (40, 0, 30, 10, 20):
+            enclosure = Enclosure(f"Pen{x}", EnvironmentalType.DESERT, 10)
+            enclosure.location = (x, 0)
+            enclosures.append(enclosure)
+        return enclosures
+
+    def test_distance_matrix_from_locations(self, row_of_enclosures: list[Enclosure]) -> None:
+        distances = RoutePlanner().distance_matrix(row_of_enclosures[:3])
+        assert np.allclose(distances, [[0, 40, 10], [40, 0, 30], [10, 30, 0]])
+
+    def test_distance_matrix_from_walking_paths(self, row_of_enclosures: list[Enclosure]) -> None:
+        planner = RoutePlanner()
+        a, b, c = row_of_enclosures[:3]
+        planner.add_path(a, b, 5)
+        planner.add_path(b, c, 7)
+        assert np.allclose(planner.distance_matrix([a, b, c]), [[0, 5, 12], [5, 0, 7], [12, 7, 0]])
+
+    def test_plan_route_walks_in_a_line(self, row_of_enclosures: list[Enclosure]) -> None:
+        start = row_of_enclosures[1]  # x = 0
+        route = RoutePlanner().plan_route(row_of_enclosures, start)
+        assert [enclosure.location[0] for enclosure in route] == [0, 10, 20, 30, 40]
+
+    def test_two_opt_improves_on_nearest_neighbour(self) -> None:
+        generator = random.Random(7)
+        stops = []
+        for number in range(200):
+            enclosure = Enclosure(f"Pen{number}", EnvironmentalType.GRASS, 10)
+            enclosure.location = (generator.uniform(0, 1000), generator.uniform(0, 1000))
+            stops.append(enclosure)
+
+        planner = RoutePlanner()
+        distances = planner.distance_matrix(stops)
+        route = planner.plan_route(stops)
+        position = {enclosure.id: i for i, enclosure in enumerate(stops)}
+        route_length = sum(distances[position[a.id], position[b.id]] for a, b in zip(route, route[1:]))
+        id_order_length = sum(distances[i, i + 1] for i in range(len(stops) - 1))
+
+        assert sorted(enclosure.id for enclosure in route) == sorted(enclosure.id for enclosure in stops)
+        assert route_length < id_order_length / 4
+
+    def test_generate_schedule_orders_same_time_tasks(self, row_of_enclosures: list[Enclosure]) -> None:
+        keeper = Zookeeper("Daniel")
+        for enclosure in row_of_enclosures:
+            cobra = Reptile("Cobra", "King Cobra", "Hiss", "Smooth", True, 4, habitat=EnvironmentalType.DESERT)
+            cobra.add_to_diet("Raw Chicken", "200g", time(10))
+            enclosure.add_animal(cobra)
+            keeper.assign(enclosure)
+
+        schedule = keeper.generate_schedule(RoutePlanner()).data
+        cleaning_order = [row.ObjectName for row in schedule.itertuples() if row.Time == time(7)]
+        feeding_order = [row.ObjectID for row in schedule.itertuples() if row.Time == time(10)]
+
+        assert cleaning_order == ["Pen40", "Pen30", "Pen20", "Pen10", "Pen0"]
+        # the feeding round starts where the cleaning round finished:
+        assert feeding_order == [row_of_enclosures[i].inhabitants[0].id for i in (1, 3, 4, 2, 0)]
+
+    def test_invalid_location(self, capsys) -> None:
+        enclosure = Enclosure("Dune", EnvironmentalType.DESERT, 10)
+        enclosure.location = "north"
+        assert capsys.readouterr().out.strip() == \
+               "[ERROR] The location of an enclosure must be a pair of (x, y) coordinates. No change made."
+        assert enclosure.location is None
@@ -0,0 +1,76 @@
+"""
+File: test_tracing.py
+Description: Suite of unit tests for the Tracer class and the instrumentation hooks it uses.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import json
+from datetime import datetime
+
+import pytest
+
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from instrumentation import get_hooks
+from metrics import MetricsRegistry
+from tracing import Tracer
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+
+class TestTracing:
+    @pytest.fixture
+    def zoo1(self) -> ZooSystem:
+        zoo = ZooSystem("The Royal Zoo")
+        keeper = Zookeeper("Daniel")
+        dune = Enclosure("Dune", EnvironmentalType.DESERT, 10)
+        zoo.add_enclosure(dune)
+        zoo.add_staff_member(keeper)
+        zoo.assign_staff_to_enclosure(keeper, dune, datetime(2004, 11, 12))  # cleaned at 7am each day
+        return zoo
+
+    def test_nested_spans(self, zoo1: ZooSystem) -> None:
+        with Tracer() as tracer:
+            zoo1.report_zoo_daily_staff_schedules()
+        assert get_hooks() == ()
+        stacks = {span.stack for span in tracer.spans}
+        assert ("ZooSystem.report_zoo_daily_staff_schedules", "Zookeeper.generate_schedule", "Schedule.new",
+                "DataRecord.new") in stacks
+        report = tracer.spans[-1]  # the outermost call ends last
+        assert report.name == "ZooSystem.report_zoo_daily_staff_schedules" and report.stack == (report.name,)
+        inner = [span for span in tracer.spans if len(span.stack) == 2]
+        assert report.self_time == report.duration - sum(span.duration for span in inner)
+
+        zoo1.report_species()  # not traced once the block ends
+        assert "ZooSystem.report_species" not in {span.name for span in tracer.spans}
+
+    def test_sampling(self, zoo1: ZooSystem) -> None:
+        with Tracer(sample_every=3) as tracer:
+            for _ in range(6):
+                zoo1.report_zoo_daily_staff_schedules()
+        outermost = [span for span in tracer.spans if len(span.stack) == 1]
+        assert len(outermost) == 2 and tracer.sample_every == 3
+        assert all(span.stack[0] == outermost[0].name for span in tracer.spans)  # nested calls follow their root
+
+    def test_output(self, zoo1: ZooSystem, tmp_path) -> None:
+        clock = iter(range(0, 10 ** 9, 1000))  # each reading of the clock is one microsecond later
+        metrics = MetricsRegistry()
+        metrics.enable()
+        with Tracer(clock=lambda: next(clock)) as tracer:
+            zoo1.report_zoo_daily_staff_schedules()
+        metrics.disable()
+        assert metrics.calls.value("Zookeeper.generate_schedule") == 1  # the hooks can be used together
+
+        lines = tracer.collapsed_stacks().splitlines()
+        assert any(line.startswith("ZooSystem.report_zoo_daily_staff_schedules;Zookeeper.generate_schedule ")
+                   for line in lines)
+        assert sum(int(line.rpartition(" ")[2]) for line in lines) == tracer.spans[-1].duration // 1000
+
+        tracer.write(str(tmp_path / "nightly"))
+        trace = json.loads((tmp_path / "nightly.trace.json").read_text())
+        events = {event["name"]: event for event in trace["traceEvents"]}
+        assert events["ZooSystem.report_zoo_daily_staff_schedules"]["ph"] == "X"
+        assert events["ZooSystem.report_zoo_daily_staff_schedules"]["ts"] == 1
+        assert (tmp_path / "nightly.folded").read_text().splitlines() == lines
@@ -0,0 +1,135 @@
+"""
+File: test_triage_queue.py
+Description: Suite of unit tests for the TriageQueue class and the IndexedHeap class it is built on.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from datetime import datetime, time
+
+import pytest
+
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from indexed_heap import IndexedHeap
+from mammal import Mammal
+from reptile import Reptile
+from severity import Severity
+from veterinarian import Veterinarian
+from zoo_system import ZooSystem
+
+
+class TestIndexedHeap:
+    @pytest.fixture
+    def heap(self) -> IndexedHeap:
+        heap = IndexedHeap()
+        for key, priority in (("a", 5), ("b", 3), ("c", 8), ("d", 1), ("e", 7)):
+            heap.push(key, priority)
+        return heap
+
+    def test_pop_in_priority_order(self, heap: IndexedHeap) -> None:
+        assert [heap.pop()[0] for _ in range(len(heap))] == ["d", "b", "a", "e", "c"]
+        assert heap.pop() is None
+
+    def test_update_and_remove(self, heap: IndexedHeap) -> None:
+        heap.decrease_key("c", 0)
+        assert heap.peek(1) == [("c", 0)]
+        heap.update("d", 9)
+        heap.remove("b")
+        assert "b" not in heap
+        assert [key for key, priority in heap.peek(5)] == ["c", "a", "e", "d"]
+
+    def test_decrease_key_cannot_increase(self, heap: IndexedHeap, capsys) -> None:
+        heap.decrease_key("d", 10)
+        assert capsys.readouterr().out.strip() == "[ERROR] The new priority of d is higher than its existing " \
+                                                  "priority. No change made."
+        assert heap.get_priority("d") == 1
+
+    def test_peek_with_predicate(self, heap: IndexedHeap) -> None:
+        assert heap.peek(2, lambda key: key in {"a", "c", "e"}) == [("a", 5), ("e", 7)]
+        assert len(heap) == 5  # peeking does not remove entries
+
+
+class TestTriageQueue:
+    @pytest.fixture
+    def zoo1(self) -> dict:
+        zoo = ZooSystem("The Royal Zoo")
+        dune = Enclosure("Dune", EnvironmentalType.DESERT, 10)
+        hideout = Enclosure("DesertHideout", EnvironmentalType.DESERT, 10)
+        cobra = Reptile("Shai-Hulud", "King Cobra", "Hiss", "Smooth", True, 4,
+                        habitat=EnvironmentalType.DESERT)
+        mouse1 = Mammal("Muad'Dib", "Brown Desert Mouse", "Squeak", "Brown", True,
+                        habitat=EnvironmentalType.DESERT)
+        mouse2 = Mammal("Chani", "Brown Desert Mouse", "Squeak", "Brown", True,
+                        habitat=EnvironmentalType.DESERT)
+        vet = Veterinarian("Ethan")
+
+        for enclosure in (dune, hideout):
+            zoo.add_enclosure(enclosure)
+        for animal in (cobra, mouse1, mouse2):
+            zoo.add_animal(animal)
+        zoo.add_staff_member(vet)
+        zoo.assign_animal_to_enclosure(cobra, dune)
+        zoo.assign_animal_to_enclosure(mouse1, hideout)
+        zoo.assign_animal_to_enclosure(mouse2, hideout)
+        zoo.assign_staff_to_enclosure(vet, hideout, datetime(2004, 11, 10))
+
+        return {"zoo": zoo, "cobra": cobra, "mouse1": mouse1, "mouse2": mouse2, "vet": vet}
+
+    def test_ordered_by_severity_then_age(self, zoo1: dict) -> None:
+        zoo, vet = zoo1["zoo"], zoo1["vet"]
+        vet.check_health(zoo1["mouse1"], "Limping", Severity.MODERATE, datetime(2004, 11, 12, 9))
+        vet.check_health(zoo1["cobra"], "Shedding issue", Severity.MODERATE, datetime(2004, 11, 12, 8))
+        vet.check_health(zoo1["mouse2"], "Not eating", Severity.HIGH, datetime(2004, 11, 12, 10))
+
+        assert zoo.triage.peek(3) == [zoo1["mouse2"], zoo1["cobra"], zoo1["mouse1"]]
+        assert zoo.triage.get_severity(zoo1["mouse2"]) == Severity.HIGH
+        assert zoo.triage.pop_most_urgent() == zoo1["mouse2"]
+        assert len(zoo.triage) == 2
+
+    def test_updates_on_treatment_and_recovery(self, zoo1: dict) -> None:
+        zoo, vet = zoo1["zoo"], zoo1["vet"]
+        vet.diagnose(zoo1["mouse1"], "Anxiety", Severity.LOW, "Cuddles.", [[time(7), "5 min cuddles"]],
+                     datetime(2004, 11, 12, 8))
+        vet.diagnose(zoo1["mouse2"], "Anxiety", Severity.LOW, "Cuddles.", [[time(7), "5 min cuddles"]],
+                     datetime(2004, 11, 12, 9))
+        assert zoo.triage.peek(2) == [zoo1["mouse1"], zoo1["mouse2"]]
+
+        # treating mouse1 means it has been attended to more recently than mouse2:
+        vet.treat(zoo1["mouse1"], "5 min cuddles", Severity.LOW, datetime(2004, 11, 12, 10))
+        assert zoo.triage.peek(2) == [zoo1["mouse2"], zoo1["mouse1"]]
+        assert zoo.triage.get_severity(zoo1["mouse1"]) == Severity.LOW
+
+        vet.declare_recovery(zoo1["mouse2"], "Calm again.", datetime(2004, 11, 12, 11))
+        assert zoo1["mouse2"] not in zoo.triage
+        assert zoo.triage.peek(5) == [zoo1["mouse1"]]
+
+    def test_escalate_moves_animal_up(self, zoo1: dict) -> None:
+        zoo, vet = zoo1["zoo"], zoo1["vet"]
+        vet.check_health(zoo1["mouse1"], "Limping", Severity.MODERATE, datetime(2004, 11, 12, 9))
+        vet.check_health(zoo1["mouse2"], "Sneezing", Severity.LOW, datetime(2004, 11, 12, 8))
+        zoo.triage.escalate(zoo1["mouse2"], Severity.VERY_HIGH, datetime(2004, 11, 12, 12))
+        assert zoo.triage.pop_most_urgent() == zoo1["mouse2"]
+
+    def test_next_patients_only_includes_assigned_animals(self, zoo1: dict) -> None:
+        zoo, vet = zoo1["zoo"], zoo1["vet"]
+        vet.check_health(zoo1["cobra"], "Shedding issue", Severity.VERY_HIGH, datetime(2004, 11, 12, 8))
+        vet.check_health(zoo1["mouse1"], "Limping", Severity.MODERATE, datetime(2004, 11, 12, 9))
+        vet.check_health(zoo1["mouse2"], "Not eating", Severity.HIGH, datetime(2004, 11, 12, 10))
+
+        assert vet.next_patients(zoo.triage, 5) == [zoo1["mouse2"], zoo1["mouse1"]]
+        assert vet.next_patients(zoo.triage, 1) == [zoo1["mouse2"]]
+
+    def test_watch_seeds_from_existing_history_and_unwatch(self, zoo1: dict) -> None:
+        zoo = ZooSystem("Second Zoo")
+        mouse = zoo1["mouse1"]
+        zoo1["vet"].check_health(mouse, "Limping", Severity.MODERATE, datetime(2004, 11, 12, 9))
+
+        zoo.add_animal(mouse)
+        assert zoo.triage.peek(1) == [mouse]
+
+        zoo.remove_animal(mouse)
+        assert len(zoo.triage) == 0
+        zoo1["vet"].check_health(mouse, "Limping", Severity.HIGH, datetime(2004, 11, 12, 10))
+        assert len(zoo.triage) == 0  # no longer watched
@@ -0,0 +1,96 @@
+"""
+File: test_workload.py
+Description: Suite of unit tests for the WorkloadRecorder and WorkloadReplayer classes.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import gzip
+from datetime import datetime, time
+
+import pytest
+
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from instrumentation import get_hooks
+from metrics import MetricsRegistry
+from reptile import Reptile
+from severity import Severity
+from veterinarian import Veterinarian
+from workload import WorkloadRecorder, WorkloadReplayer, read_workload
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+
+def open_zoo() -> ZooSystem:
+    """Build a small zoo and run a day of it: the workload recorded by the tests."""
+    zoo = ZooSystem("The Royal Zoo")
+    dune = Enclosure("Dune", EnvironmentalType.DESERT, 10)
+    zoo.add_enclosure(dune)
+    cobra = Reptile("Shai-Hulud", "King Cobra", "Hiss", "Smooth", True, 4, habitat=EnvironmentalType.DESERT)
+    zoo.add_animal(cobra)
+    zoo.assign_animal_to_enclosure(cobra, dune)
+    keeper, vet = Zookeeper("Daniel"), Veterinarian("Ethan")
+    zoo.add_staff_member(keeper)
+    zoo.add_staff_member(vet)
+    zoo.assign_staff_to_enclosure(keeper, dune, datetime(2004, 11, 12))
+    keeper.feed(cobra, "Raw Chicken", "200g", datetime(2004, 11, 12, 9))
+    vet.diagnose(cobra, "Mouth rot", Severity.HIGH, "Antibiotics.", [[time(9), "antibiotics"]],
+                 datetime(2004, 11, 12, 10))
+    zoo.report_zoo_daily_staff_schedules()
+    return zoo
+
+
+class TestWorkload:
+    def test_record_and_replay(self, tmp_path) -> None:
+        outsider = Reptile("Sally", "Rattlesnake", "Hiss", "Keeled")  # built before recording began
+        with WorkloadRecorder() as recorder:
+            zoo = open_zoo()
+            zoo.add_animal(outsider)
+        assert get_hooks() == ()
+        labels = [f"{call[3]}.{call[4]}" for call in recorder.calls]
+        assert labels[:3] == ["ZooSystem.__init__", "Enclosure.__init__", "ZooSystem.add_enclosure"]
+        assert "Zookeeper.feed" in labels and "Animal.eat" not in labels  # only the outermost calls
+        feed = recorder.calls[labels.index("Zookeeper.feed")]
+        assert feed[5][1:] == ["Raw Chicken", "200g", {"datetime": "2004-11-12T09:00:00"}] and "ref" in feed[5][0]
+
+        recorder.write(str(tmp_path / "day.workload.gz"))
+        header, calls = read_workload(str(tmp_path / "day.workload.gz"))
+        assert header["calls"] == len(calls) == len(recorder.calls)
+        assert [call[1] for call in calls] == sorted(call[1] for call in calls)
+
+        results = WorkloadReplayer(calls).replay()
+        assert results.skipped == 1  # adding the outsider, which the trace never built
+        assert results.operations == len(calls) - 1 and sum(results.errors.values()) == 0
+        assert len(results.durations["ZooSystem.add_staff_member"]) == 2
+        assert "Veterinarian.diagnose" in str(results)
+
+    def test_replay_speed(self) -> None:
+        calls = [["new", 0.0, 0, "ZooSystem", "__init__", ["The Royal Zoo"], {}, False],
+                 ["call", 0.1, 0, "ZooSystem", "report_species", [], {}, False],
+                 ["call", 0.2, 0, "ZooSystem", "add_animal", [{"unsupported": "RoutePlanner"}], {}, False],
+                 ["call", 0.2, 0, "ZooSystem", "remove_animal", [], {}, False]]
+        assert WorkloadReplayer(calls).replay(speed=2.0).duration >= 0.1  # half the recorded pace
+        results = WorkloadReplayer(calls).replay()
+        assert results.duration < 0.1 and results.skipped == 1
+        assert results.errors == {"ZooSystem.remove_animal": 1}  # raised TypeError, as it would have when recorded
+
+    def test_recorder_shares_methods_with_other_hooks(self, tmp_path) -> None:
+        metrics = MetricsRegistry()
+        metrics.enable()
+        recorder = WorkloadRecorder()
+        recorder.start()
+        metrics.disable()  # the recorder keeps observing the methods it shares with the metrics
+        try:
+            zoo = ZooSystem("The Royal Zoo")
+            zoo.report_species()
+        finally:
+            recorder.stop()
+        assert [call[4] for call in recorder.calls] == ["__init__", "report_species"]
+        assert not hasattr(ZooSystem.report_species, "__wrapped__") and not hasattr(Zookeeper.feed, "__wrapped__")
+
+        with gzip.open(tmp_path / "other.gz", "wt") as file:
+            file.write('{"format": "zoo-workload", "version": 99}\n')
+        with pytest.raises(ValueError):
+            read_workload(str(tmp_path / "other.gz"))
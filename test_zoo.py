@@ -0,0 +1,55 @@
+"""
+File: test_zoo.py
+Description: Suite of unit tests for the command line of the Zoo Management System.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import os
+import subprocess
+import sys
+
+from benchmarks.synthetic_zoo import generate_zoo
+from zoo import main
+from zoo_store import ZooStore
+
+
+class TestZoo:
+    def test_import_and_report(self, tmp_path, capsys) -> None:
+        store = str(tmp_path / "royal")
+        assert main(["import", store, "--synthetic", "20", "--seed", "4"]) == 0
+        assert "Saved Synthetic Zoo (20 animals, seed 4)" in capsys.readouterr().out
+        assert main(["import", store, "--synthetic", "20"]) == 1  # the store already holds a zoo.
+
+        assert main(["report", store, "species", "zoo_staff_activity", "--output", str(tmp_path / "out.txt")]) == 0
+        report = (tmp_path / "out.txt").read_text(encoding="utf-8")
+        assert "ANIMALS BY SPECIES (20 total)" in report and "COMBINED STAFF GENERAL ACTIVITY LOG" in report
+        assert report.index("ANIMALS BY SPECIES") < report.index("COMBINED STAFF GENERAL ACTIVITY LOG")
+
+        assert main(["report", store, "animal_medical_history"]) == 1  # which animal?
+        assert main(["report", store, "animal_medical_history", "--animal", "A0"]) == 1
+        assert main(["report", str(tmp_path / "nowhere"), "species"]) == 1
+        assert "holds no zoo" in capsys.readouterr().err
+
+    def test_report_in_new_process(self, tmp_path) -> None:
+        zoo = generate_zoo(20, seed=5)
+        ZooStore(str(tmp_path / "royal")).save(zoo)
+        for name in ("animals_on_display", "enclosure_status", "zoo_enclosure_maintenance"):
+            result = subprocess.run([sys.executable, "-m", "zoo", "report", str(tmp_path / "royal"), name],
+                                    capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+            assert result.returncode == 0
+            assert result.stdout == getattr(zoo, f"report_{name}")()  # with the ids the zoo was saved with.
+
+    def test_simulate_and_compact(self, tmp_path, capsys) -> None:
+        store = str(tmp_path / "royal")
+        main(["import", store, "--synthetic", "20"])
+        assert main(["simulate", store, "--days", "2", "--seed", "1"]) == 0
+        assert '"days": 2' in capsys.readouterr().out
+        simulated = ZooStore(store)
+        simulated.load()
+        assert len(simulated.segments) == 2 and simulated.latest.date().isoformat() == "2004-11-03"
+
+        events = ZooStore(store).event_count
+        assert main(["compact", store]) == 0
+        assert len(ZooStore(store).segments) == 1 and ZooStore(store).event_count == events
@@ -0,0 +1,91 @@
+"""
+File: test_zoo_batch.py
+Description: Suite of unit tests for the ZooBatch class and the atomic changes it makes to a ZooSystem.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from datetime import datetime, time
+
+import pytest
+
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from mammal import Mammal
+from reptile import Reptile
+from severity import Severity
+from veterinarian import Veterinarian
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+
+class TestZooBatch:
+    @pytest.fixture
+    def zoo1(self) -> ZooSystem:
+        zoo = ZooSystem("The Royal Zoo")
+        zoo.enable_history()
+        dune = Enclosure("Dune", EnvironmentalType.DESERT, 10)
+        arrakis = Enclosure("Arrakis", EnvironmentalType.DESERT, 10)
+        lagoon = Enclosure("Blue Lagoon", EnvironmentalType.AQUATIC, 10)
+        cobras = [Reptile(f"Cobra {number}", "King Cobra", "Hiss", "Smooth", True, 4,
+                          habitat=EnvironmentalType.DESERT) for number in range(3)]
+        mouse = Mammal("Stuart", "Desert Mouse", "Squeak", "Sandy", True, 1, habitat=EnvironmentalType.DESERT)
+        for enclosure in (dune, arrakis, lagoon):
+            zoo.add_enclosure(enclosure)
+        for animal in cobras + [mouse]:
+            zoo.add_animal(animal)
+        for cobra in cobras:
+            zoo.assign_animal_to_enclosure(cobra, dune)
+        zoo.assign_animal_to_enclosure(mouse, arrakis)
+        zoo.add_staff_member(Zookeeper("Daniel"))
+        zoo.add_staff_member(Veterinarian("Ethan"))
+        return zoo
+
+    def test_swap_enclosures(self, zoo1: ZooSystem) -> None:
+        dune, arrakis, lagoon = zoo1.enclosures
+        *cobras, mouse = zoo1.animals
+        keeper = zoo1.staff[0]
+        with zoo1.batch(datetime(2004, 11, 12)) as rotation:
+            for cobra in cobras:
+                rotation.move_animal(cobra, dune, arrakis)
+            rotation.move_animal(mouse, arrakis, dune)  # only allowed as the cobras leave in the same batch
+            rotation.assign_staff(keeper, arrakis)
+            rotation.remove_enclosure(lagoon)
+        assert arrakis.inhabitants == cobras and arrakis.species == "King Cobra"
+        assert dune.inhabitants == [mouse] and dune.species == "Desert Mouse"
+        assert keeper.enclosure_assignments == [arrakis] and lagoon not in zoo1.enclosures
+        assert zoo1.as_of(datetime(2004, 11, 12)).inhabitants(arrakis) == cobras
+        assert len(rotation) == 0
+
+    def test_all_or_nothing(self, zoo1: ZooSystem, capsys) -> None:
+        dune, arrakis, lagoon = zoo1.enclosures
+        *cobras, mouse = zoo1.animals
+        keeper, vet = zoo1.staff
+        vet.diagnose(cobras[2], "Mouth rot", Severity.HIGH, "Antibiotics.", [[time(9), "antibiotics"]],
+                     datetime(2004, 11, 11))
+        events_before = len(zoo1.history)
+
+        batch = zoo1.batch(datetime(2004, 11, 12))
+        for cobra in cobras:
+            batch.move_animal(cobra, dune, arrakis)  # the third cobra is under treatment
+        batch.assign_staff(keeper, arrakis)
+        batch.move_animal(mouse, arrakis, lagoon)  # aquatic
+        batch.remove_enclosure(arrakis)  # not empty, as the cobras move in
+        assert len(batch.check()) == 3 and len(batch) == 6
+        assert not batch.commit()
+        assert "The batch of 6 changes cannot be made" in capsys.readouterr().out
+        assert dune.inhabitants == cobras and arrakis.inhabitants == [mouse] and arrakis in zoo1.enclosures
+        assert keeper.enclosure_assignments == [] and len(zoo1.history) == events_before
+
+        assert not zoo1.move_animal(cobras[2], dune, arrakis)  # a single move is not half made either
+        assert cobras[2] in dune.inhabitants
+
+    def test_exception_discards_batch(self, zoo1: ZooSystem) -> None:
+        dune, arrakis, lagoon = zoo1.enclosures
+        cobra = zoo1.animals[0]
+        with pytest.raises(RuntimeError):
+            with zoo1.batch() as batch:
+                batch.remove_animal(cobra)
+                raise RuntimeError("interrupted")
+        assert cobra in zoo1.animals and cobra in dune.inhabitants
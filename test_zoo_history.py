@@ -0,0 +1,116 @@
+"""
+File: test_zoo_history.py
+Description: Suite of unit tests for the ZooHistory and ZooState classes and the time-travel queries of ZooSystem.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from reptile import Reptile
+from severity import Severity
+from state_change import StateChange
+from veterinarian import Veterinarian
+from zoo_history import ZooHistory
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+
+class TestZooHistory:
+    @pytest.fixture
+    def zoo1(self) -> ZooSystem:
+        zoo = ZooSystem("The Royal Zoo")
+        zoo.enable_history()
+        zoo.add_enclosure(Enclosure("Dune", EnvironmentalType.DESERT, 10), datetime(2004, 11, 1))
+        zoo.add_enclosure(Enclosure("Arrakis", EnvironmentalType.DESERT, 10), datetime(2004, 11, 1))
+        zoo.add_animal(Reptile("Shai-Hulud", "King Cobra", "Hiss", "Smooth", True, 4,
+                               habitat=EnvironmentalType.DESERT), datetime(2004, 11, 2))
+        zoo.add_staff_member(Zookeeper("Daniel"), datetime(2004, 11, 2))
+        zoo.add_staff_member(Veterinarian("Ethan"), datetime(2004, 11, 2))
+        return zoo
+
+    def test_inhabitants_as_of(self, zoo1: ZooSystem) -> None:
+        dune, arrakis = zoo1.enclosures
+        cobra = zoo1.animals[0]
+        zoo1.assign_animal_to_enclosure(cobra, dune, datetime(2004, 11, 3))
+        zoo1.move_animal(cobra, dune, arrakis, datetime(2004, 11, 5))
+
+        assert zoo1.as_of(datetime(2004, 11, 1)).animals == []
+        assert zoo1.as_of(datetime(2004, 11, 2)).enclosure_of(cobra) is None
+        assert zoo1.as_of(datetime(2004, 11, 4)).inhabitants(dune) == [cobra]
+        state = zoo1.as_of(datetime(2004, 11, 6))
+        assert state.inhabitants(dune) == [] and state.enclosure_of(cobra) is arrakis
+        assert state.at_datetime == datetime(2004, 11, 6)
+
+        zoo1.remove_animal(cobra, datetime(2004, 11, 7))
+        assert cobra not in zoo1.as_of(datetime(2004, 11, 8)).animals
+        assert zoo1.as_of(datetime(2004, 11, 8)).inhabitants(arrakis) == []
+        assert zoo1.as_of(datetime(2004, 11, 6)).inhabitants(arrakis) == [cobra]  # the past is unchanged
+
+    def test_health_cleanliness_and_assignments_as_of(self, zoo1: ZooSystem) -> None:
+        keeper, vet = zoo1.staff
+        dune = zoo1.enclosures[0]
+        cobra = zoo1.animals[0]
+        zoo1.assign_staff_to_enclosure(keeper, dune, datetime(2004, 11, 3))
+        dune.become_dirtier(datetime(2004, 11, 4), 3)
+        keeper.clean(dune, datetime(2004, 11, 6))
+        vet.diagnose(cobra, "Mouth rot", Severity.HIGH, "Antibiotics.", [[time(9), "antibiotics"]],
+                     datetime(2004, 11, 4))
+        vet.declare_recovery(cobra, "Recovered.", datetime(2004, 11, 6))
+
+        before, during, after = (zoo1.as_of(datetime(2004, 11, day)) for day in (2, 5, 7))
+        assert before.assignments(keeper) == [] and during.assignments(keeper) == [dune]
+        assert before.cleanliness(dune) == Severity.VERY_HIGH
+        assert during.cleanliness(dune) == Severity.LOW
+        assert after.cleanliness(dune) == dune.cleanliness and after.cleanliness(dune).level > Severity.LOW.level
+        assert not before.under_treatment(cobra) and during.under_treatment(cobra)
+        assert not after.under_treatment(cobra)
+
+    def test_checkpoints_and_late_events(self) -> None:
+        history = ZooHistory(checkpoint_interval=timedelta(days=2), max_checkpoints=8)
+        dune = Enclosure("Dune", EnvironmentalType.DESERT, 10)
+        for day in range(1, 11):
+            history.record(datetime(2004, 11, day), StateChange.CLEANLINESS, dune.id, value=day)
+        assert len(history) == 10 and history.checkpoint_count == 6  # the empty state and every other day
+        assert history.as_of(datetime(2004, 11, 6)).cleanliness(dune) == 6
+        assert history.as_of(datetime(2004, 10, 31)).cleanliness(dune) is None
+
+        history.record(datetime(2004, 11, 2, 12), StateChange.CLEANLINESS, dune.id, value=0)  # recorded late
+        assert history.as_of(datetime(2004, 11, 2, 13)).cleanliness(dune) == 0
+        assert history.as_of(datetime(2004, 11, 6)).cleanliness(dune) == 6
+        assert [event.value for event in history.events][:4] == [1, 2, 0, 3]
+        history.record(None, StateChange.CLEANLINESS, dune.id, value=11)  # undated, so at the latest time
+        assert history.events[-1].at_datetime == datetime(2004, 11, 10)
+        assert history.as_of(datetime(2004, 11, 10)).cleanliness(dune) == 11
+
+    def test_checkpoints_are_capped(self) -> None:
+        history = ZooHistory(checkpoint_interval=timedelta(hours=1), max_checkpoints=4)
+        dune, arrakis = (Enclosure(name, EnvironmentalType.DESERT, 10) for name in ("Dune", "Arrakis"))
+        for day in range(1, 31):
+            history.record(datetime(2004, 11, day), StateChange.CLEANLINESS, dune.id, value=day)
+            if day % 10 == 0:
+                history.record(datetime(2004, 11, day), StateChange.CLEANLINESS, arrakis.id, value=-day)
+        assert history.checkpoint_count <= 4 and history.checkpoint_interval >= timedelta(days=4)
+        for day in range(1, 31):
+            state = history.as_of(datetime(2004, 11, day, 12))
+            assert state.cleanliness(dune) == day and state.cleanliness(arrakis) == (-(day // 10 * 10) or None)
+
+        history.record(datetime(2004, 11, 1, 12), StateChange.CLEANLINESS, arrakis.id, value=0)  # late, and early
+        assert history.as_of(datetime(2004, 11, 9)).cleanliness(arrakis) == 0
+        assert history.as_of(datetime(2004, 11, 30)).cleanliness(arrakis) == -30
+
+    def test_history_is_opt_in(self, capsys) -> None:
+        zoo = ZooSystem("The Royal Zoo")
+        dune = Enclosure("Dune", EnvironmentalType.DESERT, 10)
+        zoo.add_enclosure(dune)
+        assert zoo.history is None and zoo.as_of(datetime(2004, 11, 1)) is None
+        assert "No history of The Royal Zoo is kept" in capsys.readouterr().out
+
+        history = zoo.enable_history(at_datetime=datetime(2004, 11, 1))
+        assert zoo.enable_history() is history and len(history) == 1  # the enclosure already in the zoo
+        assert zoo.as_of(datetime(2004, 11, 1)).enclosures == [dune]
@@ -0,0 +1,148 @@
+"""
+File: test_zoo_server.py
+Description: Suite of unit tests for the ZooServer class, its JSON API and the ZooClient and load test that use it.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import asyncio
+import sys
+from datetime import datetime
+
+import pytest
+
+from action import Action
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from reptile import Reptile
+from veterinarian import Veterinarian
+from zoo_load_test import ZooClient, request_mix, run_load_test
+from zoo_server import ZooServer
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+
+def serve(zoo: ZooSystem, test, **options):
+    """Run an async test function against a server of the zoo, passing it the server and a connected client."""
+    async def run():
+        async with ZooServer(zoo, **options) as server, ZooClient(*server.address) as client:
+            return await test(server, client)
+    return asyncio.run(run())
+
+
+class TestZooServer:
+    @pytest.fixture
+    def zoo1(self) -> ZooSystem:
+        zoo = ZooSystem("The Royal Zoo")
+        dune = Enclosure("Dune", EnvironmentalType.DESERT, 100)
+        zoo.add_enclosure(dune)
+        for number in range(4):
+            cobra = Reptile(f"Cobra {number}", "King Cobra", "Hiss", "Smooth", True, 4,
+                            habitat=EnvironmentalType.DESERT)
+            zoo.add_animal(cobra)
+            zoo.assign_animal_to_enclosure(cobra, dune)
+        zoo.add_staff_member(Zookeeper("Daniel"))
+        zoo.add_staff_member(Veterinarian("Ethan"))
+        return zoo
+
+    def test_entities(self, zoo1: ZooSystem) -> None:
+        async def test(server: ZooServer, client: ZooClient) -> None:
+            status, animals = await client.request("GET", "/animals")
+            assert status == 200 and [animal["id"] for animal in animals] == [a.id for a in zoo1.animals]
+            status, lagoon = await client.request("POST", "/enclosures", {"name": "Blue Lagoon",
+                                                                          "environmental_type": "AQUATIC", "size": 5})
+            assert status == 200 and lagoon["result"]["environmental_type"] == "AQUATIC"
+            status, cobra = await client.request("POST", "/animals", {
+                "class": "Reptile", "name": "Sally", "species": "King Cobra", "sound": "Hiss", "scale_type": "Keeled",
+                "habitat": "DESERT"})
+            assert status == 200 and cobra["result"]["class"] == "Reptile"
+
+            cobra_id, lagoon_id = cobra["result"]["id"], lagoon["result"]["id"]
+            status, answer = await client.request("POST", f"/enclosures/{lagoon_id}/animals", {"animal_id": cobra_id})
+            assert status == 409 and "habitat" in answer["errors"][0]  # the zoo's own [ERROR] message
+            dune_id = zoo1.enclosures[0].id
+            status, answer = await client.request("POST", f"/enclosures/{dune_id}/animals", {"animal_id": cobra_id})
+            assert status == 200 and cobra_id in answer["result"]["inhabitants"]
+
+            assert (await client.request("GET", "/animals/A0"))[0] == 404
+            assert (await client.request("PUT", "/animals"))[0] == 405
+            assert (await client.request("POST", "/enclosures", {"name": "Dune"}))[0] == 400
+            assert (await client.request("DELETE", f"/enclosures/{lagoon_id}"))[0] == 200
+            assert lagoon_id not in [enclosure.id for enclosure in zoo1.enclosures]
+
+        serve(zoo1, test)
+
+    def test_staff_actions_and_reports(self, zoo1: ZooSystem) -> None:
+        keeper, vet = zoo1.staff
+        cobra = zoo1.animals[0]
+
+        async def test(server: ZooServer, client: ZooClient) -> None:
+            at = datetime(2004, 11, 12, 9).isoformat()
+            status, _ = await client.request("POST", f"/staff/{keeper.id}/feed", {
+                "animal_id": cobra.id, "food": "Raw Chicken", "quantity": "200g", "at": at})
+            assert status == 200
+            status, _ = await client.request("POST", f"/staff/{vet.id}/diagnose", {
+                "animal_id": cobra.id, "details": "Mouth rot", "severity": "HIGH", "treatment": "Antibiotics.",
+                "treatments": [["09:00", "antibiotics"]], "at": at})
+            assert status == 200 and cobra.under_treatment
+            assert (await client.request("POST", f"/staff/{keeper.id}/diagnose", {"animal_id": cobra.id}))[0] == 404
+            assert (await client.request("POST", f"/staff/{vet.id}/treat", {
+                "animal_id": cobra.id, "severity": "EXTREME"}))[0] == 400
+
+            status, report = await client.request("GET", f"/reports/animal_medical_history/{cobra.id}")
+            assert status == 200 and "Mouth rot" in report
+            status, report = await client.request("GET", "/reports/zoo_staff_activity")
+            assert status == 200 and report == zoo1.report_zoo_staff_activity()
+            assert (await client.request("GET", "/reports/nothing"))[0] == 404
+
+        serve(zoo1, test)
+        assert (zoo1.events([keeper])["Action"] == Action.FEED).sum() == 1
+
+    def test_writes_are_batched(self, zoo1: ZooSystem) -> None:
+        keeper = zoo1.staff[0]
+
+        async def test(server: ZooServer, client: ZooClient) -> None:
+            clients = [ZooClient(*server.address) for _ in range(50)]
+            answers = await asyncio.gather(*(other.request("POST", f"/staff/{keeper.id}/feed", {
+                "animal_id": zoo1.animals[number % 4].id, "food": "Mouse", "quantity": "1x whole"})
+                for number, other in enumerate(clients)))
+            for other in clients:
+                await other.close()
+            assert all(status == 200 for status, _ in answers)
+            assert server.write_count == 50 and server.batch_count < 50
+
+        serve(zoo1, test, batch_window=0.05)
+        assert (zoo1.events([keeper])["Action"] == Action.FEED).sum() == 50
+
+    def test_only_the_writer_thread_is_captured(self, zoo1: ZooSystem, capsys) -> None:
+        async def test(server: ZooServer, client: ZooClient) -> None:
+            status, answer = await client.request("POST", "/animals", {"class": "Reptile", "name": "Sally"})
+            assert status == 400 and "cannot be made" in answer["error"]  # made on the writer thread
+            printing = asyncio.get_running_loop().run_in_executor(None, lambda: [print("elsewhere")
+                                                                                 for _ in range(200)])
+            clients = [ZooClient(*server.address) for _ in zoo1.animals]
+            answers = await asyncio.gather(*(other.request("DELETE", f"/enclosures/{zoo1.enclosures[0].id}")
+                                             for other in clients))  # not empty, so each prints an [ERROR]
+            await printing
+            for other in clients:
+                await other.close()
+            assert all(status == 409 and len(answer["errors"]) == 1 for status, answer in answers)
+            assert zoo1.get_member(zoo1.animals[0].id) is zoo1.animals[0] and zoo1.get_member("A0") is None
+
+        stdout = sys.stdout
+        serve(zoo1, test)
+        assert sys.stdout is stdout  # put back once the server closes
+        printed = capsys.readouterr().out
+        assert printed.count("elsewhere") == 200 and "[ERROR]" not in printed
+
+    def test_load_test(self, zoo1: ZooSystem) -> None:
+        async def test(server: ZooServer, client: ZooClient):
+            mix = await request_mix(*server.address)
+            assert [method for method, path, body in mix].count("POST") == len(zoo1.animals)
+            return await run_load_test(*server.address, mix, rate=400, duration=0.5, connections=8)
+
+        results = serve(zoo1, test)
+        assert len(results.latencies) == 200 and results.errors == 0
+        assert 0 < results.percentile(50) <= results.percentile(99) <= max(results.latencies)
+        assert "p99" in str(results)
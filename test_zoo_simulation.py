@@ -0,0 +1,89 @@
+"""
+File: test_zoo_simulation.py
+Description: Suite of unit tests for the ZooSimulation class and the clocks that drive it.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from datetime import datetime, time, timedelta
+
+from action import Action
+from clock import SimulatedClock
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from reptile import Reptile
+from veterinarian import Veterinarian
+from zoo_simulation import ZooSimulation, run_scenarios
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+
+def build_desert_zoo(seed: int = 0) -> ZooSystem:
+    """Build a small zoo of two desert enclosures of cobras, with one zookeeper and one vet."""
+    zoo = ZooSystem(f"Desert Zoo {seed}")
+    keeper = Zookeeper("Daniel")
+    vet = Veterinarian("Ethan")
+    zoo.add_staff_member(keeper)
+    zoo.add_staff_member(vet)
+
+    for enclosure_number in range(2):
+        enclosure = Enclosure(f"Dune{enclosure_number}", EnvironmentalType.DESERT, 10)
+        zoo.add_enclosure(enclosure)
+        for animal_number in range(5):
+            cobra = Reptile(f"Cobra{animal_number}", "King Cobra", "Hiss", "Smooth", True, 4,
+                            habitat=EnvironmentalType.DESERT)
+            cobra.add_to_diet("Raw Chicken", "200g", time(10))
+            zoo.add_animal(cobra)
+            zoo.assign_animal_to_enclosure(cobra, enclosure)
+        zoo.assign_staff_to_enclosure(keeper, enclosure, datetime(2004, 11, 1))
+        zoo.assign_staff_to_enclosure(vet, enclosure, datetime(2004, 11, 1))
+    return zoo
+
+
+class TestZooSimulation:
+    def test_simulated_clock(self) -> None:
+        clock = SimulatedClock(datetime(2004, 11, 12))
+        clock.advance_to(datetime(2004, 11, 13))
+        clock.advance_to(datetime(2004, 11, 12, 12))  # cannot go backwards
+        assert clock.now() == datetime(2004, 11, 13)
+
+    def test_staff_carry_out_daily_schedules(self) -> None:
+        zoo = build_desert_zoo()
+        summary = ZooSimulation(zoo, datetime(2004, 11, 12), seed=1, incident_rate=0).run(3)
+
+        assert summary["events"]["day"] == 3
+        assert summary["events"]["feed"] == 10 * 3
+        assert summary["events"]["clean"] == 2 * 3
+        assert summary["events"]["perform health checkup on"] == 10 * 3
+        assert summary["events"]["decay"] == 5  # every 12 hours, except at the very end of the last day
+
+        keeper = zoo.staff[0]
+        feeds = keeper.log.data[keeper.log.data["Action"] == Action.FEED]
+        assert len(feeds) == 30
+        assert feeds["DateTime"].min() == datetime(2004, 11, 12, 10)
+        assert zoo.animals[0].log.data["Action"].value_counts()[Action.EAT] == 3
+
+    def test_decay_through_animal_table(self) -> None:
+        zoo, table_zoo = build_desert_zoo(), build_desert_zoo()
+        table_zoo.enable_animal_table()
+        summary = ZooSimulation(zoo, datetime(2004, 11, 12), seed=2, incident_rate=0.1).run(3)
+        assert ZooSimulation(table_zoo, datetime(2004, 11, 12), seed=2, incident_rate=0.1).run(3) == summary
+        assert [animal.cleanliness for animal in table_zoo.animals] == [animal.cleanliness for animal in zoo.animals]
+        assert [list(animal.log.data["Details"]) for animal in table_zoo.animals] == [
+            list(animal.log.data["Details"]) for animal in zoo.animals]
+
+    def test_same_seed_gives_same_results(self) -> None:
+        options = {"incident_rate": 0.2, "decay_interval": timedelta(hours=8)}
+        summary1 = ZooSimulation(build_desert_zoo(), datetime(2004, 11, 12), 7, **options).run(10)
+        summary2 = ZooSimulation(build_desert_zoo(), datetime(2004, 11, 12), 7, **options).run(10)
+        assert summary1 == summary2
+        assert summary1["events"]["incident"] > 0
+        assert summary1["events"]["treat"] > 0
+
+    def test_run_scenarios_in_parallel(self) -> None:
+        summaries = run_scenarios(build_desert_zoo, datetime(2004, 11, 12), 2, [1, 2, 3], max_workers=2,
+                                  incident_rate=0.1)
+        assert [summary["seed"] for summary in summaries] == [1, 2, 3]
+        assert summaries[0] == ZooSimulation(build_desert_zoo(1), datetime(2004, 11, 12), 1,
+                                             incident_rate=0.1).run(2)
@@ -0,0 +1,165 @@
+"""
+File: test_zoo_store.py
+Description: Suite of unit tests for the ZooStore class.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import sys
+from datetime import datetime, time
+
+import pytest
+
+from action import Action
+from benchmarks.synthetic_zoo import generate_zoo
+from bird import Bird
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from reptile import Reptile
+from severity import Severity
+from veterinarian import Veterinarian
+from zoo_store import ZooStore
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+
+def describe(zoo: ZooSystem) -> dict:
+    """Describe a zoo without the ids of its entities (which differ when it is loaded into the same process)."""
+    return {"animals": [(animal.name, type(animal).__name__, animal.age, animal.cleanliness, animal.under_treatment,
+                         animal.sound, list(animal.diet.data["Details"]), list(animal.treatments.data["Details"]),
+                         list(animal.medical_log.data["Details"]), list(animal.log.data["Details"]))
+                        for animal in zoo.animals],
+            "enclosures": [(enclosure.name, enclosure.location, enclosure.cleanliness, enclosure.species,
+                            [animal.name for animal in enclosure.inhabitants], list(enclosure.log.data["Action"]))
+                           for enclosure in zoo.enclosures],
+            "staff": [(staff_member.name, [assigned.name for assigned in staff_member.enclosure_assignments],
+                       list(staff_member.special_tasks.data["Details"]), list(staff_member.log.data["Details"]))
+                      for staff_member in zoo.staff]}
+
+
+def reports(zoo: ZooSystem) -> dict[str, str]:
+    """Generate every report_* of a zoo (the medical history of each of its animals)."""
+    output = {}
+    for name in [name for name in vars(ZooSystem) if name.startswith("report_")]:
+        if name == "report_animal_medical_history":
+            output |= {f"{name} {animal.id}": getattr(zoo, name)(animal) for animal in zoo.animals}
+        else:
+            output[name] = getattr(zoo, name)()
+    return output
+
+
+class TestZooStore:
+    @pytest.fixture
+    def zoo(self) -> ZooSystem:
+        zoo = ZooSystem("The Royal Zoo")
+        dune = Enclosure("Dune", EnvironmentalType.DESERT, 10)
+        dune.location = (10, 20)
+        lagoon = Enclosure("BlueLagoon", EnvironmentalType.AQUATIC, 5)
+        cobra = Reptile("Shai-Hulud", "King Cobra", "Hiss", "Smooth", True, 4, habitat=EnvironmentalType.DESERT)
+        penguin = Bird("Pinky", "Emperor Penguin", 76, False, 2, habitat=EnvironmentalType.AQUATIC)
+        keeper, vet = Zookeeper("Daniel"), Veterinarian("Ethan")
+        for enclosure in (dune, lagoon):
+            zoo.add_enclosure(enclosure, datetime(2004, 11, 1))
+        for animal, enclosure in ((cobra, dune), (penguin, lagoon)):
+            zoo.add_animal(animal, datetime(2004, 11, 1))
+            zoo.assign_animal_to_enclosure(animal, enclosure, datetime(2004, 11, 1))
+        zoo.add_staff_member(keeper)
+        zoo.add_staff_member(vet)
+        zoo.assign_staff_to_enclosure(keeper, dune, datetime(2004, 11, 1, 8))
+        zoo.assign_staff_to_enclosure(keeper, lagoon, datetime(2004, 11, 1, 8))
+        vet.assign(cobra, datetime(2004, 11, 1, 8))
+        cobra.add_to_diet("Raw Chicken", "200g", time(10))
+        keeper.special_tasks.new({"Time": time(14), "SubjectID": keeper.id, "SubjectName": keeper.name,
+                                  "ObjectID": penguin.id, "ObjectName": penguin.name, "Action": Action.GROOM,
+                                  "Details": "Trim feathers"})
+        keeper.feed(cobra, "Raw Chicken", "200g", datetime(2004, 11, 12, 9))
+        lagoon.become_dirtier(datetime(2004, 11, 12, 10), 2)
+        vet.diagnose(cobra, "Mouth rot", Severity.HIGH, "Antibiotics.", [[time(9), "antibiotics"]],
+                     datetime(2004, 11, 12, 11))
+        return zoo
+
+    def test_save_and_load(self, zoo, tmp_path) -> None:
+        store = ZooStore(str(tmp_path / "royal"))
+        assert not store.exists()
+        events = store.save(zoo)
+        assert store.exists() and len(store.segments) == 1 and store.event_count == events > 0
+        assert store.latest == datetime(2004, 11, 12, 11)
+
+        loaded = store.load(history=True)
+        assert loaded is not zoo and loaded.name == "The Royal Zoo"
+        assert describe(loaded) == describe(zoo)
+        assert loaded.animals[0].diet.customised and not loaded.animals[1].diet.customised
+        assert loaded.as_of(datetime(2004, 11, 12, 11)).under_treatment(loaded.animals[0])
+
+        snapshot = json.load(gzip.open(tmp_path / "royal" / "zoo.json.gz"))
+        assert store.save(loaded) == 0  # the history it was loaded with is already on disk.
+        resaved = json.load(gzip.open(tmp_path / "royal" / "zoo.json.gz"))
+        for content in (snapshot, resaved):
+            del content["saved"], content["next_ids"]
+        assert resaved == snapshot  # saved under the ids it was stored with, not those it was loaded with.
+
+    def test_load_without_history(self, zoo, tmp_path) -> None:
+        store = ZooStore(str(tmp_path / "royal"))
+        store.save(zoo)
+        shutil.rmtree(tmp_path / "royal" / "events")  # only the snapshot is read.
+        loaded = store.load()
+        assert [animal.name for animal in loaded.animals] == ["Shai-Hulud", "Pinky"]
+        assert loaded.animals[0].under_treatment and len(loaded.animals[0].medical_log.data) == 0
+        assert loaded.enclosures[1].cleanliness == zoo.enclosures[1].cleanliness
+        assert [animal.name for animal in loaded.enclosures[0].inhabitants] == ["Shai-Hulud"]
+
+    def test_append_and_compact(self, zoo, tmp_path) -> None:
+        store = ZooStore(str(tmp_path / "royal"))
+        first = store.save(zoo)
+        loaded = store.load()
+        keeper, penguin = loaded.staff[0], loaded.animals[1]
+        keeper.feed(penguin, "Fish", "3x whole", datetime(2004, 11, 13, 9))
+        keeper.clean(loaded.enclosures[1], datetime(2004, 11, 13, 10))
+        assert store.save(loaded) == 2  # the feeding (eaten by the penguin and joined by the keeper) and cleaning.
+        assert len(store.segments) == 2 and store.latest == datetime(2004, 11, 13, 10)
+
+        history = ZooStore(str(tmp_path / "royal")).load(history=True)
+        feeds = history.events([history.staff[0]])
+        assert list(feeds["Action"]).count(Action.FEED) == 2
+
+        assert store.compact(segment_events=first) == 2  # at most first events in each segment.
+        assert store.compact() == 1 and store.event_count == first + 2
+        assert describe(ZooStore(str(tmp_path / "royal")).load(history=True)) == describe(history)
+
+    def test_interrupted_compaction(self, zoo, tmp_path) -> None:
+        store = ZooStore(str(tmp_path / "royal"))
+        events = store.save(zoo)
+        expected = describe(store.load(history=True))
+        shutil.copytree(tmp_path / "royal" / "events", tmp_path / "royal" / "events.compact")
+        assert store.event_count == events  # interrupted while writing the compacted segments: they are not read.
+
+        os.replace(tmp_path / "royal" / "events", tmp_path / "royal" / "events.old")  # interrupted while swapping.
+        assert len(store.segments) == 1 and store.event_count == events
+        assert sorted(os.listdir(tmp_path / "royal")) == ["events", "zoo.json.gz"]
+        assert describe(ZooStore(str(tmp_path / "royal")).load(history=True)) == expected
+
+    def test_reports_after_reload(self, tmp_path) -> None:
+        zoo = generate_zoo(30, seed=3)
+        ZooStore(str(tmp_path / "synthetic")).save(zoo)
+        load = ("import json, sys\nfrom test_zoo_store import reports\nfrom zoo_store import ZooStore\n"
+                "print(json.dumps(reports(ZooStore(sys.argv[1]).load(history=True))))")
+        run = subprocess.run([sys.executable, "-c", load, str(tmp_path / "synthetic")], capture_output=True,
+                             text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        loaded = json.loads(run.stdout.splitlines()[-1])  # in a new process, with the ids it was saved with.
+        expected = reports(zoo)
+        assert loaded.keys() == expected.keys()
+        for name, report in expected.items():
+            assert loaded[name] == report, name
+
+    def test_not_a_store(self, tmp_path) -> None:
+        (tmp_path / "royal").mkdir()
+        with gzip.open(tmp_path / "royal" / "zoo.json.gz", "wt") as file:
+            json.dump({"format": "zoo-store", "version": 0}, file)
+        with pytest.raises(ValueError):
+            ZooStore(str(tmp_path / "royal")).load()
@@ -6,7 +6,7 @@ ID: 110462390
 Username: ivany005
 This is my own work as defined by the University's Academic Integrity Policy.
 """
-from datetime import datetime, time
+from datetime import date, datetime, time
 
 import pytest
 
@@ -550,3 +550,26 @@ class TestZooSystem:
         expected = f"[ERROR] Enclosure must belong to this zoo before assignment. No change made."
         actual = capsys.readouterr().out.strip()
         assert expected == actual
+
+    def test_generate_staff_calendar(self, zoo1):
+        zoo = zoo1["zoo"]
+        staff_calendar = zoo.generate_staff_calendar(date(2004, 11, 15))
+        daily_tasks = sum(len(member.generate_schedule().data) for member in zoo.staff)
+
+        assert len(staff_calendar.schedules) == len(zoo.staff)
+        assert staff_calendar.count(date(2004, 11, 1), date(2004, 11, 30)) == daily_tasks * 16
+        first_event = next(staff_calendar.expand(date(2004, 11, 15), date(2004, 11, 15)))
+        assert first_event["DateTime"] == datetime(2004, 11, 15, 6)
+
+    def test_memory_report(self, zoo1):
+        zoo = zoo1["zoo"]
+        usage = zoo.memory_usage()
+        assert usage["Reptile"]["count"] == 3 and usage["Enclosure"]["count"] == 4
+        assert set(usage["Reptile"]) == {"count", "objects", "log", "diet", "medical_log", "treatments"}
+        assert usage["Reptile"]["diet"] > usage["Mammal"]["diet"]  # the cobras have diets, the mouse does not
+        assert not any(hasattr(entity, "__dict__") for entity in zoo.animals + zoo.enclosures + zoo.staff)
+        assert zoo.animals[0].species is zoo.animals[1].species  # species names are interned
+
+        report = zoo.memory_report()
+        assert "MEMORY USAGE (" in report
+        assert f"Reptile (3): {sum(usage['Reptile'].values()) - 3:,} bytes" in report
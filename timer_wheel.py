@@ -0,0 +1,107 @@
+"""
+File: timer_wheel.py
+Description: Contains the TimerWheel class which is a hierarchical timing wheel: timers for any number of keys can be
+scheduled and cancelled in O(1) time, and the timers that are due are found as time moves forward without looking at
+the timers that are not. Each level of the wheel is a ring of slots; level 0 has one slot per tick and each slot of a
+higher level covers a whole turn of the level below it. Timers far in the future wait in a higher level and move
+down a level ("cascade") when their slot comes around.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from typing import Hashable, Iterator
+
+
+class TimerWheel:
+    def __init__(self, slots_per_level: int = 64, levels: int = 6, start_tick: int = 0):
+        """
+        Create a new (empty) TimerWheel instance. Timers can be set up to slots_per_level ** levels ticks ahead.
+        :param slots_per_level: The number of slots in each level of the wheel (default 64).
+        :param levels: The number of levels of the wheel (default 6).
+        :param start_tick: The tick the wheel starts at (default 0).
+        """
+        self.__size = slots_per_level
+        self.__slots = [[{} for _ in range(slots_per_level)] for _ in range(levels)]  # level -> slot -> {key: due}
+        self.__where = {}  # key -> (level, slot) of the key's timer.
+        self.__now = start_tick
+
+    def __len__(self) -> int:
+        """Return the number of timers that are set."""
+        return len(self.__where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Determine whether a timer is set for a key."""
+        return key in self.__where
+
+    def get_now(self) -> int:
+        """Return the current tick of the wheel."""
+        return self.__now
+
+    now = property(get_now)
+
+    def get_due(self, key: Hashable) -> int | None:
+        """Return the tick a key's timer is due at (None if no timer is set for the key)."""
+        if key not in self.__where:
+            return None
+        level, slot = self.__where[key]
+        return self.__slots[level][slot][key]
+
+    def schedule(self, key: Hashable, due_tick: int) -> None:
+        """
+        Set the timer of a key (replacing any timer the key already has). Timers that are already due fire on the
+        next tick.
+        :param key: The unique (hashable) key of the timer.
+        :param due_tick: The tick the timer is due at.
+        :return: None
+        """
+        self.cancel(key)
+        self.__place(key, max(due_tick, self.__now + 1))
+
+    def cancel(self, key: Hashable) -> None:
+        """
+        Remove the timer of a key (if it has one).
+        :param key: The key of the timer to remove.
+        :return: None
+        """
+        if key in self.__where:
+            level, slot = self.__where.pop(key)
+            del self.__slots[level][slot][key]
+
+    def advance(self, to_tick: int) -> Iterator[tuple[int, list]]:
+        """
+        Move the wheel forward one tick at a time up to a tick, generating the keys whose timers are due at each tick
+        (their timers are removed). Timers scheduled while the keys of a tick are being handled fire later in the same
+        advance if they are due by to_tick.
+        :param to_tick: The tick to move the wheel to.
+        :return: An iterator of (tick, keys due at the tick) for every tick that has due timers.
+        """
+        while self.__now < to_tick:
+            self.__now += 1
+
+            # move timers down from each level whose slot has come around, highest level first:
+            level, span = 1, self.__size
+            cascading = []
+            while level < len(self.__slots) and self.__now % span == 0:
+                cascading.append((level, (self.__now // span) % self.__size))
+                level, span = level + 1, span * self.__size
+            for level, slot in reversed(cascading):
+                timers, self.__slots[level][slot] = self.__slots[level][slot], {}
+                for key, due_tick in timers.items():
+                    self.__place(key, due_tick)
+
+            slot = self.__now % self.__size
+            if self.__slots[0][slot]:
+                timers, self.__slots[0][slot] = self.__slots[0][slot], {}
+                for key in timers:
+                    del self.__where[key]
+                yield self.__now, list(timers)
+
+    def __place(self, key: Hashable, due_tick: int) -> None:
+        """Put a timer in the lowest level whose ring reaches its due tick."""
+        level, span = 0, 1
+        while level < len(self.__slots) - 1 and due_tick // span - self.__now // span >= self.__size:
+            level, span = level + 1, span * self.__size
+        slot = (due_tick // span) % self.__size
+        self.__slots[level][slot][key] = due_tick
+        self.__where[key] = (level, slot)
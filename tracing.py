@@ -0,0 +1,154 @@
+"""
+File: tracing.py
+Description: Contains the Tracer class which records each call of the zoo's key methods (see instrumentation.py) as a
+span, nested inside the spans of the calls it was made from, e.g. ZooSystem.report_zoo_daily_staff_schedules ->
+Zookeeper.generate_schedule -> Schedule.new -> DataRecord.new, and the Span class which describes one call. Spans are
+timed with the monotonic nanosecond clock, and to keep tracing cheap only every Nth outermost call (with everything
+it calls) can be recorded. The spans are written as collapsed stacks, the input of flamegraph tools (flamegraph.pl,
+speedscope, inferno), weighted by the microseconds spent in each method itself, and as a Chrome trace (for
+chrome://tracing or Perfetto). Tracing is switched on for a block of code with 'with Tracer() as tracer:', or for a
+whole run by setting the environment variable ZOO_TRACE to a path prefix before the zoo is imported, e.g.
+
+    ZOO_TRACE=nightly ZOO_TRACE_SAMPLE=10 python main.py   # writes nightly.folded and nightly.trace.json at exit
+
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import atexit
+import json
+import os
+import threading
+from itertools import count
+from time import perf_counter_ns
+from typing import NamedTuple
+
+from instrumentation import add_hook, remove_hook
+
+
+class Span(NamedTuple):
+    name: str  # the method called, e.g. "Zookeeper.generate_schedule"
+    stack: tuple[str, ...]  # the names of the calls it was made from, outermost first, ending with its own name
+    thread_id: int
+    start: int  # nanoseconds on the tracer's clock
+    duration: int  # nanoseconds from start to end
+    self_time: int  # nanoseconds of the duration not spent in the traced calls it made
+    failed: bool  # whether it raised an exception
+
+
+class Tracer:
+    def __init__(self, sample_every: int = 1, clock=perf_counter_ns):
+        """
+        Create a new (stopped) Tracer instance.
+        :param sample_every: Record one in every this many outermost calls, with the calls they make (default 1, all).
+        :param clock: Function returning the time in nanoseconds from a monotonic clock (default perf_counter_ns).
+        """
+        self.__sample_every = max(1, sample_every)
+        self.__clock = clock
+        self.__origin = clock()  # the time of the start of the Chrome trace.
+        self.__spans = []  # each finished Span, in the order they ended.
+        self.__outermost = count()  # numbers the outermost calls, to choose which are recorded.
+        self.__local = threading.local()  # per thread: the stack of calls in progress.
+
+    def __enter__(self):
+        """Record calls inside a 'with Tracer() as tracer:' block."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        """Stop recording calls at the end of the block."""
+        self.stop()
+        return False
+
+    def get_spans(self) -> list[Span]:
+        """Return the spans recorded so far, in the order they ended."""
+        return self.__spans
+
+    def get_sample_every(self) -> int:
+        """Return how many outermost calls there are for each one that is recorded."""
+        return self.__sample_every
+
+    spans = property(get_spans)
+    sample_every = property(get_sample_every)
+
+    def start(self) -> None:
+        """Start recording calls."""
+        add_hook(self)
+
+    def stop(self) -> None:
+        """Stop recording calls (the spans recorded are kept)."""
+        remove_hook(self)
+
+    def clear(self) -> None:
+        """Forget the spans recorded so far."""
+        self.__spans = []
+
+    def enter(self, label: str) -> list | None:
+        """Start the span of a call (see instrumentation.py); calls inside a call that is not recorded are skipped."""
+        stack = getattr(self.__local, "stack", None)
+        if stack is None:
+            stack = self.__local.stack = []
+        if (stack[-1] is None) if stack else next(self.__outermost) % self.__sample_every:
+            stack.append(None)
+            return None
+        frame = [label, self.__clock(), 0]  # [name, start, nanoseconds spent in the traced calls it makes]
+        stack.append(frame)
+        return frame
+
+    def leave(self, label: str, frame: list | None, failed: bool) -> None:
+        """End the span of a call that has returned or raised an exception."""
+        stack = self.__local.stack
+        stack.pop()
+        if frame is None:
+            return None
+        duration = self.__clock() - frame[1]
+        if stack:
+            stack[-1][2] += duration
+        self.__spans.append(Span(label, tuple(outer[0] for outer in stack) + (label,), threading.get_ident(),
+                                 frame[1], duration, duration - frame[2], failed))
+
+    # output ---------------------------------------------------------------------------------------------------
+
+    def collapsed_stacks(self) -> str:
+        """
+        Return the spans as collapsed stacks: one line per distinct stack of calls, e.g.
+        "ZooSystem.report_zoo_daily_staff_schedules;Zookeeper.generate_schedule;Schedule.new 1520", with the total
+        microseconds spent in the last method of the stack itself.
+        :return: The collapsed stacks as a string, one per line.
+        """
+        self_times = {}
+        for span in list(self.__spans):
+            self_times[span.stack] = self_times.get(span.stack, 0) + span.self_time
+        return "".join(f"{';'.join(stack)} {round(nanoseconds / 1000)}\n"
+                       for stack, nanoseconds in sorted(self_times.items()))
+
+    def chrome_trace(self) -> dict:
+        """Return the spans as a Chrome trace (a dictionary in the Trace Event Format, times in microseconds)."""
+        process_id = os.getpid()
+        return {"displayTimeUnit": "ms",
+                "traceEvents": [{"name": span.name, "cat": "zoo", "ph": "X", "pid": process_id, "tid": span.thread_id,
+                                 "ts": (span.start - self.__origin) / 1000, "dur": span.duration / 1000,
+                                 "args": {"failed": span.failed}} for span in list(self.__spans)]}
+
+    def write_collapsed_stacks(self, path: str) -> None:
+        """Write the spans as collapsed stacks to a file (e.g. for 'flamegraph.pl nightly.folded > nightly.svg')."""
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.collapsed_stacks())
+
+    def write_chrome_trace(self, path: str) -> None:
+        """Write the spans as a Chrome trace to a JSON file."""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.chrome_trace(), file)
+
+    def write(self, path_prefix: str) -> None:
+        """Write the spans to <path_prefix>.folded (collapsed stacks) and <path_prefix>.trace.json (Chrome trace)."""
+        self.write_collapsed_stacks(f"{path_prefix}.folded")
+        self.write_chrome_trace(f"{path_prefix}.trace.json")
+
+
+TRACER = None  # the tracer of the whole run, if tracing was switched on by the environment variable ZOO_TRACE.
+if os.environ.get("ZOO_TRACE"):
+    TRACER = Tracer(int(os.environ.get("ZOO_TRACE_SAMPLE", "1")))
+    TRACER.start()
+    atexit.register(TRACER.write, os.environ["ZOO_TRACE"])
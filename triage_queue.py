@@ -0,0 +1,150 @@
+"""
+File: triage_queue.py
+Description: Contains the TriageQueue class which keeps the animals of a zoo ordered by how urgently they need
+veterinary attention. Animals are ranked by the Severity of their latest health check or diagnosis and then by how
+long it has been since they were last attended to. The queue watches each animal so it is always up to date, and can
+be used by several threads at once.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import threading
+from datetime import datetime
+
+from action import Action
+from has_health import HasHealth
+from indexed_heap import IndexedHeap
+from severity import Severity
+
+
+class TriageQueue:
+    def __init__(self):
+        """
+        Create a new (empty) TriageQueue instance.
+        """
+        self.__heap = IndexedHeap()  # animal id -> (-severity level, last attended datetime)
+        self.__patients = {}  # animal id -> animal, for every animal being watched by the queue.
+        self.__severities = {}  # animal id -> Severity of latest health check or diagnosis.
+        self.__lock = threading.RLock()  # held while the queue is read or changed (by any thread).
+
+    def __len__(self) -> int:
+        """Return the number of animals currently waiting in the queue."""
+        return len(self.__heap)
+
+    def __contains__(self, patient: HasHealth) -> bool:
+        """Determine whether an animal is currently waiting in the queue."""
+        return isinstance(patient, HasHealth) and patient.id in self.__heap
+
+    def get_severity(self, patient: HasHealth) -> Severity | None:
+        """Return the Severity an animal is queued with (None if it is not waiting in the queue)."""
+        return self.__severities.get(patient.id) if patient in self else None
+
+    def watch(self, patient: HasHealth) -> None:
+        """
+        Start keeping track of an animal. The animal is queued straight away if its medical log shows that it was
+        checked or diagnosed and has not since recovered.
+        :param patient: The animal (or other HasHealth object) to watch.
+        :return: None
+        """
+        try:
+            if not isinstance(patient, HasHealth):
+                raise TypeError("Only HasHealth objects can be added to the triage queue.")
+
+            with self.__lock:  # other threads wait until the animal is queued.
+                self.__patients[patient.id] = patient
+                patient.add_observer(self)
+
+                # seed the queue from the medical history the animal already has:
+                history = patient.medical_log.data.sort_values(by=["DateTime"], kind="stable")
+                for row in history.itertuples():
+                    self.update(patient, row.Action, row.DateTime, severity=row.Severity)
+        except TypeError as e:
+            print(f"[ERROR] {e} No change made.\n")
+
+    def unwatch(self, patient: HasHealth) -> None:
+        """
+        Stop keeping track of an animal and remove it from the queue.
+        :param patient: The animal to stop watching.
+        :return: None
+        """
+        with self.__lock:
+            if isinstance(patient, HasHealth) and patient.id in self.__patients:
+                patient.remove_observer(self)
+                self.__discharge(patient.id)
+                del self.__patients[patient.id]
+
+    def update(self, subject: HasHealth, action: Action, at_datetime: datetime, **details) -> None:
+        """
+        Re-prioritise an animal after a change to its health (called by the animal as one of its observers).
+        :param subject: The animal whose health changed.
+        :param action: The medical action that occurred.
+        :param at_datetime: When the medical action occurred.
+        :param details: Further information about the action (must include severity for checks and diagnoses).
+        :return: None
+        """
+        with self.__lock:
+            if subject.id not in self.__patients:
+                return None  # unwatched by another thread while it was being notified.
+            match action:
+                case Action.RECEIVE_HEALTH_CHECK | Action.RECEIVE_DIAGNOSIS:
+                    self.escalate(subject, details["severity"], at_datetime)
+                case Action.RECEIVE_TREATMENT:
+                    # treatment does not change the severity of the condition, but the animal has now been attended to.
+                    severity = self.__severities.get(subject.id, details.get("severity", Severity.VERY_LOW))
+                    self.escalate(subject, severity, at_datetime)
+                case Action.RECOVER:
+                    self.__discharge(subject.id)
+
+    def escalate(self, patient: HasHealth, severity: Severity, at_datetime: datetime) -> None:
+        """
+        Set the Severity an animal is queued with and the time it was last attended to, adding it to the queue if it
+        is not already waiting. Raising the severity of a waiting animal moves it up the queue (decrease-key).
+        :param patient: The animal to (re)prioritise.
+        :param severity: The Severity of the animal's condition.
+        :param at_datetime: When the animal was last attended to.
+        :return: None
+        """
+        try:
+            if not isinstance(severity, Severity):
+                raise TypeError("The severity of a triage queue entry must be from the Severity enumeration.")
+            if patient.id not in self.__patients:
+                raise ValueError(f"{patient.name}_{patient.id} is not being watched by the triage queue.")
+
+            with self.__lock:
+                current_priority = self.__heap.get_priority(patient.id)
+                if current_priority is not None and at_datetime < current_priority[1]:
+                    return None  # an older event cannot override the animal's latest status.
+
+                self.__severities[patient.id] = severity
+                self.__heap.push(patient.id, (-severity.level, at_datetime))  # most severe, then longest waiting first
+        except (TypeError, ValueError) as e:
+            print(f"[ERROR] {e} No change made.\n")
+
+    def pop_most_urgent(self) -> HasHealth | None:
+        """
+        Remove and return the animal that most urgently needs attention.
+        :return: The most urgent animal, or None if no animals are waiting.
+        """
+        with self.__lock:
+            entry = self.__heap.pop()
+            if entry is None:
+                return None
+            del self.__severities[entry[0]]
+            return self.__patients[entry[0]]
+
+    def peek(self, k: int = 1, patient_ids: set[str] | None = None) -> list[HasHealth]:
+        """
+        Return (without removing) the k animals that most urgently need attention, most urgent first.
+        :param k: The number of animals to return (default 1).
+        :param patient_ids: Optionally only consider the animals with these ids.
+        :return: A list of animals.
+        """
+        predicate = None if patient_ids is None else patient_ids.__contains__
+        with self.__lock:
+            return [self.__patients[key] for key, priority in self.__heap.peek(k, predicate)]
+
+    def __discharge(self, patient_id: str) -> None:
+        """Remove an animal from the queue (if it is waiting)."""
+        self.__heap.remove(patient_id)
+        self.__severities.pop(patient_id, None)
@@ -9,52 +9,78 @@ This is my own work as defined by the University's Academic Integrity Policy.
 """
 from datetime import time, datetime  # automatically handles formatting issues with dates and times.
 
-import pandas as pd
-
 from action import Action
 from animal import Animal
+from data_record import DataRecord
+from lazy_modules import pd
+from lock_stripes import ENTITY_LOCKS
+from route_planner import RoutePlanner
 from schedule import Schedule
 from severity import Severity
 from staff import Staff
+from triage_queue import TriageQueue
 
 
 class Veterinarian(Staff):
+    __slots__ = ()
+
     def __str__(self) -> str:
         """Return the Veterinarian's key attributes as a formatted string."""
         return "\n<VETERINARIAN> " + super().__str__()
 
-    def generate_schedule(self) -> Schedule:
-        """Return the full daily schedule of responsibilities of the Veterinarian"""
+    def generate_schedule(self, route_planner: RoutePlanner | None = None) -> Schedule:
+        """
+        Return the full daily schedule of responsibilities of the Veterinarian.
+        :param route_planner: Optional RoutePlanner used to order tasks that share a time so that the Veterinarian
+        walks the shortest route between enclosures (default is no reordering).
+        :return: Schedule
+        """
         # schedule is recreated from scratch every time it is required to ensure all changes are incorporated.
         schedule = Schedule(f"{self.name}_{self.id} Daily Task")
 
         schedule.data = pd.concat([schedule.data, self.special_tasks.data])  # add all special (non-routine) tasks first
 
-        for enclosure in self.enclosure_assignments:
-            for animal in enclosure.inhabitants:
-                # perform a health checkup on each animal in the vet's assigned enclosures:
-                schedule.new({"Time": time(8),  # conduct all routine checkups each morning at 8am
-                              "SubjectID": self.id,
-                              "SubjectName": self.name,
-                              "ObjectID": animal.id,
-                              "ObjectName": animal.name,
-                              "Action": Action.CHECK_HEALTH,
-                              "Details": "standard"}  # no specific details for a routine (standard) checkup.
-                             )
-                # administer each animal's prescribed treatment(s) in the vet's assigned enclosures:
-                animal_treatments = animal.treatments
-                for entry in animal_treatments.data.itertuples():  # add each entry in the animal's treatment schedule.
-                    schedule.new(
-                        {"Time": entry.Time,
-                         "SubjectID": self.id,
-                         "SubjectName": self.name,
-                         "ObjectID": animal.id,
-                         "ObjectName": animal.name,
-                         "Action": Action.TREAT,
-                         "Details": entry.Details}  # get treatment details from the animal's treatment schedule.
-                    )
+        with DataRecord.batched_writes():  # the routine tasks are added to the schedule in one step.
+            for enclosure in self.enclosure_assignments:
+                for animal in enclosure.inhabitants:
+                    # perform a health checkup on each animal in the vet's assigned enclosures:
+                    schedule.new({"Time": time(8),  # conduct all routine checkups each morning at 8am
+                                  "SubjectID": self.id,
+                                  "SubjectName": self.name,
+                                  "ObjectID": animal.id,
+                                  "ObjectName": animal.name,
+                                  "Action": Action.CHECK_HEALTH,
+                                  "Details": "standard"}  # no specific details for a routine (standard) checkup.
+                                 )
+                    # administer each animal's prescribed treatment(s) in the vet's assigned enclosures:
+                    entries = animal.treatments.data
+                    for entry_time, details in zip(entries["Time"], entries["Details"]):  # each treatment entry.
+                        schedule.new(
+                            {"Time": entry_time,
+                             "SubjectID": self.id,
+                             "SubjectName": self.name,
+                             "ObjectID": animal.id,
+                             "ObjectName": animal.name,
+                             "Action": Action.TREAT,
+                             "Details": details}  # get treatment details from the animal's treatment schedule.
+                        )
+
+        if route_planner is not None:
+            schedule = route_planner.order_schedule(schedule, self.get_task_locations())
         return schedule
 
+    def next_patients(self, triage_queue: TriageQueue, n: int = 5) -> list[Animal]:
+        """
+        Return the animals the Veterinarian is responsible for that most urgently need attention.
+        :param triage_queue: The triage queue of the zoo the Veterinarian works in.
+        :param n: The maximum number of animals to return (default 5).
+        :return: A list of animals, most urgent first.
+        """
+        patient_ids = {animal.id for animal in self.animal_assignments}
+        for enclosure in self.enclosure_assignments:
+            patient_ids.update(animal.id for animal in enclosure.inhabitants)
+        return triage_queue.peek(n, patient_ids)
+
     def check_health(self, animal: Animal, details: str, severity: Severity,
                      at_datetime: datetime = datetime.now()):
         """
@@ -69,16 +95,17 @@ class Veterinarian(Staff):
             if not isinstance(animal, Animal):
                 raise TypeError("Veterinarians can only perform a health check on Animals.")
 
-            # record that the animal received a health check in its own logs (returns a ref number):
-            log_ref_num = animal.receive_health_check(self.id, self.name, details, severity, at_datetime)
-
-            self.log.new({"DateTime": at_datetime,
-                          "SubjectID": self.id,
-                          "SubjectName": self.name,
-                          "ObjectID": animal.id,
-                          "ObjectName": animal.name,
-                          "Action": Action.CHECK_HEALTH,
-                          "Details": f"log ref: {log_ref_num}"})
+            with ENTITY_LOCKS.holding(self.id, animal.id):  # the whole action is atomic.
+                # record that the animal received a health check in its own logs (returns a ref number):
+                log_ref_num = animal.receive_health_check(self.id, self.name, details, severity, at_datetime)
+
+                self.log.join(log_ref_num, {"DateTime": at_datetime,
+                                            "SubjectID": self.id,
+                                            "SubjectName": self.name,
+                                            "ObjectID": animal.id,
+                                            "ObjectName": animal.name,
+                                            "Action": Action.CHECK_HEALTH,
+                                            "Details": f"log ref: {log_ref_num}"})
         except TypeError as e:
             print(f"[ERROR] {e} No change made.\n")
 
@@ -99,17 +126,18 @@ class Veterinarian(Staff):
             if not isinstance(animal, Animal):
                 raise TypeError("Veterinarians can only diagnose Animals.")
 
-            # record that the animal received a diagnosis in its own logs (returns a ref number):
-            log_ref_num = animal.receive_diagnosis(self.id, self.name, details, severity, treatment_desc,
-                                                   treatment_list, at_datetime)
-
-            self.log.new({"DateTime": at_datetime,
-                          "SubjectID": self.id,
-                          "SubjectName": self.name,
-                          "ObjectID": animal.id,
-                          "ObjectName": animal.name,
-                          "Action": Action.DIAGNOSE,
-                          "Details": f"log ref: {log_ref_num}"})
+            with ENTITY_LOCKS.holding(self.id, animal.id):
+                # record that the animal received a diagnosis in its own logs (returns a ref number):
+                log_ref_num = animal.receive_diagnosis(self.id, self.name, details, severity, treatment_desc,
+                                                       treatment_list, at_datetime)
+
+                self.log.join(log_ref_num, {"DateTime": at_datetime,
+                                            "SubjectID": self.id,
+                                            "SubjectName": self.name,
+                                            "ObjectID": animal.id,
+                                            "ObjectName": animal.name,
+                                            "Action": Action.DIAGNOSE,
+                                            "Details": f"log ref: {log_ref_num}"})
         except TypeError as e:
             print(f"[ERROR] {e} No change made.\n")
 
@@ -126,16 +154,17 @@ class Veterinarian(Staff):
             if not isinstance(animal, Animal):
                 raise TypeError("Veterinarians can only treat Animals.")
 
-            # record that the animal received a diagnosis in its own logs (returns a ref number):
-            log_ref_num = animal.receive_treatment(self.id, self.name, details, severity, at_datetime)
-
-            self.log.new({"DateTime": at_datetime,
-                          "SubjectID": self.id,
-                          "SubjectName": self.name,
-                          "ObjectID": animal.id,
-                          "ObjectName": animal.name,
-                          "Action": Action.TREAT,
-                          "Details": f"log ref: {log_ref_num}"})
+            with ENTITY_LOCKS.holding(self.id, animal.id):
+                # record that the animal received a diagnosis in its own logs (returns a ref number):
+                log_ref_num = animal.receive_treatment(self.id, self.name, details, severity, at_datetime)
+
+                self.log.join(log_ref_num, {"DateTime": at_datetime,
+                                            "SubjectID": self.id,
+                                            "SubjectName": self.name,
+                                            "ObjectID": animal.id,
+                                            "ObjectName": animal.name,
+                                            "Action": Action.TREAT,
+                                            "Details": f"log ref: {log_ref_num}"})
         except TypeError as e:
             print(f"[ERROR] {e} No change made.\n")
 
@@ -151,16 +180,17 @@ class Veterinarian(Staff):
             if not isinstance(animal, Animal):
                 raise TypeError("Veterinarians can only treat Animals")
 
-            # record that the animal received a diagnosis in its own logs (returns a ref number):
-            log_ref_num = animal.recover(self.id, self.name, details, at_datetime)
-
-            self.log.new({"DateTime": at_datetime,
-                          "SubjectID": self.id,
-                          "SubjectName": self.name,
-                          "ObjectID": animal.id,
-                          "ObjectName": animal.name,
-                          "Action": Action.DECLARE_RECOVERY,
-                          "Details": f"log ref: {log_ref_num}"})
+            with ENTITY_LOCKS.holding(self.id, animal.id):
+                # record that the animal received a diagnosis in its own logs (returns a ref number):
+                log_ref_num = animal.recover(self.id, self.name, details, at_datetime)
+
+                self.log.join(log_ref_num, {"DateTime": at_datetime,
+                                            "SubjectID": self.id,
+                                            "SubjectName": self.name,
+                                            "ObjectID": animal.id,
+                                            "ObjectName": animal.name,
+                                            "Action": Action.DECLARE_RECOVERY,
+                                            "Details": f"log ref: {log_ref_num}"})
 
         except TypeError as e:
             print(f"[ERROR] {e} No change made.\n")
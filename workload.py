@@ -0,0 +1,330 @@
+"""
+File: workload.py
+Description: Contains the WorkloadRecorder class which captures the workload of a zoo: every outermost call (not the
+calls they make) of a public method of ZooSystem, the animal, enclosure and staff classes (including the staff's
+actions, e.g. Zookeeper.feed) and their constructors, with its arguments and the time it started, through a hook (see
+instrumentation.py). Entities and zoos passed as arguments are recorded as references to the calls that built them.
+The trace is saved as gzip-compressed JSON lines. The WorkloadReplayer class re-executes a trace against fresh zoos,
+at full speed or at the pace it was recorded, timing each type of operation (e.g. "Zookeeper.feed"), so that a real
+day's mix of calls can be replayed against a new build. Recording is switched on for a block of code with
+'with WorkloadRecorder() as recorder:', or for a whole run by setting the environment variable ZOO_WORKLOAD to the path
+of the trace before the zoo is imported, e.g.
+
+    ZOO_WORKLOAD=monday.workload.gz python main.py           # records the run, the trace is written at exit
+    python -m benchmarks --replay monday.workload.gz --repeat 5
+
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import atexit
+import gzip
+import importlib
+import json
+import os
+import statistics
+import threading
+from abc import ABC
+from contextlib import nullcontext, redirect_stdout
+from datetime import date, datetime, time, timedelta
+from enum import Enum
+from time import perf_counter, sleep
+from types import FunctionType
+
+from instrumentation import add_hook, remove_hook
+
+FORMAT = "zoo-workload"
+VERSION = 1
+
+
+def recorded_classes() -> dict[str, type]:
+    """Return each class whose construction and public methods are recorded, by name."""
+    # imported here so that importing the recorder does not import the zoo:
+    from animal import Animal
+    from bird import Bird
+    from enclosure import Enclosure
+    from mammal import Mammal
+    from reptile import Reptile
+    from staff import Staff
+    from veterinarian import Veterinarian
+    from zoo_system import ZooSystem
+    from zookeeper import Zookeeper
+
+    return {cls.__name__: cls for cls in (ZooSystem, Animal, Mammal, Bird, Reptile, Enclosure, Staff, Zookeeper,
+                                          Veterinarian)}
+
+
+def recorded_methods() -> list[tuple[type, str]]:
+    """Return the (class, method name) of each method whose calls are recorded, each where it is defined."""
+    from observable import Observable
+
+    classes = recorded_classes()
+    methods = {}
+    for cls in classes.values():
+        for base in cls.__mro__:
+            if base in (Observable, ABC, object):  # not the methods of the observer pattern.
+                continue
+            for name, attribute in vars(base).items():
+                if isinstance(attribute, FunctionType) and (name == "__init__" or not name.startswith(("_", "get_"))):
+                    methods[(base, name)] = None
+    methods.pop((classes["ZooSystem"], "locked"), None)  # a context manager, not an operation.
+    return list(methods)
+
+
+class WorkloadRecorder:
+    def __init__(self):
+        """Create a new (stopped) WorkloadRecorder instance."""
+        self.__calls = []  # [kind, start, reference, class name, method name, args, kwargs, failed] of each call.
+        self.__references = {}  # id of each zoo or entity involved -> (its reference, the object, kept alive)
+        self.__lock = threading.Lock()  # held while references are given out.
+        self.__local = threading.local()  # per thread: the number of recorded calls in progress.
+        self.__origin = perf_counter()
+        self.__started = datetime.now()
+        self.__classes = ()  # the recorded classes, whose objects are passed by reference.
+
+    def __enter__(self):
+        """Record calls inside a 'with WorkloadRecorder() as recorder:' block."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        """Stop recording calls at the end of the block."""
+        self.stop()
+        return False
+
+    def get_calls(self) -> list[list]:
+        """Return the calls recorded so far, in the order they ended."""
+        return self.__calls
+
+    calls = property(get_calls)
+
+    def start(self) -> None:
+        """Start recording calls (times are from the first start)."""
+        self.__classes = tuple(recorded_classes().values())
+        add_hook(self, recorded_methods(), arguments=True)
+
+    def stop(self) -> None:
+        """Stop recording calls (the calls recorded are kept)."""
+        remove_hook(self)
+
+    def enter(self, label: str, args: tuple, kwargs: dict) -> list | None:
+        """Start recording a call (see instrumentation.py); the calls made by a recorded call are not recorded."""
+        depth = getattr(self.__local, "depth", 0)
+        self.__local.depth = depth + 1
+        if depth:
+            return None
+        target, method_name = args[0], label.rsplit(".", 1)[1]
+        arguments = self.__encode(list(args[1:])), {key: self.__encode(value) for key, value in kwargs.items()}
+        if method_name == "__init__":  # the object is given its reference once it is built.
+            return ["new", round(perf_counter() - self.__origin, 6), target, type(target).__name__, method_name,
+                    *arguments]
+        return ["call", round(perf_counter() - self.__origin, 6), self.__reference(target), type(target).__name__,
+                method_name, *arguments]
+
+    def leave(self, label: str, call: list | None, failed: bool) -> None:
+        """Finish recording a call that has returned or raised an exception."""
+        self.__local.depth -= 1
+        if call is None:
+            return None
+        if call[0] == "new":
+            call[2] = self.__reference(call[2])
+        self.__calls.append(call + [failed])
+
+    def __reference(self, value) -> int:
+        """Return the reference of a zoo or entity in the trace, giving it one if it has none."""
+        with self.__lock:
+            if id(value) not in self.__references:
+                self.__references[id(value)] = (len(self.__references), value)
+            return self.__references[id(value)][0]
+
+    def __encode(self, value):
+        """Return an argument as a JSON value, tagging the values JSON has no type for (e.g. {"datetime": ...})."""
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, list):
+            return [self.__encode(item) for item in value]
+        if isinstance(value, tuple):
+            return {"tuple": [self.__encode(item) for item in value]}
+        if isinstance(value, dict):
+            return {"dict": [[self.__encode(key), self.__encode(item)] for key, item in value.items()]}
+        if isinstance(value, Enum):
+            return {"enum": f"{type(value).__module__}:{type(value).__qualname__}:{value.name}"}
+        if isinstance(value, (datetime, date, time)):
+            return {type(value).__name__: value.isoformat()}
+        if isinstance(value, timedelta):
+            return {"timedelta": value.total_seconds()}
+        if isinstance(value, self.__classes):
+            return {"ref": self.__reference(value)}
+        return {"unsupported": type(value).__name__}  # the call cannot be replayed.
+
+    def write(self, path: str) -> None:
+        """Write the calls recorded so far to a trace file (gzip-compressed JSON lines, in the order they started)."""
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            file.write(json.dumps({"format": FORMAT, "version": VERSION, "started": self.__started.isoformat(),
+                                   "calls": len(self.__calls)}) + "\n")
+            for call in sorted(list(self.__calls), key=lambda recorded: recorded[1]):
+                file.write(json.dumps(call, separators=(",", ":")) + "\n")
+
+
+def read_workload(path: str) -> tuple[dict, list[list]]:
+    """
+    Read a trace file written by a WorkloadRecorder.
+    :param path: The path of the trace.
+    :return: Its header (e.g. when it was started) and its calls, in the order they started.
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header = json.loads(file.readline())
+        if header.get("format") != FORMAT or header.get("version") != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} zoo workload trace.")
+        return header, [json.loads(line) for line in file]
+
+
+class ReplayResults:
+    def __init__(self, durations: dict[str, list[float]], errors: dict[str, int], skipped: int, duration: float,
+                 zoos: list | None = None):
+        """
+        Create a new ReplayResults instance.
+        :param durations: Dictionary of operation (e.g. "Zookeeper.feed") -> the seconds each call of it took.
+        :param errors: Dictionary of operation -> the number of its calls that raised an exception.
+        :param skipped: The number of calls that could not be replayed.
+        :param duration: The seconds the whole replay took.
+        :param zoos: The zoos built by the replay, in the order they were built (default none).
+        """
+        self.__durations = durations
+        self.__errors = errors
+        self.__skipped = skipped
+        self.__duration = duration
+        self.__zoos = [] if zoos is None else zoos
+
+    def get_durations(self) -> dict[str, list[float]]:
+        """Return the seconds each call of each operation took."""
+        return self.__durations
+
+    def get_errors(self) -> dict[str, int]:
+        """Return the number of calls of each operation that raised an exception."""
+        return self.__errors
+
+    def get_skipped(self) -> int:
+        """Return the number of calls that could not be replayed (e.g. on an entity built before recording began)."""
+        return self.__skipped
+
+    def get_duration(self) -> float:
+        """Return the seconds the whole replay took."""
+        return self.__duration
+
+    def get_zoos(self) -> list:
+        """Return the zoos built by the replay (e.g. to save one with a ZooStore)."""
+        return self.__zoos
+
+    def get_operations(self) -> int:
+        """Return the number of calls replayed."""
+        return sum(map(len, self.__durations.values()))
+
+    def get_rate(self) -> float:
+        """Return the calls replayed per second."""
+        return self.operations / self.__duration if self.__duration else 0.0
+
+    durations = property(get_durations)
+    errors = property(get_errors)
+    skipped = property(get_skipped)
+    duration = property(get_duration)
+    zoos = property(get_zoos)
+    operations = property(get_operations)
+    rate = property(get_rate)
+
+    def __str__(self) -> str:
+        """Return the number of calls and time spent per operation, slowest in total first, as a table."""
+        lines = [f"{self.operations:,} calls replayed in {self.__duration:.3f} s ({self.rate:,.0f} calls/s), "
+                 f"{sum(self.__errors.values()):,} errors, {self.__skipped:,} skipped",
+                 f"{'operation':<48} {'calls':>8} {'total ms':>10} {'mean us':>10} {'median us':>10}"]
+        for label, durations in sorted(self.__durations.items(), key=lambda item: -sum(item[1])):
+            lines.append(f"{label:<48} {len(durations):>8,} {sum(durations) * 1000:>10.2f} "
+                         f"{statistics.fmean(durations) * 1e6:>10.1f} {statistics.median(durations) * 1e6:>10.1f}")
+        return "\n".join(lines)
+
+
+class WorkloadReplayer:
+    def __init__(self, calls: list[list]):
+        """
+        Create a new WorkloadReplayer instance.
+        :param calls: The calls of a trace, in the order they started (see read_workload()).
+        """
+        self.__calls = calls
+        self.__classes = recorded_classes()
+
+    @classmethod
+    def from_file(cls, path: str):
+        """Return a WorkloadReplayer of the calls in a trace file."""
+        return cls(read_workload(path)[1])
+
+    def get_calls(self) -> list[list]:
+        """Return the calls that are replayed."""
+        return self.__calls
+
+    calls = property(get_calls)
+
+    def replay(self, speed: float | None = None, quiet: bool = True) -> ReplayResults:
+        """
+        Re-execute every call against fresh zoos and entities, built by the trace's own calls.
+        :param speed: None to replay as fast as possible (default), or how many times faster than recorded to replay
+        (e.g. 1.0 replays at the pace of the recording).
+        :param quiet: Whether to hide what the calls print, e.g. their [ERROR] messages (default True).
+        :return: The ReplayResults.
+        """
+        objects = {}  # reference -> the zoo or entity built by the replay.
+        durations, errors, skipped = {}, {}, 0
+        with open(os.devnull, "w") as null, (redirect_stdout(null) if quiet else nullcontext()):
+            start = perf_counter()
+            for kind, at, reference, class_name, method_name, args, kwargs, _failed in self.__calls:
+                if speed is not None and (wait := at / speed - (perf_counter() - start)) > 0:
+                    sleep(wait)
+                try:
+                    args = self.__decode(args, objects)
+                    kwargs = {key: self.__decode(value, objects) for key, value in kwargs.items()}
+                    method = self.__classes[class_name] if kind == "new" else getattr(objects[reference], method_name)
+                except (KeyError, AttributeError, ValueError):  # e.g. an entity built before recording began.
+                    skipped += 1
+                    continue
+                label = f"{class_name}.{method_name}"
+                began = perf_counter()
+                try:
+                    result = method(*args, **kwargs)
+                    if kind == "new":
+                        objects[reference] = result
+                except Exception:
+                    errors[label] = errors.get(label, 0) + 1
+                durations.setdefault(label, []).append(perf_counter() - began)
+            duration = perf_counter() - start
+        zoos = [built for built in objects.values() if isinstance(built, self.__classes["ZooSystem"])]
+        return ReplayResults(durations, errors, skipped, duration, zoos)
+
+    def __decode(self, value, objects: dict):
+        """Return the argument a JSON value was recorded from (KeyError if it cannot be replayed)."""
+        if isinstance(value, list):
+            return [self.__decode(item, objects) for item in value]
+        if not isinstance(value, dict):
+            return value
+        (tag, content), = value.items()
+        match tag:
+            case "ref":
+                return objects[content]
+            case "tuple":
+                return tuple(self.__decode(item, objects) for item in content)
+            case "dict":
+                return {self.__decode(key, objects): self.__decode(item, objects) for key, item in content}
+            case "enum":
+                module, qualname, name = content.split(":")
+                return getattr(importlib.import_module(module), qualname)[name]
+            case "datetime" | "date" | "time":
+                return {"datetime": datetime, "date": date, "time": time}[tag].fromisoformat(content)
+            case "timedelta":
+                return timedelta(seconds=content)
+        raise KeyError(tag)  # "unsupported": a value the recorder could not capture.
+
+
+RECORDER = None  # the recorder of the whole run, if switched on by the environment variable ZOO_WORKLOAD.
+if os.environ.get("ZOO_WORKLOAD"):
+    RECORDER = WorkloadRecorder()
+    RECORDER.start()
+    atexit.register(RECORDER.write, os.environ["ZOO_WORKLOAD"])
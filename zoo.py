@@ -0,0 +1,183 @@
+"""
+File: zoo.py
+Description: Command line of the Zoo Management System, over a zoo kept on disk by a ZooStore (see zoo_store.py), so
+that reports can be produced and maintenance run without writing Python, e.g.
+
+    python -m zoo import royal --synthetic 1000        # or --workload monday.workload.gz (see workload.py)
+    python -m zoo report royal species animals_on_display --output display.txt
+    python -m zoo report royal animal_medical_history --animal A12
+    python -m zoo simulate royal --days 1
+    python -m zoo compact royal
+    python -m zoo benchmark --scales 1000 10000
+
+Each subcommand loads only what it needs: the history of the zoo's logs is only read by the reports made from the
+logs, so the other subcommands start up in the same time however long the history grows. Reports are written one at a
+time, each as soon as it is generated.
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import argparse
+import json
+import runpy
+import sys
+from datetime import datetime, timedelta
+
+from zoo_store import SEGMENT_EVENTS, ZooStore
+from zoo_system import ZooSystem
+
+REPORTS = [name.removeprefix("report_") for name in vars(ZooSystem) if name.startswith("report_")]
+HISTORY_REPORTS = {"animal_medical_history", "zoo_medical_history", "zoo_staff_activity", "zoo_enclosure_maintenance"}
+
+
+def import_zoo(arguments: argparse.Namespace) -> int:
+    """Build a zoo (a synthetic zoo or the zoo of a recorded workload) and save it in a new store."""
+    store = ZooStore(arguments.store)
+    if store.exists():
+        print(f"[ERROR] {arguments.store} already holds a zoo. No change made.\n", file=sys.stderr)
+        return 1
+    if arguments.synthetic is not None:
+        from benchmarks.synthetic_zoo import generate_zoo  # imported here as only this subcommand needs it.
+        zoo = generate_zoo(arguments.synthetic, events_per_animal=arguments.events_per_animal, seed=arguments.seed)
+    else:
+        from workload import WorkloadReplayer
+        zoos = WorkloadReplayer.from_file(arguments.workload).replay().zoos
+        zoos = [zoo for zoo in zoos if arguments.zoo in (None, zoo.name)]
+        if not zoos:
+            print(f"[ERROR] {arguments.workload} builds no zoo{'' if arguments.zoo is None else ' ' + arguments.zoo}."
+                  f" No change made.\n", file=sys.stderr)
+            return 1
+        zoo = zoos[0]
+    events = store.save(zoo)
+    print(f"Saved {zoo.name} to {arguments.store}: {len(zoo.animals):,} animals, {len(zoo.enclosures):,} enclosures,"
+          f" {len(zoo.staff):,} staff and {events:,} events.")
+    return 0
+
+
+def report(arguments: argparse.Namespace) -> int:
+    """Write reports of a stored zoo to stdout or a file."""
+    names = [name for name in REPORTS if name != "animal_medical_history" or arguments.animal] \
+        if "all" in arguments.reports else arguments.reports
+    if "animal_medical_history" in names and not arguments.animal:
+        print("[ERROR] The animal_medical_history report needs --animal. No report made.\n", file=sys.stderr)
+        return 1
+    zoo = ZooStore(arguments.store).load(history=bool(HISTORY_REPORTS.intersection(names)))
+    animals = {animal.id: animal for animal in zoo.animals}
+    missing = [animal_id for animal_id in arguments.animal or [] if animal_id not in animals]
+    if missing and "animal_medical_history" in names:
+        print(f"[ERROR] {zoo.name} has no animal {', '.join(missing)}. No report made.\n", file=sys.stderr)
+        return 1
+
+    output = sys.stdout if arguments.output is None else open(arguments.output, "w", encoding="utf-8")
+    try:
+        for name in names:
+            if name == "animal_medical_history":
+                for animal_id in arguments.animal:
+                    output.write(zoo.report_animal_medical_history(animals[animal_id]))
+                    output.flush()
+            else:
+                output.write(getattr(zoo, f"report_{name}")())
+                output.flush()  # each report reaches the reader as soon as it is generated.
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+def simulate(arguments: argparse.Namespace) -> int:
+    """Simulate days of a stored zoo (see zoo_simulation.py) and save it with the events of those days."""
+    from zoo_simulation import ZooSimulation  # imported here as only this subcommand needs it.
+
+    store = ZooStore(arguments.store)
+    zoo = store.load()
+    start = arguments.start
+    if start is None:  # the start of the day after the latest event of the zoo.
+        latest = store.latest if store.latest is not None else datetime.now() - timedelta(days=1)
+        start = datetime.combine(latest.date() + timedelta(days=1), datetime.min.time())
+    summary = ZooSimulation(zoo, start, arguments.seed).run(arguments.days)
+    events = store.save(zoo)
+    print(json.dumps({"start": start.isoformat(), **summary, "events_saved": events}, indent=2))
+    return 0
+
+
+def compact(arguments: argparse.Namespace) -> int:
+    """Merge the segments of a stored zoo's history into as few as possible."""
+    store = ZooStore(arguments.store)
+    before = len(store.segments)
+    after = store.compact(arguments.segment_events)
+    print(f"Compacted {store.event_count:,} events from {before:,} segments into {after:,}.")
+    return 0
+
+
+def benchmark(arguments: argparse.Namespace) -> int:
+    """Run the benchmark suite (see benchmarks/__main__.py) with the options given."""
+    sys.argv = ["python -m zoo benchmark", *arguments.options]
+    try:
+        runpy.run_module("benchmarks", run_name="__main__")
+    except SystemExit as exit_status:
+        return exit_status.code or 0
+    return 0
+
+
+parser = argparse.ArgumentParser(prog="python -m zoo", description="Report on and maintain a zoo kept on disk.")
+subcommands = parser.add_subparsers(dest="subcommand", required=True)
+
+import_parser = subcommands.add_parser("import", help="build a zoo and save it in a new store")
+import_parser.add_argument("store", help="directory to keep the zoo in")
+source = import_parser.add_mutually_exclusive_group(required=True)
+source.add_argument("--synthetic", type=int, metavar="ANIMALS", help="build a synthetic zoo of this many animals")
+source.add_argument("--workload", metavar="TRACE", help="replay a recorded workload and save the zoo it builds")
+import_parser.add_argument("--zoo", help="name of the zoo to save, if the workload builds several (default first)")
+import_parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic zoo (default 0)")
+import_parser.add_argument("--events-per-animal", type=int, default=4,
+                           help="average events in the history of each synthetic animal (default 4)")
+import_parser.set_defaults(run=import_zoo)
+
+report_parser = subcommands.add_parser("report", help="write reports of a stored zoo")
+report_parser.add_argument("store", help="directory the zoo is kept in")
+report_parser.add_argument("reports", nargs="+", choices=REPORTS + ["all"], metavar="REPORT",
+                           help=f"reports to write: {', '.join(REPORTS)} or all")
+report_parser.add_argument("--animal", nargs="+", metavar="ID", help="ids of the animals for animal_medical_history")
+report_parser.add_argument("--output", help="file to write the reports to (default stdout)")
+report_parser.set_defaults(run=report)
+
+simulate_parser = subcommands.add_parser("simulate", help="simulate days of a stored zoo and save it")
+simulate_parser.add_argument("store", help="directory the zoo is kept in")
+simulate_parser.add_argument("--days", type=int, default=1, help="days to simulate (default 1)")
+simulate_parser.add_argument("--seed", type=int, default=0, help="seed of the simulation (default 0)")
+simulate_parser.add_argument("--start", type=datetime.fromisoformat,
+                             help="when the simulation starts (default the day after the zoo's latest event)")
+simulate_parser.set_defaults(run=simulate)
+
+compact_parser = subcommands.add_parser("compact", help="merge the segments of a stored zoo's history")
+compact_parser.add_argument("store", help="directory the zoo is kept in")
+compact_parser.add_argument("--segment-events", type=int, default=SEGMENT_EVENTS,
+                            help=f"most events in one segment (default {SEGMENT_EVENTS:,})")
+compact_parser.set_defaults(run=compact)
+
+benchmark_parser = subcommands.add_parser("benchmark", help="run the benchmark suite with any of its options "
+                                                           "(see python -m benchmarks -h)")
+benchmark_parser.set_defaults(run=benchmark)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run a subcommand.
+    :param argv: The command line arguments (default sys.argv[1:]).
+    :return: The exit status, 0 if the subcommand succeeded.
+    """
+    arguments, options = parser.parse_known_args(argv)
+    if arguments.run is benchmark:
+        arguments.options = options  # passed on to the benchmark suite.
+    elif options:
+        parser.error(f"unrecognized arguments: {' '.join(options)}")
+    if getattr(arguments, "store", None) is not None and arguments.run is not import_zoo \
+            and not ZooStore(arguments.store).exists():
+        print(f"[ERROR] {arguments.store} holds no zoo (see python -m zoo import).\n", file=sys.stderr)
+        return 1
+    return arguments.run(arguments)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
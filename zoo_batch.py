@@ -0,0 +1,256 @@
+"""
+File: zoo_batch.py
+Description: Contains the ZooBatch class which collects changes to a zoo (moving animals between enclosures, housing
+animals, assigning staff and removing animals, enclosures and staff) and makes them all together or not at all. The
+changes are checked together against the rules of Enclosure.add_animal (habitat, species and treatment status) using
+the state the zoo would be in after the whole batch, so e.g. two enclosures can swap species in one batch. Nothing is
+changed unless every change can be made, and the log entries of the batch are written in one step. While a batch is
+committed it holds the zoo's lock and the locks of every entity it involves (see lock_stripes.py).
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from datetime import datetime
+
+from animal import Animal
+from data_record import DataRecord
+from enclosure import Enclosure
+from lock_stripes import ENTITY_LOCKS
+from staff import Staff
+from zoo_system import ZooSystem
+
+
+class ZooBatch:
+    def __init__(self, zoo: ZooSystem, at_datetime: datetime | None = None):
+        """
+        Create a new (empty) ZooBatch instance. It is usually made with zoo.batch() and used in a 'with' block, which
+        commits the batch when the block ends (or discards it if the block raises an exception).
+        :param zoo: The zoo the changes are made to.
+        :param at_datetime: When the changes are made (default is the time of the zoo's latest change, or when the
+        batch is committed for staff assignments).
+        """
+        self.__zoo = zoo
+        self.__at_datetime = at_datetime
+        self.__changes = []  # (name of the change, its arguments), in the order they were added.
+
+    def __len__(self) -> int:
+        """Return the number of changes waiting to be committed."""
+        return len(self.__changes)
+
+    def __enter__(self):
+        """Start collecting the changes of a 'with zoo.batch() as batch:' block."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        """Commit the batch at the end of the block, or discard it if the block raised an exception."""
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False  # exceptions raised in the block are not suppressed.
+
+    def get_zoo(self) -> ZooSystem:
+        """Return the zoo the changes are made to."""
+        return self.__zoo
+
+    def get_at_datetime(self) -> datetime | None:
+        """Return when the changes are made (None if it is the time of the zoo's latest change)."""
+        return self.__at_datetime
+
+    zoo = property(get_zoo)
+    at_datetime = property(get_at_datetime)
+
+    # collecting changes ---------------------------------------------------------------------------------------
+
+    def move_animal(self, animal: Animal, from_enclosure: Enclosure, to_enclosure: Enclosure) -> None:
+        """Move an animal from one enclosure to another when the batch is committed."""
+        self.__changes.append(("move_animal", (animal, from_enclosure, to_enclosure)))
+
+    def assign_animal_to_enclosure(self, animal: Animal, enclosure: Enclosure) -> None:
+        """House an animal of the zoo in an enclosure when the batch is committed."""
+        self.__changes.append(("assign_animal_to_enclosure", (animal, enclosure)))
+
+    def assign_staff(self, staff_member: Staff, assignment: Animal | Enclosure) -> None:
+        """Assign an animal or enclosure of the zoo to a staff member when the batch is committed."""
+        self.__changes.append(("assign_staff", (staff_member, assignment)))
+
+    def unassign_staff(self, staff_member: Staff, assignment: Animal | Enclosure) -> None:
+        """Unassign an animal or enclosure from a staff member when the batch is committed."""
+        self.__changes.append(("unassign_staff", (staff_member, assignment)))
+
+    def remove_animal(self, animal: Animal) -> None:
+        """Remove an animal (and take it out of its enclosures) when the batch is committed."""
+        self.__changes.append(("remove_animal", (animal,)))
+
+    def remove_enclosure(self, enclosure: Enclosure) -> None:
+        """Remove an enclosure, which must be empty once the rest of the batch is made, when the batch is committed."""
+        self.__changes.append(("remove_enclosure", (enclosure,)))
+
+    def remove_staff_member(self, staff_member: Staff) -> None:
+        """Remove a staff member when the batch is committed."""
+        self.__changes.append(("remove_staff_member", (staff_member,)))
+
+    # committing -----------------------------------------------------------------------------------------------
+
+    def discard(self) -> None:
+        """Forget every change in the batch without making any of them."""
+        self.__changes = []
+
+    def check(self) -> list[str]:
+        """
+        Check whether every change in the batch can be made, without making any of them.
+        :return: A description of each problem found (empty if the batch can be committed).
+        """
+        return self.__plan()[0]
+
+    def commit(self) -> bool:
+        """
+        Make every change in the batch if they can all be made, otherwise make none of them. The batch is empty
+        afterwards either way.
+        :return: Whether the changes were made.
+        """
+        with self.__zoo.locked():  # the zoo's members cannot change between checking and making the changes ...
+            with ENTITY_LOCKS.holding(*self.__involved()):  # ... and neither can the entities involved.
+                return self.__commit()
+
+    def __commit(self) -> bool:
+        """Make every change in the batch if they can all be made (the locks of the batch must be held)."""
+        problems, moves_out, moves_in = self.__plan()
+        changes, self.__changes = self.__changes, []
+        if problems:
+            print(f"[ERROR] The batch of {len(changes)} changes cannot be made:\n - "
+                  + "\n - ".join(problems) + "\nNo change made.\n")
+            return False
+
+        at_datetime = self.__at_datetime
+        with DataRecord.batched_writes():  # one write per log for the whole batch.
+            # animals leave their enclosures before any arrive, so each enclosure only ever holds one species:
+            for enclosure, animals in moves_out:
+                for animal in animals:
+                    enclosure.remove_animal(animal, at_datetime)
+            for enclosure, animals in moves_in:
+                for animal in animals:
+                    enclosure.add_animal(animal, at_datetime)
+
+            staff_datetime = datetime.now() if at_datetime is None else at_datetime  # staff logs need a time.
+            for name, arguments in changes:
+                match name:
+                    case "assign_staff":
+                        arguments[0].assign(arguments[1], staff_datetime)
+                    case "unassign_staff":
+                        arguments[0].unassign(arguments[1], staff_datetime)
+                    case "remove_animal":
+                        self.__zoo.remove_animal(arguments[0], at_datetime)
+                    case "remove_enclosure":
+                        self.__zoo.remove_enclosure(arguments[0], at_datetime)
+                    case "remove_staff_member":
+                        self.__zoo.remove_staff_member(arguments[0], at_datetime)
+        return True
+
+    def __involved(self) -> set[str]:
+        """Return the ids of the entities the batch may change (those in it and the enclosures their animals live in)."""
+        ids = {entity.id for name, arguments in self.__changes for entity in arguments if hasattr(entity, "id")}
+        for enclosure in self.__zoo.enclosures:
+            if any(animal.id in ids for animal in enclosure.inhabitants):
+                ids.add(enclosure.id)
+        return ids
+
+    def __plan(self) -> tuple[list[str], list[tuple[Enclosure, list[Animal]]], list[tuple[Enclosure, list[Animal]]]]:
+        """
+        Work out the state the zoo would be in after the batch and check it against the rules.
+        :return: (the problems found, the animals that leave each enclosure, the animals that arrive in each enclosure)
+        """
+        animals = {animal.id: animal for animal in self.__zoo.animals}
+        enclosures = {enclosure.id: enclosure for enclosure in self.__zoo.enclosures}
+        staff = {staff_member.id: staff_member for staff_member in self.__zoo.staff}
+        housed = {enclosure_id: {animal.id: animal for animal in enclosure.inhabitants}  # enclosure id -> inhabitants
+                  for enclosure_id, enclosure in enclosures.items()}
+        homes = {}  # animal id -> {id of each enclosure it lives in: None}
+        for enclosure_id, inhabitants in housed.items():
+            for animal_id in inhabitants:
+                homes.setdefault(animal_id, {})[enclosure_id] = None
+        removed_enclosures = []
+        problems = []
+
+        for name, arguments in self.__changes:
+            match name:
+                case "move_animal":
+                    animal, from_enclosure, to_enclosure = arguments
+                    if from_enclosure.id not in enclosures or to_enclosure.id not in enclosures:
+                        problems.append(f"Both enclosures must belong to {self.__zoo.name} to move {animal.name}.")
+                    elif animal.id not in housed[from_enclosure.id]:
+                        problems.append(f"{animal.name}_{animal.id} does not live in "
+                                        f"{from_enclosure.name}_{from_enclosure.id}.")
+                    else:
+                        del housed[from_enclosure.id][animal.id]
+                        del homes[animal.id][from_enclosure.id]
+                        housed[to_enclosure.id][animal.id] = animal
+                        homes[animal.id][to_enclosure.id] = None
+                case "assign_animal_to_enclosure":
+                    animal, enclosure = arguments
+                    if not isinstance(animal, Animal) or animal.id not in animals:
+                        problems.append(f"Animal must belong to {self.__zoo.name} before it can be assigned to an "
+                                        f"enclosure.")
+                    elif enclosure.id not in enclosures:
+                        problems.append(f"Enclosure must belong to {self.__zoo.name} before it can receive animals.")
+                    else:
+                        housed[enclosure.id][animal.id] = animal
+                        homes.setdefault(animal.id, {})[enclosure.id] = None
+                case "assign_staff" | "unassign_staff":
+                    staff_member, assignment = arguments
+                    if not isinstance(staff_member, Staff) or staff_member.id not in staff:
+                        problems.append(f"Staff member must belong to {self.__zoo.name} before assignment.")
+                    elif name == "assign_staff" and assignment.id not in (
+                            enclosures if isinstance(assignment, Enclosure) else animals):
+                        problems.append(f"{assignment.name}_{assignment.id} must belong to {self.__zoo.name} before "
+                                        f"staff can be assigned to it.")
+                case "remove_animal":
+                    animal = arguments[0]
+                    if not isinstance(animal, Animal) or animal.id not in animals:
+                        problems.append(f"{getattr(animal, 'name', animal)} cannot be removed as they do not live "
+                                        f"in {self.__zoo.name}.")
+                    else:
+                        del animals[animal.id]
+                        for enclosure_id in homes.pop(animal.id, {}):
+                            del housed[enclosure_id][animal.id]
+                case "remove_enclosure":
+                    enclosure = arguments[0]
+                    if not isinstance(enclosure, Enclosure) or enclosure.id not in enclosures:
+                        problems.append(f"{getattr(enclosure, 'name', enclosure)} cannot be removed as it does not "
+                                        f"belong to {self.__zoo.name}.")
+                    else:
+                        removed_enclosures.append(enclosures.pop(enclosure.id))
+                case "remove_staff_member":
+                    staff_member = arguments[0]
+                    if not isinstance(staff_member, Staff) or staff_member.id not in staff:
+                        problems.append(f"{getattr(staff_member, 'name', staff_member)} cannot be removed as they "
+                                        f"do not work at {self.__zoo.name}.")
+                    else:
+                        del staff[staff_member.id]
+
+        for enclosure in removed_enclosures:
+            if housed[enclosure.id]:
+                problems.append(f"{enclosure.name}_{enclosure.id} cannot be removed as it is not empty.")
+
+        # check every enclosure whose inhabitants change against the rules of Enclosure.add_animal:
+        moves_out, moves_in = [], []
+        for enclosure in self.__zoo.enclosures:
+            before = {animal.id for animal in enclosure.inhabitants}
+            after = housed[enclosure.id]
+            leaving = [animal for animal in enclosure.inhabitants if animal.id not in after]
+            arriving = [animal for animal_id, animal in after.items() if animal_id not in before]
+            for animal in leaving:
+                if animal.under_treatment:
+                    problems.append(f"{animal.name}_{animal.id} is under treatment so they cannot be relocated at "
+                                    f"this time.")
+            for animal in arriving:
+                try:
+                    enclosure.check_inhabitant(animal, list(after.values()))
+                except (TypeError, ValueError) as e:
+                    problems.append(str(e))
+            if leaving:
+                moves_out.append((enclosure, leaving))
+            if arriving:
+                moves_in.append((enclosure, arriving))
+        return list(dict.fromkeys(problems)), moves_out, moves_in  # each problem once
@@ -0,0 +1,396 @@
+"""
+File: zoo_history.py
+Description: Contains the ZooHistory class which records every change to the state of a zoo (which animals, enclosures
+and staff it has, which animals live in each enclosure, staff assignments, cleanliness and treatment status) as a
+typed event in a stream kept in date and time order, and the ZooState class which is the state of a zoo at one moment.
+Checkpoints of the state are kept at most once per checkpoint interval (e.g. once a day), each storing only the state
+of the entities that changed since the checkpoint before, so the state at any date and time is rebuilt from the
+checkpoints up to it and the events after the nearest one rather than from every event since the zoo opened. The
+number of checkpoints is capped: when there would be too many, every other one is merged into the next and the
+interval doubles. An event recorded late is inserted among the events after its checkpoint, and the later
+checkpoints are only brought up to date when the history is next read. A ZooSystem only keeps a history once it is
+enabled (see ZooSystem.enable_history()).
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import threading
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from action import Action
+from animal import Animal
+from enclosure import Enclosure
+from severity import Severity
+from staff import Staff
+from state_change import StateChange
+
+
+class ZooEvent(NamedTuple):
+    at_datetime: datetime
+    change: StateChange
+    subject_id: str  # the animal, enclosure or staff member whose state changed.
+    object_id: str | None = None  # the enclosure an animal moved into/out of, or what a staff member was assigned.
+    value: object = None  # the new cleanliness, treatment status or (when added to the zoo) initial state.
+
+
+class ZooState:
+    def __init__(self, entities: dict, at_datetime: datetime = datetime.min):
+        """
+        Create a new (empty) ZooState instance.
+        :param entities: Dictionary of id -> every entity that has been part of the zoo (shared, not copied).
+        :param at_datetime: The date and time the state is at.
+        """
+        self.__entities = entities
+        self.__at_datetime = at_datetime
+        self.__members = {"animal": {}, "enclosure": {}, "staff": {}}  # kind -> {id: None} (ordered sets of ids)
+        self.__homes = {}  # animal id -> id of the enclosure it lives in.
+        self.__inhabitants = {}  # enclosure id -> {animal id: None}
+        self.__assignments = {}  # staff id -> {assigned animal or enclosure id: None}
+        self.__cleanliness = {}  # animal or enclosure id -> Severity
+        self.__under_treatment = set()  # ids of the animals under treatment.
+
+    def copy(self, at_datetime: datetime | None = None):
+        """Return an independent copy of the state (at another date and time, if given)."""
+        state = ZooState(self.__entities, self.__at_datetime if at_datetime is None else at_datetime)
+        state.__members = {kind: dict(ids) for kind, ids in self.__members.items()}
+        state.__homes = dict(self.__homes)
+        state.__inhabitants = {enclosure_id: dict(ids) for enclosure_id, ids in self.__inhabitants.items()}
+        state.__assignments = {staff_id: dict(ids) for staff_id, ids in self.__assignments.items()}
+        state.__cleanliness = dict(self.__cleanliness)
+        state.__under_treatment = set(self.__under_treatment)
+        return state
+
+    def get_at_datetime(self) -> datetime:
+        """Return the date and time the state is at."""
+        return self.__at_datetime
+
+    def get_animals(self) -> list[Animal]:
+        """Return the animals that were in the zoo."""
+        return [self.__entities[animal_id] for animal_id in self.__members["animal"]]
+
+    def get_enclosures(self) -> list[Enclosure]:
+        """Return the enclosures that were in the zoo."""
+        return [self.__entities[enclosure_id] for enclosure_id in self.__members["enclosure"]]
+
+    def get_staff(self) -> list[Staff]:
+        """Return the staff members that worked in the zoo."""
+        return [self.__entities[staff_id] for staff_id in self.__members["staff"]]
+
+    at_datetime = property(get_at_datetime)
+    animals = property(get_animals)
+    enclosures = property(get_enclosures)
+    staff = property(get_staff)
+
+    def inhabitants(self, enclosure: Enclosure) -> list[Animal]:
+        """Return the animals that lived in an enclosure."""
+        return [self.__entities[animal_id] for animal_id in self.__inhabitants.get(enclosure.id, {})]
+
+    def enclosure_of(self, animal: Animal) -> Enclosure | None:
+        """Return the enclosure an animal lived in (None if it was not in an enclosure)."""
+        enclosure_id = self.__homes.get(animal.id)
+        return None if enclosure_id is None else self.__entities[enclosure_id]
+
+    def assignments(self, staff_member: Staff) -> list[Animal | Enclosure]:
+        """Return the animals and enclosures a staff member was responsible for."""
+        return [self.__entities[assigned_id] for assigned_id in self.__assignments.get(staff_member.id, {})]
+
+    def cleanliness(self, dirtying_object: Animal | Enclosure) -> Severity | None:
+        """Return how clean an animal or enclosure was (None if it was not in the zoo)."""
+        return self.__cleanliness.get(dirtying_object.id)
+
+    def under_treatment(self, animal: Animal) -> bool:
+        """Return whether an animal was under treatment."""
+        return animal.id in self.__under_treatment
+
+    def entity_state(self, entity_id: str) -> tuple:
+        """Return the state of one entity: what kind of member of the zoo it is (None if it is not), its enclosure,
+        its inhabitants, its assignments, its cleanliness and whether it is under treatment."""
+        kind = next((kind for kind, ids in self.__members.items() if entity_id in ids), None)
+        return (kind, self.__homes.get(entity_id), tuple(self.__inhabitants.get(entity_id, ())),
+                tuple(self.__assignments.get(entity_id, ())), self.__cleanliness.get(entity_id),
+                entity_id in self.__under_treatment)
+
+    def restore(self, entity_id: str, entity_state: tuple) -> None:
+        """
+        Set the state of one entity.
+        :param entity_id: The id of the entity.
+        :param entity_state: Its state (see entity_state()).
+        :return: None
+        """
+        kind, home, inhabitants, assignments, cleanliness, under_treatment = entity_state
+        for member_kind, ids in self.__members.items():
+            if member_kind != kind:
+                ids.pop(entity_id, None)
+        if kind is not None:
+            self.__members[kind][entity_id] = None
+        for values, value in ((self.__homes, home), (self.__inhabitants, dict.fromkeys(inhabitants)),
+                              (self.__assignments, dict.fromkeys(assignments)), (self.__cleanliness, cleanliness)):
+            if value is None or value == {}:
+                values.pop(entity_id, None)
+            else:
+                values[entity_id] = value
+        if under_treatment:
+            self.__under_treatment.add(entity_id)
+        else:
+            self.__under_treatment.discard(entity_id)
+
+    def apply(self, event: ZooEvent) -> list[str]:
+        """
+        Change the state by one event.
+        :param event: The event (a ZooEvent).
+        :return: The ids of the entities whose state changed.
+        """
+        subject_id, object_id, value = event.subject_id, event.object_id, event.value
+        changed = [subject_id]
+        match event.change:
+            case StateChange.ADD_ANIMAL | StateChange.ADD_ENCLOSURE | StateChange.ADD_STAFF:
+                self.__members[value["kind"]][subject_id] = None
+                if "cleanliness" in value:
+                    self.__cleanliness[subject_id] = value["cleanliness"]
+                if value.get("under_treatment"):
+                    self.__under_treatment.add(subject_id)
+                for animal_id in value.get("inhabitants", ()):
+                    changed += [animal_id, self.__house(animal_id, subject_id)]
+                for assigned_id in value.get("assignments", ()):
+                    self.__assignments.setdefault(subject_id, {})[assigned_id] = None
+            case StateChange.REMOVE_ANIMAL | StateChange.REMOVE_ENCLOSURE | StateChange.REMOVE_STAFF:
+                for members in self.__members.values():
+                    members.pop(subject_id, None)
+                self.__cleanliness.pop(subject_id, None)
+                self.__under_treatment.discard(subject_id)
+                self.__assignments.pop(subject_id, None)
+            case StateChange.HOUSE:
+                changed += [object_id, self.__house(subject_id, object_id)]
+            case StateChange.UNHOUSE:
+                if self.__homes.get(subject_id) == object_id:
+                    del self.__homes[subject_id]
+                self.__inhabitants.get(object_id, {}).pop(subject_id, None)
+                changed.append(object_id)
+            case StateChange.ASSIGN:
+                self.__assignments.setdefault(subject_id, {})[object_id] = None
+            case StateChange.UNASSIGN:
+                self.__assignments.get(subject_id, {}).pop(object_id, None)
+            case StateChange.CLEANLINESS:
+                self.__cleanliness[subject_id] = value
+            case StateChange.TREATMENT:
+                if value:
+                    self.__under_treatment.add(subject_id)
+                else:
+                    self.__under_treatment.discard(subject_id)
+        return [entity_id for entity_id in changed if entity_id is not None]
+
+    def __house(self, animal_id: str, enclosure_id: str) -> str | None:
+        """Record that an animal lives in an enclosure (and no longer in any other).
+        :return: The id of the enclosure it lived in before (None if it had none)."""
+        previous_id = self.__homes.get(animal_id)
+        if previous_id is not None:
+            self.__inhabitants.get(previous_id, {}).pop(animal_id, None)
+        self.__homes[animal_id] = enclosure_id
+        self.__inhabitants.setdefault(enclosure_id, {})[animal_id] = None
+        return previous_id
+
+
+class ZooHistory:
+    def __init__(self, checkpoint_interval: timedelta = timedelta(days=1), max_checkpoints: int = 64):
+        """
+        Create a new (empty) ZooHistory instance.
+        :param checkpoint_interval: The least time between checkpoints of the state (default 1 day), doubled whenever
+        there would be more than max_checkpoints.
+        :param max_checkpoints: The most checkpoints kept (default 64).
+        """
+        self.__interval = checkpoint_interval
+        self.__max_checkpoints = max(2, max_checkpoints)
+        self.__entities = {}  # id -> every entity that has been part of the zoo.
+        self.__times = [datetime.min]  # the date and time of each checkpoint, in order.
+        # at each checkpoint, the state of the entities that changed since the checkpoint before (id -> entity_state):
+        self.__deltas = [{}]
+        self.__buckets = [[]]  # the ZooEvents from each checkpoint until the next, in date and time order.
+        self.__tip = ZooState(self.__entities)  # the state at the latest checkpoint.
+        self.__stale = None  # the first checkpoint out of date because of an event recorded late (None if none).
+        self.__count = 0  # the number of events recorded.
+        self.__latest = None  # the date and time of the latest event.
+        self.__lock = threading.RLock()  # held while events are recorded or states are rebuilt.
+
+    def __len__(self) -> int:
+        """Return the number of events recorded."""
+        return self.__count
+
+    def get_events(self) -> list[ZooEvent]:
+        """Return every event recorded, in date and time order."""
+        with self.__lock:
+            return [event for bucket in self.__buckets for event in bucket]
+
+    def get_checkpoint_count(self) -> int:
+        """Return the number of checkpoints of the state that are kept."""
+        return len(self.__times)
+
+    def get_checkpoint_interval(self) -> timedelta:
+        """Return the least time between checkpoints of the state."""
+        return self.__interval
+
+    events = property(get_events)
+    checkpoint_count = property(get_checkpoint_count)
+    checkpoint_interval = property(get_checkpoint_interval)
+
+    def record(self, at_datetime: datetime | None, change: StateChange, subject_id: str, object_id: str | None = None,
+               value: object = None) -> None:
+        """
+        Add an event to the stream. Events are kept in date and time order, so an event recorded late is inserted
+        before any later events after its checkpoint (and the checkpoints after it are made again when next read).
+        :param at_datetime: When the change happened (None is taken to be the time of the latest event so far).
+        :param change: The kind of change (StateChange).
+        :param subject_id: The id of the animal, enclosure or staff member whose state changed.
+        :param object_id: The id of the enclosure or assignment involved (if any).
+        :param value: The new value (if any).
+        :return: None
+        """
+        with self.__lock:  # events are recorded one at a time, by any thread.
+            if at_datetime is None:
+                at_datetime = self.__latest if self.__latest is not None else datetime.min
+            latest_bucket = self.__buckets[-1]
+            if (at_datetime - self.__times[-1] >= self.__interval
+                    and (not latest_bucket or at_datetime > latest_bucket[-1].at_datetime)):
+                self.__checkpoint(at_datetime)
+
+            index = bisect_right(self.__times, at_datetime) - 1
+            bucket = self.__buckets[index]
+            event = ZooEvent(at_datetime, change, subject_id, object_id, value)
+            if bucket and at_datetime < bucket[-1].at_datetime:
+                bucket.insert(bisect_right(bucket, at_datetime, key=lambda entry: entry.at_datetime), event)
+            else:
+                bucket.append(event)
+            if index < len(self.__times) - 1:  # recorded late, so the later checkpoints are out of date.
+                self.__stale = index + 1 if self.__stale is None else min(self.__stale, index + 1)
+            self.__count += 1
+            if self.__latest is None or at_datetime > self.__latest:
+                self.__latest = at_datetime
+
+    def as_of(self, at_datetime: datetime) -> ZooState:
+        """
+        Rebuild the state of the zoo at a date and time, from the checkpoints up to it.
+        :param at_datetime: The date and time (events at exactly this time are included).
+        :return: ZooState
+        """
+        with self.__lock:
+            self.__refresh()
+            index = bisect_right(self.__times, at_datetime) - 1
+            state = self.__tip.copy(at_datetime) if index == len(self.__times) - 1 else self.__state(index, at_datetime)
+            for event in self.__buckets[index]:
+                if event.at_datetime > at_datetime:
+                    break
+                state.apply(event)
+        return state
+
+    def __state(self, index: int, at_datetime: datetime = datetime.min) -> ZooState:
+        """Return the state at a checkpoint, made from the changes kept at it and every checkpoint before."""
+        state = ZooState(self.__entities, at_datetime)
+        for delta in self.__deltas[:index + 1]:
+            for entity_id, entity_state in delta.items():
+                state.restore(entity_id, entity_state)
+        return state
+
+    def __replay(self, state: ZooState, index: int) -> dict:
+        """Apply the events after a checkpoint to its state and return the state of the entities they changed."""
+        changed = {}
+        for event in self.__buckets[index]:
+            changed.update(dict.fromkeys(state.apply(event)))
+        return {entity_id: state.entity_state(entity_id) for entity_id in changed}
+
+    def __checkpoint(self, at_datetime: datetime) -> None:
+        """Add a checkpoint at a date and time after every event so far (the lock must be held)."""
+        self.__refresh()
+        self.__deltas.append(self.__replay(self.__tip, len(self.__times) - 1))
+        self.__times.append(at_datetime)
+        self.__buckets.append([])
+        if len(self.__times) > self.__max_checkpoints:  # merge every other checkpoint into the next one.
+            times, deltas, buckets, carried = [], [], [], {}
+            for index, (checkpoint_time, delta, bucket) in enumerate(zip(self.__times, self.__deltas,
+                                                                            self.__buckets)):
+                if index % 2 == 1 and index < len(self.__times) - 1:
+                    buckets[-1].extend(bucket)
+                    carried = delta
+                else:
+                    times.append(checkpoint_time)
+                    deltas.append(carried | delta)
+                    buckets.append(bucket)
+                    carried = {}
+            self.__times, self.__deltas, self.__buckets = times, deltas, buckets
+            self.__interval *= 2
+
+    def __refresh(self) -> None:
+        """Make the checkpoints out of date because of events recorded late again (the lock must be held)."""
+        if self.__stale is None:
+            return None
+        state = self.__state(self.__stale - 1)
+        for index in range(self.__stale - 1, len(self.__times) - 1):
+            self.__deltas[index + 1] = self.__replay(state, index)
+        self.__tip = state
+        self.__stale = None
+
+    # watching entities ---------------------------------------------------------------------------------------
+
+    def watch(self, entity: Animal | Enclosure | Staff, at_datetime: datetime | None = None) -> None:
+        """
+        Record that an animal, enclosure or staff member was added to the zoo (with its current state) and record
+        the changes to its state from then on.
+        :param entity: The animal, enclosure or staff member.
+        :param at_datetime: When it was added (default is the time of the latest event so far).
+        :return: None
+        """
+        self.__entities[entity.id] = entity
+        related = entity.inhabitants if isinstance(entity, Enclosure) else (
+            entity.enclosure_assignments + entity.animal_assignments if isinstance(entity, Staff) else [])
+        for related_entity in related:  # so that states can return the entities themselves.
+            self.__entities.setdefault(related_entity.id, related_entity)
+
+        if isinstance(entity, Animal):
+            self.record(at_datetime, StateChange.ADD_ANIMAL, entity.id,
+                        value={"kind": "animal", "cleanliness": entity.cleanliness,
+                               "under_treatment": entity.under_treatment})
+        elif isinstance(entity, Enclosure):
+            self.record(at_datetime, StateChange.ADD_ENCLOSURE, entity.id,
+                        value={"kind": "enclosure", "cleanliness": entity.cleanliness,
+                               "inhabitants": [animal.id for animal in related]})
+        else:
+            self.record(at_datetime, StateChange.ADD_STAFF, entity.id,
+                        value={"kind": "staff", "assignments": [assigned.id for assigned in related]})
+        entity.add_observer(self)
+
+    def unwatch(self, entity: Animal | Enclosure | Staff, at_datetime: datetime | None = None) -> None:
+        """
+        Record that an animal, enclosure or staff member was removed from the zoo and stop recording its changes.
+        :param entity: The animal, enclosure or staff member.
+        :param at_datetime: When it was removed (default is the time of the latest event so far).
+        :return: None
+        """
+        entity.remove_observer(self)
+        change = (StateChange.REMOVE_ANIMAL if isinstance(entity, Animal) else
+                  StateChange.REMOVE_ENCLOSURE if isinstance(entity, Enclosure) else StateChange.REMOVE_STAFF)
+        self.record(at_datetime, change, entity.id)
+
+    def update(self, subject: Animal | Enclosure | Staff, action: Action, at_datetime: datetime | None,
+               **details) -> None:
+        """
+        Record a change to the state of an entity (called by the entity as one of its observers).
+        :param subject: The entity whose state changed.
+        :param action: The action that changed it.
+        :param at_datetime: When the action occurred.
+        :param details: Further information about the action.
+        :return: None
+        """
+        match action:
+            case Action.BECOME_DIRTIER | Action.RECEIVE_CLEANING:
+                self.record(at_datetime, StateChange.CLEANLINESS, subject.id, value=details["cleanliness"])
+            case Action.RECEIVE_DIAGNOSIS | Action.RECOVER:
+                self.record(at_datetime, StateChange.TREATMENT, subject.id, value=action == Action.RECEIVE_DIAGNOSIS)
+            case Action.ASSIGN | Action.UNASSIGN if isinstance(subject, Enclosure):
+                change = StateChange.HOUSE if action == Action.ASSIGN else StateChange.UNHOUSE
+                self.__entities.setdefault(details["animal"].id, details["animal"])
+                self.record(at_datetime, change, details["animal"].id, subject.id)
+            case Action.ASSIGN | Action.UNASSIGN:
+                change = StateChange.ASSIGN if action == Action.ASSIGN else StateChange.UNASSIGN
+                self.__entities.setdefault(details["assignment"].id, details["assignment"])
+                self.record(at_datetime, change, subject.id, details["assignment"].id)
@@ -0,0 +1,239 @@
+"""
+File: zoo_load_test.py
+Description: Contains the ZooClient class, a minimal asyncio client of the JSON API of a ZooServer, and the
+LoadTestResults class and run_load_test function which send requests to a server at a fixed rate (e.g. 1000 per
+second) over a pool of connections and report the latency of the requests. Requests are sent on schedule whether or
+not earlier requests have been answered, and each latency is measured from when its request was due, so a server
+that falls behind is seen in the latencies rather than hidden by a slower sending rate. Run this file to load test a
+local instance serving a small demonstration zoo (or --host and --port to test a running server), e.g.
+
+    python zoo_load_test.py --rate 1000 --duration 5
+
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import threading
+import time
+
+
+class ZooClient:
+    def __init__(self, host: str, port: int):
+        """
+        Create a new ZooClient instance (it connects on its first request and keeps the connection open).
+        :param host: The address of the server.
+        :param port: The port of the server.
+        """
+        self.__host = host
+        self.__port = port
+        self.__reader = None
+        self.__writer = None
+
+    async def __aenter__(self):
+        """Use the client in an 'async with ZooClient(host, port) as client:' block, which closes it at the end."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> bool:
+        """Close the connection at the end of an 'async with' block."""
+        await self.close()
+        return False
+
+    async def request(self, method: str, path: str, body: dict | None = None) -> tuple[int, dict | list | str]:
+        """
+        Send a request to the server and wait for its answer.
+        :param method: The HTTP method, e.g. "GET" or "POST".
+        :param path: The path of the request, e.g. "/animals".
+        :param body: The JSON body of the request (default is no body).
+        :return: (the HTTP status of the answer, its JSON payload, or its text if it was streamed text).
+        """
+        if self.__writer is None:
+            self.__reader, self.__writer = await asyncio.open_connection(self.__host, self.__port)
+        data = b"" if body is None else json.dumps(body).encode()
+        self.__writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.__host}\r\nContent-Type: application/json\r\n"
+                            f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+        await self.__writer.drain()
+
+        status = int((await self.__reader.readline()).split()[1])
+        headers = {}
+        while (line := await self.__reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding") == "chunked":
+            chunks = []
+            while size := int(await self.__reader.readline(), 16):
+                chunks.append(await self.__reader.readexactly(size + 2))  # each chunk ends with \r\n
+            await self.__reader.readline()
+            return status, b"".join(chunk[:-2] for chunk in chunks).decode()
+        payload = await self.__reader.readexactly(int(headers.get("content-length", 0)))
+        return status, json.loads(payload) if payload else None
+
+    async def close(self) -> None:
+        """Close the connection to the server (a later request opens a new one)."""
+        if self.__writer is not None:
+            self.__writer.close()
+            self.__reader = self.__writer = None
+
+
+class LoadTestResults:
+    def __init__(self, latencies: list[float], statuses: list[int], duration: float):
+        """
+        Create a new LoadTestResults instance.
+        :param latencies: The latency of each request in seconds, from when it was due until it was answered.
+        :param statuses: The HTTP status of each answer (0 if the request failed without an answer).
+        :param duration: How long the test took in seconds.
+        """
+        self.__latencies = latencies
+        self.__statuses = statuses
+        self.__duration = duration
+
+    def __str__(self) -> str:
+        """Return a summary of the results as a formatted string."""
+        return (f"{len(self.__latencies)} requests in {self.__duration:.2f}s ({self.rate:.0f} per second), "
+                f"{self.errors} errors\np50 {self.percentile(50) * 1000:.2f} ms, "
+                f"p99 {self.percentile(99) * 1000:.2f} ms, max {max(self.__latencies, default=0) * 1000:.2f} ms")
+
+    def get_latencies(self) -> list[float]:
+        """Return the latency of each request in seconds."""
+        return self.__latencies
+
+    def get_errors(self) -> int:
+        """Return the number of requests answered with a server error, or not answered at all."""
+        return sum(1 for status in self.__statuses if status == 0 or status >= 500)
+
+    def get_rate(self) -> float:
+        """Return the number of requests answered per second."""
+        return len(self.__latencies) / self.__duration if self.__duration else 0.0
+
+    latencies = property(get_latencies)
+    errors = property(get_errors)
+    rate = property(get_rate)
+
+    def percentile(self, percent: float) -> float:
+        """Return a percentile of the latencies in seconds, e.g. results.percentile(99) for the p99 latency."""
+        if len(self.__latencies) < 2:
+            return self.__latencies[0] if self.__latencies else 0.0
+        cut_points = statistics.quantiles(self.__latencies, n=1000, method="inclusive")
+        return cut_points[min(len(cut_points) - 1, max(0, round(percent * 10) - 1))]
+
+
+async def run_load_test(host: str, port: int, requests: list[tuple[str, str, dict | None]], rate: float = 1000,
+                        duration: float = 5.0, connections: int = 64) -> LoadTestResults:
+    """
+    Send requests to a server at a fixed rate and measure how long each takes to be answered.
+    :param host: The address of the server.
+    :param port: The port of the server.
+    :param requests: The (method, path, body) of the requests to send, sent in turn and repeated as needed.
+    :param rate: How many requests to send per second (default 1000).
+    :param duration: How long to send requests for in seconds (default 5).
+    :param connections: The number of connections the requests are sent over (default 64).
+    :return: The latencies and statuses of the requests as LoadTestResults.
+    """
+    due = asyncio.Queue()  # (request, when it was due) waiting for a free connection.
+    latencies, statuses = [], []
+
+    async def send_from(client: ZooClient) -> None:
+        while (item := await due.get()) is not None:
+            (method, path, body), due_at = item
+            try:
+                status, _ = await client.request(method, path, body)
+            except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+                status = 0
+                await client.close()
+            latencies.append(time.perf_counter() - due_at)
+            statuses.append(status)
+        await client.close()
+
+    senders = [asyncio.create_task(send_from(ZooClient(host, port))) for _ in range(connections)]
+    start = time.perf_counter()
+    total = int(rate * duration)
+    schedule = itertools.cycle(requests)
+    for number in range(total):
+        due_at = start + number / rate
+        if (wait := due_at - time.perf_counter()) > 0:
+            await asyncio.sleep(wait)
+        due.put_nowait((next(schedule), due_at))
+    for _ in senders:
+        due.put_nowait(None)
+    await asyncio.gather(*senders)
+    return LoadTestResults(latencies, statuses, time.perf_counter() - start)
+
+
+async def request_mix(host: str, port: int, reads_per_write: int = 4) -> list[tuple[str, str, dict | None]]:
+    """
+    Make a mix of requests for a load test from the entities of a server's zoo: descriptions of animals and
+    enclosures, and keepers feeding animals.
+    :param host: The address of the server.
+    :param port: The port of the server.
+    :param reads_per_write: The number of reads in the mix for each write (default 4).
+    :return: The (method, path, body) of each request in the mix.
+    """
+    async with ZooClient(host, port) as client:
+        animals = [animal["id"] for animal in (await client.request("GET", "/animals"))[1]]
+        enclosures = [enclosure["id"] for enclosure in (await client.request("GET", "/enclosures"))[1]]
+        keepers = [member["id"] for member in (await client.request("GET", "/staff"))[1]
+                   if member["role"] == "Zookeeper"]
+    reads = itertools.cycle([("GET", f"/animals/{animal_id}", None) for animal_id in animals]
+                            + [("GET", f"/enclosures/{enclosure_id}", None) for enclosure_id in enclosures])
+    mix = []
+    for keeper_id, animal_id in zip(itertools.cycle(keepers), animals) if keepers else []:
+        mix += [next(reads) for _ in range(reads_per_write)]
+        mix.append(("POST", f"/staff/{keeper_id}/feed", {"animal_id": animal_id, "food": "Raw Chicken",
+                                                         "quantity": "200g"}))
+    return mix or [next(reads)]
+
+
+def _serve_demo_zoo() -> tuple[str, int]:
+    """Serve a small demonstration zoo from a background thread and return the server's (host, port)."""
+    from enclosure import Enclosure  # the zoo is only imported when this process runs the server itself.
+    from environmental_type import EnvironmentalType
+    from reptile import Reptile
+    from zoo_server import ZooServer
+    from zoo_system import ZooSystem
+    from zookeeper import Zookeeper
+
+    zoo = ZooSystem("The Royal Zoo")
+    for number in range(10):
+        dune = Enclosure(f"Dune {number}", EnvironmentalType.DESERT, 100)
+        zoo.add_enclosure(dune)
+        for _ in range(10):
+            cobra = Reptile(f"Cobra {number}", "King Cobra", "Hiss", "Smooth", True, 4,
+                            habitat=EnvironmentalType.DESERT)
+            zoo.add_animal(cobra)
+            zoo.assign_animal_to_enclosure(cobra, dune)
+        zoo.add_staff_member(Zookeeper(f"Keeper {number}"))
+
+    started = threading.Event()
+    server = ZooServer(zoo)
+
+    async def serve() -> None:
+        await server.start()
+        started.set()
+        await server.serve_forever()
+
+    threading.Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+    started.wait()
+    return server.address
+
+
+async def main(arguments: argparse.Namespace) -> None:
+    """Run a load test as described by the command line arguments and print the results."""
+    host, port = (arguments.host, arguments.port) if arguments.port else _serve_demo_zoo()
+    mix = await request_mix(host, port)
+    print(f"Sending {arguments.rate:.0f} requests per second to {host}:{port} for {arguments.duration}s ...")
+    print(await run_load_test(host, port, mix, arguments.rate, arguments.duration, arguments.connections))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the JSON API of a ZooServer.")
+    parser.add_argument("--host", default="127.0.0.1", help="address of the server (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=0, help="port of the server (default: serve a demo zoo here)")
+    parser.add_argument("--rate", type=float, default=1000, help="requests per second (default 1000)")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds to send requests for (default 5)")
+    parser.add_argument("--connections", type=int, default=64, help="connections to send over (default 64)")
+    asyncio.run(main(parser.parse_args()))
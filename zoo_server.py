@@ -0,0 +1,549 @@
+"""
+File: zoo_server.py
+Description: Contains the ZooServer class which serves a ZooSystem over a local JSON API, built on asyncio streams.
+Entities are listed, added and removed under /animals, /enclosures and /staff, the actions of staff members (feed,
+clean, check_health, diagnose, treat and declare_recovery) are posted to /staff/<id>/<action>, and the report_*
+methods of the zoo are streamed from /reports/<name>. The event loop never runs zoo code itself: reads and reports
+run on a pool of threads, and writes are queued, coalesced into batches and made one batch at a time by a single
+writer thread inside DataRecord.batched_writes(), so each batch writes every log once. New animals, enclosures and
+staff are made on the writer thread too, and entities are found by id through the zoo's index (ZooSystem.get_member()).
+The [ERROR] messages a write prints are returned to the client, who receives 409 Conflict if the write could not be
+made: while servers run, sys.stdout is replaced by a stand-in that keeps what the writer thread prints during a write
+for that write and passes everything other threads print on unchanged.
+
+    POST /animals                  {"class": "Reptile", "name": ..., "species": ..., ...}  (constructor arguments)
+    POST /enclosures               {"name": ..., "environmental_type": "DESERT", "size": 10}
+    POST /staff                    {"role": "Zookeeper", "name": ...}
+    GET|DELETE /<kind>/<id>
+    POST /enclosures/<id>/animals  {"animal_id": ...}
+    POST /animals/<id>/move        {"from": <enclosure id>, "to": <enclosure id>}
+    POST /staff/<id>/assignments   {"enclosure_id": ...}
+    POST /staff/<id>/feed          {"animal_id": ..., "food": ..., "quantity": ..., "at": <ISO date and time>}
+    GET /reports/<name>[/<animal id>]
+
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+import asyncio
+import io
+import json
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, time
+from http import HTTPStatus
+from urllib.parse import unquote, urlsplit
+
+from animal import Animal
+from bird import Bird
+from data_record import DataRecord
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from mammal import Mammal
+from reptile import Reptile
+from severity import Severity
+from staff import Staff
+from veterinarian import Veterinarian
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+ANIMAL_CLASSES = {"Mammal": Mammal, "Bird": Bird, "Reptile": Reptile}
+STAFF_CLASSES = {"Zookeeper": Zookeeper, "Veterinarian": Veterinarian}
+REPORTS = ("species", "enclosure_status", "animals_on_display", "animal_medical_history", "zoo_medical_history",
+           "zoo_daily_staff_schedules", "zoo_staff_activity", "zoo_enclosure_maintenance")
+CHUNK_SIZE = 16 * 1024  # the most report text sent in one chunk.
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        """
+        Create a new ApiError, raised by a request handler to answer with an error status.
+        :param status: The HTTP status of the answer (e.g. 404).
+        :param message: A description of the problem.
+        """
+        super().__init__(message)
+        self.status = status
+
+
+class _ThreadStdout(io.TextIOBase):
+    _installed = None  # the stand-in in sys.stdout while any server runs (None otherwise).
+    _users = 0  # the number of running servers using it.
+    _lock = threading.Lock()  # held while it is installed or removed.
+
+    def __init__(self, stream):
+        """
+        Create a new stand-in for sys.stdout (see install()).
+        :param stream: The stream it replaces, which receives everything that is not captured.
+        """
+        super().__init__()
+        self.__stream = stream
+        self.__local = threading.local()  # the buffer of the thread capturing what it prints (if any).
+
+    @classmethod
+    def install(cls) -> "_ThreadStdout":
+        """Put the stand-in in sys.stdout (once, however many servers use it) and return it."""
+        with cls._lock:
+            if cls._installed is None:
+                cls._installed = cls(sys.stdout)
+                sys.stdout = cls._installed
+            cls._users += 1
+            return cls._installed
+
+    @classmethod
+    def uninstall(cls) -> None:
+        """Put the stream the stand-in replaced back in sys.stdout once no server uses it."""
+        with cls._lock:
+            cls._users -= 1
+            if cls._users == 0 and cls._installed is not None:
+                if sys.stdout is cls._installed:
+                    sys.stdout = cls._installed.__stream
+                cls._installed = None
+
+    @contextmanager
+    def capture(self):
+        """Keep what the current thread prints inside a 'with stdout.capture() as printed:' block in printed (a
+        StringIO), rather than writing it to the stream."""
+        self.__local.buffer = io.StringIO()
+        try:
+            yield self.__local.buffer
+        finally:
+            self.__local.buffer = None
+
+    def writable(self) -> bool:
+        """Return whether text can be written (always)."""
+        return True
+
+    def write(self, text: str) -> int:
+        """Write text to the capturing thread's buffer, or else to the stream."""
+        buffer = getattr(self.__local, "buffer", None)
+        return (self.__stream if buffer is None else buffer).write(text)
+
+    def flush(self) -> None:
+        """Flush the stream."""
+        self.__stream.flush()
+
+    def isatty(self) -> bool:
+        """Return whether the stream is a terminal."""
+        return self.__stream.isatty()
+
+    def fileno(self) -> int:
+        """Return the file descriptor of the stream."""
+        return self.__stream.fileno()
+
+    @property
+    def encoding(self) -> str | None:
+        """Return the encoding of the stream."""
+        return getattr(self.__stream, "encoding", None)
+
+
+def describe(entity: Animal | Enclosure | Staff) -> dict:
+    """Return the key attributes of an animal, enclosure or staff member as a JSON-ready dict."""
+    if isinstance(entity, Animal):
+        return {"id": entity.id, "name": entity.name, "class": type(entity).__name__, "species": entity.species,
+                "age": entity.age, "habitat": entity.habitat.name, "cleanliness": entity.cleanliness.name,
+                "under_treatment": entity.under_treatment}
+    if isinstance(entity, Enclosure):
+        return {"id": entity.id, "name": entity.name, "environmental_type": entity.environmental_type.name,
+                "size": entity.size, "species": entity.species, "cleanliness": entity.cleanliness.name,
+                "inhabitants": [animal.id for animal in entity.inhabitants]}
+    return {"id": entity.id, "name": entity.name, "role": type(entity).__name__,
+            "animal_assignments": [animal.id for animal in entity.animal_assignments],
+            "enclosure_assignments": [enclosure.id for enclosure in entity.enclosure_assignments]}
+
+
+class ZooServer:
+    def __init__(self, zoo: ZooSystem, host: str = "127.0.0.1", port: int = 0, batch_window: float = 0.002,
+                 max_batch: int = 256, read_threads: int = 4):
+        """
+        Create a new ZooServer instance (it serves requests once started, e.g. 'async with ZooServer(zoo) as server:').
+        :param zoo: The zoo to serve.
+        :param host: The address to listen on (default is only this computer).
+        :param port: The port to listen on (default 0, any free port; see address once started).
+        :param batch_window: How long in seconds a write waits for others to join its batch (default 2 ms).
+        :param max_batch: The most writes made in one batch (default 256).
+        :param read_threads: The number of threads that run reads and reports (default 4).
+        """
+        self.__zoo = zoo
+        self.__host = host
+        self.__port = port
+        self.__batch_window = batch_window
+        self.__max_batch = max_batch
+        self.__read_threads = read_threads
+        self.__server = None
+        self.__readers = None  # thread pool for reads and reports.
+        self.__writer = None  # single thread that makes the batches of writes, in the order they were received.
+        self.__writes = None  # queue of (write, future for its outcome) waiting to be batched.
+        self.__stdout = None  # the stand-in for sys.stdout that captures what writes print (see _ThreadStdout).
+        self.__batcher = None  # task that collects queued writes into batches.
+        self.__connections = set()  # tasks serving open connections.
+        self.__batch_count = 0
+        self.__write_count = 0
+        self.__routes = [  # (method, path pattern, handler); handlers receive the path's groups and the JSON body.
+            ("GET", r"/(animals|enclosures|staff)", self.__list),
+            ("POST", r"/animals", self.__add_animal),
+            ("POST", r"/enclosures", self.__add_enclosure),
+            ("POST", r"/staff", self.__add_staff_member),
+            ("GET", r"/(animals|enclosures|staff)/([^/]+)", self.__get),
+            ("DELETE", r"/(animals|enclosures|staff)/([^/]+)", self.__remove),
+            ("POST", r"/enclosures/([^/]+)/animals", self.__assign_animal),
+            ("POST", r"/animals/([^/]+)/move", self.__move_animal),
+            ("POST", r"/staff/([^/]+)/assignments", self.__assign_staff),
+            ("POST", r"/staff/([^/]+)/(feed|clean|check_health|diagnose|treat|declare_recovery)", self.__act),
+            ("GET", r"/reports/([a-z_]+)(?:/([^/]+))?", self.__report),
+        ]
+
+    async def __aenter__(self):
+        """Start serving at the start of an 'async with' block."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> bool:
+        """Stop serving at the end of an 'async with' block."""
+        await self.close()
+        return False
+
+    def get_zoo(self) -> ZooSystem:
+        """Return the zoo being served."""
+        return self.__zoo
+
+    def get_address(self) -> tuple[str, int]:
+        """Return the (host, port) the server listens on (the port is only known once started)."""
+        if self.__server is not None:
+            return self.__server.sockets[0].getsockname()[:2]
+        return self.__host, self.__port
+
+    def get_batch_count(self) -> int:
+        """Return the number of batches of writes made so far."""
+        return self.__batch_count
+
+    def get_write_count(self) -> int:
+        """Return the number of writes made so far."""
+        return self.__write_count
+
+    zoo = property(get_zoo)
+    address = property(get_address)
+    batch_count = property(get_batch_count)
+    write_count = property(get_write_count)
+
+    # serving --------------------------------------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Start listening for requests."""
+        self.__readers = ThreadPoolExecutor(self.__read_threads, thread_name_prefix="zoo-reader")
+        self.__writer = ThreadPoolExecutor(1, thread_name_prefix="zoo-writer")
+        self.__writes = asyncio.Queue()
+        self.__stdout = _ThreadStdout.install()
+        self.__batcher = asyncio.create_task(self.__make_batches())
+        self.__server = await asyncio.start_server(self.__serve_connection, self.__host, self.__port)
+
+    async def serve_forever(self) -> None:
+        """Start listening (if not started yet) and serve requests until cancelled."""
+        if self.__server is None:
+            await self.start()
+        try:
+            await self.__server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """Stop listening, close open connections and wait for queued writes to be made."""
+        if self.__server is None:
+            return
+        server, self.__server = self.__server, None
+        server.close()
+        for connection in list(self.__connections):
+            connection.cancel()
+        await asyncio.gather(*self.__connections, return_exceptions=True)
+        await server.wait_closed()
+        await self.__writes.join()
+        self.__batcher.cancel()
+        self.__readers.shutdown()
+        self.__writer.shutdown()
+        _ThreadStdout.uninstall()
+
+    async def __serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer the requests sent over one connection, in order, until the client closes it."""
+        self.__connections.add(asyncio.current_task())
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                await self.__answer(writer, method, unquote(urlsplit(target).path), body)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass  # the client went away or sent something that is not HTTP.
+        except asyncio.CancelledError:
+            pass  # the server is closing.
+        finally:
+            self.__connections.discard(asyncio.current_task())
+            writer.close()
+
+    async def __answer(self, writer: asyncio.StreamWriter, method: str, path: str, body: bytes) -> None:
+        """Route one request to its handler and send the JSON (or streamed text) it answers with."""
+        try:
+            payload = json.loads(body) if body else {}
+            if not isinstance(payload, dict):
+                raise ApiError(400, "The body of a request must be a JSON object.")
+            matches = {route_method: (handler, match) for route_method, pattern, handler in self.__routes
+                       if (match := re.fullmatch(pattern, path.rstrip("/") or "/"))}
+            if not matches:
+                raise ApiError(404, f"There is nothing at {path}.")
+            if method not in matches:
+                raise ApiError(405, f"{method} cannot be used on {path}.")
+            handler, match = matches[method]
+            status, answer = await handler(*match.groups(), payload)
+        except ApiError as e:
+            status, answer = e.status, {"error": str(e)}
+        except json.JSONDecodeError:
+            status, answer = 400, {"error": "The body of the request is not valid JSON."}
+        except Exception as e:  # a bug should fail the request, not the connection.
+            status, answer = 500, {"error": f"{type(e).__name__}: {e}"}
+
+        if isinstance(answer, str):
+            await self.__stream(writer, status, answer)
+        else:
+            data = json.dumps(answer).encode()
+            writer.write(f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+            await writer.drain()
+
+    @staticmethod
+    async def __stream(writer: asyncio.StreamWriter, status: int, text: str) -> None:
+        """Send a text answer in chunks, so a long report is sent while the client reads it."""
+        writer.write(f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\nContent-Type: text/plain; charset=utf-8\r\n"
+                     f"Transfer-Encoding: chunked\r\n\r\n".encode())
+        data = text.encode()
+        for start in range(0, len(data), CHUNK_SIZE):
+            chunk = data[start:start + CHUNK_SIZE]
+            writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    # reads and writes -----------------------------------------------------------------------------------------
+
+    async def __read(self, read, *args):
+        """Run a read of the zoo on the reader threads and return its result."""
+        return await asyncio.get_running_loop().run_in_executor(self.__readers, read, *args)
+
+    async def __write(self, write) -> tuple[int, dict]:
+        """
+        Queue a write of the zoo to be made in the next batch and wait until it is made.
+        :param write: Function that makes the write and returns the JSON-ready result.
+        :return: (200, or 409 if the write printed an [ERROR], the result and any errors).
+        """
+        outcome = asyncio.get_running_loop().create_future()
+        await self.__writes.put((write, outcome))
+        result, errors = await outcome
+        answer = {"result": result}
+        if errors:
+            answer["errors"] = errors
+        return (409 if errors else 200), answer
+
+    async def __make_batches(self) -> None:
+        """Collect queued writes into batches and make each batch on the writer thread."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.__writes.get()]
+            deadline = loop.time() + self.__batch_window
+            while len(batch) < self.__max_batch:
+                if not self.__writes.empty():
+                    batch.append(self.__writes.get_nowait())
+                elif loop.time() >= deadline:
+                    break
+                else:
+                    try:
+                        batch.append(await asyncio.wait_for(self.__writes.get(), deadline - loop.time()))
+                    except asyncio.TimeoutError:
+                        break
+            outcomes = await loop.run_in_executor(self.__writer, self.__make_batch, [write for write, _ in batch])
+            for (_, future), outcome in zip(batch, outcomes):
+                if not future.done():
+                    if isinstance(outcome, BaseException):
+                        future.set_exception(outcome)
+                    else:
+                        future.set_result(outcome)
+                self.__writes.task_done()
+
+    def __make_batch(self, writes: list) -> list:
+        """Make a batch of writes, writing every log once (runs on the writer thread)."""
+        outcomes = []
+        with DataRecord.batched_writes():
+            for write in writes:
+                try:
+                    with self.__stdout.capture() as printed:  # errors are printed by the zoo (on this thread).
+                        result = write()
+                    errors = [line.removeprefix("[ERROR] ") for line in printed.getvalue().splitlines()
+                              if line.startswith("[ERROR]")]
+                    outcomes.append((result, errors))
+                except ApiError as e:  # e.g. a new animal that cannot be made from the fields given.
+                    outcomes.append(e)
+                except Exception as e:  # e.g. a ValueError from the zoo, answered as 409 rather than lost.
+                    outcomes.append(ApiError(409, str(e)))
+        self.__batch_count += 1
+        self.__write_count += len(writes)
+        return outcomes
+
+    # handlers -------------------------------------------------------------------------------------------------
+
+    def __members(self, kind: str) -> list:
+        """Return the animals, enclosures or staff of the zoo."""
+        return {"animals": self.__zoo.animals, "enclosures": self.__zoo.enclosures, "staff": self.__zoo.staff}[kind]
+
+    def __find(self, kind: str, entity_id, role: type = object):
+        """Return the animal, enclosure or staff member of the zoo with an id, or answer 404 if there is none."""
+        entity = self.__zoo.get_member(entity_id) if isinstance(entity_id, str) else None
+        if not isinstance(entity, {"animals": Animal, "enclosures": Enclosure, "staff": Staff}[kind]) \
+                or not isinstance(entity, role):
+            raise ApiError(404, f"{self.__zoo.name} has no {role.__name__ if role is not object else kind} "
+                                f"with id {entity_id}.")
+        return entity
+
+    @staticmethod
+    def __field(payload: dict, name: str, convert=None, default=...):
+        """Return a field of a request's body (converted, e.g. to a Severity), or answer 400 if it is missing or bad."""
+        if name not in payload:
+            if default is ...:
+                raise ApiError(400, f"The field '{name}' is required.")
+            return default
+        try:
+            return payload[name] if convert is None else convert(payload[name])
+        except (KeyError, ValueError, TypeError):
+            raise ApiError(400, f"The field '{name}' has an invalid value: {payload[name]!r}.")
+
+    def __at(self, payload: dict) -> datetime:
+        """Return the date and time of an action (the 'at' field, default now)."""
+        return self.__field(payload, "at", datetime.fromisoformat, None) or datetime.now()
+
+    async def __list(self, kind: str, payload: dict) -> tuple[int, list]:
+        """List the animals, enclosures or staff of the zoo."""
+        return 200, await self.__read(lambda: [describe(entity) for entity in list(self.__members(kind))])
+
+    async def __get(self, kind: str, entity_id: str, payload: dict) -> tuple[int, dict]:
+        """Describe one animal, enclosure or staff member."""
+        entity = self.__find(kind, entity_id)
+        return 200, await self.__read(describe, entity)
+
+    async def __add_animal(self, payload: dict) -> tuple[int, dict]:
+        """Add a Mammal, Bird or Reptile made from the fields of the body to the zoo."""
+        arguments = dict(payload)
+        animal_class = self.__field(arguments, "class", ANIMAL_CLASSES.__getitem__)
+        del arguments["class"]
+        if "habitat" in arguments:
+            arguments["habitat"] = self.__field(arguments, "habitat", EnvironmentalType.__getitem__)
+
+        def write() -> dict:  # the animal is made on the writer thread, not on the event loop.
+            try:
+                animal = animal_class(**arguments)
+            except TypeError as e:
+                raise ApiError(400, f"A {animal_class.__name__} cannot be made from these fields: {e}")
+            self.__zoo.add_animal(animal)
+            return describe(animal)
+        return await self.__write(write)
+
+    async def __add_enclosure(self, payload: dict) -> tuple[int, dict]:
+        """Add an enclosure to the zoo."""
+        arguments = (self.__field(payload, "name", str),
+                     self.__field(payload, "environmental_type", EnvironmentalType.__getitem__),
+                     self.__field(payload, "size", int))
+
+        def write() -> dict:
+            enclosure = Enclosure(*arguments)
+            self.__zoo.add_enclosure(enclosure)
+            return describe(enclosure)
+        return await self.__write(write)
+
+    async def __add_staff_member(self, payload: dict) -> tuple[int, dict]:
+        """Add a Zookeeper or Veterinarian to the zoo."""
+        role, name = self.__field(payload, "role", STAFF_CLASSES.__getitem__), self.__field(payload, "name", str)
+
+        def write() -> dict:
+            staff_member = role(name)
+            self.__zoo.add_staff_member(staff_member)
+            return describe(staff_member)
+        return await self.__write(write)
+
+    async def __remove(self, kind: str, entity_id: str, payload: dict) -> tuple[int, dict]:
+        """Remove an animal, enclosure or staff member from the zoo."""
+        entity = self.__find(kind, entity_id)
+        remove = {"animals": self.__zoo.remove_animal, "enclosures": self.__zoo.remove_enclosure,
+                  "staff": self.__zoo.remove_staff_member}[kind]
+        return await self.__write(lambda: remove(entity) or entity.id)
+
+    async def __assign_animal(self, enclosure_id: str, payload: dict) -> tuple[int, dict]:
+        """House an animal of the zoo in an enclosure."""
+        enclosure = self.__find("enclosures", enclosure_id)
+        animal = self.__find("animals", self.__field(payload, "animal_id"))
+        return await self.__write(lambda: self.__zoo.assign_animal_to_enclosure(animal, enclosure)
+                                  or describe(enclosure))
+
+    async def __move_animal(self, animal_id: str, payload: dict) -> tuple[int, dict]:
+        """Move an animal from one enclosure to another (the result is whether it moved)."""
+        animal = self.__find("animals", animal_id)
+        from_enclosure = self.__find("enclosures", self.__field(payload, "from"))
+        to_enclosure = self.__find("enclosures", self.__field(payload, "to"))
+        return await self.__write(lambda: self.__zoo.move_animal(animal, from_enclosure, to_enclosure))
+
+    async def __assign_staff(self, staff_id: str, payload: dict) -> tuple[int, dict]:
+        """Assign an enclosure to a staff member."""
+        staff_member = self.__find("staff", staff_id)
+        enclosure = self.__find("enclosures", self.__field(payload, "enclosure_id"))
+        at_datetime = self.__at(payload)
+        return await self.__write(lambda: self.__zoo.assign_staff_to_enclosure(staff_member, enclosure, at_datetime)
+                                  or describe(staff_member))
+
+    async def __act(self, staff_id: str, action: str, payload: dict) -> tuple[int, dict]:
+        """Make a staff member feed, clean, check the health of, diagnose, treat or declare the recovery of a target."""
+        at_datetime = self.__at(payload)
+        if action in ("feed", "clean"):
+            keeper = self.__find("staff", staff_id, Zookeeper)
+            if action == "feed":
+                animal = self.__find("animals", self.__field(payload, "animal_id"))
+                food, quantity = self.__field(payload, "food", str), self.__field(payload, "quantity", str)
+                return await self.__write(lambda: keeper.feed(animal, food, quantity, at_datetime))
+            object_id = self.__field(payload, "object_id")
+            cleaned = self.__find("enclosures" if str(object_id).startswith("E") else "animals", object_id)
+            details = self.__field(payload, "details", str, "standard")
+            return await self.__write(lambda: keeper.clean(cleaned, at_datetime, details))
+
+        vet = self.__find("staff", staff_id, Veterinarian)
+        animal = self.__find("animals", self.__field(payload, "animal_id"))
+        details = self.__field(payload, "details", str, "")
+        match action:
+            case "check_health":
+                severity = self.__field(payload, "severity", Severity.__getitem__)
+                return await self.__write(lambda: vet.check_health(animal, details, severity, at_datetime))
+            case "diagnose":
+                severity = self.__field(payload, "severity", Severity.__getitem__)
+                treatment_desc = self.__field(payload, "treatment", str)
+                treatments = self.__field(payload, "treatments", lambda treatments: [
+                    [time.fromisoformat(at), description] for at, description in treatments], [])
+                return await self.__write(lambda: vet.diagnose(animal, details, severity, treatment_desc, treatments,
+                                                               at_datetime))
+            case "treat":
+                severity = self.__field(payload, "severity", Severity.__getitem__)
+                return await self.__write(lambda: vet.treat(animal, details, severity, at_datetime))
+            case _:
+                return await self.__write(lambda: vet.declare_recovery(animal, details, at_datetime))
+
+    async def __report(self, name: str, animal_id: str | None, payload: dict) -> tuple[int, str]:
+        """Generate one of the zoo's reports on the reader threads; it is streamed as text."""
+        if name not in REPORTS:
+            raise ApiError(404, f"There is no report called {name}; the reports are: {', '.join(REPORTS)}.")
+        if name == "animal_medical_history":
+            animal = self.__find("animals", animal_id)
+            return 200, await self.__read(self.__zoo.report_animal_medical_history, animal)
+        return 200, await self.__read(getattr(self.__zoo, f"report_{name}"))
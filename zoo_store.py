@@ -0,0 +1,387 @@
+"""
+File: zoo_store.py
+Description: Contains the ZooStore class which keeps a zoo on disk in a directory: a snapshot of its animals, enclosures
+and staff as they are now (zoo.json.gz) and the history of their logs as segments of events (events/000001.jsonl.gz,
+...), both gzip-compressed JSON. Events keep their reference numbers when they are loaded. Saving rewrites the snapshot
+and appends the events logged since the zoo was loaded or last saved as a new segment, so history already on disk is
+never rewritten. Loading reads only the snapshot unless the history is asked for, so a job that does not need the logs
+(e.g. the species report) starts up in the same time however long the history grows. compact() merges the small segments
+of many saves into fewer, larger ones, written to a directory of their own that then replaces the old one, so a
+compaction that is interrupted leaves the history either as it was or compacted, never both. Entities keep the ids they
+were saved with when loaded into a new process (in a process that has already given out those ids they get new ones, and
+are saved under their stored ids again).
+Author: Nenja Ivanovic
+ID: 110462390
+Username: ivany005
+This is my own work as defined by the University's Academic Integrity Policy.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import shutil
+from datetime import datetime, time
+from itertools import count
+
+from action import Action
+from animal import Animal
+from bird import Bird
+from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from event_store import EventStore, decode_value, encode_value
+from lazy_modules import pd
+from mammal import Mammal
+from reptile import Reptile
+from schedule import Schedule
+from severity import Severity
+from species_profile import SpeciesProfile
+from staff import Staff
+from state_change import StateChange
+from veterinarian import Veterinarian
+from zoo_system import ZooSystem
+from zookeeper import Zookeeper
+
+FORMAT = "zoo-store"
+VERSION = 1
+SNAPSHOT = "zoo.json.gz"
+EVENTS = "events"
+COMPACTED = "events.compact"  # where compact() writes the merged segments ...
+REPLACED = "events.old"  # ... and where it moves the old ones before they are removed.
+SEGMENT_EVENTS = 100_000  # the most events compact() puts in one segment.
+# class name -> the class and the names of the attributes passed to it after name and species:
+ANIMAL_CLASSES = {"Mammal": (Mammal, ("sound", "fur_colour", "is_nocturnal")),
+                  "Bird": (Bird, ("wingspan", "can_fly")),
+                  "Reptile": (Reptile, ("sound", "scale_type", "is_venomous"))}
+STAFF_CLASSES = {"Zookeeper": Zookeeper, "Veterinarian": Veterinarian}
+ID_COLUMNS = ("SubjectID", "ObjectID", "CounterpartID")  # the columns of an event that hold the id of an entity.
+_ID_POSITIONS = [list(EventStore.COLUMNS).index(column) for column in ID_COLUMNS]
+_POSITIONS = {column: position for position, column in enumerate(EventStore.COLUMNS)}  # of each value of an event
+
+
+class ZooStore:
+    def __init__(self, path: str):
+        """
+        Create a new ZooStore instance.
+        :param path: The directory the zoo is kept in (created when the zoo is first saved).
+        """
+        self.__path = path
+        self.__stored_ids = {}  # id of each loaded entity -> the id it is stored under (when they differ).
+        self.__saved_through = -1  # the reference number of the latest event in the event store that is on disk.
+        self.__latest = None  # the date and time of the latest event on disk.
+
+    def get_path(self) -> str:
+        """Return the directory the zoo is kept in."""
+        return self.__path
+
+    def get_latest(self) -> datetime | None:
+        """Return the date and time of the latest event saved (None if none have been, or nothing is loaded yet)."""
+        return self.__latest
+
+    def get_segments(self) -> list[str]:
+        """Return the paths of the segments of the zoo's history, oldest first."""
+        self.__finish_compaction()
+        directory = os.path.join(self.__path, EVENTS)
+        if not os.path.isdir(directory):
+            return []
+        return [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.endswith(".jsonl.gz")]
+
+    def get_event_count(self) -> int:
+        """Return the number of events in the zoo's history (read from the first line of each segment)."""
+        total = 0
+        for segment in self.segments:
+            with gzip.open(segment, "rt", encoding="utf-8") as file:
+                total += json.loads(file.readline())["events"]
+        return total
+
+    path = property(get_path)
+    latest = property(get_latest)
+    segments = property(get_segments)
+    event_count = property(get_event_count)
+
+    def exists(self) -> bool:
+        """Return whether a zoo has been saved in the store."""
+        return os.path.exists(os.path.join(self.__path, SNAPSHOT))
+
+    # saving --------------------------------------------------------------------------------------------------
+
+    def save(self, zoo: ZooSystem) -> int:
+        """
+        Save a zoo: rewrite the snapshot of its entities and append the events they logged since the zoo was loaded
+        or last saved (if any) as a new segment.
+        :param zoo: The zoo to save.
+        :return: The number of events appended.
+        """
+        self.__finish_compaction()  # before the history's directory is made, in case compact() was interrupted.
+        os.makedirs(os.path.join(self.__path, EVENTS), exist_ok=True)
+        previous = self.__read_snapshot() if self.exists() else {}
+        self.__latest = decode_value(previous.get("latest"), datetime)
+
+        ids = {entity.id for entity in zoo.animals + zoo.enclosures + zoo.staff}
+        through = zoo.event_store.last_ref_num  # events added while saving are left for the next save.
+        new = []
+        for log_ref_num, row in zoo.event_store.events(self.__saved_through):  # read a chunk at a time.
+            if log_ref_num <= through and row[_POSITIONS["Record"]] is not None \
+                    and (row[_POSITIONS["SubjectID"]] in ids or row[_POSITIONS["CounterpartID"]] in ids):
+                new.append(self.__stored_row(log_ref_num, row))
+                latest = row[_POSITIONS["DateTime"]]
+                self.__latest = latest if self.__latest is None else max(self.__latest, latest)
+        if new:
+            self.__write_segment(new)
+        self.__saved_through = max(self.__saved_through, through)
+
+        next_ids = previous.get("next_ids", {})
+        snapshot = {"format": FORMAT, "version": VERSION, "name": zoo.name, "saved": datetime.now().isoformat(),
+                    "latest": encode_value(self.__latest),
+                    "next_ids": {root.__name__: max(next_ids.get(root.__name__, 1), _peek_id(root))
+                                 for root in (Animal, Enclosure, Staff)},
+                    "profiles": [self.__profile_snapshot(profile) for profile in zoo.species_profiles.values()],
+                    "animals": [self.__animal_snapshot(animal) for animal in zoo.animals],
+                    "enclosures": [self.__enclosure_snapshot(enclosure) for enclosure in zoo.enclosures],
+                    "staff": [self.__staff_snapshot(staff_member, ids) for staff_member in zoo.staff]}
+        temporary = os.path.join(self.__path, SNAPSHOT + ".tmp")
+        with gzip.open(temporary, "wt", encoding="utf-8") as file:
+            json.dump(snapshot, file, separators=(",", ":"))
+        os.replace(temporary, os.path.join(self.__path, SNAPSHOT))  # a reader never sees half a snapshot.
+        return len(new)
+
+    def __stored(self, entity_id: str | None) -> str | None:
+        """Return the id an entity is stored under."""
+        return self.__stored_ids.get(entity_id, entity_id)
+
+    def __stored_row(self, log_ref_num: int, row: tuple) -> list:
+        """Return an event (its reference number, then its values in the order of EventStore.COLUMNS) as JSON values
+        with stored ids."""
+        values = [None if value is pd.NA else value for value in row]
+        for position in _ID_POSITIONS:
+            values[position] = self.__stored(values[position])
+        return [log_ref_num, *(encode_value(value) for value in values)]
+
+    def __profile_snapshot(self, profile: SpeciesProfile) -> dict:
+        """Return the species, habitat, sound and diet template of a SpeciesProfile as JSON values."""
+        return {"species": profile.species, "habitat": profile.habitat.name, "sound": profile.sound,
+                "diet": _diet_rows(profile.diet)}
+
+    def __animal_snapshot(self, animal: Animal) -> dict:
+        """Return the attributes and state of an animal as JSON values."""
+        cls, attributes = ANIMAL_CLASSES[type(animal).__name__]
+        return {"id": self.__stored(animal.id), "class": type(animal).__name__, "name": animal.name,
+                "species": animal.species, "arguments": [getattr(animal, attribute) for attribute in attributes],
+                "age": animal.age, "habitat": animal.habitat.name, "cleanliness": animal.cleanliness.name,
+                "under_treatment": animal.under_treatment,
+                "diet": _diet_rows(animal.diet) if animal.diet.customised else None,
+                "treatments": [[encode_value(row.Time), row.Details] for row in animal.treatments.data.itertuples()]}
+
+    def __enclosure_snapshot(self, enclosure: Enclosure) -> dict:
+        """Return the attributes and state of an enclosure as JSON values."""
+        return {"id": self.__stored(enclosure.id), "name": enclosure.name,
+                "environmental_type": enclosure.environmental_type.name, "size": enclosure.size,
+                "location": enclosure.location, "cleanliness": enclosure.cleanliness.name,
+                "inhabitants": [self.__stored(animal.id) for animal in enclosure.inhabitants]}
+
+    def __staff_snapshot(self, staff_member: Staff, ids: set[str]) -> dict:
+        """Return the attributes, assignments (to entities of the zoo, whose ids are given) and special tasks of a
+        staff member as JSON values."""
+        return {"id": self.__stored(staff_member.id), "class": type(staff_member).__name__, "name": staff_member.name,
+                "enclosure_assignments": [self.__stored(enclosure.id) for enclosure in
+                                          staff_member.enclosure_assignments if enclosure.id in ids],
+                "animal_assignments": [self.__stored(animal.id) for animal in staff_member.animal_assignments
+                                       if animal.id in ids],
+                "special_tasks": [[encode_value(row.Time), self.__stored(row.ObjectID), row.ObjectName, row.Action.name,
+                                   row.Details] for row in staff_member.special_tasks.data.itertuples()]}
+
+    def __write_segment(self, rows: list[list], directory: str = EVENTS) -> str:
+        """Write events (as JSON values) to a new segment after the existing ones in a directory of the store (default
+        the history's) and return its path."""
+        segments = sorted(name for name in os.listdir(os.path.join(self.__path, directory))
+                          if name.endswith(".jsonl.gz"))
+        number = int(segments[-1].split(".")[0]) + 1 if segments else 1
+        path = os.path.join(self.__path, directory, f"{number:06d}.jsonl.gz")
+        with gzip.open(path + ".tmp", "wt", encoding="utf-8") as file:
+            file.write(json.dumps({"format": "zoo-events", "version": VERSION, "events": len(rows)}) + "\n")
+            for row in rows:
+                file.write(json.dumps(row, separators=(",", ":")) + "\n")
+        os.replace(path + ".tmp", path)
+        return path
+
+    # loading -------------------------------------------------------------------------------------------------
+
+    def load(self, history: bool = False) -> ZooSystem:
+        """
+        Load the zoo: build its entities from the snapshot and, if asked for, load the events of its history into
+        the zoo's event store and keep a history of its state from then on (their logs are empty otherwise, and the
+        triage and cleaning queues are only seeded from the logs when the history is loaded).
+        :param history: Whether to load the history of the zoo's logs as well (default False).
+        :return: The zoo as a ZooSystem.
+        """
+        snapshot = self.__read_snapshot()
+        self.__latest = decode_value(snapshot["latest"], datetime)
+        at_datetime = self.__latest if self.__latest is not None else datetime.min
+
+        zoo = ZooSystem(snapshot["name"])
+        for entry in snapshot["profiles"]:  # the diet templates the zoo's animals of each species share.
+            profile = zoo.get_species_profile(entry["species"], EnvironmentalType[entry["habitat"]], entry["sound"])
+            for at_time, quantity, food in entry["diet"]:
+                profile.add_to_diet(food, quantity, time.fromisoformat(at_time))
+
+        entities = {}  # stored id -> the entity built.
+        for entry in sorted(snapshot["animals"], key=lambda animal_entry: _id_number(animal_entry["id"])):
+            cls = ANIMAL_CLASSES[entry["class"]][0]
+            _advance_ids(Animal, _id_number(entry["id"]))
+            animal = cls(entry["name"], entry["species"], *entry["arguments"], age=entry["age"],
+                         habitat=EnvironmentalType[entry["habitat"]])
+            if entry["diet"] is not None:
+                animal.diet.data = animal.diet.data.iloc[0:0]  # customised, without the template's rows.
+                for at_time, quantity, food in entry["diet"]:
+                    animal.add_to_diet(food, quantity, time.fromisoformat(at_time))
+            animal.schedule_treatments([[time.fromisoformat(at_time), details]
+                                        for at_time, details in entry["treatments"]])
+            animal._set_cleanliness(Severity[entry["cleanliness"]])  # restored, not a change the animal logs.
+            entities[entry["id"]] = animal
+        for entry in sorted(snapshot["enclosures"], key=lambda enclosure_entry: _id_number(enclosure_entry["id"])):
+            _advance_ids(Enclosure, _id_number(entry["id"]))
+            enclosure = Enclosure(entry["name"], EnvironmentalType[entry["environmental_type"]], entry["size"])
+            if entry["location"] is not None:
+                enclosure.location = entry["location"]
+            enclosure._set_cleanliness(Severity[entry["cleanliness"]])
+            entities[entry["id"]] = enclosure
+        for entry in sorted(snapshot["staff"], key=lambda staff_entry: _id_number(staff_entry["id"])):
+            _advance_ids(Staff, _id_number(entry["id"]))
+            entities[entry["id"]] = STAFF_CLASSES[entry["class"]](entry["name"])
+        for root in (Animal, Enclosure, Staff):  # new entities never get the id of one in the store.
+            _advance_ids(root, snapshot["next_ids"][root.__name__])
+
+        current = {stored_id: entity.id for stored_id, entity in entities.items()}
+        self.__stored_ids = {entity_id: stored_id for stored_id, entity_id in current.items()
+                             if entity_id != stored_id}
+        for entry in snapshot["staff"]:  # assignments were logged when they were made, so are not made again.
+            staff_member = entities[entry["id"]]
+            for stored_id in entry["enclosure_assignments"]:
+                staff_member.enclosure_assignments.append(entities[stored_id])
+            for stored_id in entry["animal_assignments"]:
+                staff_member.animal_assignments.append(entities[stored_id])
+            for at_time, object_id, object_name, action, details in entry["special_tasks"]:
+                staff_member.special_tasks.new({"Time": time.fromisoformat(at_time), "SubjectID": staff_member.id,
+                                                "SubjectName": staff_member.name,
+                                                "ObjectID": current.get(object_id, object_id),
+                                                "ObjectName": object_name, "Action": Action[action],
+                                                "Details": details})
+        if history:
+            self.__load_history(current, zoo.event_store)
+            zoo.enable_history()  # the changes to the zoo's state are recorded from the time it was saved.
+        self.__saved_through = zoo.event_store.last_ref_num
+
+        for entry in snapshot["enclosures"]:
+            zoo.add_enclosure(entities[entry["id"]], at_datetime)
+        for entry in snapshot["animals"]:
+            zoo.add_animal(entities[entry["id"]], at_datetime)
+        for entry in snapshot["staff"]:
+            zoo.add_staff_member(entities[entry["id"]], at_datetime)
+        for entry in snapshot["enclosures"]:
+            for stored_id in entry["inhabitants"]:
+                zoo.assign_animal_to_enclosure(entities[stored_id], entities[entry["id"]], at_datetime)
+        for entry in snapshot["animals"]:  # after housing them, as animals under treatment cannot be moved in.
+            if entry["under_treatment"]:
+                entities[entry["id"]]._set_under_treatment(True)
+                if zoo.history is not None:
+                    zoo.history.record(at_datetime, StateChange.TREATMENT, entities[entry["id"]].id, value=True)
+        return zoo
+
+    def __read_snapshot(self) -> dict:
+        """Read the snapshot of the zoo's entities."""
+        path = os.path.join(self.__path, SNAPSHOT)
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            snapshot = json.load(file)
+        if snapshot.get("format") != FORMAT or snapshot.get("version") != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} zoo store snapshot.")
+        return snapshot
+
+    def __load_history(self, current: dict[str, str], store: EventStore) -> None:
+        """Add the events of every segment to the zoo's event store, each under the current ids of its entities and
+        the reference number it was saved with, which rows such as a veterinarian's "log ref: ..." refer to."""
+        for row in self.__rows(self.segments):
+            log_ref_num = row.pop(0) if len(row) > len(EventStore.COLUMNS) else None  # (events saved without one)
+            event = {column: decode_value(value, EventStore.COLUMN_TYPES.get(column)) for column, value in
+                     zip(EventStore.COLUMNS, row)}
+            for column in ID_COLUMNS:
+                event[column] = current.get(event[column], event[column])
+            counterpart = {"DateTime": event["DateTime"], "SubjectID": event["CounterpartID"],
+                           "SubjectName": event["CounterpartName"], "ObjectID": event["SubjectID"],
+                           "ObjectName": event["SubjectName"], "Action": event["CounterpartAction"],
+                           "Details": event["CounterpartDetails"]}
+            for column in ("CounterpartID", "CounterpartName", "CounterpartAction", "CounterpartDetails"):
+                event[column] = None  # the counterpart joins the event as they did when it happened.
+            log_ref_num = store.record(event["SubjectID"], event["Record"], event, log_ref_num)
+            if counterpart["SubjectID"] is not None:
+                store.join(counterpart["SubjectID"], log_ref_num, counterpart)
+
+    @staticmethod
+    def __rows(segments: list[str]):
+        """Yield the events (as JSON values) of segments, in order."""
+        for segment in segments:
+            with gzip.open(segment, "rt", encoding="utf-8") as file:
+                file.readline()  # the segment's header.
+                for line in file:
+                    yield json.loads(line)
+
+    # compaction ----------------------------------------------------------------------------------------------
+
+    def compact(self, segment_events: int = SEGMENT_EVENTS) -> int:
+        """
+        Merge the segments of the zoo's history into as few as possible of at most segment_events events each, in
+        the same order. The new segments are written to a directory of their own, which replaces the history's
+        directory once they are all written (see __finish_compaction()).
+        :param segment_events: The most events in one segment (default SEGMENT_EVENTS).
+        :return: The number of segments the history is kept in.
+        """
+        old = self.segments
+        compacted = os.path.join(self.__path, COMPACTED)
+        shutil.rmtree(compacted, ignore_errors=True)  # the segments of a compaction interrupted while writing them.
+        os.makedirs(compacted)
+        new, rows = [], []
+        for row in self.__rows(old):
+            rows.append(row)
+            if len(rows) == segment_events:
+                new.append(self.__write_segment(rows, COMPACTED))
+                rows = []
+        if rows:
+            new.append(self.__write_segment(rows, COMPACTED))
+        os.replace(os.path.join(self.__path, EVENTS), os.path.join(self.__path, REPLACED))
+        self.__finish_compaction()
+        return len(new)
+
+    def __finish_compaction(self) -> None:
+        """Finish a compaction once its segments are all written, which is when compact() moves the old history aside:
+        the compacted segments take its place and the old ones are removed. Also finishes a compaction interrupted
+        after that point."""
+        replaced = os.path.join(self.__path, REPLACED)
+        if not os.path.isdir(replaced):
+            return None
+        if not os.path.isdir(os.path.join(self.__path, EVENTS)):
+            os.replace(os.path.join(self.__path, COMPACTED), os.path.join(self.__path, EVENTS))
+        shutil.rmtree(replaced)
+
+
+def _diet_rows(diet: Schedule) -> list[list]:
+    """Return the (time, quantity, food) of each row of a diet, from which it can be built again with add_to_diet."""
+    return [[encode_value(row.Time), row.Details.removesuffix(f" {row.Food}"), row.Food]
+            for row in diet.data.itertuples()]
+
+
+def _id_number(entity_id: str) -> int:
+    """Return the number of an entity's id, e.g. 12 for "A12"."""
+    return int(entity_id[1:])
+
+
+def _peek_id(root: type) -> int:
+    """Return the number the next entity of a class (Animal, Enclosure or Staff) will be given in its id. The store
+    is loaded and saved by one thread while no other entities are being built."""
+    number = next(root._ids)
+    root._ids = count(number)
+    return number
+
+
+def _advance_ids(root: type, number: int) -> None:
+    """Make the next entity of a class (Animal, Enclosure or Staff) get at least a number in its id."""
+    if _peek_id(root) < number:
+        root._ids = count(number)
@@ -8,16 +8,33 @@ ID: 110462390
 Username: ivany005
 This is my own work as defined by the University's Academic Integrity Policy.
 """
-from datetime import datetime
+from __future__ import annotations
 
-import pandas as pd
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from enum import Enum
 
 from animal import Animal
+from animal_table import AnimalTable
+from cleaning_queue import CleaningQueue
+from data_record import DataRecord
 from enclosure import Enclosure
+from environmental_type import EnvironmentalType
+from event_store import EventStore
+from lazy_modules import pd
+from lock_stripes import ENTITY_LOCKS
 from log import Log
 from medical_log import MedicalLog
+from recurring_calendar import RecurringCalendar
+from route_planner import RoutePlanner
 from schedule import Schedule
+from species_profile import SpeciesProfile
 from staff import Staff
+from triage_queue import TriageQueue
+from zoo_history import ZooHistory, ZooState
 
 
 class ZooSystem:
@@ -29,7 +46,15 @@ class ZooSystem:
         self.__enclosures = []
         self.__animals = []
         self.__staff = []
+        self.__members = {}  # id -> each animal, enclosure and staff member of the zoo (see get_member()).
+        self.__species_profiles = {}  # species name -> the SpeciesProfile shared by the zoo's animals of that species.
         self.__name = zoo_name
+        self.__triage = TriageQueue()  # animals ordered by how urgently they need veterinary attention.
+        self.__cleaning = CleaningQueue()  # enclosures and animals ordered by how much they need cleaning.
+        self.__animal_table = None  # optional columnar store of animal state, see enable_animal_table().
+        self.__history = None  # optional stream of every change to the state of the zoo, see enable_history().
+        self.__event_store = EventStore.from_environment()  # the events of the zoo's entities, see events().
+        self.__lock = threading.RLock()  # held while the zoo's animals, enclosures or staff change.
 
     def __str__(self) -> str:
         """Return the Zoo's key attributes as a formatted string."""
@@ -67,98 +92,254 @@ class ZooSystem:
         """ Returns the Staff members that work in the zoo."""
         return self.__staff
 
+    def get_member(self, entity_id: str) -> Animal | Enclosure | Staff | None:
+        """ Returns the animal, enclosure or staff member of the zoo with an id (None if there is none)."""
+        return self.__members.get(entity_id)
+
+    def get_species_profiles(self) -> dict[str, SpeciesProfile]:
+        """ Returns the zoo's species profiles by species name."""
+        return self.__species_profiles
+
+    def get_species_profile(self, species: str, habitat: EnvironmentalType = EnvironmentalType.GRASS,
+                            sound: str = "") -> SpeciesProfile:
+        """
+        Return the profile shared by the zoo's animals of a species, creating it if the zoo has none yet (animals of
+        the species added later share it too).
+        :param species: The name of the species.
+        :param habitat: The environmental type the species lives in if the profile is created (default is GRASS).
+        :param sound: The default sound of the species if the profile is created.
+        :return: The zoo's SpeciesProfile of the species.
+        """
+        with self.__lock:
+            if species not in self.__species_profiles:
+                self.__species_profiles[species] = SpeciesProfile(species, habitat, sound)
+            return self.__species_profiles[species]
+
+    def get_triage(self) -> TriageQueue:
+        """ Returns the queue of zoo animals ordered by how urgently they need veterinary attention."""
+        return self.__triage
+
+    def get_cleaning(self) -> CleaningQueue:
+        """ Returns the queue of zoo enclosures and animals ordered by how much they need cleaning."""
+        return self.__cleaning
+
+    def get_animal_table(self) -> AnimalTable | None:
+        """ Returns the AnimalTable that stores the state of the zoo's animals (None unless enabled)."""
+        return self.__animal_table
+
+    def enable_animal_table(self) -> AnimalTable:
+        """
+        Store the age, cleanliness and treatment status of every animal in the zoo in an AnimalTable, so they can be
+        updated for the whole zoo at once (e.g. zoo.animal_table.soil_all()). Animals added later join the table.
+        :return: The zoo's AnimalTable.
+        """
+        if self.__animal_table is None:
+            self.__animal_table = AnimalTable(max(1024, len(self.__animals)))
+            for animal in self.__animals:
+                self.__animal_table.add(animal)
+        return self.__animal_table
+
+    def get_history(self) -> ZooHistory | None:
+        """ Returns the stream of changes to the state of the zoo, with checkpoints (None unless enabled)."""
+        return self.__history
+
+    def enable_history(self, checkpoint_interval: timedelta = timedelta(days=1), max_checkpoints: int = 64,
+                       at_datetime: datetime | None = None) -> ZooHistory:
+        """
+        Record every change to the state of the zoo from now on in a ZooHistory, so that past states can be rebuilt
+        with as_of(). The animals, enclosures and staff already in the zoo are recorded as added at at_datetime.
+        :param checkpoint_interval: The least time between checkpoints of the state (default 1 day).
+        :param max_checkpoints: The most checkpoints kept (default 64), see ZooHistory.
+        :param at_datetime: When the history starts (default is the earliest date and time).
+        :return: The zoo's ZooHistory.
+        """
+        with self.__lock:
+            if self.__history is None:
+                self.__history = ZooHistory(checkpoint_interval, max_checkpoints)
+                for entity in self.__enclosures + self.__animals + self.__staff:
+                    self.__history.watch(entity, at_datetime)
+            return self.__history
+
+    def as_of(self, at_datetime: datetime) -> ZooState:
+        """
+        Rebuild the state of the zoo (its animals, enclosures and staff, enclosure inhabitants, staff assignments,
+        cleanliness and treatment status) at a date and time, e.g. zoo.as_of(datetime(2004, 11, 9, 14)).inhabitants(
+        dune). Changes made without a date and time are taken to have happened at the time of the latest change before
+        them.
+        The zoo's history must have been enabled first (see enable_history()).
+        :param at_datetime: The date and time.
+        :return: The state of the zoo at that date and time as a ZooState (None if no history is kept).
+        """
+        if self.__history is None:
+            print(f"[ERROR] No history of {self.__name} is kept (see ZooSystem.enable_history()).\n")
+            return None
+        return self.__history.as_of(at_datetime)
+
+    def get_event_store(self) -> EventStore:
+        """ Returns the store in which every event of the zoo's entities is written once."""
+        return self.__event_store
+
     name = property(get_name)
     animals = property(get_animals)
     enclosures = property(get_enclosures)
     staff = property(get_staff)
+    species_profiles = property(get_species_profiles)
+    triage = property(get_triage)
+    cleaning = property(get_cleaning)
+    animal_table = property(get_animal_table)
+    event_store = property(get_event_store)
+    history = property(get_history)
+
+    @contextmanager
+    def locked(self, *entities: Animal | Enclosure | Staff):
+        """
+        Hold the zoo's lock, so that no other thread changes its animals, enclosures and staff, and the locks of some
+        of its entities inside a 'with zoo.locked(cobra, dune):' block (see lock_stripes.py).
+        :param entities: The animals, enclosures and staff members to lock.
+        :return: None
+        """
+        with self.__lock, ENTITY_LOCKS.holding(*(entity.id for entity in entities)):
+            yield
+
+    def __keep_events(self, entity: Animal | Enclosure | Staff) -> None:
+        """Keep the logs of an entity joining the zoo in the zoo's EventStore (with the rows they already have)."""
+        for log in (entity.log, getattr(entity, "medical_log", None)):
+            if log is not None:
+                log.use_event_store(entity.id, self.__event_store)
 
     # adding, removing, moving and assignment -----------------------------------------------------------------
 
-    def add_animal(self, animal: Animal) -> None:
+    def add_animal(self, animal: Animal, at_datetime: datetime | None = None) -> None:
         """
         Add an Animal to the zoo.
         :param animal: The Animal to add to the zoo.
+        :param at_datetime: When the animal was added (default is the time of the zoo's latest change).
         :return: None
         """
-        try:
-            if not isinstance(animal, Animal):
-                raise TypeError("Only Animal instances can be added to the zoo animals.")
-            if animal not in self.__animals:
-                self.__animals.append(animal)
-        except TypeError as e:
-            print(f"[ERROR] {e} No change made.\n")
-
-    def remove_animal(self, animal: Animal) -> None:
+        with self.__lock:  # one change to the zoo's members at a time.
+            try:
+                if not isinstance(animal, Animal):
+                    raise TypeError("Only Animal instances can be added to the zoo animals.")
+                if animal not in self.__animals:
+                    if animal.species not in self.__species_profiles:  # the first of its species brings its profile.
+                        self.__species_profiles[animal.species] = animal.profile
+                    animal.use_profile(self.__species_profiles[animal.species])
+                    self.__keep_events(animal)
+                    self.__animals.append(animal)
+                    self.__members[animal.id] = animal
+                    self.__triage.watch(animal)
+                    self.__cleaning.watch(animal)
+                    if self.__animal_table is not None:
+                        self.__animal_table.add(animal)
+                    if self.__history is not None:
+                        self.__history.watch(animal, at_datetime)
+            except TypeError as e:
+                print(f"[ERROR] {e} No change made.\n")
+
+    def remove_animal(self, animal: Animal, at_datetime: datetime | None = None) -> None:
         """
         Remove an Animal from the zoo that is not under treatment.
         :param animal: The Animal to remove from the zoo.
+        :param at_datetime: When the animal was removed (default is the time of the zoo's latest change).
         :return: None
         """
-        if animal in self.__animals:  # can only remove animals from the zoo that already live there.
-            # Remove from any enclosures first
-            for enclosure in self.__enclosures:
-                if animal in enclosure.inhabitants:
-                    enclosure.remove_animal(animal)  # internally checks that animal is not sick.
+        with self.__lock:
+            if animal in self.__animals:  # can only remove animals from the zoo that already live there.
+                # Remove from any enclosures first
+                for enclosure in self.__enclosures:
+                    if animal in enclosure.inhabitants:
+                        enclosure.remove_animal(animal, at_datetime)  # internally checks that animal is not sick.
 
-            self.__animals.remove(animal)
+                self.__animals.remove(animal)
+                self.__members.pop(animal.id, None)
+                self.__triage.unwatch(animal)
+                self.__cleaning.unwatch(animal)
+                if self.__animal_table is not None:
+                    self.__animal_table.remove(animal)
+                if self.__history is not None:
+                    self.__history.unwatch(animal, at_datetime)
 
-    def add_enclosure(self, enclosure: Enclosure) -> None:
+    def add_enclosure(self, enclosure: Enclosure, at_datetime: datetime | None = None) -> None:
         """
         Add an Enclosure from the zoo - enclosures must be empty before adding.
         :param enclosure: The enclosure to remove from the zoo (must be empty).
+        :param at_datetime: When the enclosure was added (default is the time of the zoo's latest change).
         :return: None
         """
-        try:
-            if not isinstance(enclosure, Enclosure):
-                raise TypeError("Only Enclosure instances can be added to the zoo enclosures.")
-            if len(enclosure.inhabitants) > 0:
-                raise ValueError(f"{enclosure.name}_{enclosure.id} cannot be added as it is not empty.")
-            if enclosure not in self.__enclosures:
-                self.__enclosures.append(enclosure)
-        except (TypeError, ValueError) as e:
-            print(f"[ERROR] {e} No change made.\n")
-
-    def remove_enclosure(self, enclosure: Enclosure) -> None:
+        with self.__lock:
+            try:
+                if not isinstance(enclosure, Enclosure):
+                    raise TypeError("Only Enclosure instances can be added to the zoo enclosures.")
+                if len(enclosure.inhabitants) > 0:
+                    raise ValueError(f"{enclosure.name}_{enclosure.id} cannot be added as it is not empty.")
+                if enclosure not in self.__enclosures:
+                    self.__keep_events(enclosure)
+                    self.__enclosures.append(enclosure)
+                    self.__members[enclosure.id] = enclosure
+                    self.__cleaning.watch(enclosure)
+                    if self.__history is not None:
+                        self.__history.watch(enclosure, at_datetime)
+            except (TypeError, ValueError) as e:
+                print(f"[ERROR] {e} No change made.\n")
+
+    def remove_enclosure(self, enclosure: Enclosure, at_datetime: datetime | None = None) -> None:
         """
         Remove an Enclosure from the zoo - enclosures must be empty before removal.
         :param enclosure: The enclosure to remove from the zoo (must be empty).
+        :param at_datetime: When the enclosure was removed (default is the time of the zoo's latest change).
         :return: None
         """
-        try:
-            if not isinstance(enclosure, Enclosure):
-                raise TypeError("Only Enclosure instances can be removed from the zoo enclosures.")
-            if len(enclosure.inhabitants) > 0:
-                raise ValueError(f"{enclosure.name}_{enclosure.id} cannot be removed as it is not empty.")
-            if enclosure in self.__enclosures:
-                self.__enclosures.remove(enclosure)
-        except (TypeError, ValueError) as e:
-            print(f"[ERROR] {e} No change made.\n")
-
-    def add_staff_member(self, staff_member: Staff) -> None:
+        with self.__lock:
+            try:
+                if not isinstance(enclosure, Enclosure):
+                    raise TypeError("Only Enclosure instances can be removed from the zoo enclosures.")
+                if len(enclosure.inhabitants) > 0:
+                    raise ValueError(f"{enclosure.name}_{enclosure.id} cannot be removed as it is not empty.")
+                if enclosure in self.__enclosures:
+                    self.__enclosures.remove(enclosure)
+                    self.__members.pop(enclosure.id, None)
+                    self.__cleaning.unwatch(enclosure)
+                    if self.__history is not None:
+                        self.__history.unwatch(enclosure, at_datetime)
+            except (TypeError, ValueError) as e:
+                print(f"[ERROR] {e} No change made.\n")
+
+    def add_staff_member(self, staff_member: Staff, at_datetime: datetime | None = None) -> None:
         """Add a Staff member to the zoo.
         :param staff_member: The staff member to add to the zoo.
-        """
-        try:
-            if not isinstance(staff_member, Staff):
-                raise TypeError("Only Staff instances can be added to the zoo staff.")
-            if staff_member not in self.__staff:
-                self.__staff.append(staff_member)
-        except TypeError as e:
-            print(f"[ERROR] {e} No change made.\n")
-
-    def remove_staff_member(self, staff_member: Staff) -> None:
+        :param at_datetime: When the staff member was added (default is the time of the zoo's latest change).
+        """
+        with self.__lock:
+            try:
+                if not isinstance(staff_member, Staff):
+                    raise TypeError("Only Staff instances can be added to the zoo staff.")
+                if staff_member not in self.__staff:
+                    self.__keep_events(staff_member)
+                    self.__staff.append(staff_member)
+                    self.__members[staff_member.id] = staff_member
+                    if self.__history is not None:
+                        self.__history.watch(staff_member, at_datetime)
+            except TypeError as e:
+                print(f"[ERROR] {e} No change made.\n")
+
+    def remove_staff_member(self, staff_member: Staff, at_datetime: datetime | None = None) -> None:
         """
         Remove a Staff member from the zoo.
         :param staff_member: The staff member to remove from the zoo.
+        :param at_datetime: When the staff member was removed (default is the time of the zoo's latest change).
         """
-        try:
-            if not isinstance(staff_member, Staff):
-                raise TypeError("Only Staff instances can be removed from the zoo staff.")
+        with self.__lock:
+            try:
+                if not isinstance(staff_member, Staff):
+                    raise TypeError("Only Staff instances can be removed from the zoo staff.")
 
-            if staff_member in self.__staff:
-                self.__staff.remove(staff_member)
-        except TypeError as e:
-            print(f"[ERROR] {e} No change made.\n")
+                if staff_member in self.__staff:
+                    self.__staff.remove(staff_member)
+                    self.__members.pop(staff_member.id, None)
+                    if self.__history is not None:
+                        self.__history.unwatch(staff_member, at_datetime)
+            except TypeError as e:
+                print(f"[ERROR] {e} No change made.\n")
 
     def assign_staff_to_enclosure(self, staff_member: Staff, enclosure: Enclosure,
                                   at_datetime: datetime) -> None:
@@ -169,65 +350,91 @@ class ZooSystem:
         :param at_datetime: The date and time at which the assignment was made (default is when method is called).
         :return: None
         """
-        try:
-            if staff_member not in self.__staff:
-                raise ValueError("Staff member must belong to this zoo before assignment.")
-            if enclosure not in self.__enclosures:
-                raise ValueError("Enclosure must belong to this zoo before assignment.")
+        with self.__lock:
+            try:
+                if staff_member not in self.__staff:
+                    raise ValueError("Staff member must belong to this zoo before assignment.")
+                if enclosure not in self.__enclosures:
+                    raise ValueError("Enclosure must belong to this zoo before assignment.")
 
-            staff_member.assign(enclosure, at_datetime)
-        except ValueError as e:
-            print(f"[ERROR] {e} No change made.\n")
+                staff_member.assign(enclosure, at_datetime)
+            except ValueError as e:
+                print(f"[ERROR] {e} No change made.\n")
 
-    def assign_animal_to_enclosure(self, animal: Animal, enclosure: Enclosure) -> None:
+    def assign_animal_to_enclosure(self, animal: Animal, enclosure: Enclosure,
+                                   at_datetime: datetime | None = None) -> None:
         """
         Assign a member of staff to an enclosure.
         :param animal: The animal to assign to the enclosure.
         :param enclosure: The enclosure the animal is being assigned to.
+        :param at_datetime: When the animal moved in (default is the time of the zoo's latest change).
         :return: None
         """
-        try:
-            if animal not in self.__animals:
-                raise ValueError(f"Animal must belong to {self.name} before it can be assigned to an enclosure.")
-            if enclosure not in self.__enclosures:
-                raise ValueError(f"Enclosure must belong to {self.name} before it can receive animals.")
-            enclosure.add_animal(animal)  # checks that animal is not under treatment internally
+        with self.__lock:
+            try:
+                if animal not in self.__animals:
+                    raise ValueError(f"Animal must belong to {self.name} before it can be assigned to an enclosure.")
+                if enclosure not in self.__enclosures:
+                    raise ValueError(f"Enclosure must belong to {self.name} before it can receive animals.")
+                enclosure.add_animal(animal, at_datetime)  # checks that animal is not under treatment internally
 
-        except ValueError as e:
-            print(f"[ERROR] {e} No change made.\n")
+            except ValueError as e:
+                print(f"[ERROR] {e} No change made.\n")
 
-    def move_animal(self, animal: Animal, from_enclosure: Enclosure, to_enclosure: Enclosure) -> None:
+    def move_animal(self, animal: Animal, from_enclosure: Enclosure, to_enclosure: Enclosure,
+                    at_datetime: datetime | None = None) -> bool:
         """
         Move an animal from one enclosure to another. This will respect all existing rules in
-        Enclosure (habitat, species, treatment status).
+        Enclosure (habitat, species, treatment status), and the animal stays where it is if the move cannot be made.
         :param animal: The animal being relocated.
         :param from_enclosure: Where the animal is currently located.
         :param to_enclosure: Where the animal is to be relocated.
-        :return: None
+        :param at_datetime: When the animal was moved (default is the time of the zoo's latest change).
+        :return: Whether the animal was moved.
         """
-        try:
-            if from_enclosure not in self.__enclosures or to_enclosure not in self.__enclosures:
-                raise ValueError("Both enclosures must belong to this zoo.")
+        batch = self.batch(at_datetime)
+        batch.move_animal(animal, from_enclosure, to_enclosure)
+        return batch.commit()
 
-            if animal not in from_enclosure.inhabitants:
-                raise ValueError(
-                    f"{animal.name}_{animal.id} does not live in {from_enclosure.name}_{from_enclosure.id}.")
+    def batch(self, at_datetime: datetime | None = None):
+        """
+        Start a batch of changes that are made all together or not at all, e.g.
 
-            from_enclosure.remove_animal(animal)
-            to_enclosure.add_animal(animal)
+            with zoo.batch(datetime(2004, 11, 12)) as rotation:
+                rotation.move_animal(cobra, dune, arrakis)
+                rotation.move_animal(mouse, arrakis, dune)
 
-        except ValueError as e:
-            print(f"[ERROR] {e} No change made.\n")
+        The changes are checked together when the block ends, using the state the zoo would be in after all of them.
+        :param at_datetime: When the changes are made (default is the time of the zoo's latest change).
+        :return: A ZooBatch of the zoo.
+        """
+        from zoo_batch import ZooBatch  # imported here as zoo_batch imports this module.
+        return ZooBatch(self, at_datetime)
 
     # reporting  ------------------------------------------------------------------------------------------------
 
+    def events(self, entities: list | None = None, record_kind: str = "Log") -> pd.DataFrame:
+        """
+        Return the events of zoo entities from each entity's side (as they appear in their logs), read straight from
+        the event store rather than combining the logs of every entity.
+        :param entities: The entities whose events to include (default is every animal, enclosure and staff member).
+        :param record_kind: The kind of log the events are in, "Log" or "MedicalLog" (default "Log").
+        :return: DataFrame with the columns of that kind of log, indexed by reference number in the order the events
+        were written.
+        """
+        if entities is None:
+            entities = self.__animals + self.__enclosures + self.__staff
+        columns = ["DateTime", "SubjectID", "SubjectName", "Action", "ObjectID", "ObjectName", "Details"]
+        if record_kind == "MedicalLog":
+            columns += ["Severity", "Treatment"]
+        return self.event_store.view([entity.id for entity in entities], record_kind, columns)
+
     def report_species(self) -> str:
         """
         Generate a text report listing animals grouped by species.
         :return: Report of animals grouped by species as a string.
         """
-        species = [animal.species for animal in self.animals]
-        species = list(set(species))  # remove duplicates
+        species = list(dict.fromkeys(animal.species for animal in self.animals))  # remove duplicates, keep the order
         output = (f"----------------------------------------------------------------------------------------------\n"
                   f"ANIMALS BY SPECIES ({len(self.__animals)} total):\n")
 
@@ -283,23 +490,24 @@ class ZooSystem:
         :return: A report of all zoo animals' medical logs combined as a string.
         """
         animal_medical_log = MedicalLog("Combined Animal Medical")
-        medical_logs = [animal.medical_log.data for animal in self.__animals if not animal.medical_log.data.empty]
+        medical_events = self.events(self.__animals, "MedicalLog")
 
-        if len(medical_logs):
-            animal_medical_log.data = pd.concat(medical_logs)
+        if len(medical_events):
+            animal_medical_log.data = medical_events
 
         return str(animal_medical_log)
 
-    def report_zoo_daily_staff_schedules(self) -> str:
+    def report_zoo_daily_staff_schedules(self, route_planner: RoutePlanner | None = None) -> str:
         """
         Generate a combined daily schedule for all Staff in the zoo.
+        :param route_planner: Optional RoutePlanner used to order each staff member's tasks by walking route.
         :return: A Schedule with all daily schedules of zoo staff combined as a String
         """
         staff_schedule = Schedule("Combined Staff Daily")
 
         daily_schedules = []
         for member in self.__staff:
-            member_schedule = member.generate_schedule()
+            member_schedule = member.generate_schedule(route_planner)
             if not member_schedule.data.empty:
                 daily_schedules.append(member_schedule.data)
 
@@ -308,16 +516,28 @@ class ZooSystem:
 
         return str(staff_schedule)
 
+    def generate_staff_calendar(self, start_date: date = date.min, end_date: date = date.max) -> RecurringCalendar:
+        """
+        Generate a calendar in which the current daily schedule of every Staff member recurs each day.
+        :param start_date: The first date on which the schedules apply (default is no start date).
+        :param end_date: The last date on which the schedules apply (default is no end date).
+        :return: A RecurringCalendar containing the daily schedules of zoo staff.
+        """
+        staff_calendar = RecurringCalendar(f"{self.name} Staff")
+        for member in self.__staff:
+            staff_calendar.add_schedule(member.generate_schedule(), start_date, end_date)
+        return staff_calendar
+
     def report_zoo_staff_activity(self) -> str:
         """
         Generate a combined general activity log for all Staff in the zoo.
         :return: A log with all daily activity logs of zoo staff combined as a String
         """
         staff_log = Log("Combined Staff General Activity")
-        activity_logs = [member.log.data for member in self.__staff if not member.log.data.empty]
+        activity_events = self.events(self.__staff)
 
-        if len(activity_logs) > 0:
-            staff_log.data = pd.concat(activity_logs)
+        if len(activity_events) > 0:
+            staff_log.data = activity_events
 
         return str(staff_log)
 
@@ -327,9 +547,99 @@ class ZooSystem:
         :return: A log with all maintenance logs of zoo enclosures combined as a String
         """
         enclosure_log = Log("Combined Enclosure Maintenance")
-        maintenance_logs = [enclosure.log.data for enclosure in self.__enclosures if not enclosure.log.data.empty]
+        maintenance_events = self.events(self.__enclosures)
 
-        if len(maintenance_logs) > 0:
-            enclosure_log.data = pd.concat(maintenance_logs)
+        if len(maintenance_events) > 0:
+            enclosure_log.data = maintenance_events
 
         return str(enclosure_log)
+
+    # memory accounting ---------------------------------------------------------------------------------------
+
+    def memory_usage(self) -> dict[str, dict[str, int]]:
+        """
+        Measure the memory used by the zoo's animals, enclosures and staff, grouped by entity type (e.g. Mammal).
+        Each entity's own attributes are counted under "objects", values shared between entities (such as interned
+        species names) are only counted once, and each attached record (log, diet, medical_log, ...) is counted
+        separately, including the memory used by its DataFrame. Logs only count their index into the event store, whose
+        events are counted once under "EventStore".
+        :return: Dictionary of entity type -> {"count": entities, "objects": bytes, <record name>: bytes, ...}.
+        """
+        usage = {}
+        counted = set()  # ids of the attribute values that have already been counted.
+        for entity in self.__animals + self.__enclosures + self.__staff:
+            entity_usage = usage.setdefault(type(entity).__name__, {"count": 0, "objects": 0})
+            entity_usage["count"] += 1
+            entity_usage["objects"] += sys.getsizeof(entity)
+
+            for cls in type(entity).__mro__:
+                for slot in getattr(cls, "__slots__", ()):
+                    if slot.startswith("__"):
+                        slot = f"_{cls.__name__}{slot}"  # the name the private attribute is stored under.
+                    value = getattr(entity, slot, None)
+                    if isinstance(value, DataRecord):
+                        record_name = slot.rpartition("__")[2]  # e.g. _Animal__log -> log
+                        entity_usage[record_name] = entity_usage.get(record_name, 0) + value.get_memory_usage()
+                    elif (isinstance(value, (str, int, float, list, tuple)) and not isinstance(value, (bool, Enum))
+                          and id(value) not in counted):
+                        counted.add(id(value))
+                        entity_usage["objects"] += sys.getsizeof(value)
+
+        usage["EventStore"] = {"count": len(self.event_store),  # shared by the zoo's entities
+                               "objects": self.event_store.get_memory_usage()}
+
+        profiles = self.__species_profiles  # shared by the zoo's animals
+        if profiles:
+            usage["SpeciesProfile"] = {"count": len(profiles),
+                                       "objects": sum(sys.getsizeof(profile) for profile in profiles.values()),
+                                       "diet": sum(profile.diet.get_memory_usage() for profile in profiles.values())}
+        return usage
+
+    def records(self) -> dict[str, list[DataRecord]]:
+        """
+        Return every DataRecord of the zoo (the logs, medical logs, diets and special tasks of its entities, the diets
+        of the species profiles of its animals and the event store), each once, grouped by type of record.
+        :return: Dictionary of record type (e.g. "MedicalLog") -> records of that type.
+        """
+        records = {id(self.event_store): self.event_store}
+        for entity in self.__animals + self.__enclosures + self.__staff:
+            records[id(entity.log)] = entity.log
+        for animal in self.__animals:
+            for record in (animal.medical_log, animal.diet):
+                records[id(record)] = record
+        for profile in self.__species_profiles.values():  # animals without their own diet share these diets.
+            records[id(profile.diet)] = profile.diet
+        for staff_member in self.__staff:
+            records[id(staff_member.special_tasks)] = staff_member.special_tasks
+
+        by_type = {}
+        for record in records.values():
+            by_type.setdefault(type(record).__name__, []).append(record)
+        return by_type
+
+    def memory_report(self) -> str:
+        """
+        Generate a report of the memory used by the zoo's entities and their records, by entity type.
+        :return: Report of memory usage in bytes as a string.
+        """
+        usage = self.memory_usage()
+        totals = {entity_type: sum(size for part, size in entity_usage.items() if part != "count")
+                  for entity_type, entity_usage in usage.items()}
+        output = ("----------------------------------------------------------------------------------------------\n"
+                  f"MEMORY USAGE ({sum(totals.values()):,} bytes):\n")
+        for entity_type, entity_usage in usage.items():
+            output += f"\n{entity_type} ({entity_usage['count']}): {totals[entity_type]:,} bytes"
+            for part, size in entity_usage.items():
+                if part != "count":
+                    output += f"\n - {part}: {size:,} bytes"
+        output += "\n----------------------------------------------------------------------------------------------\n"
+        return output
+
+
+# profiling and recording switched on by environment variable (see metrics.py, tracing.py and workload.py) start as
+# soon as the zoo is imported:
+if os.environ.get("ZOO_METRICS", "") not in ("", "0") or os.environ.get("ZOO_TRACE"):
+    import metrics
+    import tracing
+if os.environ.get("ZOO_WORKLOAD"):
+    import workload
@@ -9,49 +9,87 @@ This is my own work as defined by the University's Academic Integrity Policy.
 """
 from datetime import time, datetime  # automatically handles formatting issues with dates and times.
 
-import pandas as pd
-
 from action import Action
 from animal import Animal
+from cleaning_queue import CleaningQueue
+from data_record import DataRecord
+from lazy_modules import pd
+from lock_stripes import ENTITY_LOCKS
 from requires_cleaning import RequiresCleaning
+from route_planner import RoutePlanner
 from schedule import Schedule
 from staff import Staff
 
 
 class Zookeeper(Staff):
+    __slots__ = ()
+
     def __str__(self) -> str:
         """Return the Zookeeper's key attributes as a formatted string."""
         return "\n<ZOOKEEPER> " + super().__str__()
 
-    def generate_schedule(self) -> Schedule:
-        """Return the full daily schedule of responsibilities of the Zookeeper"""
+    def generate_schedule(self, route_planner: RoutePlanner | None = None) -> Schedule:
+        """
+        Return the full daily schedule of responsibilities of the Zookeeper.
+        :param route_planner: Optional RoutePlanner used to order tasks that share a time so that the Zookeeper
+        walks the shortest route between enclosures (default is no reordering).
+        :return: Schedule
+        """
         # schedule is recreated from scratch every time it is required to ensure all changes are incorporated.
         schedule = Schedule(f"{self.name}_{self.id} Daily Task")
 
         schedule.data = pd.concat([schedule.data, self.special_tasks.data])  # add all special (non-routine) tasks first
 
-        for enclosure in self.enclosure_assignments:
-            schedule.new({"Time": time(7),  # clean all the assigned enclosures at 7am each morning
-                          "SubjectID": self.id,
-                          "SubjectName": self.name,
-                          "ObjectID": enclosure.id,
-                          "ObjectName": enclosure.name,
-                          "Action": Action.CLEAN,
-                          "Details": f"standard"})
-
-            for animal in enclosure.inhabitants:
-                animal_diet = animal.diet  # feed every animal in the enclosure
-                for entry in animal_diet.data.itertuples():  # add each entry in the animal's diet as a separate task
-                    schedule.new({"Time": entry.Time,  # get what time to feed from the animal's diet
-                                  "SubjectID": self.id,
-                                  "SubjectName": self.name,
-                                  "ObjectID": animal.id,
-                                  "ObjectName": animal.name,
-                                  "Action": Action.FEED,
-                                  "Details": entry.Details}  # get what food to feed from the animal's diet
-                                 )
+        templates = {}  # species diet template -> its (time, details) entries, read once for all its animals.
+        with DataRecord.batched_writes():  # the routine tasks are added to the schedule in one step.
+            for enclosure in self.enclosure_assignments:
+                schedule.new({"Time": time(7),  # clean all the assigned enclosures at 7am each morning
+                              "SubjectID": self.id,
+                              "SubjectName": self.name,
+                              "ObjectID": enclosure.id,
+                              "ObjectName": enclosure.name,
+                              "Action": Action.CLEAN,
+                              "Details": f"standard"})
+
+                for animal in enclosure.inhabitants:
+                    # feed every animal in the enclosure. Until a diet is customised its times and details are those
+                    # of the species' template, so each template is read once rather than copied for each animal:
+                    diet = animal.diet.template
+                    if diet is None or diet not in templates:
+                        diet_data = (animal.diet if diet is None else diet).data
+                        entries = list(zip(diet_data["Time"], diet_data["Details"]))
+                        if diet is not None:
+                            templates[diet] = entries
+                    else:
+                        entries = templates[diet]
+                    for entry_time, details in entries:  # add each entry in the animal's diet as a separate task
+                        schedule.new({"Time": entry_time,  # get what time to feed from the animal's diet
+                                      "SubjectID": self.id,
+                                      "SubjectName": self.name,
+                                      "ObjectID": animal.id,
+                                      "ObjectName": animal.name,
+                                      "Action": Action.FEED,
+                                      "Details": details}  # get what food to feed from the animal's diet
+                                     )
+
+        if route_planner is not None:
+            schedule = route_planner.order_schedule(schedule, self.get_task_locations())
         return schedule
 
+    def next_to_clean(self, cleaning_queue: CleaningQueue, n: int = 5) -> list[RequiresCleaning]:
+        """
+        Return the enclosures (and the animals living in them) the Zookeeper is responsible for that most need
+        cleaning, so they can be cleaned by need rather than by routine.
+        :param cleaning_queue: The cleaning queue of the zoo the Zookeeper works in.
+        :param n: The maximum number of objects to return (default 5).
+        :return: A list of enclosures and/or animals, dirtiest first.
+        """
+        object_ids = {animal.id for animal in self.animal_assignments}
+        for enclosure in self.enclosure_assignments:
+            object_ids.add(enclosure.id)
+            object_ids.update(animal.id for animal in enclosure.inhabitants)
+        return cleaning_queue.next_to_clean(n, object_ids)
+
     def feed(self, animal: Animal, food: str, quantity: str, at_datetime: datetime = datetime.now()):
         """
         Log that the Zookeeper fed an animal.
@@ -65,17 +103,18 @@ class Zookeeper(Staff):
             if not isinstance(animal, Animal):
                 raise TypeError("Zookeepers can only feed Animal objects.")
 
-            self.log.new({"DateTime": at_datetime,
-                          "SubjectID": self.id,
-                          "SubjectName": self.name,
-                          "ObjectID": animal.id,
-                          "ObjectName": animal.name,
-                          "Action": Action.FEED,
-                          "Details": f"{quantity} {food}"})
-
-            # record that the object ate in its own logs:
-            animal.eat(food, quantity, at_datetime)
+            with ENTITY_LOCKS.holding(self.id, animal.id):  # the whole feeding is one atomic action.
+                # record that the object ate in its own logs (returns a ref number):
+                log_ref_num = animal.eat(food, quantity, at_datetime)
 
+                # the feeding is the same event, so the Zookeeper joins it rather than logging it again:
+                self.log.join(log_ref_num, {"DateTime": at_datetime,
+                                            "SubjectID": self.id,
+                                            "SubjectName": self.name,
+                                            "ObjectID": animal.id,
+                                            "ObjectName": animal.name,
+                                            "Action": Action.FEED,
+                                            "Details": f"{quantity} {food}"})
 
         except TypeError as e:
             print(f"[ERROR] {e} No change made.\n")
@@ -93,15 +132,16 @@ class Zookeeper(Staff):
             if not isinstance(object_cleaned, RequiresCleaning):
                 raise TypeError("Zookeepers can only clean instances of the RequiresCleaning class.")
 
-            self.log.new({"DateTime": at_datetime,
-                          "SubjectID": self.id,
-                          "SubjectName": self.name,
-                          "ObjectID": object_cleaned.get_id(),
-                          "ObjectName": object_cleaned.get_name(),
-                          "Action": Action.CLEAN,
-                          "Details": f"{details}"})
-
-            # record that the object was cleaned in its own logs:
-            object_cleaned.receive_cleaning(self.id, self.name, at_datetime, 1)
+            with ENTITY_LOCKS.holding(self.id, object_cleaned.id):
+                # record that the object was cleaned in its own logs (returns a ref number):
+                log_ref_num = object_cleaned.receive_cleaning(self.id, self.name, at_datetime, 1)
+
+                self.log.join(log_ref_num, {"DateTime": at_datetime,
+                                            "SubjectID": self.id,
+                                            "SubjectName": self.name,
+                                            "ObjectID": object_cleaned.get_id(),
+                                            "ObjectName": object_cleaned.get_name(),
+                                            "Action": Action.CLEAN,
+                                            "Details": f"{details}"})
         except TypeError as e:
             print(f"[ERROR] {e} No change made.\n")